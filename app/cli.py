@@ -0,0 +1,71 @@
+"""
+Command line runner of batches and sweeps, writing the results to a file without the HTTP server.
+
+  python -m app.cli batch inputs.json -f parquet -o results.parquet
+  python -m app.cli sweep sweep.json -f arrow -o results.arrow
+"""
+import argparse
+import json
+import sys
+from typing import List
+from pydantic import TypeAdapter, ValidationError
+from app.controllers.simulation_controller import iter_batch_simulation, iter_batch_columns, iter_sweep, iter_sweep_columns
+from app.models.input import Input
+from app.models.sweep import SweepRequest
+from app.services.thermodynamics.steam.saturation_parameters import SATURATION_MODES
+from app.utils.errors import LogicConstraintError
+from app.utils.result_stream import STREAM_MEDIA_TYPES, result_chunks
+from app.utils.result_table import TABLE_MEDIA_TYPES
+
+
+def build_parser():
+  parser = argparse.ArgumentParser(prog="python -m app.cli", description="Run a batch or a sweep of simulations and write the results.")
+  parser.add_argument("kind", choices=["batch", "sweep"], help="batch: JSON list of inputs; sweep: JSON sweep request")
+  parser.add_argument("request", help="JSON file of the batch or sweep (- for standard input)")
+  parser.add_argument("-f", "--format", choices=list(STREAM_MEDIA_TYPES), default="parquet", help="Format of the results (default: parquet)")
+  parser.add_argument("-o", "--output", help="File of the results (default: standard output)")
+  parser.add_argument("--saturation-mode", choices=SATURATION_MODES, help="Saturation curve (default: the SATURATION_MODE setting)")
+  return parser
+
+
+def write_results(kind, payload, output_format, output, saturation_mode=None):
+  """
+  Running the batch or sweep of the payload, writing each piece of the results to the binary output as it is computed
+  (the columnar formats are written from the ResultColumns of each chunk)
+  """
+  columnar = output_format in TABLE_MEDIA_TYPES
+  if kind == "batch":
+    inputs = TypeAdapter(List[Input]).validate_python(payload)
+    rows = (iter_batch_columns if columnar else iter_batch_simulation)(inputs, saturation_mode)
+    point_fields = ()
+  else:
+    request = SweepRequest.model_validate(payload)
+    rows = (iter_sweep_columns if columnar else iter_sweep)(request, saturation_mode)
+    point_fields = [variable.field for variable in request.variables]
+
+  for chunk in result_chunks(rows, output_format, point_fields):
+    output.write(chunk.encode() if isinstance(chunk, str) else chunk)
+
+
+def main(argv=None):
+  args = build_parser().parse_args(argv)
+  if args.request == "-":
+    payload = json.load(sys.stdin)
+  else:
+    with open(args.request) as file:
+      payload = json.load(file)
+
+  try:
+    if args.output:
+      with open(args.output, "wb") as output:
+        write_results(args.kind, payload, args.format, output, args.saturation_mode)
+    else:
+      write_results(args.kind, payload, args.format, sys.stdout.buffer, args.saturation_mode)
+  except (ValidationError, LogicConstraintError) as exc:
+    print(f"error: {exc}", file=sys.stderr)
+    return 2
+  return 0
+
+
+if __name__ == "__main__":
+  sys.exit(main())
@@ -1,8 +1,435 @@
+import numpy as np
+from pydantic import ValidationError
+from sqlmodel import Session
+from ..core.config import settings
+from ..core.process_pool import get_process_pool
+from ..core.profiler import profiling
+from ..database.engine import engine
+from ..models.output import Output
+from ..models.input import Input
+from ..models.input_columns import InputColumns
+from ..models.result_columns import ResultColumns
+from ..models.simulation_error import SimulationError
+from ..models.sweep import SweepRow
+from ..models.part_load import PartLoadCurve, PartLoadPoint, PartLoadResult
+from ..models.profile import ProfiledSimulation
 from ..services.orchestrators.full_cycles import FullCycles
+from ..services.orchestrators.monte_carlo import MonteCarlo
+from ..services.orchestrators.operating_point_optimizer import OperatingPointOptimizer
+from ..services.orchestrators.sensitivity_analysis import SensitivityAnalysis
+from ..services.orchestrators.simulation_cache import simulation_cache, simulation_cache_key
+from ..services.utils.experiment_design import cartesian_design, linspace_design, latin_hypercube_design
+from ..services.utils.stage_cache import StageMemo
 from ..repositories.repositories_container import RepositoriesContainer
+from ..utils.lru_cache import MISSING
+from ..utils.errors import (
+  ThermodynamicError,
+  LogicConstraintError,
+  DataValidationError,
+  NotFoundError,
+  ComputationalError
+)
+
+# Errors reported per item in batches, with the same types of the API error handlers
+SIMULATION_ERRORS = (
+  ThermodynamicError,
+  LogicConstraintError,
+  DataValidationError,
+  NotFoundError,
+  ComputationalError
+)
+
+# Simulations of a batch evaluated together by the array kernels, and the smallest chunk worth it
+# (the fixed cost of a pass of the array kernels is about that of 10 scalar simulations)
+BATCH_CHUNK_SIZE = 1024
+BATCH_MIN_VECTOR_SIZE = 16
+
+def create_simulation(input, db, saturation_mode=None):
+  pool = get_process_pool()
+  if pool is not None:
+    return pool.submit(run_simulation_worker, input, saturation_mode).result()
 
-def create_simulation(input, db):
   repos = RepositoriesContainer(db)
-  full_cycles = FullCycles(input, repos)
+  full_cycles = FullCycles(input, repos, saturation_mode)
   results = full_cycles.create_full_cycles_combined()
   return results
+
+def create_cached_simulation(input, db, saturation_mode=None):
+  """
+  Running a simulation through the simulation result cache.
+  Returns the results and the cache status ("HIT" or "MISS"); errors are never cached
+  """
+  key = simulation_cache_key(input, saturation_mode or settings.SATURATION_MODE)
+  results = simulation_cache.get(key)
+  if results is not MISSING:
+    return results, "HIT"
+
+  results = create_simulation(input, db, saturation_mode)
+  simulation_cache.put(key, results)
+  return results, "MISS"
+
+def simulation_error(exc):
+  """Converting an exception of a simulation into its per-item error"""
+  if isinstance(exc, SIMULATION_ERRORS):
+    return SimulationError(error=str(exc), type=type(exc).__name__)
+  if isinstance(exc, ValidationError):
+    # Results out of the physical limits of the Output model
+    return SimulationError(error=str(exc), type="OutputValidationError")
+  return SimulationError(error=str(exc), type="InternalServerError")
+
+def simulate_item(input, repos, saturation_mode=None, stage_memo=None):
+  """Running one simulation of a batch, returning its Output or its error"""
+  try:
+    results = FullCycles(input, repos, saturation_mode, stage_memo).create_full_cycles_combined()
+    return Output(**results._asdict())
+  except Exception as exc:
+    return simulation_error(exc)
+
+def simulate_batch(inputs, repos, saturation_mode=None):
+  """Running a chunk of a batch through the array kernels (simulate_batch_columns), returning its Outputs or errors"""
+  return simulate_batch_columns(inputs, repos, saturation_mode).rows()
+
+def simulate_batch_columns(inputs, repos, saturation_mode=None):
+  """
+  Running a chunk of a batch in one pass of the array kernels over its InputColumns, returning its ResultColumns.
+  The results are rounded like the single simulations. An error of any item aborts the pass: the items reported by the
+  error are run alone, each with its own error, and the pass runs again over the others (or over each half of the chunk,
+  when the error does not report its items). Items with non-finite results are also run alone, as are small chunks;
+  items out of the bounds of the Output fields get the validation error of their Output
+  """
+  if len(inputs) < BATCH_MIN_VECTOR_SIZE:
+    return ResultColumns.from_rows([simulate_item(input, repos, saturation_mode) for input in inputs])
+
+  try:
+    with np.errstate(all="ignore"):
+      results = FullCycles(InputColumns.from_inputs(inputs), repos, saturation_mode).create_full_cycles_combined_array()
+  except Exception as exc:
+    failed = set(getattr(exc, "elements", ()))
+    if not failed or max(failed) >= len(inputs):
+      middle = len(inputs) // 2
+      return ResultColumns.assemble(len(inputs), [
+        (range(middle), simulate_batch_columns(inputs[:middle], repos, saturation_mode)),
+        (range(middle, len(inputs)), simulate_batch_columns(inputs[middle:], repos, saturation_mode))
+      ])
+
+    others = [index for index in range(len(inputs)) if index not in failed]
+    failed = sorted(failed)
+    return ResultColumns.assemble(len(inputs), [
+      (others, simulate_batch_columns([inputs[index] for index in others], repos, saturation_mode)),
+      (failed, ResultColumns.from_rows([simulate_item(inputs[index], repos, saturation_mode) for index in failed]))
+    ])
+
+  columns = ResultColumns({name: np.round(values, 2) for name, values in results._asdict().items()}, [None] * len(inputs))
+  valid = ResultColumns.valid_mask(columns.columns)
+  if valid.all():
+    return columns
+
+  # Getting the error of each invalid item: its own simulation (non-finite results) or the validation of its Output
+  invalid = np.flatnonzero(~valid)
+  rows = [
+    output_row(values) if np.isfinite(values).all() else simulate_item(inputs[index], repos, saturation_mode)
+    for index, values in zip(invalid.tolist(), np.column_stack(list(columns.columns.values()))[invalid])
+  ]
+  return ResultColumns.assemble(len(inputs), [
+    (np.flatnonzero(valid), columns.take(np.flatnonzero(valid))),
+    (invalid, ResultColumns.from_rows(rows))
+  ])
+
+def output_row(values):
+  """Output of a row of results, or the error of its validation"""
+  try:
+    return Output(**dict(zip(Output.model_fields, values.tolist())))
+  except Exception as exc:
+    return simulation_error(exc)
+
+def create_profiled_simulation(input, db, saturation_mode=None):
+  """
+  Running a simulation with the trace of its calculation: call tree, property evaluations, root finder iterations,
+  database round trips and cache hits. It always runs in the current thread, bypassing the simulation result cache
+  and the worker processes, so the trace is of this very calculation; a failing simulation returns its error with the trace
+  """
+  with profiling() as trace:
+    result = simulate_item(input, RepositoriesContainer(db), saturation_mode)
+  return ProfiledSimulation(result=result, profile=trace.summary())
+
+def check_batch_size(inputs):
+  if len(inputs) > settings.SIMULATION_BATCH_MAX_SIZE:
+    raise LogicConstraintError(f"Batch too large: {len(inputs)} simulations (maximum {settings.SIMULATION_BATCH_MAX_SIZE})")
+
+def simulate_column_chunks(inputs, repos, saturation_mode=None):
+  """Running a batch in chunks of BATCH_CHUNK_SIZE through the array kernels, yielding the ResultColumns of each chunk"""
+  for start in range(0, len(inputs), BATCH_CHUNK_SIZE):
+    yield simulate_batch_columns(inputs[start:start + BATCH_CHUNK_SIZE], repos, saturation_mode)
+
+def simulate_chunks(inputs, repos, saturation_mode=None):
+  """Running a batch in chunks of BATCH_CHUNK_SIZE through the array kernels, yielding the results of each chunk"""
+  for columns in simulate_column_chunks(inputs, repos, saturation_mode):
+    yield from columns.rows()
+
+def create_batch_simulation(inputs, db, saturation_mode=None):
+  """Running a list of simulations sharing the same repositories and component catalog"""
+  check_batch_size(inputs)
+  pool = get_process_pool()
+  if pool is not None:
+    return list(pool.imap_chunks(simulate_chunk_worker, inputs, saturation_mode))
+  return list(simulate_chunks(inputs, RepositoriesContainer(db), saturation_mode))
+
+def iter_batch_simulation(inputs, saturation_mode=None):
+  """
+  Generator version of create_batch_simulation, for streamed responses: the results of each chunk are yielded
+  as soon as it is computed. The size is checked at once, before the first simulation
+  """
+  check_batch_size(inputs)
+  pool = get_process_pool()
+  if pool is not None:
+    return pool.imap_chunks(simulate_chunk_worker, inputs, saturation_mode)
+  return stream_batch_simulation(inputs, saturation_mode)
+
+def stream_batch_simulation(inputs, saturation_mode=None):
+  """Running a streamed batch with its own session: the session of the request is closed before the stream is iterated"""
+  with Session(engine) as db:
+    yield from simulate_chunks(inputs, RepositoriesContainer(db), saturation_mode)
+
+def iter_batch_columns(inputs, saturation_mode=None):
+  """
+  Columnar version of iter_batch_simulation, for the Arrow and Parquet formats: the ResultColumns of each chunk
+  are yielded as soon as it is computed, without an Output for each result
+  """
+  check_batch_size(inputs)
+  pool = get_process_pool()
+  if pool is not None:
+    return pool.imap(simulate_chunk_columns_worker, pool.chunks(inputs), saturation_mode)
+  return stream_batch_columns(inputs, saturation_mode)
+
+def stream_batch_columns(inputs, saturation_mode=None):
+  """Running a streamed columnar batch with its own session, like stream_batch_simulation"""
+  with Session(engine) as db:
+    yield from simulate_column_chunks(inputs, RepositoriesContainer(db), saturation_mode)
+
+def sweep_points(request):
+  """Points of the design of experiments of a sweep, as {field: value}"""
+  if request.design == "latin_hypercube":
+    bounds = {variable.field: variable.bounds() for variable in request.variables}
+    return latin_hypercube_design(bounds, request.samples, request.seed)
+  axes = {variable.field: variable.points() for variable in request.variables}
+  if request.design == "linspace":
+    return linspace_design(axes)
+  return cartesian_design(axes)
+
+def sweep_input(base, point):
+  """Input of a point of a sweep, or the error of its invalid values"""
+  try:
+    return Input(**{**base.model_dump(), **point})
+  except ValidationError as exc:
+    return SimulationError(error=str(exc), type="InputValidationError")
+
+def simulate_sweep(items, repos, saturation_mode=None):
+  """
+  Running the inputs of a sweep (errors of invalid points are kept) sharing one stage memo,
+  yielding each result as soon as it is computed: the stages that do not read the varied fields are computed once
+  """
+  stage_memo = StageMemo()
+  for item in items:
+    yield item if isinstance(item, SimulationError) else simulate_item(item, repos, saturation_mode, stage_memo)
+
+def check_sweep_size(points):
+  if len(points) > settings.SIMULATION_BATCH_MAX_SIZE:
+    raise LogicConstraintError(f"Sweep too large: {len(points)} simulations (maximum {settings.SIMULATION_BATCH_MAX_SIZE})")
+
+def sweep_rows(request, points, repos, saturation_mode=None):
+  """Rows of the points of a sweep, yielding each row as soon as it is computed"""
+  results = simulate_sweep((sweep_input(request.base, point) for point in points), repos, saturation_mode)
+  for point, result in zip(points, results):
+    yield SweepRow(point=point, result=result)
+
+def simulate_sweep_batch(items, repos, saturation_mode=None):
+  """
+  Running a chunk of sweep inputs (errors of invalid points are kept) through the array kernels (simulate_batch),
+  for the chunks simulated at once: Monte Carlo samples and the chunks of the worker processes
+  """
+  return simulate_sweep_batch_columns(items, repos, saturation_mode).rows()
+
+def simulate_sweep_batch_columns(items, repos, saturation_mode=None):
+  """Columnar version of simulate_sweep_batch, returning the ResultColumns of the chunk"""
+  simulated = [index for index, item in enumerate(items) if not isinstance(item, SimulationError)]
+  invalid = [index for index, item in enumerate(items) if isinstance(item, SimulationError)]
+  return ResultColumns.assemble(len(items), [
+    (simulated, simulate_batch_columns([items[index] for index in simulated], repos, saturation_mode)),
+    (invalid, ResultColumns.from_rows([items[index] for index in invalid]))
+  ])
+
+def create_sweep(request, db, saturation_mode=None):
+  """Running a parametric sweep: one row for each point of the design, in order"""
+  points = sweep_points(request)
+  check_sweep_size(points)
+  pool = get_process_pool()
+  if pool is not None:
+    return list(sweep_pool_rows(request, points, pool, saturation_mode))
+  return list(sweep_rows(request, points, RepositoriesContainer(db), saturation_mode))
+
+def iter_sweep(request, saturation_mode=None):
+  """
+  Generator version of create_sweep, for streamed responses: each row is yielded as soon as it is computed.
+  The design is expanded and its size checked at once, before the first simulation
+  """
+  points = sweep_points(request)
+  check_sweep_size(points)
+  pool = get_process_pool()
+  if pool is not None:
+    return sweep_pool_rows(request, points, pool, saturation_mode)
+  return stream_sweep(request, points, saturation_mode)
+
+def sweep_pool_rows(request, points, pool, saturation_mode=None):
+  """Rows of the points of a sweep run by the worker processes, in order"""
+  items = [sweep_input(request.base, point) for point in points]
+  results = pool.imap_chunks(simulate_sweep_chunk_worker, items, saturation_mode)
+  return (SweepRow(point=point, result=result) for point, result in zip(points, results))
+
+def stream_sweep(request, points, saturation_mode=None):
+  """Running a streamed sweep with its own session: the session of the request is closed before the stream is iterated"""
+  with Session(engine) as db:
+    yield from sweep_rows(request, points, RepositoriesContainer(db), saturation_mode)
+
+def point_columns(points, fields):
+  """Columns of the varied fields of some points of a sweep"""
+  return {field: [point[field] for point in points] for field in fields}
+
+def iter_sweep_columns(request, saturation_mode=None):
+  """
+  Columnar version of iter_sweep, for the Arrow and Parquet formats: the ResultColumns of each chunk of points,
+  with the varied fields ahead of the Output fields, are yielded as soon as the chunk is computed
+  """
+  points = sweep_points(request)
+  check_sweep_size(points)
+  fields = [variable.field for variable in request.variables]
+  pool = get_process_pool()
+  if pool is not None:
+    chunks = list(pool.chunks(points))
+    items = ([sweep_input(request.base, point) for point in chunk] for chunk in chunks)
+    results = pool.imap(simulate_sweep_chunk_columns_worker, items, saturation_mode)
+    return (columns.with_columns(point_columns(chunk, fields)) for chunk, columns in zip(chunks, results))
+  return stream_sweep_columns(request, points, fields, saturation_mode)
+
+def stream_sweep_columns(request, points, fields, saturation_mode=None):
+  """Running a streamed columnar sweep with its own session, in chunks of BATCH_CHUNK_SIZE through the array kernels"""
+  with Session(engine) as db:
+    repos = RepositoriesContainer(db)
+    for start in range(0, len(points), BATCH_CHUNK_SIZE):
+      chunk = points[start:start + BATCH_CHUNK_SIZE]
+      columns = simulate_sweep_batch_columns([sweep_input(request.base, point) for point in chunk], repos, saturation_mode)
+      yield columns.with_columns(point_columns(chunk, fields))
+
+def create_part_load(request, db, saturation_mode=None):
+  """
+  Part-load curves: the loads of each ambient condition run as one sweep, in increasing load, sharing one stage memo.
+  The fuel chemistry is computed once per ambient condition (the Brayton cycle scales with the fuel mass flow),
+  and the steam turbine stages once per set of pressures and temperatures
+  """
+  loads = request.load_points()
+  conditions = cartesian_design({variable.field: variable.points() for variable in request.ambient}) if request.ambient else [{}]
+  size = len(loads) * len(conditions)
+  if size > settings.SIMULATION_BATCH_MAX_SIZE:
+    raise LogicConstraintError(f"Part-load curves too large: {size} simulations (maximum {settings.SIMULATION_BATCH_MAX_SIZE})")
+
+  fuel_mass_flows = [load * request.base.fuel_mass_flow for load in loads]
+  items = [
+    sweep_input(request.base, {**condition, "fuel_mass_flow": fuel_mass_flow})
+    for condition in conditions for fuel_mass_flow in fuel_mass_flows
+  ]
+  pool = get_process_pool()
+  if pool is not None:
+    results = pool.map_chunks(simulate_sweep_chunk_worker, items, saturation_mode)
+  else:
+    results = list(simulate_sweep(items, RepositoriesContainer(db), saturation_mode))
+
+  curves = []
+  for index, condition in enumerate(conditions):
+    curve_results = results[index * len(loads):(index + 1) * len(loads)]
+    points = [
+      PartLoadPoint(load=load, fuel_mass_flow=fuel_mass_flow, result=result)
+      for load, fuel_mass_flow, result in zip(loads, fuel_mass_flows, curve_results)
+    ]
+    curves.append(PartLoadCurve(ambient=condition, points=points))
+  return PartLoadResult(curves=curves, evaluations=size)
+
+def create_monte_carlo(request, db, saturation_mode=None):
+  """
+  Monte Carlo propagation: the samples are drawn, simulated and aggregated one chunk at a time, so they are never
+  all held in memory. Each chunk runs through the array kernels; invalid samples count as InputValidationError failures
+  """
+  if request.samples > settings.MONTE_CARLO_MAX_SAMPLES:
+    raise LogicConstraintError(f"Too many samples: {request.samples} (maximum {settings.MONTE_CARLO_MAX_SAMPLES})")
+
+  monte_carlo = MonteCarlo(request)
+  pool = get_process_pool()
+  if pool is not None:
+    chunk_size = min(pool.chunk_size(request.samples), MonteCarlo.chunk_size)
+    chunks = ([sweep_input(request.base, point) for point in points] for points in monte_carlo.sample_chunks(chunk_size))
+    for results in pool.imap(simulate_sweep_chunk_worker, chunks, saturation_mode):
+      monte_carlo.add(results)
+  else:
+    repos = RepositoriesContainer(db)
+    for points in monte_carlo.sample_chunks():
+      monte_carlo.add(simulate_sweep_batch([sweep_input(request.base, point) for point in points], repos, saturation_mode))
+  return monte_carlo.result()
+
+def create_optimization(request, db, saturation_mode=None):
+  """Optimizing an operating point, with at most the maximum number of simulations of a batch"""
+  if request.maximum_evaluations > settings.SIMULATION_BATCH_MAX_SIZE:
+    raise LogicConstraintError(f"Too many evaluations: {request.maximum_evaluations} simulations (maximum {settings.SIMULATION_BATCH_MAX_SIZE})")
+
+  pool = get_process_pool()
+  if pool is not None:
+    return pool.submit(run_optimization_worker, request, saturation_mode).result()
+
+  return OperatingPointOptimizer(request, RepositoriesContainer(db), saturation_mode).run()
+
+def create_sensitivity(request, db, saturation_mode=None):
+  """Sensitivity analysis of an operating point: at most 2 simulations for each field, and the base one"""
+  pool = get_process_pool()
+  if pool is not None:
+    return pool.submit(run_sensitivity_worker, request, saturation_mode).result()
+
+  return SensitivityAnalysis(request, RepositoriesContainer(db), saturation_mode).run()
+
+# Functions run in the worker processes (SIMULATION_EXECUTOR=process), with their own sessions
+
+def initialize_simulation_worker():
+  """Preloading the component catalog once in each worker process"""
+  with Session(engine) as db:
+    RepositoriesContainer(db).component_catalog
+
+def run_simulation_worker(input, saturation_mode=None):
+  """Running one simulation in a worker process"""
+  with Session(engine) as db:
+    return FullCycles(input, RepositoriesContainer(db), saturation_mode).create_full_cycles_combined()
+
+def simulate_chunk_worker(inputs, saturation_mode=None):
+  """Running a chunk of a batch in a worker process, returning its Outputs or errors"""
+  with Session(engine) as db:
+    return simulate_batch(inputs, RepositoriesContainer(db), saturation_mode)
+
+def simulate_chunk_columns_worker(inputs, saturation_mode=None):
+  """Running a chunk of a batch in a worker process, returning its ResultColumns"""
+  with Session(engine) as db:
+    return simulate_batch_columns(inputs, RepositoriesContainer(db), saturation_mode)
+
+def simulate_sweep_chunk_worker(items, saturation_mode=None):
+  """Running a chunk of a sweep in a worker process, through the array kernels"""
+  with Session(engine) as db:
+    return simulate_sweep_batch(items, RepositoriesContainer(db), saturation_mode)
+
+def simulate_sweep_chunk_columns_worker(items, saturation_mode=None):
+  """Running a chunk of a sweep in a worker process, returning its ResultColumns"""
+  with Session(engine) as db:
+    return simulate_sweep_batch_columns(items, RepositoriesContainer(db), saturation_mode)
+
+def run_optimization_worker(request, saturation_mode=None):
+  """Running an optimization in a worker process"""
+  with Session(engine) as db:
+    return OperatingPointOptimizer(request, RepositoriesContainer(db), saturation_mode).run()
+
+def run_sensitivity_worker(request, saturation_mode=None):
+  """Running a sensitivity analysis in a worker process"""
+  with Session(engine) as db:
+    return SensitivityAnalysis(request, RepositoriesContainer(db), saturation_mode).run()
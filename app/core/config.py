@@ -7,4 +7,35 @@ load_dotenv()
 class Settings:
   DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///app/database/database.db")
 
+  # Maximum number of simulations in a single batch, sweep or optimization request
+  SIMULATION_BATCH_MAX_SIZE: int = int(os.getenv("SIMULATION_BATCH_MAX_SIZE") or 10000)
+
+  # Maximum number of samples of a Monte Carlo request
+  MONTE_CARLO_MAX_SAMPLES: int = int(os.getenv("MONTE_CARLO_MAX_SAMPLES") or 1000000)
+
+  # Default mode of the saturation curve: "analytic" (correlations) or "tabulated" (precomputed spline table of the saturation pressure)
+  SATURATION_MODE: str = os.getenv("SATURATION_MODE") or "analytic"
+
+  # Entries of the process-wide cache of steam properties (0 disables it)
+  STEAM_PROPERTY_CACHE_SIZE: int = int(os.getenv("STEAM_PROPERTY_CACHE_SIZE") or 4096)
+
+  # Entries of the cache of whole simulation results (0 disables it) and their time to live in seconds
+  SIMULATION_CACHE_SIZE: int = int(os.getenv("SIMULATION_CACHE_SIZE") or 1024)
+  SIMULATION_CACHE_TTL: float = float(os.getenv("SIMULATION_CACHE_TTL") or 300)
+
+  # Simulations running at once in the worker pool, simulations waiting for a worker,
+  # and the Retry-After (seconds) of the requests refused beyond that capacity
+  SIMULATION_WORKERS: int = int(os.getenv("SIMULATION_WORKERS") or 4)
+  SIMULATION_QUEUE_DEPTH: int = int(os.getenv("SIMULATION_QUEUE_DEPTH") or 16)
+  SIMULATION_RETRY_AFTER: int = int(os.getenv("SIMULATION_RETRY_AFTER") or 1)
+
+  # Executor of the simulations: "thread" (worker pool only) or "process" (computation dispatched to worker processes),
+  # the number of worker processes (0 for the number of cores) and the size of the chunks of batches (0 for automatic)
+  SIMULATION_EXECUTOR: str = os.getenv("SIMULATION_EXECUTOR") or "thread"
+  SIMULATION_PROCESSES: int = int(os.getenv("SIMULATION_PROCESSES") or 0)
+  SIMULATION_CHUNK_SIZE: int = int(os.getenv("SIMULATION_CHUNK_SIZE") or 0)
+
+  # Recording of the metrics exported by GET /metrics (stage latencies, iterations, errors): 1 (default) or 0
+  METRICS_ENABLED: bool = bool(int(os.getenv("METRICS_ENABLED") or 1))
+
 settings = Settings()
@@ -0,0 +1,261 @@
+import time
+from bisect import bisect_left
+from functools import wraps
+from threading import Lock
+import numpy as np
+from app.core.config import settings
+from app.core.profiler import active_trace
+
+# Upper bounds (seconds) of the latency buckets: from a steam property (10 µs) to a large batch (10 s)
+LATENCY_BUCKETS = (1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4, 1e-3, 2.5e-3, 5e-3, 1e-2, 2.5e-2, 5e-2, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Upper bounds of the iteration buckets of the root finders, and of the evaluation buckets of the optimizer
+ITERATION_BUCKETS = (1, 2, 3, 4, 5, 6, 8, 10, 15, 20, 30, 50, 100)
+EVALUATION_BUCKETS = (10, 20, 50, 100, 200, 500, 1000)
+
+
+def _labels_text(names, values, extra=""):
+  """Labels of a sample in the Prometheus text format, like {stage="hrsg",le="0.1"}"""
+  pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+  if extra:
+    pairs.append(extra)
+  return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value):
+  return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value):
+  """Sample value in the Prometheus text format"""
+  if value == np.inf:
+    return "+Inf"
+  return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+  """Monotonic count of each combination of label values, like errors by type"""
+  kind = "counter"
+
+  def __init__(self, registry, name, help, labelnames=()):
+    self.registry = registry
+    self.name = name
+    self.help = help
+    self.labelnames = tuple(labelnames)
+    self._values = {}
+    self._lock = Lock()
+
+  def inc(self, *labels, amount=1):
+    """Adding amount to the count of the label values (ignored while the metrics are disabled)"""
+    if not self.registry.enabled:
+      return
+    with self._lock:
+      self._values[labels] = self._values.get(labels, 0) + amount
+
+  def value(self, *labels):
+    return self._values.get(labels, 0)
+
+  def samples(self):
+    with self._lock:
+      values = dict(self._values)
+    return [f"{self.name}_total{_labels_text(self.labelnames, labels)} {_number(value)}" for labels, value in sorted(values.items())]
+
+  def clear(self):
+    with self._lock:
+      self._values.clear()
+
+
+class Histogram:
+  """Distribution of observed values (latencies, iterations) of each combination of label values, in cumulative buckets"""
+  kind = "histogram"
+
+  def __init__(self, registry, name, help, labelnames=(), buckets=LATENCY_BUCKETS):
+    self.registry = registry
+    self.name = name
+    self.help = help
+    self.labelnames = tuple(labelnames)
+    self.buckets = tuple(buckets)
+    # Label values: [counts of each bucket (the last one beyond all bounds), sum, count]
+    self._series = {}
+    self._lock = Lock()
+
+  def _series_of(self, labels):
+    series = self._series.get(labels)
+    if series is None:
+      series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+    return series
+
+  def observe(self, value, *labels):
+    """Counting a value in its bucket (ignored while the metrics are disabled)"""
+    if not self.registry.enabled:
+      return
+    bucket = bisect_left(self.buckets, value)
+    with self._lock:
+      series = self._series.get(labels) or self._series_of(labels)
+      series[0][bucket] += 1
+      series[1] += value
+      series[2] += 1
+
+  def observe_array(self, values, *labels):
+    """Counting all values of an array at once, like the iterations of the array root finders"""
+    if not self.registry.enabled:
+      return
+    values = np.ravel(values)
+    counts = np.bincount(np.searchsorted(self.buckets, values, side="left"), minlength=len(self.buckets) + 1)
+    with self._lock:
+      series = self._series_of(labels)
+      series[0] = [count + int(added) for count, added in zip(series[0], counts)]
+      series[1] += float(values.sum())
+      series[2] += len(values)
+
+  def count(self, *labels):
+    series = self._series.get(labels)
+    return series[2] if series else 0
+
+  def samples(self):
+    with self._lock:
+      series = {labels: (list(counts), total, count) for labels, (counts, total, count) in self._series.items()}
+    lines = []
+    for labels, (counts, total, count) in sorted(series.items()):
+      cumulative = np.cumsum(counts)
+      for bound, bucket_count in zip(self.buckets + (np.inf,), cumulative):
+        bound_label = f'le="{_number(bound)}"'
+        lines.append(f"{self.name}_bucket{_labels_text(self.labelnames, labels, bound_label)} {bucket_count}")
+      lines.append(f"{self.name}_sum{_labels_text(self.labelnames, labels)} {_number(float(total))}")
+      lines.append(f"{self.name}_count{_labels_text(self.labelnames, labels)} {count}")
+    return lines
+
+  def clear(self):
+    with self._lock:
+      self._series.clear()
+
+
+class MetricsRegistry:
+  """
+  Process-wide metrics of the simulations, exported in the Prometheus text format by GET /metrics.
+  While disabled (METRICS_ENABLED=0), observations return at once and the timed functions are called directly.
+  The hit/miss statistics of the registered caches are read from the caches themselves at each export
+  """
+
+  def __init__(self, enabled=True):
+    self.enabled = enabled
+    self.metrics = []
+    self.caches = {}
+
+  def counter(self, name, help, labelnames=()):
+    metric = Counter(self, name, help, labelnames)
+    self.metrics.append(metric)
+    return metric
+
+  def histogram(self, name, help, labelnames=(), buckets=LATENCY_BUCKETS):
+    metric = Histogram(self, name, help, labelnames, buckets)
+    self.metrics.append(metric)
+    return metric
+
+  def register_cache(self, name, cache):
+    """Exporting the statistics (LRUCache.stats()) of a cache under its name"""
+    self.caches[name] = cache
+
+  def clear(self):
+    """Discarding all observations (the caches keep their own statistics)"""
+    for metric in self.metrics:
+      metric.clear()
+
+  def _cache_lines(self):
+    stats = {name: cache.stats() for name, cache in sorted(self.caches.items())}
+    families = [
+      ("cycle_comb_cache_hits", "counter", "Lookups of the cache that found the entry", "hits"),
+      ("cycle_comb_cache_misses", "counter", "Lookups of the cache that did not find the entry (or found it expired)", "misses"),
+      ("cycle_comb_cache_hit_ratio", "gauge", "Fraction of the lookups of the cache that found the entry", "hit_rate"),
+      ("cycle_comb_cache_entries", "gauge", "Entries in the cache", "size"),
+    ]
+    lines = []
+    for name, kind, help, key in families:
+      lines += [f"# HELP {name} {help}", f"# TYPE {name} {kind}"]
+      # Like Counter.samples, only the samples of a counter family carry the _total suffix
+      sample = f"{name}_total" if kind == "counter" else name
+      lines += [f'{sample}{{cache="{_escape(cache)}"}} {_number(values[key])}' for cache, values in stats.items()]
+    return lines
+
+  def render(self):
+    """All metrics in the Prometheus text exposition format (version 0.0.4)"""
+    lines = []
+    for metric in self.metrics:
+      lines += [f"# HELP {metric.name} {metric.help}", f"# TYPE {metric.name} {metric.kind}"]
+      lines += metric.samples()
+    if self.caches:
+      lines += self._cache_lines()
+    return "\n".join(lines) + "\n"
+
+
+# Process-wide registry and the metrics of the simulations
+metrics = MetricsRegistry(settings.METRICS_ENABLED)
+
+stage_duration = metrics.histogram(
+  "cycle_comb_stage_duration_seconds",
+  "Duration of the calculation stages, including the stages they call",
+  ("stage",)
+)
+repository_query_duration = metrics.histogram(
+  "cycle_comb_repository_query_duration_seconds",
+  "Duration of the database queries of the repositories",
+  ("query",)
+)
+root_finder_iterations = metrics.histogram(
+  "cycle_comb_root_finder_iterations",
+  "Iterations of each root found by the Newton method",
+  ("method",),
+  ITERATION_BUCKETS
+)
+optimizer_evaluations = metrics.histogram(
+  "cycle_comb_optimizer_evaluations",
+  "Objective evaluations of each Nelder-Mead minimization",
+  ("method",),
+  EVALUATION_BUCKETS
+)
+stage_memo_lookups = metrics.counter(
+  "cycle_comb_stage_memo_lookups",
+  "Lookups of the stage memo of sweeps and optimizations, by stage and result (hit or miss)",
+  ("stage", "result")
+)
+error_responses = metrics.counter(
+  "cycle_comb_error_responses",
+  "Error responses of the API, by error type",
+  ("type",)
+)
+
+
+def timed(histogram, *labels, kind="stage"):
+  """Decorator observing the duration of each call (failed calls included) on the histogram with the label values.
+  While a profile trace is active, each call is also a span (of the kind) of its call tree, named by the first label.
+  While the metrics are disabled and no trace is active, the function is called directly"""
+  def decorator(function):
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+      trace = active_trace.get()
+      if trace is None and not histogram.registry.enabled:
+        return function(*args, **kwargs)
+      span = trace.open(labels[0], kind) if trace is not None else None
+      start = time.perf_counter()
+      try:
+        return function(*args, **kwargs)
+      except BaseException as exc:
+        if span is not None:
+          span.error = type(exc).__name__
+        raise
+      finally:
+        duration = time.perf_counter() - start
+        histogram.observe(duration, *labels)
+        if span is not None:
+          trace.close(span, duration)
+    return wrapper
+  return decorator
+
+
+def timed_stage(stage):
+  """Decorator timing a calculation stage on cycle_comb_stage_duration_seconds"""
+  return timed(stage_duration, stage)
+
+
+def timed_query(query):
+  """Decorator timing a repository query on cycle_comb_repository_query_duration_seconds (a database round trip of the profiles)"""
+  return timed(repository_query_duration, query, kind="query")
@@ -0,0 +1,130 @@
+import math
+from collections import deque
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from threading import Lock
+from app.core.config import settings
+from app.repositories.component_catalog import component_catalog_version, sync_component_catalog_version
+
+class ProcessPool:
+  """
+  Pool of worker processes running the CPU-bound simulations on all cores.
+  Workers are started ahead of the requests (start()) and each runs the initializer once, to preload its data.
+  Each task carries the component catalog version of the server process, so the workers discard their snapshot
+  of the catalog once it is invalidated (see invalidate_component_catalog).
+  The "spawn" start method is used: the server process has threads (event loop and worker pool), which fork does not copy safely.
+  """
+
+  def __init__(self, workers, initializer=None, initargs=()):
+    self.workers = workers
+    self.executor = ProcessPoolExecutor(
+      max_workers=workers,
+      mp_context=multiprocessing.get_context("spawn"),
+      initializer=_initialize_worker,
+      initargs=(component_catalog_version(), initializer, *initargs)
+    )
+
+  def start(self):
+    """Starting all workers (and running their initializers) before the first request"""
+    for future in [self.executor.submit(_ping) for _ in range(self.workers)]:
+      future.result()
+
+  def submit(self, function, *args):
+    """Run the function in a worker, returning its Future"""
+    return self.executor.submit(_run_task, component_catalog_version(), function, *args)
+
+  def chunk_size(self, size):
+    """Chunk size of a batch: the configured one, or about 4 chunks per worker to balance the load"""
+    return settings.SIMULATION_CHUNK_SIZE or max(1, math.ceil(size / (self.workers * 4)))
+
+  def chunks(self, items):
+    """Consecutive chunks of the items, of chunk_size"""
+    size = self.chunk_size(len(items))
+    return (items[start:start + size] for start in range(0, len(items), size))
+
+  def map_chunks(self, function, items, *args):
+    """
+    Run function(chunk, *args) on consecutive chunks of the items, in parallel.
+    The function returns a list for each chunk; the lists are concatenated in the order of the items
+    """
+    return list(self.imap_chunks(function, items, *args))
+
+  def imap_chunks(self, function, items, *args):
+    """
+    Generator version of map_chunks, yielding the results in order as their chunks finish.
+    At most 2 chunks per worker are submitted ahead of the consumer, so memory stays bounded for slow consumers;
+    closing the generator cancels the chunks not started yet
+    """
+    for results in self.imap(function, self.chunks(items), *args):
+      yield from results
+
+  def imap(self, function, chunks, *args):
+    """
+    Run function(chunk, *args) on each chunk of an iterable, in parallel, yielding the result of each chunk in order.
+    The chunks are taken from the iterable only as they are submitted (at most 2 per worker ahead of the consumer),
+    so they can be produced lazily; closing the generator cancels the chunks not started yet
+    """
+    chunks = iter(chunks)
+    futures = deque()
+    try:
+      while True:
+        while len(futures) < self.workers * 2:
+          chunk = next(chunks, None)
+          if chunk is None:
+            break
+          futures.append(self.submit(function, chunk, *args))
+        if not futures:
+          return
+        yield futures.popleft().result()
+    finally:
+      for future in futures:
+        future.cancel()
+
+  def shutdown(self, wait=True):
+    """Finishing the submitted work and stopping the workers; queued work is cancelled when not waiting"""
+    self.executor.shutdown(wait=wait, cancel_futures=not wait)
+
+
+def _initialize_worker(catalog_version, initializer, *initargs):
+  """Initializer of a worker: the catalog it preloads is of the server's version at the start of the pool"""
+  sync_component_catalog_version(catalog_version)
+  if initializer is not None:
+    initializer(*initargs)
+
+
+def _run_task(catalog_version, function, *args):
+  """Running a task in a worker with the component catalog of the server's version when it was submitted"""
+  sync_component_catalog_version(catalog_version)
+  return function(*args)
+
+
+def _ping():
+  return True
+
+
+# Process-wide pool, only with SIMULATION_EXECUTOR=process
+_pool = None
+_pool_lock = Lock()
+
+
+def get_process_pool():
+  """Return the process-wide process pool, or None when the simulations run in threads"""
+  global _pool
+  if settings.SIMULATION_EXECUTOR != "process":
+    return None
+  if _pool is None:
+    with _pool_lock:
+      if _pool is None:
+        # Imported here: the initializer lives with the simulation controller, which uses this module
+        from app.controllers.simulation_controller import initialize_simulation_worker
+        _pool = ProcessPool(settings.SIMULATION_PROCESSES or multiprocessing.cpu_count(), initialize_simulation_worker)
+  return _pool
+
+
+def shutdown_process_pool(wait=True):
+  """Stopping the process-wide pool, if started"""
+  global _pool
+  with _pool_lock:
+    if _pool is not None:
+      _pool.shutdown(wait)
+      _pool = None
@@ -0,0 +1,138 @@
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+import numpy as np
+
+# Trace of the profiled simulation running in the current context (None when not profiling)
+active_trace = ContextVar("active_trace", default=None)
+
+
+class Span:
+  """Call of a stage or query of the trace, with the spans of the calls it made"""
+  __slots__ = ("name", "kind", "duration", "error", "children")
+
+  def __init__(self, name, kind):
+    self.name = name
+    self.kind = kind
+    self.duration = 0.0
+    self.error = None
+    self.children = []
+
+  def as_dict(self):
+    return {
+      "name": self.name,
+      "kind": self.kind,
+      "duration_ms": self.duration * 1000,
+      "error": self.error,
+      "children": [child.as_dict() for child in self.children]
+    }
+
+
+class ProfileTrace:
+  """
+  Call tree, property evaluations, root finder iterations and database round trips of a single simulation.
+  It is filled by the hooks of the stages (timed_stage, profile_span), the queries (timed_query), the root finders
+  and the steam property cache while it is the active trace of the context (see profiling())
+  """
+
+  def __init__(self):
+    self.root = Span("simulation", "stage")
+    self._stack = [self.root]
+    # Correlation: [lookups, lookups through the cache, cache hits]
+    self.properties = {}
+    # (stage, method, iterations) of each root found
+    self.root_finders = []
+    self._start = time.perf_counter()
+
+  def open(self, name, kind):
+    span = Span(name, kind)
+    self._stack[-1].children.append(span)
+    self._stack.append(span)
+    return span
+
+  def close(self, span, duration):
+    span.duration = duration
+    self._stack.pop()
+
+  @contextmanager
+  def span(self, name, kind="stage"):
+    span = self.open(name, kind)
+    start = time.perf_counter()
+    try:
+      yield span
+    except BaseException as exc:
+      span.error = type(exc).__name__
+      raise
+    finally:
+      self.close(span, time.perf_counter() - start)
+
+  def count_property(self, correlation, cache_hit=None):
+    """Counting a lookup of a property correlation: cache_hit is None when it did not go through the cache"""
+    counts = self.properties.get(correlation)
+    if counts is None:
+      counts = self.properties[correlation] = [0, 0, 0]
+    counts[0] += 1
+    if cache_hit is not None:
+      counts[1] += 1
+      counts[2] += cache_hit
+
+  def add_root_finder(self, method, iterations):
+    """Iterations of the roots found by a root finder, in the stage being computed"""
+    stage = self._stack[-1].name
+    for value in np.ravel(iterations).tolist():
+      self.root_finders.append((stage, method, int(value)))
+
+  def summary(self):
+    """The trace as a dict of SimulationProfile fields"""
+    queries = 0
+    pending = list(self.root.children)
+    while pending:
+      span = pending.pop()
+      queries += span.kind == "query"
+      pending.extend(span.children)
+
+    cached = [counts for counts in self.properties.values() if counts[1]]
+    return {
+      "duration_ms": (time.perf_counter() - self._start) * 1000,
+      "call_tree": [span.as_dict() for span in self.root.children],
+      "property_evaluations": {
+        correlation: {"lookups": lookups, "cache_hits": hits, "evaluations": lookups - hits}
+        for correlation, (lookups, _, hits) in sorted(self.properties.items())
+      },
+      "root_finders": [{"stage": stage, "method": method, "iterations": iterations} for stage, method, iterations in self.root_finders],
+      "database_round_trips": queries,
+      "caches": {
+        "steam_property": {"hits": sum(counts[2] for counts in cached), "misses": sum(counts[1] - counts[2] for counts in cached)}
+      }
+    }
+
+
+@contextmanager
+def profiling():
+  """Profiling the calls made in the block (in the current thread) on a new ProfileTrace"""
+  trace = ProfileTrace()
+  token = active_trace.set(trace)
+  try:
+    yield trace
+  finally:
+    active_trace.reset(token)
+
+
+def profile_span(name):
+  """Span of a stage in the active trace, or a no-op context when not profiling"""
+  trace = active_trace.get()
+  return nullcontext() if trace is None else trace.span(name)
+
+
+def record_root_finder(method, iterations):
+  """Recording the iterations of a root finder in the active trace, if any"""
+  trace = active_trace.get()
+  if trace is not None:
+    trace.add_root_finder(method, iterations)
+
+
+def record_property(correlation, cache_hit=None):
+  """Recording a lookup of a property correlation in the active trace, if any"""
+  trace = active_trace.get()
+  if trace is not None:
+    trace.count_property(correlation, cache_hit)
@@ -0,0 +1,105 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from threading import BoundedSemaphore, Lock
+from app.core.config import settings
+from app.utils.errors import OverloadedError
+
+class WorkerPool:
+  """
+  Bounded pool running the CPU-bound simulations outside of the event loop.
+  At most `workers` calls run at once and at most `queue_depth` wait for a worker;
+  beyond that capacity, new calls are refused at once with an OverloadedError (429 with Retry-After).
+  """
+
+  def __init__(self, workers, queue_depth, retry_after=1):
+    self.workers = workers
+    self.queue_depth = queue_depth
+    self.retry_after = retry_after
+    self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="simulation")
+    # One slot for each running or waiting call
+    self._slots = BoundedSemaphore(workers + queue_depth)
+
+  def _acquire(self):
+    if not self._slots.acquire(blocking=False):
+      raise OverloadedError(f"Server at capacity ({self.workers} running, {self.queue_depth} queued), retry later", self.retry_after)
+
+  async def run(self, function, *args):
+    """Run the function in the pool, without blocking the event loop"""
+    self._acquire()
+    try:
+      future = self.executor.submit(function, *args)
+    except BaseException:
+      self._slots.release()
+      raise
+
+    # The slot is released when the call finishes, even if the client disconnects before
+    future.add_done_callback(lambda _: self._slots.release())
+    return await asyncio.wrap_future(future)
+
+  def stream(self, function, *args):
+    """
+    Iterate the generator function(*args) in the pool, one item at a time, as an async generator.
+    The slot is taken at once (OverloadedError when full) and kept until the stream ends or is closed
+    (client disconnected): the generator is then closed in the pool, so no further item is computed
+    """
+    self._acquire()
+    return self._stream(function, args)
+
+  async def _stream(self, function, args):
+    iterator = None
+    pending = None
+    try:
+      iterator = function(*args)
+      while True:
+        pending = self.executor.submit(next, iterator, _END)
+        item = await asyncio.wrap_future(pending)
+        if item is _END:
+          break
+        yield item
+    finally:
+      # The generator is closed after the item being computed, if any; the slot is released after it
+      closing = self.executor.submit(_close_iterator, iterator, pending)
+      closing.add_done_callback(lambda _: self._slots.release())
+
+  def shutdown(self, wait=True):
+    """Stop accepting work and wait for the running calls"""
+    self.executor.shutdown(wait=wait)
+
+
+# End of a stream, returned by next() in the pool
+_END = object()
+
+
+def _close_iterator(iterator, pending):
+  """Closing a stream's generator once its last next() call (if any) has finished"""
+  if pending is not None:
+    try:
+      pending.result()
+    except BaseException:
+      pass
+  if iterator is not None and hasattr(iterator, "close"):
+    iterator.close()
+
+
+# Process-wide pool of the simulation routes, created on first use
+_pool = None
+_pool_lock = Lock()
+
+
+def get_worker_pool():
+  """Return the process-wide worker pool, configured by the settings"""
+  global _pool
+  if _pool is None:
+    with _pool_lock:
+      if _pool is None:
+        _pool = WorkerPool(settings.SIMULATION_WORKERS, settings.SIMULATION_QUEUE_DEPTH, settings.SIMULATION_RETRY_AFTER)
+  return _pool
+
+
+def shutdown_worker_pool(wait=True):
+  """Stopping the process-wide worker pool, if started"""
+  global _pool
+  with _pool_lock:
+    if _pool is not None:
+      _pool.shutdown(wait)
+      _pool = None
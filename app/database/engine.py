@@ -1,4 +1,7 @@
 from sqlmodel import create_engine
 from app.core.config import settings
 
-engine = create_engine(settings.DATABASE_URL, echo=False)
+# SQLite connections are used by the worker threads of the simulations, not only by the thread that opened them
+connect_args = {"check_same_thread": False} if settings.DATABASE_URL.startswith("sqlite") else {}
+
+engine = create_engine(settings.DATABASE_URL, echo=False, connect_args=connect_args)
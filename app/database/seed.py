@@ -3,6 +3,7 @@ from sqlmodel import Session, select
 from .create import create_db_and_tables
 from .models import Substance, CorrelationSpecificHeat
 from .engine import engine
+from ..repositories.component_catalog import invalidate_component_catalog
 
 
 def populate_database_tables():
@@ -42,6 +43,8 @@ def populate_database_tables():
         session.add(corr)
 
       session.commit()
+      # Substances changed, so the in-memory catalog must be reloaded
+      invalidate_component_catalog()
       print("Finished populating database.")
 
 
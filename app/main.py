@@ -1,8 +1,13 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from pydantic import BaseModel
 from typing import List
-from app.routes import simulation, substances
+from app.routes import metrics, simulation, substances
 from app.utils.error_handler import register_error_handlers
+from app.core.config import settings
+from app.core.worker_pool import shutdown_worker_pool
+from app.core.process_pool import get_process_pool, shutdown_process_pool
+from app.services.thermodynamics.steam.saturation_parameters import get_saturation_tables
 from fastapi.middleware.cors import CORSMiddleware
 import logging
 
@@ -10,10 +15,27 @@ import logging
 logging.getLogger("sqlalchemy.engine").setLevel(logging.WARNING)
 logging.getLogger("sqlalchemy.pool").setLevel(logging.WARNING)
 
+# Building the saturation tables at startup when they are the default mode
+if settings.SATURATION_MODE == "tabulated":
+  get_saturation_tables()
+
+@asynccontextmanager
+async def lifespan(app):
+  # Starting the worker processes (with their component catalog) before the first request
+  process_pool = get_process_pool()
+  if process_pool is not None:
+    process_pool.start()
+  yield
+  # Graceful shutdown: running simulations finish before the workers stop
+  shutdown_worker_pool()
+  shutdown_process_pool()
+
 app = FastAPI(
-  title="Simulator for combined thermodynamic cycles (Brayton-Rankine)")
+  title="Simulator for combined thermodynamic cycles (Brayton-Rankine)",
+  lifespan=lifespan)
 app.include_router(simulation.router)
 app.include_router(substances.router)
+app.include_router(metrics.router)
 register_error_handlers(app)
 
 origins = [
@@ -42,6 +64,6 @@ async def read_root():
   return InfoResponse(
     message="Welcome to the Combined Thermodynamic Cycles Calculations API!",
     description="Microservice for combined thermodynamic cycles calculations.",
-    available_endpoints=["POST /simulation", "GET /substances"],
+    available_endpoints=["POST /simulation", "POST /simulation/batch", "POST /simulation/sweep", "POST /simulation/part-load", "POST /simulation/monte-carlo", "POST /simulation/optimize", "POST /simulation/sensitivity", "GET /substances", "GET /metrics"],
     documentation="/docs"
   )
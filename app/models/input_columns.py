@@ -0,0 +1,27 @@
+import numpy as np
+from .input import Input
+
+class InputColumns:
+  """
+  Columnar view of a list of inputs: one NumPy array per Input field.
+  It exposes the same attribute names of Input, so the batch mode of the services
+  reads `input.high_steam_level_pressure` as an array of all operating points.
+  """
+  def __init__(self, columns):
+    sizes = {len(values) for values in columns.values()}
+    if len(sizes) > 1:
+      raise ValueError("All columns must have the same length")
+    self.size = sizes.pop() if sizes else 0
+    for name, values in columns.items():
+      setattr(self, name, np.asarray(values, dtype=float))
+
+  @classmethod
+  def from_inputs(cls, inputs):
+    """Building the columns from a list of Input models"""
+    return cls({
+      name: [getattr(input, name) for input in inputs]
+      for name in Input.model_fields
+    })
+
+  def __len__(self):
+    return self.size
@@ -0,0 +1,115 @@
+from typing import Dict, List, Literal, Optional
+from pydantic import BaseModel, Field, field_validator, model_validator
+from .input import Input
+from .output import Output
+
+class InputDistribution(BaseModel):
+  """
+  Probability distribution of an Input field: `normal` (mean, std), `uniform` (lower, upper)
+  or `triangular` (lower, mode, upper)
+  """
+  field: str = Field(..., example="local_temperature", description="Name of the Input field")
+  distribution: Literal["normal", "uniform", "triangular"] = Field(..., example="normal", description="Distribution of the field")
+  mean: Optional[float] = Field(None, example=15, description="Mean of normal distributions")
+  std: Optional[float] = Field(None, ge=0, example=5, description="Standard deviation of normal distributions")
+  lower: Optional[float] = Field(None, description="Lower limit of uniform and triangular distributions")
+  upper: Optional[float] = Field(None, description="Upper limit of uniform and triangular distributions")
+  mode: Optional[float] = Field(None, description="Most likely value of triangular distributions")
+
+  @field_validator("field")
+  @classmethod
+  def check_field(cls, field):
+    if field not in Input.model_fields:
+      raise ValueError(f"Unknown Input field: {field}")
+    return field
+
+  @model_validator(mode="after")
+  def check_parameters(self):
+    if self.distribution == "normal":
+      if self.mean is None or self.std is None:
+        raise ValueError(f"The normal distribution of {self.field} needs mean and std")
+      return self
+    if self.lower is None or self.upper is None:
+      raise ValueError(f"The {self.distribution} distribution of {self.field} needs lower and upper")
+    if self.lower >= self.upper:
+      raise ValueError(f"The lower limit of {self.field} must be less than the upper limit")
+    if self.distribution == "triangular" and (self.mode is None or not self.lower <= self.mode <= self.upper):
+      raise ValueError(f"The triangular distribution of {self.field} needs a mode between lower and upper")
+    return self
+
+  def draw(self, generator, size):
+    """Array of `size` values of the distribution, from the numpy generator"""
+    if self.distribution == "normal":
+      return generator.normal(self.mean, self.std, size)
+    if self.distribution == "uniform":
+      return generator.uniform(self.lower, self.upper, size)
+    return generator.triangular(self.lower, self.mode, self.upper, size)
+
+
+class MonteCarloRequest(BaseModel):
+  """
+  Monte Carlo propagation of the uncertainty of some Input fields to the Output fields
+  """
+  base: Input = Field(..., description="Input of all samples, except for the uncertain fields")
+  distributions: List[InputDistribution] = Field(..., min_length=1, description="Distributions of the uncertain fields")
+  samples: int = Field(10000, ge=1, description="Number of samples")
+  seed: Optional[int] = Field(None, description="Seed of the samples, for reproducible results")
+  outputs: Optional[List[str]] = Field(None, example=["net_power_cycle_combined"], description="Output fields of the statistics (default: all)")
+  percentiles: List[float] = Field([5, 25, 50, 75, 95], min_length=1, description="Percentiles of the outputs (0-100)")
+  bins: int = Field(40, ge=2, le=1000, description="Number of bins of the histograms, before leaving out the empty bins at the ends")
+  normalize_fuel: bool = Field(True, description="Rescaling the sampled fuel composition to the total of the base composition")
+
+  @field_validator("outputs")
+  @classmethod
+  def check_outputs(cls, outputs):
+    for output in outputs or []:
+      if output not in Output.model_fields:
+        raise ValueError(f"Unknown Output field: {output}")
+    return outputs
+
+  @field_validator("percentiles")
+  @classmethod
+  def check_percentiles(cls, percentiles):
+    for percentile in percentiles:
+      if not 0 <= percentile <= 100:
+        raise ValueError("The percentiles must be between 0 and 100")
+    return percentiles
+
+  @model_validator(mode="after")
+  def check_distributions(self):
+    fields = [distribution.field for distribution in self.distributions]
+    if len(set(fields)) != len(fields):
+      raise ValueError("Each field can have only one distribution")
+    return self
+
+
+class Histogram(BaseModel):
+  """
+  Histogram of an Output field over all successful samples, without the empty bins at the ends
+  """
+  edges: List[float] = Field(..., description="Edges of the bins (one more than the counts)")
+  counts: List[int] = Field(..., description="Samples in each bin")
+
+
+class OutputStatistics(BaseModel):
+  """
+  Statistics of an Output field over the successful samples
+  """
+  mean: float = Field(..., description="Mean")
+  std: float = Field(..., description="Sample standard deviation")
+  minimum: float = Field(..., description="Minimum")
+  maximum: float = Field(..., description="Maximum")
+  percentiles: Dict[str, float] = Field(..., description="Percentiles, as {percentile: value}")
+  histogram: Histogram = Field(..., description="Histogram")
+
+
+class MonteCarloResult(BaseModel):
+  """
+  Statistics of the Output fields and failure rates of a Monte Carlo propagation
+  """
+  samples: int = Field(..., description="Number of samples")
+  successes: int = Field(..., description="Number of samples simulated successfully")
+  failures: Dict[str, int] = Field(..., description="Number of failed samples by error type, like ThermodynamicError or InputValidationError")
+  failure_rates: Dict[str, float] = Field(..., description="Fraction of the samples failed by error type")
+  statistics: Dict[str, OutputStatistics] = Field(..., description="Statistics of each Output field (empty when no sample succeeded)")
+  exact_percentiles: bool = Field(..., description="Whether the percentiles use all successful samples, or a uniform subsample of them")
@@ -0,0 +1,100 @@
+from typing import Dict, List, Literal, Optional
+from pydantic import BaseModel, Field, field_validator, model_validator
+from .input import Input
+from .output import Output
+
+class OptimizationVariable(BaseModel):
+  """
+  Input field chosen by the optimizer, between its bounds
+  """
+  field: str = Field(..., example="percent_excess_air", description="Name of the Input field")
+  lower: float = Field(..., example=120, description="Lower bound of the field")
+  upper: float = Field(..., example=200, description="Upper bound of the field")
+  initial: Optional[float] = Field(None, example=160, description="Starting value (default: the value of the base input)")
+
+  @field_validator("field")
+  @classmethod
+  def check_field(cls, field):
+    if field not in Input.model_fields:
+      raise ValueError(f"Unknown Input field: {field}")
+    return field
+
+  @model_validator(mode="after")
+  def check_bounds(self):
+    if self.lower >= self.upper:
+      raise ValueError(f"The lower bound of {self.field} must be less than the upper bound")
+    return self
+
+
+class OptimizationConstraint(BaseModel):
+  """
+  Limits on an Output field (or an Input field) that the optimal point must respect
+  """
+  field: str = Field(..., example="quality_exhaustion_steam_turbine", description="Name of the Output or Input field")
+  minimum: Optional[float] = Field(None, example=0.88, description="Minimum value of the field")
+  maximum: Optional[float] = Field(None, description="Maximum value of the field")
+
+  @field_validator("field")
+  @classmethod
+  def check_field(cls, field):
+    if field not in Output.model_fields and field not in Input.model_fields:
+      raise ValueError(f"Unknown Output or Input field: {field}")
+    return field
+
+  @model_validator(mode="after")
+  def check_limits(self):
+    if self.minimum is None and self.maximum is None:
+      raise ValueError(f"Give the minimum or the maximum of {self.field}")
+    return self
+
+
+class OptimizationRequest(BaseModel):
+  """
+  Optimization of an operating point: the Input fields of the variables are chosen to maximize
+  (or minimize) an Output field, within their bounds and the constraints
+  """
+  base: Input = Field(..., description="Input of the operating point, except for the variables")
+  variables: List[OptimizationVariable] = Field(..., min_length=1, description="Fields chosen by the optimizer")
+  objective: str = Field("net_cycle_combined_efficiency", description="Output field of the objective")
+  goal: Literal["maximize", "minimize"] = Field("maximize", description="Direction of the optimization")
+  constraints: List[OptimizationConstraint] = Field([], description="Limits of Output or Input fields")
+  maximum_evaluations: int = Field(200, ge=1, description="Maximum number of simulations")
+  tolerance: float = Field(1e-3, gt=0, description="Convergence tolerance of the objective")
+
+  @field_validator("objective")
+  @classmethod
+  def check_objective(cls, objective):
+    if objective not in Output.model_fields:
+      raise ValueError(f"Unknown Output field: {objective}")
+    return objective
+
+  @model_validator(mode="after")
+  def check_variables(self):
+    fields = [variable.field for variable in self.variables]
+    if len(set(fields)) != len(fields):
+      raise ValueError("Each field can be optimized only once")
+    return self
+
+
+class OptimizationStep(BaseModel):
+  """
+  Best point after an iteration of the optimizer
+  """
+  iteration: int = Field(..., description="Iteration number")
+  evaluations: int = Field(..., description="Simulations run until the iteration")
+  objective: Optional[float] = Field(..., description="Objective of the best point, or null when no feasible simulation was found")
+  point: Dict[str, float] = Field(..., description="Values of the variables at the best point")
+
+
+class OptimizationResult(BaseModel):
+  """
+  Optimal operating point, with its simulation results and the convergence trace
+  """
+  point: Dict[str, float] = Field(..., description="Optimal values of the variables")
+  objective: float = Field(..., description="Objective at the optimal point, not rounded (unlike result)")
+  result: Output = Field(..., description="Simulation results at the optimal point")
+  feasible: bool = Field(..., description="Whether the optimal point respects all constraints")
+  converged: bool = Field(..., description="Whether the tolerance was reached before the maximum of evaluations")
+  evaluations: int = Field(..., description="Number of simulations run")
+  iterations: int = Field(..., description="Number of iterations of the optimizer")
+  trace: List[OptimizationStep] = Field(..., description="Best point after each iteration")
@@ -0,0 +1,74 @@
+from typing import Dict, List, Optional, Union
+from pydantic import BaseModel, Field, field_validator, model_validator
+from .input import Input
+from .output import Output
+from .simulation_error import SimulationError
+from .sweep import SweepVariable
+
+class PartLoadRequest(BaseModel):
+  """
+  Part-load curves: the base input at fractions of its fuel mass flow (the loads), for each combination
+  of the values of the ambient variables
+  """
+  base: Input = Field(..., description="Input of the full load (its fuel mass flow is the load 1)")
+  loads: Optional[List[float]] = Field(None, min_length=1, example=[0.5, 0.75, 1.0], description="Loads, as fractions of the base fuel mass flow")
+  minimum_load: float = Field(0.5, gt=0, description="First load of the range, when the loads are not given")
+  maximum_load: float = Field(1.0, gt=0, description="Last load of the range, when the loads are not given")
+  points: int = Field(51, ge=1, description="Number of loads of the range, when the loads are not given")
+  ambient: List[SweepVariable] = Field([], description="Ambient fields of the curves: one curve for each combination of their values")
+
+  @field_validator("loads")
+  @classmethod
+  def check_loads(cls, loads):
+    for load in loads or []:
+      if load <= 0:
+        raise ValueError("The loads must be positive")
+    return loads
+
+  @model_validator(mode="after")
+  def check_curves(self):
+    if self.minimum_load > self.maximum_load:
+      raise ValueError("The minimum load must not exceed the maximum load")
+    fields = [variable.field for variable in self.ambient]
+    if "fuel_mass_flow" in fields:
+      raise ValueError("The fuel mass flow is given by the loads")
+    if len(set(fields)) != len(fields):
+      raise ValueError("Each field can be varied only once")
+    for variable in self.ambient:
+      if variable.values is None and variable.num is None:
+        raise ValueError(f"The range of {variable.field} needs num")
+    return self
+
+  def load_points(self):
+    """Loads of the curves, in increasing order"""
+    if self.loads is not None:
+      return sorted(self.loads)
+    if self.points == 1:
+      return [self.maximum_load]
+    step = (self.maximum_load - self.minimum_load) / (self.points - 1)
+    return [self.minimum_load + i * step for i in range(self.points - 1)] + [self.maximum_load]
+
+
+class PartLoadPoint(BaseModel):
+  """
+  Point of a part-load curve: the load, its fuel mass flow and the simulation result or error
+  """
+  load: float = Field(..., description="Fraction of the base fuel mass flow")
+  fuel_mass_flow: float = Field(..., description="Mass flow rate of the fuel in kg/h")
+  result: Union[Output, SimulationError] = Field(..., description="Simulation results, or the error of the point")
+
+
+class PartLoadCurve(BaseModel):
+  """
+  Part-load curve at some ambient conditions
+  """
+  ambient: Dict[str, float] = Field(..., description="Values of the ambient fields of the curve")
+  points: List[PartLoadPoint] = Field(..., description="Points of the curve, in increasing load")
+
+
+class PartLoadResult(BaseModel):
+  """
+  Part-load curves, one for each combination of the ambient values
+  """
+  curves: List[PartLoadCurve] = Field(..., description="Curves of the ambient conditions")
+  evaluations: int = Field(..., description="Number of points simulated")
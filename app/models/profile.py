@@ -0,0 +1,60 @@
+from typing import Dict, List, Literal, Optional, Union
+from pydantic import BaseModel, Field
+from .output import Output
+from .simulation_error import SimulationError
+
+class ProfileSpan(BaseModel):
+  """
+  Call of a calculation stage or database query of a profiled simulation, with the calls it made
+  """
+  name: str = Field(..., example="high_steam_turbine", description="Name of the stage or query")
+  kind: Literal["stage", "query"] = Field(..., description="Calculation stage or database query")
+  duration_ms: float = Field(..., description="Duration of the call in ms, including its children")
+  error: Optional[str] = Field(None, description="Type of the error raised by the call, if any")
+  children: List["ProfileSpan"] = Field([], description="Calls made by this call, in order")
+
+
+class PropertyEvaluations(BaseModel):
+  """
+  Lookups of a property correlation: those answered by the steam property cache are not evaluated
+  """
+  lookups: int = Field(..., description="Calls of the correlation")
+  cache_hits: int = Field(..., description="Calls answered by the cache")
+  evaluations: int = Field(..., description="Calls evaluating the correlation")
+
+
+class RootFinderRun(BaseModel):
+  """
+  Root found by a root finder (like the outlet temperature of a steam turbine level)
+  """
+  stage: str = Field(..., example="high_steam_turbine", description="Stage that searched the root")
+  method: str = Field(..., example="newton", description="Root finder (newton)")
+  iterations: int = Field(..., description="Iterations until convergence")
+
+
+class CacheActivity(BaseModel):
+  """
+  Hits and misses of a cache during the simulation
+  """
+  hits: int = Field(..., description="Lookups that found the entry")
+  misses: int = Field(..., description="Lookups that did not find the entry")
+
+
+class SimulationProfile(BaseModel):
+  """
+  Trace of a profiled simulation
+  """
+  duration_ms: float = Field(..., description="Duration of the simulation in ms")
+  call_tree: List[ProfileSpan] = Field(..., description="Calls of the calculation stages and database queries, in order")
+  property_evaluations: Dict[str, PropertyEvaluations] = Field(..., description="Lookups of each property correlation")
+  root_finders: List[RootFinderRun] = Field(..., description="Iterations of each root, in order")
+  database_round_trips: int = Field(..., description="Database queries of the simulation")
+  caches: Dict[str, CacheActivity] = Field(..., description="Hits and misses of the caches")
+
+
+class ProfiledSimulation(BaseModel):
+  """
+  Simulation results (or error) with the trace of their calculation
+  """
+  result: Union[Output, SimulationError] = Field(..., description="Simulation results, or the error of the simulation")
+  profile: SimulationProfile = Field(..., description="Trace of the simulation")
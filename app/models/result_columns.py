@@ -0,0 +1,81 @@
+import numpy as np
+from .output import Output
+from .simulation_error import SimulationError
+
+OUTPUT_FIELDS = list(Output.model_fields)
+
+# Comparisons of the bounds of the Output fields (annotated_types constraints of their Field)
+BOUND_CHECKS = {"gt": np.greater, "ge": np.greater_equal, "lt": np.less, "le": np.less_equal}
+
+
+class ResultColumns:
+  """
+  Columnar results of a chunk of simulations, the counterpart of InputColumns: one NumPy array per Output field
+  (NaN in failed items) and the error of each item (None for the simulated ones).
+  The columns of the varied fields of a sweep can be added ahead of the Output fields (with_columns)
+  """
+  def __init__(self, columns, errors):
+    self.columns = {name: np.asarray(values, dtype=float) for name, values in columns.items()}
+    self.errors = list(errors)
+
+  @classmethod
+  def from_rows(cls, rows):
+    """Building the columns from a list of Output or SimulationError, for the items simulated one by one"""
+    errors = [row if isinstance(row, SimulationError) else None for row in rows]
+    return cls({
+      name: [np.nan if isinstance(row, SimulationError) else getattr(row, name) for row in rows]
+      for name in OUTPUT_FIELDS
+    }, errors)
+
+  @classmethod
+  def assemble(cls, size, parts):
+    """Columns of size items put together from parts of (indices of the items, ResultColumns of those items)"""
+    columns = {name: np.full(size, np.nan) for name in OUTPUT_FIELDS}
+    errors = [None] * size
+    for indices, part in parts:
+      indices = np.asarray(indices, dtype=int)
+      for name in OUTPUT_FIELDS:
+        columns[name][indices] = part.columns[name]
+      for index, error in zip(indices.tolist(), part.errors):
+        errors[index] = error
+    return cls(columns, errors)
+
+  @staticmethod
+  def valid_mask(columns):
+    """Items whose values are all finite and within the bounds of the Output fields"""
+    valid = np.ones(len(columns[OUTPUT_FIELDS[0]]), dtype=bool)
+    for name in OUTPUT_FIELDS:
+      values = columns[name]
+      valid &= np.isfinite(values)
+      for constraint in Output.model_fields[name].metadata:
+        for bound, compare in BOUND_CHECKS.items():
+          if getattr(constraint, bound, None) is not None:
+            valid &= compare(values, getattr(constraint, bound))
+    return valid
+
+  @property
+  def failed(self):
+    return np.array([error is not None for error in self.errors], dtype=bool)
+
+  def take(self, indices):
+    """Columns of some of the items"""
+    indices = np.asarray(indices, dtype=int)
+    return ResultColumns(
+      {name: values[indices] for name, values in self.columns.items()},
+      [self.errors[index] for index in indices.tolist()]
+    )
+
+  def with_columns(self, columns):
+    """The same results with other columns (the varied fields of a sweep) ahead of the Output fields"""
+    return ResultColumns({**columns, **self.columns}, self.errors)
+
+  def rows(self):
+    """The results as a list of Output or SimulationError, in the order of the items"""
+    values = np.column_stack([self.columns[name] for name in OUTPUT_FIELDS]).tolist()
+    return [
+      error if error is not None else Output(**dict(zip(OUTPUT_FIELDS, row)))
+      for row, error in zip(values, self.errors)
+    ]
+
+  def __len__(self):
+    return len(self.errors)
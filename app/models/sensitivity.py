@@ -0,0 +1,44 @@
+from typing import Dict, List, Literal, Optional
+from pydantic import BaseModel, Field, field_validator
+from .input import Input
+from .output import Output
+
+class SensitivityRequest(BaseModel):
+  """
+  Sensitivity analysis: derivatives of the Output fields with respect to some Input fields, at the base input
+  """
+  base: Input = Field(..., description="Input of the operating point")
+  fields: List[str] = Field(..., min_length=1, example=["local_temperature", "relative_humidity"], description="Input fields of the derivatives")
+  outputs: Optional[List[str]] = Field(None, example=["net_power_cycle_combined"], description="Output fields of the derivatives (default: all)")
+  relative_step: float = Field(1e-3, gt=0, le=0.1, description="Step of each field, relative to its value (absolute for null values)")
+
+  @field_validator("fields")
+  @classmethod
+  def check_fields(cls, fields):
+    for field in fields:
+      if field not in Input.model_fields:
+        raise ValueError(f"Unknown Input field: {field}")
+    if len(set(fields)) != len(fields):
+      raise ValueError("Each field can be given only once")
+    return fields
+
+  @field_validator("outputs")
+  @classmethod
+  def check_outputs(cls, outputs):
+    for output in outputs or []:
+      if output not in Output.model_fields:
+        raise ValueError(f"Unknown Output field: {output}")
+    return outputs
+
+
+class SensitivityResult(BaseModel):
+  """
+  Jacobian of the Output fields with respect to the Input fields, and its normalized version (elasticities):
+  the relative change of each output for a relative change of each input, (dY/dX)·(X/Y)
+  """
+  base: Output = Field(..., description="Simulation results at the base input")
+  jacobian: Dict[str, Dict[str, float]] = Field(..., description="Derivatives dY/dX, as {output: {input: derivative}}")
+  elasticities: Dict[str, Dict[str, Optional[float]]] = Field(..., description="Normalized derivatives (dY/dX)·(X/Y), null for null inputs or outputs")
+  steps: Dict[str, float] = Field(..., description="Step of each input field")
+  schemes: Dict[str, Literal["central", "forward", "backward"]] = Field(..., description="Finite difference of each input field: one-sided next to the limits of the field")
+  evaluations: int = Field(..., description="Number of simulations run")
@@ -0,0 +1,8 @@
+from pydantic import BaseModel, Field
+
+class SimulationError(BaseModel):
+  """
+  Error of a single simulation inside a batch, in the same format of the API error responses
+  """
+  error: str = Field(..., description="Error message")
+  type: str = Field(..., description="Error type, like ThermodynamicError or ComputationalError")
@@ -0,0 +1,81 @@
+from typing import Dict, List, Literal, Optional, Union
+from pydantic import BaseModel, Field, field_validator, model_validator
+from .input import Input
+from .output import Output
+from .simulation_error import SimulationError
+
+class SweepVariable(BaseModel):
+  """
+  Input field varied by a sweep: a list of `values`, or `num` values evenly spaced from `start` to `stop`.
+  Latin hypercube designs sample between `start` and `stop` (or the extremes of `values`)
+  """
+  field: str = Field(..., example="chimney_gas_temperature", description="Name of the Input field")
+  values: Optional[List[float]] = Field(None, min_length=1, example=[90, 100, 110], description="Values of the field")
+  start: Optional[float] = Field(None, example=90, description="First value of the range")
+  stop: Optional[float] = Field(None, example=110, description="Last value of the range")
+  num: Optional[int] = Field(None, ge=1, example=3, description="Number of values of the range (not used by latin hypercube designs)")
+
+  @field_validator("field")
+  @classmethod
+  def check_field(cls, field):
+    if field not in Input.model_fields:
+      raise ValueError(f"Unknown Input field: {field}")
+    return field
+
+  @model_validator(mode="after")
+  def check_values(self):
+    if self.values is None and (self.start is None or self.stop is None):
+      raise ValueError("Give the values of the variable, or its start and stop")
+    return self
+
+  def points(self):
+    """Values of the variable"""
+    if self.values is not None:
+      return self.values
+    if self.num is None:
+      raise ValueError(f"The range of {self.field} needs num")
+    if self.num == 1:
+      return [self.start]
+    step = (self.stop - self.start) / (self.num - 1)
+    return [self.start + i * step for i in range(self.num - 1)] + [self.stop]
+
+  def bounds(self):
+    """Lower and upper bounds of the variable"""
+    if self.values is not None:
+      return min(self.values), max(self.values)
+    return self.start, self.stop
+
+
+class SweepRequest(BaseModel):
+  """
+  Parametric sweep: the base input with some of its fields varied according to a design of experiments
+  """
+  base: Input = Field(..., description="Input of all points, except for the varied fields")
+  variables: List[SweepVariable] = Field(..., min_length=1, description="Varied fields")
+  design: Literal["cartesian", "linspace", "latin_hypercube"] = Field(
+    "cartesian",
+    description="`cartesian`: every combination of the values; `linspace`: the variables varied together; `latin_hypercube`: random stratified sample of the ranges"
+  )
+  samples: Optional[int] = Field(None, ge=1, example=50, description="Number of points of latin hypercube designs")
+  seed: Optional[int] = Field(None, description="Seed of latin hypercube designs, for reproducible samples")
+
+  @model_validator(mode="after")
+  def check_design(self):
+    fields = [variable.field for variable in self.variables]
+    if len(set(fields)) != len(fields):
+      raise ValueError("Each field can be varied only once")
+    if self.design == "latin_hypercube" and self.samples is None:
+      raise ValueError("Latin hypercube designs need samples")
+    if self.design != "latin_hypercube":
+      for variable in self.variables:
+        if variable.values is None and variable.num is None:
+          raise ValueError(f"The range of {variable.field} needs num")
+    return self
+
+
+class SweepRow(BaseModel):
+  """
+  Point of a sweep: the values of the varied fields and the simulation result or error
+  """
+  point: Dict[str, float] = Field(..., description="Values of the varied fields")
+  result: Union[Output, SimulationError] = Field(..., description="Simulation results, or the error of the point")
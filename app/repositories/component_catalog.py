@@ -0,0 +1,87 @@
+from threading import Lock
+from types import MappingProxyType
+
+class ComponentCatalog:
+  """
+  Immutable in-memory snapshot of the substances and their ICPH params.
+  It exposes the same read methods of SubstanceRepository and ICPHRepository,
+  so the chemistry and equipment services can read from it instead of the session.
+  """
+
+  def __init__(self, substances, icph_params, version=0):
+    self.version = version
+    self._substances = MappingProxyType({
+      name: MappingProxyType(dict(data))
+      for name, data in substances.items()
+    })
+    self._icph_params = MappingProxyType({
+      substance_id: MappingProxyType(dict(params))
+      for substance_id, params in icph_params.items()
+    })
+
+  @classmethod
+  def from_repositories(cls, substance_repository, icph_repository, version=0):
+    """Building the snapshot with a single query on each table"""
+    return cls(substance_repository.get_all(), icph_repository.get_all(), version)
+
+  def get_all(self):
+    """Return all substances indexed by name, like SubstanceRepository.get_all()"""
+    return self._substances
+
+  def get_by_substance_id(self, substance_id_input):
+    """Return the icph params of a substance, like ICPHRepository.get_by_substance_id()"""
+    return self._icph_params.get(substance_id_input)
+
+
+# Process-wide catalog, shared across requests until it is invalidated
+_catalog = None
+_catalog_version = 0
+_catalog_lock = Lock()
+
+
+def get_component_catalog(substance_repository, icph_repository):
+  """
+  Return the process-wide component catalog, loading it from the repositories on first access.
+  An empty database is never cached, so the catalog is loaded as soon as the seed runs.
+  """
+  global _catalog
+  catalog = _catalog
+  if catalog is not None:
+    return catalog
+
+  with _catalog_lock:
+    if _catalog is None:
+      catalog = ComponentCatalog.from_repositories(substance_repository, icph_repository, _catalog_version)
+      if not catalog.get_all():
+        return catalog
+      _catalog = catalog
+    return _catalog
+
+
+def invalidate_component_catalog():
+  """
+  Discard the process-wide component catalog.
+  Must be called whenever the substances or ICPH params change (seed or admin data).
+  """
+  global _catalog, _catalog_version
+  with _catalog_lock:
+    _catalog = None
+    _catalog_version += 1
+
+
+def component_catalog_version():
+  """Version of the catalog data, incremented on each invalidation"""
+  return _catalog_version
+
+
+def sync_component_catalog_version(version):
+  """
+  Following the catalog version of the server process in a worker process: a different version discards the snapshot,
+  so the worker reloads the data changed since it was loaded
+  """
+  global _catalog, _catalog_version
+  if version == _catalog_version:
+    return
+  with _catalog_lock:
+    _catalog = None
+    _catalog_version = version
@@ -1,6 +1,7 @@
 from typing import List, Tuple
 from sqlmodel import select, Session
 from ..database.models import CorrelationSpecificHeat
+from ..core.metrics import timed_query
 
 class ICPHRepository:
   """
@@ -11,6 +12,7 @@ class ICPHRepository:
   def __init__(self, session: Session):
     self.session = session
   
+  @timed_query("ICPHRepository.get_by_substance_id")
   def get_by_substance_id(self, substance_id_input):
     """
       Return all icph params of substances by substance_id.
@@ -40,4 +42,38 @@ class ICPHRepository:
         "param_B": param_B,
         "param_C": param_C,
         "param_D": param_D,
-    }
\ No newline at end of file
+    }
+
+  @timed_query("ICPHRepository.get_all")
+  def get_all(self):
+    """
+      Return the icph params of all substances as dict indexed by substance_id.
+      Example:
+      {
+        1: {
+          "param_A": 1.702,
+          "param_B": 9.081e-3,
+          "param_C": -2.164e-6,
+          "param_D": 0
+        }
+      }
+    """
+    statement = select(
+      CorrelationSpecificHeat.substance_id,
+      CorrelationSpecificHeat.param_A,
+      CorrelationSpecificHeat.param_B,
+      CorrelationSpecificHeat.param_C,
+      CorrelationSpecificHeat.param_D,
+    )
+    result = self.session.exec(statement).all()
+
+    # Keeping the first correlation of each substance, like get_by_substance_id
+    params = {}
+    for substance_id, param_A, param_B, param_C, param_D in result:
+      params.setdefault(substance_id, {
+        "param_A": param_A,
+        "param_B": param_B,
+        "param_C": param_C,
+        "param_D": param_D,
+      })
+    return params
@@ -1,8 +1,13 @@
 from .substance_repository import SubstanceRepository
 from .icph_repository import ICPHRepository
+from .component_catalog import get_component_catalog
 
 class RepositoriesContainer:
   def __init__(self, db):
     self.substance_repository = SubstanceRepository(db)
     self.icph_repository = ICPHRepository(db)
-    
+
+  @property
+  def component_catalog(self):
+    """Process-wide snapshot of substances and ICPH params, loaded from the database on first access"""
+    return get_component_catalog(self.substance_repository, self.icph_repository)
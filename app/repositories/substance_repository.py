@@ -1,6 +1,7 @@
 from typing import List, Tuple
 from sqlmodel import select, Session
 from ..database.models import Substance
+from ..core.metrics import timed_query
 
 class SubstanceRepository:
   """
@@ -11,6 +12,7 @@ class SubstanceRepository:
   def __init__(self, session: Session):
     self.session = session
   
+  @timed_query("SubstanceRepository.get_all")
   def get_all(self):
     """
       Return all substances as dict indexed by name.
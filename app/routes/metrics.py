@@ -0,0 +1,32 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from app.core.metrics import metrics
+
+router = APIRouter()
+
+# Content type of the Prometheus text exposition format
+PROMETHEUS_MEDIA_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@router.get(
+  "/metrics",
+  tags=["Metrics"],
+  summary="Export the metrics of the simulations",
+  description=(
+    "This endpoint exports the metrics of the process in the **Prometheus** text format, for scraping.\n\n"
+    "### Metrics:\n"
+    "- `cycle_comb_stage_duration_seconds`: latency histograms of the calculation stages (Brayton cycle, gas turbine "
+    "calculations, each steam turbine level, HRSG mass flows, condenser, cycles performances), including the stages they call.\n"
+    "- `cycle_comb_repository_query_duration_seconds`: latency histograms of the database queries.\n"
+    "- `cycle_comb_root_finder_iterations` and `cycle_comb_optimizer_evaluations`: iterations of each root of the "
+    "Newton method, and evaluations of each Nelder-Mead optimization.\n"
+    "- `cycle_comb_cache_*` and `cycle_comb_stage_memo_lookups_total`: hits, misses and hit ratios of the caches.\n"
+    "- `cycle_comb_error_responses_total`: error responses by error type.\n\n"
+    "### Notes:\n"
+    "- Recording is disabled with `METRICS_ENABLED=0`; the cache statistics are still exported.\n"
+    "- With the `process` executor, the calculation stages run in the worker processes and their metrics are not exported here.\n"
+  ),
+  response_description="Metrics in the Prometheus text exposition format",
+  response_class=PlainTextResponse)
+def show_metrics():
+  return PlainTextResponse(metrics.render(), media_type=PROMETHEUS_MEDIA_TYPE)
@@ -1,12 +1,59 @@
-from fastapi import APIRouter, Depends
+from typing import List, Literal, Optional, Union
+from fastapi import APIRouter, Depends, Query, Response
+from fastapi.responses import StreamingResponse
 from sqlmodel import Session
 from app.database.session import get_session
+from app.core.worker_pool import get_worker_pool
 from ..models.input import Input
 from ..models.output import Output
-from ..controllers.simulation_controller import create_simulation
+from ..models.simulation_error import SimulationError
+from ..models.sweep import SweepRequest, SweepRow
+from ..models.optimization import OptimizationRequest, OptimizationResult
+from ..models.sensitivity import SensitivityRequest, SensitivityResult
+from ..models.part_load import PartLoadRequest, PartLoadResult
+from ..models.monte_carlo import MonteCarloRequest, MonteCarloResult
+from ..models.profile import ProfiledSimulation
+from ..controllers.simulation_controller import create_cached_simulation, create_profiled_simulation, create_batch_simulation, create_sweep, iter_batch_simulation, iter_batch_columns, iter_sweep, iter_sweep_columns, create_part_load, create_monte_carlo, create_optimization, create_sensitivity
+from ..utils.result_stream import STREAM_MEDIA_TYPES, result_chunks
+from ..utils.result_table import TABLE_MEDIA_TYPES, require_pyarrow
 
 router = APIRouter()
 
+# Query parameter selecting the saturation curve of the request; the default mode of the process is used when omitted
+SaturationModeQuery = Query(
+  None,
+  description="Saturation curve: `analytic` correlations or `tabulated` spline table of the saturation pressure (max relative error 1e-10). Defaults to the server setting."
+)
+
+# Query parameter selecting the format of batch and sweep results
+FormatQuery = Query(
+  "json",
+  alias="format",
+  description=(
+    "`json` list, or rows streamed as they are computed: `ndjson` (one JSON object per line), `csv` (header and one line per row), "
+    "`arrow` (Arrow IPC stream) or `parquet` (Parquet file), the last two written from the result arrays of each chunk."
+  )
+)
+
+# Query parameter returning the trace of the calculation with the results of a simulation
+ProfileQuery = Query(
+  False,
+  description="Return the results with the trace of their calculation (stage timings, property evaluations, root finder iterations, database round trips and cache hits)."
+)
+
+# Formats of batch and sweep results
+ResultFormat = Literal["json", "ndjson", "csv", "arrow", "parquet"]
+
+
+def streaming_response(rows, output_format, point_fields=()):
+  """Streaming the rows (or the ResultColumns blocks of the columnar formats) from the worker pool, each one as soon as it is computed"""
+  headers = {}
+  if output_format in TABLE_MEDIA_TYPES:
+    require_pyarrow(output_format)
+    headers["Content-Disposition"] = f'attachment; filename="results.{output_format}"'
+  chunks = get_worker_pool().stream(result_chunks, rows, output_format, point_fields)
+  return StreamingResponse(chunks, media_type=STREAM_MEDIA_TYPES[output_format], headers=headers)
+
 
 @router.post(
   "/simulation", 
@@ -19,9 +66,165 @@ router = APIRouter()
     "### Notes:\n"
     "- All input parameters are required and validated according to predefined ranges.\n"
     "- The simulation assumes steady-state conditions.\n"
+    "- Results are cached for repeated inputs: the `X-Cache` header reports `HIT` or `MISS`.\n"
+    "- Simulations run in a bounded worker pool: beyond its capacity the response is `429` with `Retry-After`.\n"
+    "- With `profile=true`, the response is the `result` (Output or error object) with the `profile` of its calculation: "
+    "call tree of the stages and database queries with their durations, property evaluations per correlation, "
+    "root finder iterations per stage and cache hits. Profiled simulations bypass the result cache (`X-Cache: BYPASS`).\n"
+  ),
+  response_description="Thermodynamic simulation results (Output model), or the results and their profile with `profile=true`",
+  response_model=Union[Output, ProfiledSimulation]
+  )
+async def call_simulation(input: Input, response: Response, db: Session = Depends(get_session), saturation_mode: Optional[Literal["analytic", "tabulated"]] = SaturationModeQuery, profile: bool = ProfileQuery):
+  if profile:
+    response.headers["X-Cache"] = "BYPASS"
+    return await get_worker_pool().run(create_profiled_simulation, input, db, saturation_mode)
+  results, cache_status = await get_worker_pool().run(create_cached_simulation, input, db, saturation_mode)
+  response.headers["X-Cache"] = cache_status
+  return results
+
+
+@router.post(
+  "/simulation/batch",
+  tags=["Simulation"],
+  summary="Run a batch of thermodynamic simulations",
+  description=(
+    "This endpoint performs the complete thermodynamic analysis of the **Brayton** and **Rankine** cycles "
+    "for each input of the list provided in the request body, like a sequence of calls to `POST /simulation` "
+    "in a single request.\n\n"
+    "### Notes:\n"
+    "- The results are returned in the same order of the inputs.\n"
+    "- A failing simulation does not interrupt the batch: its item is an error object with `error` and `type`.\n"
+    "- The component data is loaded once and shared by all simulations of the batch.\n"
+    "- The batch takes one slot of the worker pool: beyond its capacity the response is `429` with `Retry-After`.\n"
+    "- With `format=ndjson`, `csv`, `arrow` or `parquet`, results are streamed as they are computed; "
+    "the simulations stop if the client disconnects.\n"
+  ),
+  response_description="List of simulation results (Output model) or per-item errors",
+  response_model=List[Union[Output, SimulationError]]
+  )
+async def call_batch_simulation(inputs: List[Input], db: Session = Depends(get_session), saturation_mode: Optional[Literal["analytic", "tabulated"]] = SaturationModeQuery, output_format: ResultFormat = FormatQuery):
+  if output_format != "json":
+    rows = iter_batch_columns(inputs, saturation_mode) if output_format in TABLE_MEDIA_TYPES else iter_batch_simulation(inputs, saturation_mode)
+    return streaming_response(rows, output_format)
+  return await get_worker_pool().run(create_batch_simulation, inputs, db, saturation_mode)
+
+
+@router.post(
+  "/simulation/sweep",
+  tags=["Simulation"],
+  summary="Run a parametric sweep of thermodynamic simulations",
+  description=(
+    "This endpoint varies some fields of a base input and performs the complete thermodynamic analysis "
+    "of the **Brayton** and **Rankine** cycles at each point of the resulting design of experiments.\n\n"
+    "### Designs:\n"
+    "- `cartesian`: every combination of the values of the variables.\n"
+    "- `linspace`: the variables varied together (same number of values).\n"
+    "- `latin_hypercube`: `samples` points stratified over the range of each variable, reproducible with `seed`.\n\n"
+    "### Notes:\n"
+    "- Each variable gives a list of `values`, or `num` values evenly spaced from `start` to `stop`.\n"
+    "- The rows are returned in the order of the design, with the values of the varied fields in `point`.\n"
+    "- A failing or invalid point does not interrupt the sweep: its result is an error object with `error` and `type`.\n"
+    "- The calculation stages that do not depend on the varied fields are computed once for the whole sweep.\n"
+    "- The sweep takes one slot of the worker pool: beyond its capacity the response is `429` with `Retry-After`.\n"
+    "- With `format=ndjson`, `csv`, `arrow` or `parquet`, rows are streamed as they are computed (CSV, Arrow and Parquet columns start with the varied fields); "
+    "the simulations stop if the client disconnects.\n"
+  ),
+  response_description="List of sweep rows: varied values and simulation results (Output model) or errors",
+  response_model=List[SweepRow]
+  )
+async def call_sweep_simulation(request: SweepRequest, db: Session = Depends(get_session), saturation_mode: Optional[Literal["analytic", "tabulated"]] = SaturationModeQuery, output_format: ResultFormat = FormatQuery):
+  if output_format != "json":
+    point_fields = [variable.field for variable in request.variables]
+    rows = iter_sweep_columns(request, saturation_mode) if output_format in TABLE_MEDIA_TYPES else iter_sweep(request, saturation_mode)
+    return streaming_response(rows, output_format, point_fields)
+  return await get_worker_pool().run(create_sweep, request, db, saturation_mode)
+
+
+@router.post(
+  "/simulation/part-load",
+  tags=["Simulation"],
+  summary="Generate part-load curves",
+  description=(
+    "This endpoint performs the complete thermodynamic analysis of the **Brayton** and **Rankine** cycles "
+    "of a base input at fractions of its fuel mass flow (the loads), giving the curves of net power, efficiencies "
+    "and the other Output fields against the load, for each combination of the values of the `ambient` variables.\n\n"
+    "### Notes:\n"
+    "- The loads are a list of `loads`, or `points` loads evenly spaced from `minimum_load` to `maximum_load` (default: 51 loads from 0.5 to 1).\n"
+    "- Each ambient variable (like `local_temperature` or `relative_humidity`) gives a list of `values`, or `num` values from `start` to `stop`.\n"
+    "- A failing or invalid point does not interrupt the curves: its result is an error object with `error` and `type`.\n"
+    "- The combustion is computed once for each ambient condition and scaled to each load, and the steam turbine "
+    "stages are computed once for each set of pressures and temperatures.\n"
+    "- The curves take one slot of the worker pool: beyond its capacity the response is `429` with `Retry-After`.\n"
+  ),
+  response_description="Part-load curves: load, fuel mass flow and simulation results (Output model) or errors of each point",
+  response_model=PartLoadResult
+  )
+async def call_part_load(request: PartLoadRequest, db: Session = Depends(get_session), saturation_mode: Optional[Literal["analytic", "tabulated"]] = SaturationModeQuery):
+  return await get_worker_pool().run(create_part_load, request, db, saturation_mode)
+
+
+@router.post(
+  "/simulation/monte-carlo",
+  tags=["Simulation"],
+  summary="Propagate the uncertainty of inputs by Monte Carlo",
+  description=(
+    "This endpoint draws `samples` inputs from the probability distributions of some fields of a base input "
+    "(like efficiencies, ambient conditions or the fuel composition), performs the complete thermodynamic analysis "
+    "of the **Brayton** and **Rankine** cycles for each one and returns the statistics of the Output fields.\n\n"
+    "### Notes:\n"
+    "- Distributions: `normal` (`mean`, `std`), `uniform` (`lower`, `upper`) or `triangular` (`lower`, `mode`, `upper`); "
+    "the samples are reproducible with `seed`.\n"
+    "- Samples out of the limits of the Input model, or whose simulation fails, are counted in `failures` and `failure_rates` by error type.\n"
+    "- With `normalize_fuel`, sampled fuel compositions are rescaled to 100%.\n"
+    "- Mean, standard deviation, extremes and histograms use all successful samples; percentiles are exact up to 10000 "
+    "successful samples and estimated from a uniform subsample of them beyond (`exact_percentiles`).\n"
+    "- The samples are simulated and aggregated in chunks, without holding them all in memory.\n"
+  ),
+  response_description="Statistics of the Output fields and failure rates by error type",
+  response_model=MonteCarloResult
+  )
+async def call_monte_carlo(request: MonteCarloRequest, db: Session = Depends(get_session), saturation_mode: Optional[Literal["analytic", "tabulated"]] = SaturationModeQuery):
+  return await get_worker_pool().run(create_monte_carlo, request, db, saturation_mode)
+
+
+@router.post(
+  "/simulation/optimize",
+  tags=["Simulation"],
+  summary="Optimize an operating point",
+  description=(
+    "This endpoint chooses the values of some fields of a base input, between their bounds, that maximize "
+    "(or minimize) an Output field of the complete thermodynamic analysis, like `net_cycle_combined_efficiency`, "
+    "`net_power_cycle_combined` or `cooling_water_mass_flow`.\n\n"
+    "### Notes:\n"
+    "- The optimizer is the derivative-free Nelder-Mead method, stopping at the `tolerance` of the objective or after `maximum_evaluations` simulations.\n"
+    "- Constraints limit Output fields (like `quality_exhaustion_steam_turbine`) or Input fields; `feasible` reports whether the optimal point respects them.\n"
+    "- Points that cannot be simulated are avoided; the response is an error only when no point of the bounds can be simulated.\n"
+    "- The calculation stages that do not depend on the variables are computed once for the whole optimization.\n"
+    "- The `trace` reports the best point after each iteration.\n"
+  ),
+  response_description="Optimal point, its simulation results (Output model) and the convergence trace",
+  response_model=OptimizationResult
+  )
+async def call_optimization(request: OptimizationRequest, db: Session = Depends(get_session), saturation_mode: Optional[Literal["analytic", "tabulated"]] = SaturationModeQuery):
+  return await get_worker_pool().run(create_optimization, request, db, saturation_mode)
+
+
+@router.post(
+  "/simulation/sensitivity",
+  tags=["Simulation"],
+  summary="Run a sensitivity analysis of an operating point",
+  description=(
+    "This endpoint computes the derivatives of the Output fields (the Jacobian) with respect to some Input fields "
+    "of a base input, like the response of the net power to the local temperature and humidity.\n\n"
+    "### Notes:\n"
+    "- Derivatives are central finite differences of step `relative_step` (relative to each value), "
+    "one-sided next to the limits of a field; they use the exact results, not the rounded ones.\n"
+    "- `elasticities` normalizes the Jacobian as (dY/dX)·(X/Y): the % change of each output for a 1% change of each input.\n"
+    "- All perturbed simulations run in a single evaluation, reusing the calculation stages that do not read the perturbed field.\n"
   ),
-  response_description="Thermodynamic simulation results (Output model)",
-  response_model=Output
+  response_description="Base results, Jacobian and elasticities of the outputs with respect to the inputs",
+  response_model=SensitivityResult
   )
-async def call_simulation(input: Input, db: Session = Depends(get_session)):
-  return create_simulation(input, db)
+async def call_sensitivity(request: SensitivityRequest, db: Session = Depends(get_session), saturation_mode: Optional[Literal["analytic", "tabulated"]] = SaturationModeQuery):
+  return await get_worker_pool().run(create_sensitivity, request, db, saturation_mode)
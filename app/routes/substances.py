@@ -22,5 +22,5 @@ router = APIRouter()
   ),
   response_description="List of substances with their respective properties",
   response_model=List[Substance])
-async def show_substances(db: Session = Depends(get_session)):
+def show_substances(db: Session = Depends(get_session)):
   return get_all_substances(db)
@@ -1,4 +1,6 @@
 from app.utils.errors import LogicConstraintError, NotFoundError, ThermodynamicError
+from app.services.utils.arrays import raise_for_invalid_elements
+from ..utils.stage_cache import cached_per_input
 
 class GasFuel:
   """
@@ -11,8 +13,8 @@ class GasFuel:
 
     # Creating a dict with fraction of components indexed by name
     self.fractions = {
-        name.replace("_molar_fraction_fuel", ""): (fraction / 100)
-        for name, fraction in vars(self.input).items()
+        name.replace("_molar_fraction_fuel", ""): (getattr(self.input, name) / 100)
+        for name in vars(self.input)
         if name.endswith("_molar_fraction_fuel")
       }
 
@@ -22,6 +24,7 @@ class GasFuel:
     if (sum_percent_components != 1):
       raise LogicConstraintError(f"Percent of components is invalid: sum = {sum_percent_components*100:.2f}%")
 
+  @cached_per_input
   def average_molar_mass_calc(self):
     """Calculating average molar mass of fuel in kmol/kg"""
     db_components = self.substance_repo.get_all()
@@ -34,6 +37,7 @@ class GasFuel:
       for name in self.fractions
     )
 
+  @cached_per_input
   def LHV_fuel_calc(self):
     """Calculation of PCI of Gas Fuel"""
     # Getting lhv's and molar mass values of each component
@@ -60,6 +64,27 @@ class GasFuel:
 
     return LHV_fuel
 
+  @cached_per_input
+  def LHV_fuel_calc_array(self):
+    """Calculation of PCI of Gas Fuel for arrays of compositions (the input is an InputColumns)"""
+    sum_percent_components = sum(self.fractions.values())
+    raise_for_invalid_elements(sum_percent_components != 1, "Percent of components is invalid", LogicConstraintError)
+    db_components = self.substance_repo.get_all()
+
+    if not db_components:
+      raise NotFoundError("Data of components not found, for the lower heating value")
+
+    # Calculating LHV fuel in Joules/mol
+    LHV_fuel_joule_per_mol = sum(
+      self.fractions[name] * db_components[name]["lower_calorific_value"]
+      for name in self.fractions
+    )
+    raise_for_invalid_elements(LHV_fuel_joule_per_mol == 0, "There are only inert components in gaseous fuel, review its composition", ThermodynamicError)
+
+    # Calculating LHV fuel in kJ/kg
+    return LHV_fuel_joule_per_mol/self.average_molar_mass_calc()
+
+  @cached_per_input
   def icph_params_calc(self):
     """Calculation of ICPH params of Gas Fuel"""
     weighted_params = {"param_A": 0, "param_B": 0, "param_C": 0, "param_D": 0}
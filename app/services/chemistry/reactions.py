@@ -1,5 +1,6 @@
 import re
 from app.utils.errors import NotFoundError
+from ..utils.stage_cache import cached_per_input
 
 class Reactions:
   """
@@ -20,6 +21,7 @@ class Reactions:
     return carbon, hydrogen
 
 
+  @cached_per_input
   def molar_flow_stoichiometric_calc(self):
     """
     Calculation of molar flow of reagents and products in kmol/h.
@@ -13,3 +13,5 @@ class GasTurbineConfig:
   combustion_gas: object
   humidity: object
   saturation_parameters: object
+  # Root finder of the exhaustion gas temperature (a NewtonMethod by default)
+  root_finder: object = None
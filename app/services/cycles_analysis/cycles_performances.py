@@ -1,7 +1,10 @@
 from app.utils.errors import ThermodynamicError
+from app.services.utils.arrays import raise_for_invalid_elements
+from app.core.metrics import timed_stage
 
 class CyclesPerformances():
   """Service class of all methods and calculations related to Cycles combined's permances"""
+  @timed_stage("cycles_performances")
   def cycles_effiencies_calc(self, input, net_power_gas_turbine, LHV_fuel, fuel_sensible_heat, rankine_cycle_data):
     """Calculation of cycles effciencies"""
     # Getting gross and net power of combined cycles (Brayton-Rankine)
@@ -28,4 +31,26 @@ class CyclesPerformances():
       "net_power_combined_cycles": net_power_combined_cycles,
       "gross_cycle_combined_efficiency": gross_cycle_combined_efficiency,
       "net_cycle_combined_efficiency": net_cycle_combined_efficiency
-    }
\ No newline at end of file
+    }
+
+  def cycles_effiencies_calc_array(self, input, net_power_gas_turbine, LHV_fuel, fuel_sensible_heat, rankine_cycle_data):
+    """Calculation of cycles effciencies, for arrays of operating points"""
+    gross_power_combined_cycles = net_power_gas_turbine + rankine_cycle_data["net_power_steam_turbine"]
+    net_power_combined_cycles = gross_power_combined_cycles - rankine_cycle_data["consumed_power"]
+    fuel_mass_flow = input.fuel_mass_flow
+    gross_cycle_combined_efficiency = (gross_power_combined_cycles / (fuel_mass_flow * (LHV_fuel + abs(fuel_sensible_heat)) * (1/3600))) * 100
+    net_cycle_combined_efficiency = (net_power_combined_cycles / (fuel_mass_flow * (LHV_fuel + abs(fuel_sensible_heat)) * (1/3600))) * 100
+
+    # Validation: efficiency cannot exceed 100%
+    raise_for_invalid_elements(
+      (gross_cycle_combined_efficiency > 100) | (net_cycle_combined_efficiency > 100),
+      "Cycle efficiency exceeds 100%. This violates the first law of thermodynamics.",
+      ThermodynamicError
+    )
+
+    return {
+      "gross_power_combined_cycles": gross_power_combined_cycles,
+      "net_power_combined_cycles": net_power_combined_cycles,
+      "gross_cycle_combined_efficiency": gross_cycle_combined_efficiency,
+      "net_cycle_combined_efficiency": net_cycle_combined_efficiency
+    }
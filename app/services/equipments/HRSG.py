@@ -1,5 +1,7 @@
 import numpy as np
 from app.utils.errors import DataValidationError, ThermodynamicError
+from app.services.utils.arrays import as_float_array, raise_for_invalid_elements
+from app.core.metrics import timed_stage
 
 class HRSG:
   """Service class to calculate enthalpy properties of the Heat Recovery Steam Generator"""
@@ -12,6 +14,12 @@ class HRSG:
     result = abs(icph.icph_calc_heat(combustion_gas_icph_params, combustion_gas_molar_mass, exhaustion_temp, chimney_gas_temperature) * combustion_gas_mass_flow)
     return result
 
+  def heat_supplied_calc_array(self, input, combustion_gas, exhaustion_temp, icph):
+    """Calculation of heat supplied (in kJ/kg) to HRSG for arrays of operating points,
+    with the ICPH params of the combustion gases stacked like ICPH.stack_params"""
+    heat = icph.icph_calc_heat_array(combustion_gas["icph_params"], combustion_gas["molar_mass"], exhaustion_temp, input.chimney_gas_temperature)
+    return np.abs(heat * combustion_gas["mass_flow"])
+
   def get_params_operation(self, input, saturation_params, enthalpy_calc, high_steam_turbine, pump):
     """Calculation of params of operation of HRSG, and from others equipments of Rankine Cycle.
     Like as enthalpy of steam to be reheated and inlet water"""
@@ -72,59 +80,89 @@ class HRSG:
       "inlet_water_enthalpy": inlet_water_enthalpy
     }
 
-  def get_mass_flow(self, input, hsrg_params, heat_supplied):
-    """Calculation of mass flows in Heat Recovery Steam Generator (Steam generated, purge, boiler feed water) in kg/h"""
-    # Getting steams and purge fractions
+  def get_params_operation_array(self, input, saturation_params, enthalpy_calc, high_steam_turbine, pump):
+    """Calculation of params of operation of HRSG, for arrays of operating points"""
+    levels = {
+      "high": (input.high_steam_level_pressure, input.high_steam_level_temperature),
+      "medium": (input.medium_steam_level_pressure, input.medium_steam_level_temperature),
+      "low": (input.low_steam_level_pressure, input.low_steam_level_temperature)
+    }
+
+    # Checks that the steam turbine pressure levels are in descending order
+    raise_for_invalid_elements(
+      (levels["high"][0] <= levels["medium"][0]) | (levels["medium"][0] <= levels["low"][0]),
+      "The steam turbine pressure levels are in the incorrect order. Verify if they are in descending order.",
+      DataValidationError
+    )
+
+    # Checks that the temperature of each steam level is above saturation
+    for level_name, (pressure, temp) in levels.items():
+      saturation_temp = np.round(saturation_params.saturation_temperature_array(pressure), 2)
+      raise_for_invalid_elements(temp <= saturation_temp, f"The {level_name} steam temperature is below saturation", ThermodynamicError)
+
+    return {
+      "high_steam_enthaply": enthalpy_calc.overheated_steam_array(*levels["high"]),
+      "medium_steam_enthaply": enthalpy_calc.overheated_steam_array(*levels["medium"]),
+      "low_steam_enthaply": enthalpy_calc.overheated_steam_array(*levels["low"]),
+      "high_purge_enthalpy": enthalpy_calc.saturated_liquid_array(levels["high"][0]),
+      "medium_purge_enthalpy": enthalpy_calc.saturated_liquid_array(levels["medium"][0]),
+      "low_purge_enthalpy": enthalpy_calc.saturated_liquid_array(levels["low"][0]),
+      "medium_steam_cold_enthaply": high_steam_turbine["outlet_enthalpy_real"],
+      "inlet_water_enthalpy": pump["outlet_real_enthalpy"]
+    }
+
+  def steam_fractions(self, input):
+    """Fractions of the steam levels and of the purge, from the input (scalars or arrays)"""
     high_steam_fraction = input.high_steam_level_fraction / 100
     medium_steam_fraction = input.medium_steam_level_fraction / 100
     low_steam_fraction = 1 - (high_steam_fraction + medium_steam_fraction)
     purge_fraction = input.purge_level / 100
-
-    # Setting up the linear system of two equations (mass and energy balances) for the NumPy solver
-
-    # ---Energy balance equation---
-    # Coefficent of Steam total generated
+    return high_steam_fraction, medium_steam_fraction, low_steam_fraction, purge_fraction
+
+  def mass_balance_determinant(self, hsrg_params, high_steam_fraction, medium_steam_fraction, low_steam_fraction, purge_fraction):
+    """Determinant (with the sign changed) of the linear system of the mass and energy balances of the HRSG (scalars or arrays).
+    Unknowns: total steam generated S and boiler feed water F, in kg/h
+      Energy balance: a * S - h_feed_water * F = heat supplied
+      Mass balance: (1 + purge) * S - F = 0 (there is no accumulation in the process)"""
+    # Coefficent of Steam total generated in the energy balance
     steam_coefficient_energy_balance = high_steam_fraction * hsrg_params["high_steam_enthaply"] + hsrg_params["medium_steam_enthaply"] * (high_steam_fraction + medium_steam_fraction) + low_steam_fraction * hsrg_params["low_steam_enthaply"] + purge_fraction * (high_steam_fraction * hsrg_params["high_purge_enthalpy"] + medium_steam_fraction * hsrg_params["medium_purge_enthalpy"] + low_steam_fraction * hsrg_params["low_purge_enthalpy"]) - high_steam_fraction * hsrg_params["medium_steam_cold_enthaply"]
 
-    # Coefficent of boiler feed water
-    feed_water_coefficient_energy_balance = -hsrg_params["inlet_water_enthalpy"]
-
-    # Independent term
-    independent_term_energy_balance = heat_supplied
+    # Substituting F = (1 + purge) * S in the energy balance
+    return steam_coefficient_energy_balance - hsrg_params["inlet_water_enthalpy"] * (1 + purge_fraction)
 
-    # ---Mass balance equation---
-    # Coefficent of Steam total generated is just 1
-    steam_coefficient_mass_balance = 1 + purge_fraction
+  def mass_flows(self, heat_supplied, determinant, high_steam_fraction, medium_steam_fraction, low_steam_fraction, purge_fraction):
+    """Solution of the balances by 2x2 elimination, and the flows of each level (scalars or arrays)"""
+    total_steam_generated = heat_supplied / determinant
+    feed_water_required = (1 + purge_fraction) * total_steam_generated
+    return {
+      "total_steam_generated": total_steam_generated,
+      "feed_water_required": feed_water_required,
+      "high_steam": total_steam_generated * high_steam_fraction,
+      "medium_steam": total_steam_generated * medium_steam_fraction,
+      "low_steam": total_steam_generated * low_steam_fraction,
+      "purge": total_steam_generated * purge_fraction
+    }
 
-    # Coefficent of boiler feed water is -1 too to equal steam total value
-    feed_water_coefficient_mass_balance = -1
+  @timed_stage("hrsg.mass_flow")
+  def get_mass_flow(self, input, hsrg_params, heat_supplied):
+    """Calculation of mass flows in Heat Recovery Steam Generator (Steam generated, purge, boiler feed water) in kg/h.
+    The 2x2 linear system of the mass and energy balances is solved in closed form, without NumPy call overhead"""
+    fractions = self.steam_fractions(input)
+    determinant = self.mass_balance_determinant(hsrg_params, *fractions)
 
-    # Independent term
-    independent_term_mass_balance = 0 # There is no accumulation in the process
+    # Checks that the balances have a single solution
+    if determinant == 0:
+      raise np.linalg.LinAlgError("Singular matrix: the mass and energy balances of the HRSG have no single solution")
 
-    # Coefficients matrix
-    A = np.array([
-      [steam_coefficient_energy_balance, feed_water_coefficient_energy_balance],
-      [steam_coefficient_mass_balance, feed_water_coefficient_mass_balance]
-    ], dtype=float)
+    return self.mass_flows(heat_supplied, determinant, *fractions)
 
-    # Independents terms vector
-    b = np.array([independent_term_energy_balance, independent_term_mass_balance], dtype=float)
+  def get_mass_flow_array(self, input, hsrg_params, heat_supplied):
+    """Calculation of mass flows in Heat Recovery Steam Generator in kg/h for arrays of operating points:
+    all balances are solved at once, with array-valued fractions, enthalpies and heats supplied"""
+    fractions = self.steam_fractions(input)
+    determinant = as_float_array(self.mass_balance_determinant(hsrg_params, *fractions))
 
-    # Solving the linear system
-    x = np.linalg.solve(A, b)
-    total_steam_generated = x[0]
-    feed_water_required = x[1]
-    high_steam = total_steam_generated * high_steam_fraction
-    medium_steam = total_steam_generated * medium_steam_fraction
-    low_steam = total_steam_generated * low_steam_fraction
-    purge = total_steam_generated * purge_fraction
+    # Checks that the balances of all points have a single solution
+    raise_for_invalid_elements(determinant == 0, "Singular matrix: the mass and energy balances of the HRSG have no single solution", error=np.linalg.LinAlgError)
 
-    return {
-      "total_steam_generated": total_steam_generated,
-      "feed_water_required": feed_water_required,
-      "high_steam": high_steam,
-      "medium_steam": medium_steam,
-      "low_steam": low_steam,
-      "purge": purge
-    }
+    return self.mass_flows(as_float_array(heat_supplied), determinant, *fractions)
@@ -1,13 +1,17 @@
 from app.utils.errors import ThermodynamicError
+from app.services.utils.arrays import raise_for_invalid_elements
+from app.core.metrics import timed_stage
 
 class Condenser:
-  """Service class to calculate properties of condenser"""
+  """Service class to calculate properties of condenser.
+  get_params_operation_array is the batch mode, over an InputColumns of many operating points"""
   def __init__(self):
     # Specific Heat Water value for the cooling and make-up water in the condenser
     self.specific_heat_water = 75.55
     # Temperature of Water value for the make-up water in the condenser in Celsius
     self.make_up_temperature_water = 25
 
+  @timed_stage("condenser")
   def get_params_operation(self, input, substance_repo, enthalpy, steam_turbine_hrsg_data):
     """Calculation of params of operation of condenser"""
     water_molar_mass = substance_repo.get_all()["water"]["molar_mass"]
@@ -42,3 +46,29 @@ class Condenser:
       "make_up_water_mass_flow": make_up_water_mass_flow,
       "saturated_water_mass_flow": outlet_mass_flow
     }
+
+  def get_params_operation_array(self, input, substance_repo, enthalpy, steam_turbine_hrsg_data):
+    """Calculation of params of operation of condenser, for arrays of operating points"""
+    water_molar_mass = substance_repo.get_all()["water"]["molar_mass"]
+
+    # Intern params
+    operation_pressure = input.condenser_operation_pressure
+    raise_for_invalid_elements(operation_pressure <= 0, "Invalid condenser pressure: must be greater than zero.", ThermodynamicError)
+    inlet_enthalpy = steam_turbine_hrsg_data["steam_turbine_data"]["low_steam_turbine_params"]["outlet_enthalpy_real"]
+    steam_mass_flow = steam_turbine_hrsg_data["hrsg_data"]["mass_flows"]["total_steam_generated"]
+    make_up_water_mass_flow = steam_turbine_hrsg_data["hrsg_data"]["mass_flows"]["purge"]
+    outlet_enthalpy = enthalpy.saturated_liquid_array(operation_pressure)
+    make_up_water_enthalpy = (self.specific_heat_water / water_molar_mass) * self.make_up_temperature_water # In kJ/kg
+
+    # Mass and energy balances of the hot side and of the cooling water, like get_params_operation
+    outlet_mass_flow = steam_mass_flow + make_up_water_mass_flow
+    thermal_change = (steam_mass_flow * inlet_enthalpy + make_up_water_mass_flow * make_up_water_enthalpy - outlet_mass_flow * outlet_enthalpy) / 3600 # In kW
+    delta_cooling_water_temperature = input.range_temperature_cooling_tower
+    cooling_water_mass_flow = ((thermal_change * 3600) / (delta_cooling_water_temperature * (self.specific_heat_water / water_molar_mass))) / 1000 # in ton/h
+
+    return {
+      "thermal_change": thermal_change,
+      "cooling_water_mass_flow": cooling_water_mass_flow,
+      "make_up_water_mass_flow": make_up_water_mass_flow,
+      "saturated_water_mass_flow": outlet_mass_flow
+    }
@@ -1,7 +1,18 @@
-from app.utils.errors import ComputationalError, ThermodynamicError
+import numpy as np
+from app.utils.errors import ThermodynamicError
+from app.services.utils.arrays import as_float_array, raise_for_invalid_elements
+from ..thermodynamics.heat.icph import icph_heat, icph_heat_derivative
+from ..utils.newton_method import NewtonMethod
+from ..utils.stage_cache import cached_per_input
+from app.core.metrics import timed_stage
 
 class GasTurbine:
-  """Service class of all methods and calculations related to gas turbine"""
+  """Service class of all methods and calculations related to gas turbine.
+  Each intermediate result is computed once per input and reused by the other methods.
+  The *_array methods are the batch mode, over an InputColumns of many operating points"""
+  # Universal Gas Constant in J/(mol.K)
+  R = 8.314462618
+
   def __init__(self, config):
     self.config = config
     self.input = config.input
@@ -14,7 +25,26 @@ class GasTurbine:
     self.combustion_gas = config.combustion_gas
     self.humidity = config.humidity
     self.saturation_parameters = config.saturation_parameters
+    # Iterations of the exhaustion gas temperature are reported by its telemetry (last_iterations, total_iterations)
+    self.root_finder = config.root_finder or NewtonMethod()
+
+  @cached_per_input
+  @timed_stage("gas_turbine.stoichiometry")
+  def reaction_stoichiometric_calc(self):
+    """
+    Calculation of stoichiometric molar flows of combustion
+    """
+    return self.reactions.molar_flow_stoichiometric_calc()
+
+  @cached_per_input
+  def LHV_fuel_calc(self):
+    """
+    Calculation of LHV of fuel gas
+    """
+    return self.gas_fuel.LHV_fuel_calc()
 
+  @cached_per_input
+  @timed_stage("gas_turbine.fuel_sensible_heat")
   def fuel_sensible_heat_calc(self):
     """
     Calculation of sensible heat of fuel gas
@@ -29,53 +59,59 @@ class GasTurbine:
     )
     return fuel_sensible_heat
 
+  @cached_per_input
+  @timed_stage("gas_turbine.net_power")
   def net_power_GT_calculation(self):
     """
     Calculation of Net Power of Gas Turbine
     """
     fuel_mass_flow = self.input.fuel_mass_flow
     heat_rate = 3600/(self.input.gas_turbine_efficiency/100)
-    LHV_fuel = self.gas_fuel.LHV_fuel_calc()
+    LHV_fuel = self.LHV_fuel_calc()
     heat_fuel_input = self.fuel_sensible_heat_calc()
     net_power_GT = (fuel_mass_flow * (LHV_fuel + abs(heat_fuel_input))) / heat_rate
     return net_power_GT
 
+  @cached_per_input
+  @timed_stage("gas_turbine.input_air")
   def input_air_properties(self):
     """
     Calculation of input air properties
     """
-    reaction_stoichiometric = self.reactions.molar_flow_stoichiometric_calc()
+    reaction_stoichiometric = self.reaction_stoichiometric_calc()
     oxygen_stoichiometric = reaction_stoichiometric['oxygen_stoichiometric']
     saturation_pressure = self.saturation_parameters.saturation_pressure(self.input.local_temperature)
     absolute_humidity = self.humidity.absolute_humidity_calc(saturation_pressure, self.input.local_atmospheric_pressure, self.input.relative_humidity)
     input_air_properties = self.input_air.input_air_data_calc(oxygen_stoichiometric, absolute_humidity)
     return input_air_properties
 
+  @cached_per_input
+  @timed_stage("gas_turbine.combustion_gas")
   def combustion_gas_properties(self):
     """
     Calculation of combustion gas properties
     """
-    reaction_stoichiometric = self.reactions.molar_flow_stoichiometric_calc()
+    reaction_stoichiometric = self.reaction_stoichiometric_calc()
     gas_fuel_molar_mass = self.gas_fuel.average_molar_mass_calc()
     input_air = self.input_air_properties()
     combustion_gas_properties = self.combustion_gas.combustion_gas_data_calc(reaction_stoichiometric, input_air, gas_fuel_molar_mass)
 
     return combustion_gas_properties
 
+  @cached_per_input
+  @timed_stage("gas_turbine.exhaustion_temperature")
   def exhaustion_gas_temp(self):
     """
     Calculation of exhaustion gas temperature of gas turbine
     """
     # Getting params to the calculation
-    initial_temperature = 298.15
     gas_turbine_efficiency = self.input.gas_turbine_efficiency/100
     combustion_gas = self.combustion_gas_properties()
     combustion_gas_molar_mass = combustion_gas["molar_mass"]
     input_air = self.input_air_properties()
     air_mass_flow = input_air["mass_flow"]
     fuel_mass_flow = self.input.fuel_mass_flow
-    LHV_fuel = self.gas_fuel.LHV_fuel_calc()
-    R = 8.314462618
+    LHV_fuel = self.LHV_fuel_calc()
 
     # Obtaining the sensible heat from the fuel
     fuel_sensible_heat = self.fuel_sensible_heat_calc()
@@ -85,43 +121,91 @@ class GasTurbine:
     molar_mass_input_air = input_air["molar_mass"]
     input_air_sensible_heat = self.icph.icph_calc_heat(icph_params_input_air, molar_mass_input_air, self.input.air_input_temperature, 25)
 
-    # Getting icph_params of combustion gas
-    A = combustion_gas["icph_params"]["param_A"]
-    B = combustion_gas["icph_params"]["param_B"]
-    C = combustion_gas["icph_params"]["param_C"]
-    D = combustion_gas["icph_params"]["param_D"]
-
-    # Defining parameters for each loop of the iteration, in order to converge to the final temperature
-    maximum_iterations = 100
-    i = 0
-    tolerance = 1
-    old_temperature = 1
-    new_temperature = initial_temperature + 1
-
-    # Ratio of the new iteration temperature to the initial combustion gas temperature of 25°C
-    tau = new_temperature / initial_temperature
-
     # Calculation of heat not converted into electrical energy and supplied to the flue gases in kJ/kg
     heat_supplied = ((1 - gas_turbine_efficiency) * (fuel_mass_flow * (LHV_fuel + abs(fuel_sensible_heat)) + air_mass_flow * abs(input_air_sensible_heat))) / (combustion_gas["mass_flow"])
 
-    # Looping
-    while tolerance > 0.001 and i < maximum_iterations:
-      average_specific_heat = R * (A + (B / 2) * initial_temperature * (tau + 1) + (C / 3) * (initial_temperature ** 2) * ((tau ** 2) + tau + 1) + (D / (tau * (initial_temperature ** 2))))
+    result = self.exhaustion_temperature(heat_supplied, combustion_gas["icph_params"], combustion_gas_molar_mass)
 
-      new_temperature = (heat_supplied / (average_specific_heat / combustion_gas_molar_mass)) + initial_temperature
+    if result <= 24.85:
+      raise ThermodynamicError("Iteration method converge to incoherent numerical value")
+
+    return result
+
+  @cached_per_input
+  def fuel_sensible_heat_calc_array(self):
+    """
+    Calculation of sensible heat of fuel gas, for arrays of operating points
+    """
+    icph_params_gas_fuel = self.icph.stack_param_columns(self.gas_fuel.icph_params_calc())
+    molar_mass_gas_fuel = self.gas_fuel.average_molar_mass_calc()
+    return self.icph.icph_calc_heat_array(icph_params_gas_fuel, molar_mass_gas_fuel, self.input.fuel_input_temperature, 25)
 
-      tolerance = abs((new_temperature - old_temperature))
+  @cached_per_input
+  def net_power_GT_calculation_array(self):
+    """
+    Calculation of Net Power of Gas Turbine, for arrays of operating points
+    """
+    heat_rate = 3600/(self.input.gas_turbine_efficiency/100)
+    return (self.input.fuel_mass_flow * (self.gas_fuel.LHV_fuel_calc_array() + np.abs(self.fuel_sensible_heat_calc_array()))) / heat_rate
 
-      old_temperature = new_temperature
+  @cached_per_input
+  def input_air_properties_array(self):
+    """
+    Calculation of input air properties, for arrays of operating points (the molar flows, fractions and params are arrays)
+    """
+    oxygen_stoichiometric = self.reaction_stoichiometric_calc()['oxygen_stoichiometric']
+    saturation_pressure = self.saturation_parameters.saturation_pressure_array(self.input.local_temperature)
+    absolute_humidity = self.humidity.absolute_humidity_calc(saturation_pressure, self.input.local_atmospheric_pressure, self.input.relative_humidity)
+    return self.input_air.input_air_data_calc(oxygen_stoichiometric, absolute_humidity)
 
-      tau = new_temperature / initial_temperature
+  @cached_per_input
+  def combustion_gas_properties_array(self):
+    """
+    Calculation of combustion gas properties, for arrays of operating points
+    """
+    return self.combustion_gas.combustion_gas_data_calc(self.reaction_stoichiometric_calc(), self.input_air_properties_array(), self.gas_fuel.average_molar_mass_calc())
 
-    if i >= maximum_iterations:
-      raise ComputationalError("Iteration method did not converge after maximum iterations")
+  @cached_per_input
+  def exhaustion_gas_temp_array(self):
+    """
+    Calculation of exhaustion gas temperature of gas turbine, for arrays of operating points
+    """
+    # Getting params to the calculation
+    gas_turbine_efficiency = self.input.gas_turbine_efficiency/100
+    combustion_gas = self.combustion_gas_properties_array()
+    input_air = self.input_air_properties_array()
+    LHV_fuel = self.gas_fuel.LHV_fuel_calc_array()
+    fuel_sensible_heat = self.fuel_sensible_heat_calc_array()
 
-    result = new_temperature - 273.15
+    # Obtaining the sensible heat from the input air
+    input_air_sensible_heat = self.icph.icph_calc_heat_array(self.icph.stack_param_columns(input_air["icph_params"]), input_air["molar_mass"], self.input.air_input_temperature, 25)
 
-    if result <= 24.85:
-      raise ThermodynamicError("Iteration method converge to incoherent numerical value")
+    # Calculation of heat not converted into electrical energy and supplied to the flue gases in kJ/kg
+    heat_supplied = ((1 - gas_turbine_efficiency) * (self.input.fuel_mass_flow * (LHV_fuel + np.abs(fuel_sensible_heat)) + input_air["mass_flow"] * np.abs(input_air_sensible_heat))) / (combustion_gas["mass_flow"])
 
+    result, _ = self.exhaustion_temperature_array(heat_supplied, self.icph.stack_param_columns(combustion_gas["icph_params"]), combustion_gas["molar_mass"])
+    raise_for_invalid_elements(result <= 24.85, "Iteration method converge to incoherent numerical value", ThermodynamicError)
     return result
+
+  def exhaustion_temperature(self, heat_supplied, icph_params, molar_mass):
+    """
+    Temperature in °C at which the sensible heat of the combustion gas, from 25 °C, equals the heat supplied (kJ/kg).
+    Newton method on the ICPH equation, whose derivative is the specific heat, with the iteration and time budgets of the root finder.
+    It starts at the temperature of the specific heat at 25 °C (the first step of a mean specific heat iteration)
+    """
+    A, B, C, D = (icph_params[name] for name in ("param_A", "param_B", "param_C", "param_D"))
+    function = lambda temperature: icph_heat(self.R, A, B, C, D, molar_mass, 25, temperature) - heat_supplied
+    derivative = lambda temperature: icph_heat_derivative(self.R, A, B, C, D, molar_mass, temperature)
+    return self.root_finder.solve(function, derivative, 25 + heat_supplied / derivative(25))
+
+  def exhaustion_temperature_array(self, heat_supplied, icph_params, molar_mass):
+    """
+    Batch mode of exhaustion_temperature: temperatures in °C of arrays of heats supplied and combustion gases,
+    with the ICPH params stacked like ICPH.stack_params. Returns the temperatures and the iterations of each one
+    """
+    A, B, C, D = np.moveaxis(as_float_array(icph_params), -1, 0)
+    heat_supplied, molar_mass, A, B, C, D = (np.ravel(values) for values in np.broadcast_arrays(as_float_array(heat_supplied), as_float_array(molar_mass), A, B, C, D))
+    function = lambda temperature, indices: icph_heat(self.R, A[indices], B[indices], C[indices], D[indices], molar_mass[indices], 25, temperature) - heat_supplied[indices]
+    derivative = lambda temperature, indices: icph_heat_derivative(self.R, A[indices], B[indices], C[indices], D[indices], molar_mass[indices], temperature)
+    initial_guess = 25 + heat_supplied / icph_heat_derivative(self.R, A, B, C, D, molar_mass, 25)
+    return self.root_finder.solve_array(function, derivative, initial_guess)
@@ -1,9 +1,12 @@
 from app.utils.errors import ThermodynamicError
+from app.services.utils.arrays import raise_for_invalid_elements
+from app.core.metrics import timed_stage
 
 class LowSteamTurbine:
-  """Service class to calculate properties of low pressure steam turbine"""
+  """Service class to calculate properties of low pressure steam turbine.
+  get_params_operation_array is the batch mode, over an InputColumns of many operating points"""
   def mixing_point_outlet_enthalpy(self, low_steam_enthalpy, medium_steam_turbine, hrsg_flows):
-    """Calculation of resultant enthalpy of mixing point between medium and low steam level turbine"""
+    """Calculation of resultant enthalpy of mixing point between medium and low steam level turbine (scalars or arrays)"""
     # Flow that comes from high and medium levels
     medium_enthalpy = medium_steam_turbine["outlet_enthalpy_real"]
     medium_flow = hrsg_flows["medium_steam"] + hrsg_flows["high_steam"]
@@ -15,14 +18,15 @@ class LowSteamTurbine:
     result_enthalpy = (medium_enthalpy * medium_flow + low_steam_enthalpy * low_flow) / (medium_flow + low_flow)
     return result_enthalpy
 
-  def get_params_operation(self, input, saturation_parameters, entropy, enthalpy, medium_steam_turbine, hrsg_data, secant_method):
+  @timed_stage("low_steam_turbine")
+  def get_params_operation(self, input, saturation_parameters, entropy, enthalpy, medium_steam_turbine, hrsg_data, root_finder):
     """Calculation of params of operation of Low Level Steam Turbine"""
     # Getting resultant enthalpy of mixing point
     low_steam_enthalpy = enthalpy.overheated_steam(input.low_steam_level_pressure, input.low_steam_level_temperature)
     result_enthalpy = self.mixing_point_outlet_enthalpy(low_steam_enthalpy, medium_steam_turbine, hrsg_data["mass_flows"])
 
-    # Getting steam inlet temperature of low steam turbine
-    inlet_steam_temperature = secant_method.run(result_enthalpy, enthalpy, input.low_steam_level_pressure, saturation_parameters)
+    # Getting steam inlet temperature of low steam turbine, starting the iteration at the temperature of the low steam level
+    inlet_steam_temperature = root_finder.run(result_enthalpy, enthalpy, input.low_steam_level_pressure, saturation_parameters, input.low_steam_level_temperature)
 
     # Intlet params
     efficiency = input.low_steam_level_efficiency
@@ -51,5 +55,49 @@ class LowSteamTurbine:
     return {
       "delta_enthalpy_real": delta_enthalpy_real,
       "outlet_enthalpy_real": outlet_enthalpy_real,
-      "real_quality_outlet_steam": real_quality_outlet_steam
+      "real_quality_outlet_steam": real_quality_outlet_steam,
+      "iterations": root_finder.last_iterations
+      }
+
+  def get_params_operation_array(self, input, saturation_parameters, entropy, enthalpy, medium_steam_turbine, hrsg_data, root_finder):
+    """Calculation of params of operation of Low Level Steam Turbine, for arrays of operating points"""
+    # Getting resultant enthalpy of mixing point
+    low_steam_enthalpy = enthalpy.overheated_steam_array(input.low_steam_level_pressure, input.low_steam_level_temperature)
+    result_enthalpy = self.mixing_point_outlet_enthalpy(low_steam_enthalpy, medium_steam_turbine, hrsg_data["mass_flows"])
+
+    # Getting steam inlet temperature of low steam turbine, all operating points solved together
+    inlet_steam_temperature, iterations = root_finder.run_array(result_enthalpy, enthalpy, input.low_steam_level_pressure, saturation_parameters, input.low_steam_level_temperature)
+
+    # Intlet params
+    efficiency = input.low_steam_level_efficiency
+    inlet_enthalpy = result_enthalpy
+    inlet_entropy = entropy.overheated_steam_array(input.low_steam_level_pressure, inlet_steam_temperature)
+
+    # Calculation of the isentropic quality of the vapor at the outlet
+    outlet_pressure = input.condenser_operation_pressure # Condenser pressure
+    liquid_saturated_outlet_entropy = entropy.saturated_liquid_array(outlet_pressure)
+    steam_saturated_outlet_entropy = entropy.saturated_steam_array(outlet_pressure)
+    isentropic_quality_outlet_steam = (inlet_entropy - liquid_saturated_outlet_entropy) / (steam_saturated_outlet_entropy - liquid_saturated_outlet_entropy)
+
+    # Calculation of isentropic enthalpy of outlet steam
+    liquid_saturated_outlet_enthalpy = enthalpy.saturated_liquid_array(outlet_pressure)
+    steam_saturated_outlet_enthalpy = enthalpy.saturated_steam_array(outlet_pressure)
+    isentropic_enthalpy_outlet_steam = liquid_saturated_outlet_enthalpy + isentropic_quality_outlet_steam * (steam_saturated_outlet_enthalpy - liquid_saturated_outlet_enthalpy)
+    delta_enthalpy_isentropic = isentropic_enthalpy_outlet_steam - inlet_enthalpy
+    delta_enthalpy_real = delta_enthalpy_isentropic * (efficiency / 100)
+    outlet_enthalpy_real = inlet_enthalpy + delta_enthalpy_real
+    real_quality_outlet_steam = (outlet_enthalpy_real - liquid_saturated_outlet_enthalpy) / (steam_saturated_outlet_enthalpy - liquid_saturated_outlet_enthalpy)
+
+    # Checks if the isentropic and real quality of the steam are between 0 and 1
+    raise_for_invalid_elements(
+      (isentropic_quality_outlet_steam >= 1) | (real_quality_outlet_steam >= 1),
+      "The outlet steam in the low steam turbine is still overheated or saturated, review the conditions of the power plant",
+      ThermodynamicError
+    )
+
+    return {
+      "delta_enthalpy_real": delta_enthalpy_real,
+      "outlet_enthalpy_real": outlet_enthalpy_real,
+      "real_quality_outlet_steam": real_quality_outlet_steam,
+      "iterations": iterations
       }
@@ -1,13 +1,19 @@
+import numpy as np
 from app.utils.errors import ThermodynamicError
+from app.services.utils.arrays import raise_for_invalid_elements
+from app.services.thermodynamics.steam.entropy import isentropic_temperature_estimate
+from app.core.metrics import timed_stage
 
 class MediumSteamTurbine:
-  """Service class to calculate properties of medium pressure steam turbine"""
-  def get_params_operation(self, input, saturation_parameters, entropy, enthalpy, secant_method):
+  """Service class to calculate properties of medium pressure steam turbine.
+  get_params_operation_array is the batch mode, over an InputColumns of many operating points"""
+  @timed_stage("medium_steam_turbine")
+  def get_params_operation(self, input, saturation_parameters, entropy, enthalpy, root_finder):
     """Calculation of params of operation of Medium Level Steam Turbine"""
     efficiency = input.medium_steam_level_efficiency
     saturation_temperature = round(saturation_parameters.saturation_temperature(input.medium_steam_level_pressure), 2)
 
-    # Before calculating, checks if the temperature of the steam is above saturation, so the secant method can converge
+    # Before calculating, checks if the temperature of the steam is above saturation, so the iteration can converge
     # This verification is crucial for the HRSG's calculations, so it is made in this module too
     if input.medium_steam_level_temperature <= saturation_temperature:
       raise ThermodynamicError(f"The medium steam temperature is below saturation ({saturation_temperature}°C)")
@@ -16,8 +22,9 @@ class MediumSteamTurbine:
     inlet_entropy = entropy.overheated_steam(input.medium_steam_level_pressure, input.medium_steam_level_temperature)
     inlet_enthalpy = enthalpy.overheated_steam(input.medium_steam_level_pressure, input.medium_steam_level_temperature)
 
-    # Estimating outlet enthalpy of process isentropic
-    outlet_temperature_isentropic = secant_method.run(inlet_entropy, entropy, input.low_steam_level_pressure, saturation_parameters)
+    # Estimating outlet enthalpy of process isentropic, starting the iteration at the ideal gas estimate
+    initial_guess = isentropic_temperature_estimate(input.medium_steam_level_temperature, input.medium_steam_level_pressure, input.low_steam_level_pressure)
+    outlet_temperature_isentropic = root_finder.run(inlet_entropy, entropy, input.low_steam_level_pressure, saturation_parameters, initial_guess)
     outlet_enthalpy_isentropic = enthalpy.overheated_steam(input.low_steam_level_pressure, outlet_temperature_isentropic)
 
     # Estimating real outlet enthalpy
@@ -27,5 +34,34 @@ class MediumSteamTurbine:
 
     return {
       "delta_enthalpy_real": delta_enthalpy_real,
-      "outlet_enthalpy_real": outlet_enthalpy_real
+      "outlet_enthalpy_real": outlet_enthalpy_real,
+      "iterations": root_finder.last_iterations
+      }
+
+  def get_params_operation_array(self, input, saturation_parameters, entropy, enthalpy, root_finder):
+    """Calculation of params of operation of Medium Level Steam Turbine, for arrays of operating points"""
+    efficiency = input.medium_steam_level_efficiency
+    saturation_temperature = np.round(saturation_parameters.saturation_temperature_array(input.medium_steam_level_pressure), 2)
+
+    # Before calculating, checks if the temperature of the steam is above saturation, so the iteration can converge
+    raise_for_invalid_elements(input.medium_steam_level_temperature <= saturation_temperature, "The medium steam temperature is below saturation", ThermodynamicError)
+
+    # Inlet params
+    inlet_entropy = entropy.overheated_steam_array(input.medium_steam_level_pressure, input.medium_steam_level_temperature)
+    inlet_enthalpy = enthalpy.overheated_steam_array(input.medium_steam_level_pressure, input.medium_steam_level_temperature)
+
+    # Estimating outlet enthalpy of process isentropic, all operating points solved together
+    initial_guess = isentropic_temperature_estimate(input.medium_steam_level_temperature, input.medium_steam_level_pressure, input.low_steam_level_pressure)
+    outlet_temperature_isentropic, iterations = root_finder.run_array(inlet_entropy, entropy, input.low_steam_level_pressure, saturation_parameters, initial_guess)
+    outlet_enthalpy_isentropic = enthalpy.overheated_steam_array(input.low_steam_level_pressure, outlet_temperature_isentropic)
+
+    # Estimating real outlet enthalpy
+    delta_enthalpy_isentropic = outlet_enthalpy_isentropic - inlet_enthalpy
+    delta_enthalpy_real = delta_enthalpy_isentropic * (efficiency/100)
+    outlet_enthalpy_real = inlet_enthalpy + delta_enthalpy_real
+
+    return {
+      "delta_enthalpy_real": delta_enthalpy_real,
+      "outlet_enthalpy_real": outlet_enthalpy_real,
+      "iterations": iterations
       }
@@ -1,7 +1,9 @@
 from app.utils.errors import ThermodynamicError
+from app.services.utils.arrays import raise_for_invalid_elements
 
 class Pump:
-  """Service class to calculate properties of outlet water pump"""
+  """Service class to calculate properties of outlet water pump.
+  get_params_operation_array is the batch mode, over an InputColumns of many operating points"""
   def get_params_operation(self, input, enthalpy, specific_volume):
     """Calculation of params of operation of outlet water pump"""
     # Pump outlet pressure set at 20 bar above the high level vapor pressure value, as a guarantee that it is not in violation of the Second Law of Thermodynamics
@@ -32,3 +34,27 @@ class Pump:
       "delta_pressure": delta_pressure / 100000, # in bar
       "delta_specific_enthalpy": delta_specific_enthalpy # in kJ/kg
     }
+
+  def get_params_operation_array(self, input, enthalpy, specific_volume):
+    """Calculation of params of operation of outlet water pump, for arrays of operating points"""
+    # Pump outlet pressure set at 20 bar above the high level vapor pressure value
+    outlet_pressure = input.high_steam_level_pressure + 20
+
+    # Inlet pressure is the same of the condenser operation
+    inlet_pressure = input.condenser_operation_pressure
+    inlet_real_enthalpy = enthalpy.saturated_liquid_array(inlet_pressure)
+
+    # Delta pressure calculation and converting from Bar to Pascal
+    delta_pressure = (outlet_pressure - inlet_pressure) * 100000
+
+    # Outlet real enthalpy by pump efficency and converting from J/kg to kJ/kg
+    outlet_real_enthalpy = ((specific_volume.saturated_liquid_array(inlet_pressure) * delta_pressure * 0.001) / (input.pump_efficiency / 100)) + inlet_real_enthalpy
+
+    # Checks delta pressure in the pump
+    raise_for_invalid_elements(outlet_pressure <= inlet_pressure, "Inconsistent pressures: outlet_pressure must be greater than inlet_pressure", ThermodynamicError)
+
+    return {
+      "outlet_real_enthalpy": outlet_real_enthalpy,
+      "delta_pressure": delta_pressure / 100000, # in bar
+      "delta_specific_enthalpy": outlet_real_enthalpy - inlet_real_enthalpy # in kJ/kg
+    }
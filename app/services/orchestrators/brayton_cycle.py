@@ -7,10 +7,11 @@ from ..thermodynamics.psychrometry.humidity import Humidity
 from ..thermodynamics.steam.saturation_parameters import SaturationParameters
 from ..equipments.gas_turbine import GasTurbine
 from ..configs.gas_turbine_config import GasTurbineConfig
+from app.core.metrics import timed_stage
 
 class BraytonCycle:
   """Service class of all methods and calculations related to Brayton's cycle"""
-  def __init__(self, input, substance_repo, icph_repo):
+  def __init__(self, input, substance_repo, icph_repo, saturation_parameters=None):
     self.input = input
     self.substance_repo = substance_repo
     self.icph_repo = icph_repo
@@ -22,7 +23,7 @@ class BraytonCycle:
     self.input_air = InputAir(self.input, self.substance_repo, self.icph_repo)
     self.combustion_gas = CombustionGas(self.input, self.substance_repo, self.icph_repo)
     self.humidity = Humidity()
-    self.saturation_parameters = SaturationParameters()
+    self.saturation_parameters = saturation_parameters or SaturationParameters()
 
     # Assembling the turbine configuration
     config = GasTurbineConfig(
@@ -41,7 +42,10 @@ class BraytonCycle:
     # Instantiating the turbine with the configuration already packaged
     self.gas_turbine = GasTurbine(config)
 
+  @timed_stage("brayton_cycle")
   def run(self):
+    """Executing all logic of Brayton Cycle in a single pass.
+    The gas turbine caches its intermediate results, so each one is computed once"""
     return {
       "LHV_fuel": self.gas_fuel.LHV_fuel_calc(),
       "fuel_sensible_heat": self.gas_turbine.fuel_sensible_heat_calc(),
@@ -49,4 +53,34 @@ class BraytonCycle:
       "input_air": self.gas_turbine.input_air_properties(),
       "combustion_gas": self.gas_turbine.combustion_gas_properties(),
       "exhaustion_temp": self.gas_turbine.exhaustion_gas_temp()
-    }
\ No newline at end of file
+    }
+
+  def run_array(self):
+    """Batch mode of run, with an InputColumns of many operating points: the same results, each value an array"""
+    return {
+      "LHV_fuel": self.gas_fuel.LHV_fuel_calc_array(),
+      "fuel_sensible_heat": self.gas_turbine.fuel_sensible_heat_calc_array(),
+      "net_power": self.gas_turbine.net_power_GT_calculation_array(),
+      "input_air": self.gas_turbine.input_air_properties_array(),
+      "combustion_gas": self.gas_turbine.combustion_gas_properties_array(),
+      "exhaustion_temp": self.gas_turbine.exhaustion_gas_temp_array()
+    }
+
+  @staticmethod
+  def scale_results(results, factor):
+    """Results of the cycle burning `factor` times the fuel mass flow.
+    The cycle is linear in the fuel mass flow: the flows and the power scale with it, while the properties
+    (LHV, sensible heat, fractions, molar masses, ICPH params and exhaustion temperature) do not change"""
+    def scale_stream(stream):
+      return {
+        **stream,
+        "molar_flow": {substance: flow * factor for substance, flow in stream["molar_flow"].items()},
+        "mass_flow": stream["mass_flow"] * factor
+      }
+
+    return {
+      **results,
+      "net_power": results["net_power"] * factor,
+      "input_air": scale_stream(results["input_air"]),
+      "combustion_gas": scale_stream(results["combustion_gas"])
+    }
@@ -1,5 +1,8 @@
 from collections import namedtuple
+from ...core.config import settings
+from ...core.metrics import timed_stage
 from ...repositories.repositories_container import RepositoriesContainer
+from ..thermodynamics.steam.saturation_parameters import SaturationParameters
 from .brayton_cycle import BraytonCycle
 from .rankine_cycle import RankineCycle
 from ..cycles_analysis.cycles_performances import CyclesPerformances
@@ -15,60 +18,97 @@ FullCyclesResult = namedtuple("FullCyclesResult", [
     "net_power_cycle_combined", "gross_cycle_combined_efficiency", "net_cycle_combined_efficiency"
 ])
 
+def round_results(results, digits=2):
+  """Results rounded to the digits of the API responses"""
+  return FullCyclesResult(*(round(value, digits) for value in results))
+
 class FullCycles:
-  def __init__(self, input, repositories: RepositoriesContainer):
+  def __init__(self, input, repositories: RepositoriesContainer, saturation_mode=None, stage_memo=None):
     self.input = input
-    self.substance_repo = repositories.substance_repository
-    self.icph_repo = repositories.icph_repository
-    self.brayton_cycle = BraytonCycle(self.input, self.substance_repo, self.icph_repo)
+    # Services read substances and ICPH params from the in-memory catalog instead of the session
+    catalog = repositories.component_catalog
+    self.substance_repo = catalog
+    self.icph_repo = catalog
+    # Saturation curve of the simulation, in the requested mode or in the default mode of the process
+    self.saturation_parameters = SaturationParameters(saturation_mode or settings.SATURATION_MODE)
+    # Optional memo of stages shared with the runs of other inputs (sweeps): the Brayton cycle is then built only when not memoized
+    self.stage_memo = stage_memo
+    self.brayton_cycle = BraytonCycle(self.input, self.substance_repo, self.icph_repo, self.saturation_parameters) if stage_memo is None else None
     self.cycles_performances= CyclesPerformances()
 
-  def create_full_cycles_combined(self):
+  def brayton_cycle_calc(self):
+    """Results of the Brayton cycle, shared through the stage memo with the inputs that agree on the fields it reads.
+    With the memo, the cycle is computed per unit of fuel mass flow (kg/h) and scaled to the input's fuel mass flow,
+    so inputs differing only in their fuel mass flow (loads) share the whole combustion calculation"""
+    if self.stage_memo is None:
+      return self.brayton_cycle.run()
+
+    unit_fuel_input = self.input.model_copy(update={"fuel_mass_flow": 1.0})
+    compute_unit_fuel = lambda input: BraytonCycle(input, self.substance_repo, self.icph_repo, self.saturation_parameters).run()
+    compute = lambda input: BraytonCycle.scale_results(self.stage_memo.run("brayton_unit_fuel", unit_fuel_input, compute_unit_fuel), input.fuel_mass_flow)
+    return self.stage_memo.run("brayton", self.input, compute, dependencies=("brayton_unit_fuel",))
+
+  @timed_stage("full_cycles")
+  def create_full_cycles_combined(self, digits=2):
     """
     Orchestrator of all calculation in Cycles Combined
     """
     # All logic of Brayton Cycle
-    brayton_cycle_data = self.brayton_cycle.run()
-    LHV_fuel = brayton_cycle_data["LHV_fuel"]
-    net_power_gas_turbine = brayton_cycle_data["net_power"]
-    input_air_porperties = brayton_cycle_data["input_air"]
-    combustion_gas_properties = brayton_cycle_data["combustion_gas"]
-    exhaustion_gas_temperature = brayton_cycle_data["exhaustion_temp"]
-    fuel_sensible_heat = brayton_cycle_data["fuel_sensible_heat"]
+    brayton_cycle_data = self.brayton_cycle_calc()
 
     # All logic of Rankine Cycle
-    rankine_cycle_data = RankineCycle(self.input, self.substance_repo, self.icph_repo, heat_suplier_cycle=brayton_cycle_data).run()
+    rankine_cycle_data = RankineCycle(self.input, self.substance_repo, self.icph_repo, heat_suplier_cycle=brayton_cycle_data, saturation_parameters=self.saturation_parameters, stage_memo=self.stage_memo).run()
+
+    # All logic of Performance Cycles Calculation
+    # Getting cycles performances data
+    cycles_performances_data = self.cycles_performances.cycles_effiencies_calc(self.input, brayton_cycle_data["net_power"], brayton_cycle_data["LHV_fuel"], brayton_cycle_data["fuel_sensible_heat"], rankine_cycle_data["generated_consumed_powers_data"])
+
+    result_of_cycles = self.full_cycles_result(brayton_cycle_data, rankine_cycle_data, cycles_performances_data)
+    # Results are rounded to 2 decimals, unless exact values are requested (digits=None, for finite differences)
+    if digits is not None:
+      result_of_cycles = round_results(result_of_cycles, digits)
+    return result_of_cycles
+
+  def create_full_cycles_combined_array(self):
+    """
+    Batch mode of create_full_cycles_combined, with an InputColumns of many operating points:
+    every stage runs once over all points, through the array kernels of the services.
+    Returns the results unrounded, each one an array; an error of any point raises for the whole batch
+    """
+    brayton_cycle_data = self.brayton_cycle.run_array()
+    rankine_cycle_data = RankineCycle(self.input, self.substance_repo, self.icph_repo, heat_suplier_cycle=brayton_cycle_data, saturation_parameters=self.saturation_parameters).run_array()
+    cycles_performances_data = self.cycles_performances.cycles_effiencies_calc_array(self.input, brayton_cycle_data["net_power"], brayton_cycle_data["LHV_fuel"], brayton_cycle_data["fuel_sensible_heat"], rankine_cycle_data["generated_consumed_powers_data"])
+    return self.full_cycles_result(brayton_cycle_data, rankine_cycle_data, cycles_performances_data)
+
+  @staticmethod
+  def full_cycles_result(brayton_cycle_data, rankine_cycle_data, cycles_performances_data):
+    """Assembling the FullCyclesResult from the data of the cycles (scalars or arrays)"""
     hrsg_data = rankine_cycle_data["hrsg_data"]
     pump_data = rankine_cycle_data["pump_data"]
     steam_turbine_data = rankine_cycle_data["steam_turbine_data"]
     condenser_data = rankine_cycle_data["condenser_data"]
     generated_consumed_powers_data = rankine_cycle_data["generated_consumed_powers_data"]
 
-    # All logic of Performance Cycles Calculation
-    # Getting cycles performances data
-    cycles_performances_data = self.cycles_performances.cycles_effiencies_calc(self.input, net_power_gas_turbine, LHV_fuel, fuel_sensible_heat, rankine_cycle_data["generated_consumed_powers_data"])
-
-    result_of_cycles = FullCyclesResult(
-      LHV_fuel = round(LHV_fuel, 2),
-      air_mass_flow = round(input_air_porperties["mass_flow"], 2),
-      exhaustion_gas_temperature = round(exhaustion_gas_temperature, 2),
-      exhaustion_gas_mass_flow = round(combustion_gas_properties["mass_flow"], 2),
-      thermal_charge = round(condenser_data["thermal_change"], 2),
-      saturated_water_mass_flow = round(condenser_data["saturated_water_mass_flow"], 2),
-      make_up_water_mass_flow = round(condenser_data["make_up_water_mass_flow"], 2),
-      cooling_water_mass_flow = round(condenser_data["cooling_water_mass_flow"], 2),
-      quality_exhaustion_steam_turbine = round(steam_turbine_data["low_steam_turbine_params"]["real_quality_outlet_steam"], 2),
-      high_steam_mass_flow = round(hrsg_data["mass_flows"]["high_steam"], 2),
-      medium_steam_mass_flow = round(hrsg_data["mass_flows"]["medium_steam"], 2),
-      low_steam_mass_flow = round(hrsg_data["mass_flows"]["low_steam"], 2),
-      pump_variation_pressure = round(pump_data["params_operation"]["delta_pressure"], 2),
-      net_power_gas_turbine= round(net_power_gas_turbine, 2),
-      gross_power_steam_turbine = round(generated_consumed_powers_data["gross_power_steam_turbine"], 2),
-      net_power_steam_turbine = round(generated_consumed_powers_data["net_power_steam_turbine"], 2),
-      power_consumed_pump = round(generated_consumed_powers_data["consumed_power"], 2),
-      gross_power_cycle_combined = round(cycles_performances_data["gross_power_combined_cycles"], 2),
-      net_power_cycle_combined = round(cycles_performances_data["net_power_combined_cycles"], 2),
-      gross_cycle_combined_efficiency = round(cycles_performances_data["gross_cycle_combined_efficiency"], 2),
-      net_cycle_combined_efficiency = round(cycles_performances_data["net_cycle_combined_efficiency"], 2)
+    return FullCyclesResult(
+      LHV_fuel = brayton_cycle_data["LHV_fuel"],
+      air_mass_flow = brayton_cycle_data["input_air"]["mass_flow"],
+      exhaustion_gas_temperature = brayton_cycle_data["exhaustion_temp"],
+      exhaustion_gas_mass_flow = brayton_cycle_data["combustion_gas"]["mass_flow"],
+      thermal_charge = condenser_data["thermal_change"],
+      saturated_water_mass_flow = condenser_data["saturated_water_mass_flow"],
+      make_up_water_mass_flow = condenser_data["make_up_water_mass_flow"],
+      cooling_water_mass_flow = condenser_data["cooling_water_mass_flow"],
+      quality_exhaustion_steam_turbine = steam_turbine_data["low_steam_turbine_params"]["real_quality_outlet_steam"],
+      high_steam_mass_flow = hrsg_data["mass_flows"]["high_steam"],
+      medium_steam_mass_flow = hrsg_data["mass_flows"]["medium_steam"],
+      low_steam_mass_flow = hrsg_data["mass_flows"]["low_steam"],
+      pump_variation_pressure = pump_data["params_operation"]["delta_pressure"],
+      net_power_gas_turbine= brayton_cycle_data["net_power"],
+      gross_power_steam_turbine = generated_consumed_powers_data["gross_power_steam_turbine"],
+      net_power_steam_turbine = generated_consumed_powers_data["net_power_steam_turbine"],
+      power_consumed_pump = generated_consumed_powers_data["consumed_power"],
+      gross_power_cycle_combined = cycles_performances_data["gross_power_combined_cycles"],
+      net_power_cycle_combined = cycles_performances_data["net_power_combined_cycles"],
+      gross_cycle_combined_efficiency = cycles_performances_data["gross_cycle_combined_efficiency"],
+      net_cycle_combined_efficiency = cycles_performances_data["net_cycle_combined_efficiency"]
     )
-    return result_of_cycles
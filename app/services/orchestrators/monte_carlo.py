@@ -0,0 +1,109 @@
+import numpy as np
+from ...models.input import Input
+from ...models.output import Output
+from ...models.monte_carlo import Histogram, MonteCarloResult, OutputStatistics
+from ...models.simulation_error import SimulationError
+from ..utils.streaming_statistics import Reservoir, RunningMoments, StreamingHistogram
+
+class MonteCarlo:
+  """
+  Service class of the Monte Carlo propagation of the uncertainty of Input fields to the Output fields.
+  The samples are drawn and aggregated chunk by chunk, so memory does not grow with their number:
+  moments and histograms use every successful sample, percentiles a reservoir of at most `reservoir_size` of them.
+  Each field (and the reservoir) draws from its own generator, spawned from the seed, so the samples
+  do not depend on the chunk size nor on the executor of the simulations
+  """
+  # Samples of each chunk, and successful samples kept for the percentiles
+  chunk_size = 1000
+  reservoir_size = 10000
+  # Steps of the last fuel fraction (of one unit in the last place) until the fractions sum exactly to the base total
+  fuel_balance_steps = 64
+
+  def __init__(self, request):
+    self.request = request
+    self.outputs = request.outputs or list(Output.model_fields)
+    self.fuel_fields = [field for field in Input.model_fields if field.endswith("_molar_fraction_fuel")]
+    self.base_values = request.base.model_dump()
+    self.fuel_total = sum(self.base_values[field] / 100 for field in self.fuel_fields)
+
+    seeds = np.random.SeedSequence(request.seed).spawn(len(request.distributions) + 1)
+    self.generators = [np.random.default_rng(seed) for seed in seeds[:-1]]
+    self.moments = RunningMoments(len(self.outputs))
+    self.reservoir = Reservoir(len(self.outputs), self.reservoir_size, seeds[-1])
+    self.histograms = [StreamingHistogram(request.bins) for _ in self.outputs]
+    self.failures = {}
+    self.drawn = 0
+
+  def normalized_fuel(self, point):
+    """Point with the fuel fractions rescaled to the total of the base composition (100%), the last non-null fraction
+    absorbing the rounding so that they sum exactly like the base (the composition check of the fuel is exact)"""
+    fractions = {field: point.get(field, self.base_values[field]) for field in self.fuel_fields}
+    total = sum(fractions.values())
+    if total <= 0:
+      return point
+    fractions = {field: value * 100 * self.fuel_total / total for field, value in fractions.items()}
+    # The fractions are summed in order, so the last non-null one closes the sum (the null ones after it add exactly 0)
+    fields = [field for field in self.fuel_fields if fractions[field] > 0]
+    partial = sum(fractions[field] / 100 for field in fields[:-1])
+    value = (self.fuel_total - partial) * 100
+    for _ in range(self.fuel_balance_steps):
+      error = self.fuel_total - (partial + value / 100)
+      if error == 0:
+        break
+      value = float(np.nextafter(value, np.inf if error > 0 else -np.inf))
+    fractions[fields[-1]] = value
+    return {**point, **fractions}
+
+  def sample_chunks(self, chunk_size=None):
+    """Points ({field: value}) of the samples, in lists of at most chunk_size"""
+    chunk_size = chunk_size or self.chunk_size
+    fields = [distribution.field for distribution in self.request.distributions]
+    normalize = self.request.normalize_fuel and any(field in self.fuel_fields for field in fields)
+    while self.drawn < self.request.samples:
+      size = min(chunk_size, self.request.samples - self.drawn)
+      columns = [distribution.draw(generator, size).tolist() for distribution, generator in zip(self.request.distributions, self.generators)]
+      points = [dict(zip(fields, values)) for values in zip(*columns)]
+      self.drawn += size
+      yield [self.normalized_fuel(point) for point in points] if normalize else points
+
+  def add(self, results):
+    """Aggregating the results of a chunk (Output or SimulationError of each sample)"""
+    successes = []
+    for result in results:
+      if isinstance(result, SimulationError):
+        self.failures[result.type] = self.failures.get(result.type, 0) + 1
+      else:
+        successes.append([getattr(result, output) for output in self.outputs])
+
+    values = np.array(successes, dtype=float).reshape(-1, len(self.outputs))
+    self.moments.add(values)
+    self.reservoir.add(values)
+    for column, histogram in enumerate(self.histograms):
+      histogram.add(values[:, column])
+
+  def result(self):
+    """Statistics of the aggregated samples"""
+    samples = self.moments.count + sum(self.failures.values())
+    statistics = {}
+    if self.moments.count:
+      percentiles = self.reservoir.percentiles(self.request.percentiles)
+      std = self.moments.std
+      for column, output in enumerate(self.outputs):
+        edges, counts = self.histograms[column].trimmed()
+        statistics[output] = OutputStatistics(
+          mean=self.moments.mean[column],
+          std=std[column],
+          minimum=self.moments.minimum[column],
+          maximum=self.moments.maximum[column],
+          percentiles={f"{percentile:g}": value for percentile, value in zip(self.request.percentiles, percentiles[:, column])},
+          histogram=Histogram(edges=edges.tolist(), counts=counts.tolist())
+        )
+
+    return MonteCarloResult(
+      samples=samples,
+      successes=self.moments.count,
+      failures=self.failures,
+      failure_rates={error: count / samples for error, count in self.failures.items()},
+      statistics=statistics,
+      exact_percentiles=self.moments.count <= self.reservoir_size
+    )
@@ -0,0 +1,107 @@
+import math
+from ...models.input import Input
+from ...models.output import Output
+from ...models.optimization import OptimizationResult, OptimizationStep
+from ...utils.errors import ComputationalError
+from ..utils.nelder_mead import NelderMead
+from ..utils.stage_cache import StageMemo
+from .full_cycles import FullCycles, round_results
+
+class OperatingPointOptimizer:
+  """
+  Service class of the optimization of an operating point: the variables of the request are chosen by the
+  Nelder-Mead method to maximize (or minimize) an Output field. Constraints follow the feasibility rule:
+  Nelder-Mead only compares values, so infeasible points are scored above all feasible ones, by their violation.
+  All simulations share a stage memo, so the stages that do not read the variables are computed once,
+  and repeated points (projected onto the bounds) are simulated once
+  """
+  # Score of the infeasible points, above the objective of any feasible point, before adding their violation
+  infeasible_score = 1e12
+
+  def __init__(self, request, repositories, saturation_mode=None, optimizer=None):
+    self.request = request
+    self.repositories = repositories
+    self.saturation_mode = saturation_mode
+    self.fields = [variable.field for variable in request.variables]
+    # The optimizer minimizes: maximized objectives are negated
+    self.sign = -1 if request.goal == "maximize" else 1
+    self.optimizer = optimizer or NelderMead()
+    self.stage_memo = StageMemo()
+    self.base_values = request.base.model_dump()
+    # Evaluated points: {values of the variables: (score, objective, Output, feasible)}
+    self.evaluated = {}
+
+  def simulate(self, point):
+    """Exact results of the base input with the point's values: rounded results would flatten the objective"""
+    input = Input(**{**self.base_values, **point})
+    return input, FullCycles(input, self.repositories, self.saturation_mode, self.stage_memo).create_full_cycles_combined(digits=None)
+
+  def violation(self, input, results):
+    """Sum of the relative violations of the constraints (0 when all are respected)"""
+    total = 0.0
+    for constraint in self.request.constraints:
+      source = results if constraint.field in Output.model_fields else input
+      value = getattr(source, constraint.field)
+      if constraint.minimum is not None and value < constraint.minimum:
+        total += (constraint.minimum - value) / max(abs(constraint.minimum), 1.0)
+      if constraint.maximum is not None and value > constraint.maximum:
+        total += (value - constraint.maximum) / max(abs(constraint.maximum), 1.0)
+    return total
+
+  def score(self, values):
+    """Value minimized by the optimizer at the values of the variables: inf for points that cannot be simulated"""
+    key = tuple(values)
+    if key not in self.evaluated:
+      try:
+        input, results = self.simulate(dict(zip(self.fields, values)))
+      except Exception:
+        # Points out of the physical limits (invalid inputs, failed or out of range simulations)
+        self.evaluated[key] = (math.inf, None, None, False)
+      else:
+        objective = getattr(results, self.request.objective)
+        violation = self.violation(input, results)
+        score = self.sign * objective if violation == 0 else self.infeasible_score * (1 + violation)
+        # Only the returned Output is rounded, like the responses of the simulations
+        self.evaluated[key] = (score, objective, Output(**round_results(results)._asdict()), violation == 0)
+    return self.evaluated[key][0]
+
+  def initial_values(self):
+    """Starting point: the initial values of the variables, or those of the base input, inside the bounds"""
+    return [
+      min(max(variable.initial if variable.initial is not None else self.base_values[variable.field], variable.lower), variable.upper)
+      for variable in self.request.variables
+    ]
+
+  def run(self):
+    """Executing the optimization, returning the optimal point with its results and the convergence trace"""
+    self.optimizer.maximum_evaluations = self.request.maximum_evaluations
+    self.optimizer.tolerance = self.request.tolerance
+    solution = self.optimizer.minimize(
+      self.score,
+      self.initial_values(),
+      [variable.lower for variable in self.request.variables],
+      [variable.upper for variable in self.request.variables]
+    )
+
+    _, objective, output, feasible = self.evaluated[tuple(solution["x"])]
+    if output is None:
+      raise ComputationalError("Optimization failed: no point of the variables' bounds could be simulated")
+
+    return OptimizationResult(
+      point=dict(zip(self.fields, solution["x"])),
+      objective=objective,
+      result=output,
+      feasible=feasible,
+      converged=solution["converged"],
+      evaluations=len(self.evaluated),
+      iterations=solution["iterations"],
+      trace=[
+        OptimizationStep(
+          iteration=step["iteration"],
+          evaluations=step["evaluations"],
+          objective=self.evaluated[tuple(step["x"])][1],
+          point=dict(zip(self.fields, step["x"]))
+        )
+        for step in solution["trace"]
+      ]
+    )
@@ -9,64 +9,118 @@ from ..equipments.medium_steam_turbine import MediumSteamTurbine
 from ..equipments.low_steam_turbine import LowSteamTurbine
 from ..equipments.condenser import Condenser
 from ..equipments.pump import Pump
-from ..utils.secant_method import SecantMethod
+from ..utils.newton_method import NewtonMethod
 from app.utils.errors import ThermodynamicError
+from app.services.utils.arrays import raise_for_invalid_elements
+from app.core.metrics import timed_stage
+from app.core.profiler import profile_span
 
 class RankineCycle:
   """Service class of all methods and calculations related to Rankine's cycle"""
-  def __init__(self, input, substance_repo, icph_repo, heat_suplier_cycle):
+  # Named stages of the calculation, as (method, stages it depends on), in order of execution.
+  # Each stage is computed once per run and its result is cached on the run context.
+  # "brayton" is not a stage: it is the heat suplier cycle given to the run. With a stage memo, the stages depending on it
+  # are keyed on the fields of the Brayton cycle memoized under that name (by FullCycles), and are not memoized otherwise
+  STAGES = {
+    "pump": ("_pump_stage", ()),
+    "high_steam_turbine": ("_high_steam_turbine_stage", ()),
+    "medium_steam_turbine": ("_medium_steam_turbine_stage", ()),
+    "hrsg_heat": ("_hrsg_heat_stage", ("brayton",)),
+    "hrsg_params": ("_hrsg_params_stage", ("high_steam_turbine", "pump")),
+    "hrsg_flows": ("_hrsg_flows_stage", ("hrsg_params", "hrsg_heat")),
+    "hrsg": ("_hrsg_stage", ("hrsg_heat", "hrsg_params", "hrsg_flows")),
+    "low_steam_turbine": ("_low_steam_turbine_stage", ("medium_steam_turbine", "hrsg")),
+    "steam_turbine": ("_steam_turbine_stage", ("high_steam_turbine", "medium_steam_turbine", "low_steam_turbine")),
+    "condenser": ("_condenser_stage", ("steam_turbine", "hrsg")),
+    "powers": ("_powers_stage", ("steam_turbine", "pump", "hrsg", "condenser")),
+  }
+
+  def __init__(self, input, substance_repo, icph_repo, heat_suplier_cycle, saturation_parameters=None, stage_memo=None):
     self.input = input
     self.substance_repo = substance_repo
     self.icph_repo = icph_repo
     self.heat_suplier_cycle = heat_suplier_cycle
-    self.enthalpy = Enthalpy()
-    self.entropy = Entropy()
-    self.specific_volume = SpecificVolume()
+    # A single saturation service (and its mode) shared by all steam properties
+    self.saturation_parameters = saturation_parameters or SaturationParameters()
+    self.enthalpy = Enthalpy(self.saturation_parameters)
+    self.entropy = Entropy(self.saturation_parameters)
+    self.specific_volume = SpecificVolume(self.saturation_parameters)
     self.icph = ICPH()
     self.hrsg = HRSG()
-    self.saturation_parameters = SaturationParameters()
     self.high_steam_turbine = HighSteamTurbine()
     self.medium_steam_turbine = MediumSteamTurbine()
     self.low_steam_turbine = LowSteamTurbine()
     self.pump = Pump()
     self.condenser = Condenser()
-    self.secant_method = SecantMethod()
+    self.root_finder = NewtonMethod()
+    # Results of the stages already computed in the current run, and the optional memo shared with runs of other inputs
+    self.context = {}
+    self.stage_memo = stage_memo
+
+  def stage(self, name):
+    """Result of the named stage, computing it (and its dependencies) only on first request of the run.
+    With a stage memo, the result is also reused from the runs of other inputs that agree on the fields the stage reads"""
+    if name not in self.context:
+      method, dependencies = self.STAGES[name]
+      dependencies_results = [self.stage(dependency) for dependency in dependencies]
+      # Span of the stage in the call tree of profiled simulations (a no-op otherwise)
+      with profile_span(f"rankine_cycle.{name}"):
+        if self.stage_memo is None:
+          self.context[name] = getattr(self, method)(*dependencies_results)
+        else:
+          compute = lambda input: self._traced_stage(input, method, dependencies_results)
+          self.context[name] = self.stage_memo.run(name, self.input, compute, dependencies)
+    return self.context[name]
+
+  def _traced_stage(self, input, method, dependencies_results):
+    """Computing a stage with the input replaced by its tracer"""
+    original_input = self.input
+    self.input = input
+    try:
+      return getattr(self, method)(*dependencies_results)
+    finally:
+      self.input = original_input
 
-  def hrsg_and_steam_turbine(self):
-    """Calculation of operation params of HRSG and All levels of Steam Turbine"""
-    # Due to the high coupling of logic between these two cycle equipment, their calculations are made in a single object.
-    # Getting first operation conditions of high and medium steam turbine, so we can get all data of HRSG
-    high_steam_turbine_params = self.high_steam_turbine.get_params_operation(self.input, self.saturation_parameters, self.entropy, self.enthalpy, self.secant_method)
-    medium_steam_turbine_params = self.medium_steam_turbine.get_params_operation(self.input, self.saturation_parameters, self.entropy, self.enthalpy, self.secant_method)
-
-    # Calculating operation conditions and properties of HRSG
-    heat_suplied_hrsg = self.hrsg.heat_supplied_calc(self.input, self.heat_suplier_cycle["combustion_gas"], self.heat_suplier_cycle["exhaustion_temp"], self.icph)
-    hrsg_params = self.hrsg.get_params_operation(self.input, self.saturation_parameters, self.enthalpy, high_steam_turbine_params, self.pump_calc()["params_operation"])
-    hrsg_mass_flows = self.hrsg.get_mass_flow(self.input, hrsg_params, heat_suplied_hrsg)
-    hrsg_data = {
+  def _pump_stage(self):
+    return self.pump.get_params_operation(self.input, self.enthalpy, self.specific_volume)
+
+  def _high_steam_turbine_stage(self):
+    return self.high_steam_turbine.get_params_operation(self.input, self.saturation_parameters, self.entropy, self.enthalpy, self.root_finder)
+
+  def _medium_steam_turbine_stage(self):
+    return self.medium_steam_turbine.get_params_operation(self.input, self.saturation_parameters, self.entropy, self.enthalpy, self.root_finder)
+
+  def _hrsg_heat_stage(self, brayton_cycle_data):
+    return self.hrsg.heat_supplied_calc(self.input, brayton_cycle_data["combustion_gas"], brayton_cycle_data["exhaustion_temp"], self.icph)
+
+  def _hrsg_params_stage(self, high_steam_turbine_params, pump_params):
+    return self.hrsg.get_params_operation(self.input, self.saturation_parameters, self.enthalpy, high_steam_turbine_params, pump_params)
+
+  def _hrsg_flows_stage(self, hrsg_params, heat_suplied_hrsg):
+    return self.hrsg.get_mass_flow(self.input, hrsg_params, heat_suplied_hrsg)
+
+  def _hrsg_stage(self, heat_suplied_hrsg, hrsg_params, hrsg_mass_flows):
+    return {
       "heat_suplied_hrsg": heat_suplied_hrsg,
       "params": hrsg_params,
       "mass_flows": hrsg_mass_flows
     }
 
-    # Calculation of low steam turbine
-    low_steam_turbine_params = self.low_steam_turbine.get_params_operation(self.input, self.saturation_parameters, self.entropy, self.enthalpy, medium_steam_turbine_params, hrsg_data, self.secant_method)
+  def _low_steam_turbine_stage(self, medium_steam_turbine_params, hrsg_data):
+    return self.low_steam_turbine.get_params_operation(self.input, self.saturation_parameters, self.entropy, self.enthalpy, medium_steam_turbine_params, hrsg_data, self.root_finder)
 
-    # Organizing steam turbine data
-    steam_turbine_data = {
+  def _steam_turbine_stage(self, high_steam_turbine_params, medium_steam_turbine_params, low_steam_turbine_params):
+    return {
       "high_steam_turbine_params": high_steam_turbine_params,
       "medium_steam_turbine_params": medium_steam_turbine_params,
       "low_steam_turbine_params": low_steam_turbine_params
     }
 
-    return {
+  def _condenser_stage(self, steam_turbine_data, hrsg_data):
+    params_operation = self.condenser.get_params_operation(self.input, self.substance_repo, self.enthalpy, {
       "hrsg_data": hrsg_data,
       "steam_turbine_data": steam_turbine_data
-    }
-
-  def condenser_calc(self):
-    """Calculation of operation params of Condenser"""
-    params_operation = self.condenser.get_params_operation(self.input, self.substance_repo, self.enthalpy, self.hrsg_and_steam_turbine())
+    })
     chimney_temperature = self.input.chimney_gas_temperature
     condenser_operation_temperature = self.saturation_parameters.saturation_temperature(self.input.condenser_operation_pressure)
     # Checks if the chimney temperature is less than the operating temperature of the condenser
@@ -75,11 +129,25 @@ class RankineCycle:
 
     return params_operation
 
+  def _powers_stage(self, steam_turbine_data, pump_params, hrsg_data, condenser_data):
+    return self.generated_consumed_powers_calc(steam_turbine_data, {"params_operation": pump_params}, hrsg_data, condenser_data)
+
+  def hrsg_and_steam_turbine(self):
+    """Calculation of operation params of HRSG and All levels of Steam Turbine"""
+    # Due to the high coupling of logic between these two cycle equipment, their calculations are made in a single object.
+    return {
+      "hrsg_data": self.stage("hrsg"),
+      "steam_turbine_data": self.stage("steam_turbine")
+    }
+
+  def condenser_calc(self):
+    """Calculation of operation params of Condenser"""
+    return self.stage("condenser")
+
   def pump_calc(self):
     """Calculation of operation params of Pump"""
-    params_operation = self.pump.get_params_operation(self.input, self.enthalpy, self.specific_volume)
     return {
-      "params_operation": params_operation
+      "params_operation": self.stage("pump")
     }
 
   def generated_consumed_powers_calc(self, steam_turbine_data, pump_data, hrsg_data, condenser_data):
@@ -105,25 +173,57 @@ class RankineCycle:
       "consumed_power": consumed_power
     }
 
+  @timed_stage("rankine_cycle")
   def run(self):
-    """Executing all logic sequence of calculation of Rankine Cycle"""
-    # Getting HRSG and Steam Turbine data
-    hrsg_data = self.hrsg_and_steam_turbine()["hrsg_data"]
-    steam_turbine_data = self.hrsg_and_steam_turbine()["steam_turbine_data"]
+    """Executing all logic sequence of calculation of Rankine Cycle, each stage exactly once"""
+    self.context = {"brayton": self.heat_suplier_cycle}
+    for name in self.STAGES:
+      self.stage(name)
 
-    # Getting Pump data
-    pump_data = self.pump_calc()
+    return {
+      "hrsg_data": self.context["hrsg"],
+      "steam_turbine_data": self.context["steam_turbine"],
+      "pump_data": {"params_operation": self.context["pump"]},
+      "condenser_data": self.context["condenser"],
+      "generated_consumed_powers_data": self.context["powers"],
+    }
 
-    # Getting Condenser data
-    condenser_data = self.condenser_calc()
+  def run_array(self):
+    """Batch mode of run, with an InputColumns of many operating points: each stage computes all points at once"""
+    brayton_cycle_data = self.heat_suplier_cycle
+    pump_params = self.pump.get_params_operation_array(self.input, self.enthalpy, self.specific_volume)
+    high_steam_turbine_params = self.high_steam_turbine.get_params_operation_array(self.input, self.saturation_parameters, self.entropy, self.enthalpy, self.root_finder)
+    medium_steam_turbine_params = self.medium_steam_turbine.get_params_operation_array(self.input, self.saturation_parameters, self.entropy, self.enthalpy, self.root_finder)
+
+    # HRSG, with the ICPH params of the combustion gases stacked for the array kernels
+    combustion_gas = {**brayton_cycle_data["combustion_gas"], "icph_params": self.icph.stack_param_columns(brayton_cycle_data["combustion_gas"]["icph_params"])}
+    heat_suplied_hrsg = self.hrsg.heat_supplied_calc_array(self.input, combustion_gas, brayton_cycle_data["exhaustion_temp"], self.icph)
+    hrsg_params = self.hrsg.get_params_operation_array(self.input, self.saturation_parameters, self.enthalpy, high_steam_turbine_params, pump_params)
+    hrsg_data = {
+      "heat_suplied_hrsg": heat_suplied_hrsg,
+      "params": hrsg_params,
+      "mass_flows": self.hrsg.get_mass_flow_array(self.input, hrsg_params, heat_suplied_hrsg)
+    }
 
-    # Getting generated and consumed powers
-    generated_consumed_powers_data = self.generated_consumed_powers_calc(steam_turbine_data, pump_data, hrsg_data, condenser_data)
+    low_steam_turbine_params = self.low_steam_turbine.get_params_operation_array(self.input, self.saturation_parameters, self.entropy, self.enthalpy, medium_steam_turbine_params, hrsg_data, self.root_finder)
+    steam_turbine_data = self._steam_turbine_stage(high_steam_turbine_params, medium_steam_turbine_params, low_steam_turbine_params)
+
+    condenser_data = self.condenser.get_params_operation_array(self.input, self.substance_repo, self.enthalpy, {
+      "hrsg_data": hrsg_data,
+      "steam_turbine_data": steam_turbine_data
+    })
+    # Checks if the chimney temperature is less than the operating temperature of the condenser
+    condenser_operation_temperature = self.saturation_parameters.saturation_temperature_array(self.input.condenser_operation_pressure)
+    raise_for_invalid_elements(
+      self.input.chimney_gas_temperature <= condenser_operation_temperature,
+      "The chimney temperature is less than the operating condenser temperature. This is impossible for the thermodynamic laws. Correct these temperatures.",
+      ThermodynamicError
+    )
 
     return {
       "hrsg_data": hrsg_data,
       "steam_turbine_data": steam_turbine_data,
-      "pump_data": pump_data,
+      "pump_data": {"params_operation": pump_params},
       "condenser_data": condenser_data,
-      "generated_consumed_powers_data": generated_consumed_powers_data,
+      "generated_consumed_powers_data": self.generated_consumed_powers_calc(steam_turbine_data, {"params_operation": pump_params}, hrsg_data, condenser_data),
     }
@@ -0,0 +1,77 @@
+from pydantic import ValidationError
+from ...models.input import Input
+from ...models.output import Output
+from ...models.sensitivity import SensitivityResult
+from ...utils.errors import LogicConstraintError
+from ..utils.stage_cache import StageMemo
+from .full_cycles import FullCycles, round_results
+
+class SensitivityAnalysis:
+  """
+  Service class of the sensitivity of the Output fields to some Input fields, by finite differences at the base input.
+  All perturbed simulations run as one batch sharing a stage memo with the base simulation, so each one only
+  recomputes the stages that read its perturbed field. The differences use the exact (unrounded) results
+  """
+
+  def __init__(self, request, repositories, saturation_mode=None):
+    self.request = request
+    self.repositories = repositories
+    self.saturation_mode = saturation_mode
+    self.outputs = request.outputs or list(Output.model_fields)
+    self.stage_memo = StageMemo()
+    self.evaluations = 0
+
+  def simulate(self, input):
+    """Exact results of the input"""
+    self.evaluations += 1
+    return FullCycles(input, self.repositories, self.saturation_mode, self.stage_memo).create_full_cycles_combined(digits=None)
+
+  def perturbed_input(self, base_values, field, value):
+    """Base input with the field perturbed, or None when the value is out of the limits of the field"""
+    try:
+      return Input(**{**base_values, field: value})
+    except ValidationError:
+      return None
+
+  def derivatives(self, base_values, base_results, field):
+    """Step, scheme and derivatives of the outputs with respect to the field: central, or one-sided next to its limits"""
+    value = base_values[field]
+    step = self.request.relative_step * abs(value) if value != 0 else self.request.relative_step
+    forward = self.perturbed_input(base_values, field, value + step)
+    backward = self.perturbed_input(base_values, field, value - step)
+
+    if forward is not None and backward is not None:
+      scheme, upper, lower, width = "central", self.simulate(forward), self.simulate(backward), 2 * step
+    elif forward is not None:
+      scheme, upper, lower, width = "forward", self.simulate(forward), base_results, step
+    elif backward is not None:
+      scheme, upper, lower, width = "backward", base_results, self.simulate(backward), step
+    else:
+      raise LogicConstraintError(f"No valid step of {field} around {value}: reduce the relative step")
+
+    return step, scheme, {output: (getattr(upper, output) - getattr(lower, output)) / width for output in self.outputs}
+
+  def run(self):
+    """Executing the analysis, returning the Jacobian and the elasticities at the base input"""
+    base_values = self.request.base.model_dump()
+    base_results = self.simulate(self.request.base)
+
+    jacobian = {output: {} for output in self.outputs}
+    elasticities = {output: {} for output in self.outputs}
+    steps = {}
+    schemes = {}
+    for field in self.request.fields:
+      steps[field], schemes[field], derivatives = self.derivatives(base_values, base_results, field)
+      for output, derivative in derivatives.items():
+        base_output = getattr(base_results, output)
+        jacobian[output][field] = derivative
+        elasticities[output][field] = derivative * base_values[field] / base_output if base_values[field] != 0 and base_output != 0 else None
+
+    return SensitivityResult(
+      base=Output(**round_results(base_results)._asdict()),
+      jacobian=jacobian,
+      elasticities=elasticities,
+      steps=steps,
+      schemes=schemes,
+      evaluations=self.evaluations
+    )
@@ -0,0 +1,31 @@
+import hashlib
+import json
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.repositories.component_catalog import component_catalog_version
+from app.utils.lru_cache import LRUCache
+
+# Process-wide cache of whole simulation results (FullCyclesResult), with TTL and LRU eviction
+simulation_cache = LRUCache(settings.SIMULATION_CACHE_SIZE, ttl=settings.SIMULATION_CACHE_TTL)
+metrics.register_cache("simulation", simulation_cache)
+
+
+def canonical_input(input):
+  """
+  Canonical JSON of the Input: keys sorted, no whitespace and floats normalized (-0.0 as 0.0),
+  so equal inputs always produce the same text
+  """
+  values = {
+    name: value + 0.0 if isinstance(value, float) else value
+    for name, value in input.model_dump().items()
+  }
+  return json.dumps(values, sort_keys=True, separators=(",", ":"))
+
+
+def simulation_cache_key(input, saturation_mode):
+  """
+  Key of a simulation: SHA-256 of the canonical Input, with the saturation mode and the component catalog version.
+  Results of a previous catalog version are never served: their keys just age out of the cache
+  """
+  digest = hashlib.sha256(canonical_input(input).encode()).hexdigest()
+  return (digest, saturation_mode, component_catalog_version())
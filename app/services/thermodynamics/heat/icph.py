@@ -1,9 +1,28 @@
+import numpy as np
 from app.utils.errors import DataValidationError
+from app.services.utils.arrays import as_float_array, raise_for_invalid_elements
+from app.core.profiler import record_property
+
+# Order of the coefficients of the stacked ICPH params
+ICPH_PARAM_NAMES = ("param_A", "param_B", "param_C", "param_D")
+
+def icph_heat(R, A, B, C, D, molar_mass, temp_in, temp_out):
+  """ICPH equation: sensible heat in kJ/kg between temperatures in °C (scalars or arrays, broadcast together)"""
+  temp_in = temp_in + 273.15
+  temp_out = temp_out + 273.15
+  tau = temp_out / temp_in
+  return (R/molar_mass) * ((A*temp_in*(tau - 1)) + ((B/2)*(temp_in**2)*((tau**2)-1)) + ((C/3)*(temp_in**3)*((tau**3)-1)) + ((D/temp_in)*((tau-1)/tau)))
+
+def icph_heat_derivative(R, A, B, C, D, molar_mass, temp_out):
+  """Derivative of the ICPH equation with the outlet temperature in °C: the specific heat in kJ/(kg*K) at that temperature"""
+  temp_out = temp_out + 273.15
+  return (R/molar_mass) * (A + B*temp_out + C*(temp_out**2) + D/(temp_out**2))
 
 class ICPH:
   """
   Computational routine called ICPH to calculate sensible
   heat of a flow (fuel, air or combustion gas) in kJ/kg.
+  icph_calc_heat_array is the batch mode, over stacked params of many mixtures and temperatures
   """
   def __init__(self):
         # Universal Gas Constant in J/(mol.K)
@@ -14,14 +33,39 @@ class ICPH:
     B = icph_params["param_B"]
     C = icph_params["param_C"]
     D = icph_params["param_D"]
-    temp_in = temp_in + 273.15
-    temp_out = temp_out + 273.15
-    tau = temp_out / temp_in
 
     # Validate molar mass value
     if (molar_mass <= 0):
       raise DataValidationError(f"Molar mass invalid: molar_mass = {molar_mass}")
 
-    heat = (self.R/molar_mass) * ((A*temp_in*(tau - 1)) + ((B/2)*(temp_in**2)*((tau**2)-1)) + ((C/3)*(temp_in**3)*((tau**3)-1)) + ((D/temp_in)*((tau-1)/tau)))
+    record_property("ICPH.icph_calc_heat")
+    heat = icph_heat(self.R, A, B, C, D, molar_mass, temp_in, temp_out)
 
     return heat
+
+  @staticmethod
+  def stack_params(icph_params_list):
+    """Stacking the ICPH params dicts of many mixtures into an array of shape (mixtures, 4), columns A, B, C and D"""
+    return np.array([[icph_params[name] for name in ICPH_PARAM_NAMES] for icph_params in icph_params_list], dtype=float).reshape(-1, 4)
+
+  @staticmethod
+  def stack_param_columns(icph_params):
+    """Stacking a params dict whose values are arrays (one element per mixture, like the params of a batch) like stack_params"""
+    return np.stack(np.broadcast_arrays(*(as_float_array(icph_params[name]) for name in ICPH_PARAM_NAMES)), axis=-1)
+
+  @staticmethod
+  def mixture_params_array(fractions, substance_params):
+    """ICPH params of mixtures, weighting the params of their substances by their molar fractions:
+    fractions of shape (mixtures, substances) and substance params of shape (substances, 4), stacked like stack_params"""
+    return as_float_array(fractions) @ as_float_array(substance_params)
+
+  def icph_calc_heat_array(self, icph_params, molar_mass, temp_in, temp_out):
+    """Calculate heats in kJ/kg of many mixtures and temperatures in one expression: stacked params of shape (..., 4)
+    (columns A, B, C and D) and arrays of molar masses and temperatures in °C, all broadcast together"""
+    A, B, C, D = np.moveaxis(as_float_array(icph_params), -1, 0)
+    molar_mass = as_float_array(molar_mass)
+
+    # Validate molar mass values
+    raise_for_invalid_elements(molar_mass <= 0, "Molar mass invalid")
+
+    return icph_heat(self.R, A, B, C, D, molar_mass, as_float_array(temp_in), as_float_array(temp_out))
@@ -1,12 +1,79 @@
 import math
-from app.services.thermodynamics.steam.saturation_parameters import SaturationParameters
+import numpy as np
+from app.services.thermodynamics.steam.saturation_parameters import (
+  SaturationParameters,
+  SATURATION_TEMPERATURE_LIMITS,
+  saturated_liquid_range,
+  saturated_liquid_ranges,
+  invalid_saturation_temperatures
+)
+from app.services.utils.arrays import as_float_array, raise_for_invalid_elements
+from app.services.thermodynamics.steam.property_cache import cached_steam_property
 from app.utils.errors import DataValidationError
 
+# Coefficients (critical_point_enthalpy, A, B, C, D, E1, ..., E7) of the saturated liquid enthalpy,
+# for each range of saturation temperature: [273.16, 300), [300, 600) and [600, 647.3] Kelvin
+SATURATED_LIQUID_COEFFICIENTS = (
+  (2099.3, 0, 0, 0, 0, 624.698837, -2343.85369, -9508.12101, 71628.7928, -163535.221, 166531.093, -64785.4585),
+  (2099.3, 0.8839230108, 0, 0, 0, -2.67172935, 6.22640035, -13.1789573, -1.91322436, 68.7937653, -124.819906, 72.1435404),
+  (2099.3, 1, -0.441057805, -5.52255517, 6.43994847, -1.164578795, -1.30574143, 0, 0, 0, 0, 0),
+)
+
+# Coefficients (critical_point_enthalpy, A, B, C, D, E1, ..., E7) of the saturated steam enthalpy
+SATURATED_STEAM_COEFFICIENTS = (2099.3, 1, 0.457874342, 5.08441288, -1.48513244, -4.81351884, 2.69411792, -7.39064542, 10.4961689, -5.46840036, 0, 0)
+
+
+# Exponential decay constant of the overheated steam enthalpy correlation
+OVERHEATED_STEAM_M = 45
+
+def overheated_steam_enthalpy_terms(pressure, saturation_temperature):
+  """Coefficients (A0, A1, A2, A3) of the overheated steam enthalpy correlation, with pressure in MPa and saturation temperature in Kelvin"""
+  B11 = 2041.21
+  B12 = -40.40021
+  B13 = -0.48095
+  B21 = 1.610693
+  B22 = 0.05472051
+  B23 = 0.0007517537
+  B31 = 0.0003383117
+  B32 = -0.00001975736
+  B33 = -0.000000287409
+  B41 = 1707.82
+  B42 = -16.99419
+  B43 = 0.062746295
+  B44 = -0.00010284259
+  B45 = 0.000000064561298
+
+  A0 = B11 + B12 * pressure + B13 * (pressure ** 2)
+  A1 = B21 + B22 * pressure + B23 * (pressure ** 2)
+  A2 = B31 + B32 * pressure + B33 * (pressure ** 2)
+  A3 = B41 + B42 * saturation_temperature + B43 * (saturation_temperature ** 2) + B44 * (saturation_temperature ** 3) + B45 * (saturation_temperature ** 4)
+  return A0, A1, A2, A3
+
+def overheated_steam_enthalpy(pressure, temperature, saturation_temperature, exp=math.exp):
+  """Correlation of enthalpy of overheated steam in kJ/kg, with pressure in MPa and temperatures in Kelvin.
+  With exp=np.exp it evaluates arrays of states"""
+  M = OVERHEATED_STEAM_M
+  A0, A1, A2, A3 = overheated_steam_enthalpy_terms(pressure, saturation_temperature)
+
+  result = (A0 + A1 * temperature + A2 * (temperature ** 2)) - (A3 * exp((saturation_temperature - temperature) / M))
+  return result
+
+def overheated_steam_enthalpy_derivative(pressure, temperature, saturation_temperature, exp=math.exp):
+  """Exact derivative dh/dT of the overheated steam enthalpy correlation in kJ/(kg*K), same units of overheated_steam_enthalpy"""
+  M = OVERHEATED_STEAM_M
+  A0, A1, A2, A3 = overheated_steam_enthalpy_terms(pressure, saturation_temperature)
+
+  result = A1 + 2 * A2 * temperature + (A3 / M) * exp((saturation_temperature - temperature) / M)
+  return result
+
+
 class Enthalpy:
-  """Service class to calculate enthalpy properties of steam"""
+  """Service class to calculate enthalpy properties of steam.
+  The *_array methods accept NumPy arrays and evaluate all elements at once"""
   def __init__(self, saturation_params=None):
     self.saturation_params = saturation_params or SaturationParameters()
 
+  @cached_steam_property
   def saturated_liquid(self, pressure):
     """Calculate enthalpy of saturated liquid in kJ/kg"""
     saturation_temperature = self.saturation_params.saturation_temperature(pressure)
@@ -14,64 +81,25 @@ class Enthalpy:
     # Converting saturation temperature to Kelvin
     saturation_temperature += 273.15
 
-    critical_point_enthalpy = 0
-    A = 0
-    B = 0
-    C = 0
-    D = 0
-    E1 = 0
-    E2 = 0
-    E3 = 0
-    E4 = 0
-    E5 = 0
-    E6 = 0
-    E7 = 0
-
-    if 273.16 <= saturation_temperature and saturation_temperature < 300:
-      critical_point_enthalpy = 2099.3
-      A = 0
-      B = 0
-      C = 0
-      D = 0
-      E1 = 624.698837
-      E2 = -2343.85369
-      E3 = -9508.12101
-      E4 = 71628.7928
-      E5 = -163535.221
-      E6 = 166531.093
-      E7 = -64785.4585
-    if 300 <= saturation_temperature and saturation_temperature < 600:
-      critical_point_enthalpy = 2099.3
-      A = 0.8839230108
-      B = 0
-      C = 0
-      D = 0
-      E1 = -2.67172935
-      E2 = 6.22640035
-      E3 = -13.1789573
-      E4 = -1.91322436
-      E5 = 68.7937653
-      E6 = -124.819906
-      E7 = 72.1435404
-    if 600 <= saturation_temperature and saturation_temperature <= 647.3:
-      critical_point_enthalpy = 2099.3
-      A = 1
-      B = -0.441057805
-      C = -5.52255517
-      D = 6.43994847
-      E1 = -1.164578795
-      E2 = -1.30574143
-      E3 = 0
-      E4 = 0
-      E5 = 0
-      E6 = 0
-      E7 = 0
-    if saturation_temperature < 273.16 or saturation_temperature > 647.3:
+    if saturation_temperature < SATURATION_TEMPERATURE_LIMITS[0] or saturation_temperature > SATURATION_TEMPERATURE_LIMITS[1]:
       raise DataValidationError(f"Pressure invalid: out of the range")
+    critical_point_enthalpy, *coefficients = SATURATED_LIQUID_COEFFICIENTS[saturated_liquid_range(saturation_temperature)]
+
+    result = self.saturation_params.saturation_factor(saturation_temperature, *coefficients) * critical_point_enthalpy
+    return result
 
-    result = self.saturation_params.saturation_factor(saturation_temperature, A, B, C, D, E1, E2, E3, E4, E5, E6, E7) * critical_point_enthalpy
+  def saturated_liquid_array(self, pressure):
+    """Calculate enthalpies of saturated liquid in kJ/kg for an array of pressures"""
+    saturation_temperature = self.saturation_params.saturation_temperature_array(pressure) + 273.15
+    raise_for_invalid_elements(invalid_saturation_temperatures(saturation_temperature), "Pressure invalid: out of the range")
+
+    coefficients = np.asarray(SATURATED_LIQUID_COEFFICIENTS)[saturated_liquid_ranges(saturation_temperature)]
+    critical_point_enthalpy, *coefficients = np.moveaxis(coefficients, -1, 0)
+
+    result = self.saturation_params.saturation_factor(saturation_temperature, *coefficients) * critical_point_enthalpy
     return result
 
+  @cached_steam_property
   def saturated_steam(self, pressure):
     """Calculate enthalpy of saturated steam in kJ/kg"""
     saturation_temperature = self.saturation_params.saturation_temperature(pressure)
@@ -79,25 +107,23 @@ class Enthalpy:
     # Converting saturation temperature to Kelvin
     saturation_temperature += 273.15
 
-    critical_point_enthalpy = 2099.3
-    A = 1
-    B = 0.457874342
-    C = 5.08441288
-    D = -1.48513244
-    E1 = -4.81351884
-    E2 = 2.69411792
-    E3 = -7.39064542
-    E4 = 10.4961689
-    E5 = -5.46840036
-    E6 = 0
-    E7 = 0
-
-    if saturation_temperature < 273.16 or saturation_temperature > 647.3:
+    if saturation_temperature < SATURATION_TEMPERATURE_LIMITS[0] or saturation_temperature > SATURATION_TEMPERATURE_LIMITS[1]:
       raise DataValidationError(f"Pressure invalid: out of the range")
+    critical_point_enthalpy, *coefficients = SATURATED_STEAM_COEFFICIENTS
 
-    result = self.saturation_params.saturation_factor(saturation_temperature, A, B, C, D, E1, E2, E3, E4, E5, E6, E7) * critical_point_enthalpy
+    result = self.saturation_params.saturation_factor(saturation_temperature, *coefficients) * critical_point_enthalpy
     return result
 
+  def saturated_steam_array(self, pressure):
+    """Calculate enthalpies of saturated steam in kJ/kg for an array of pressures"""
+    saturation_temperature = self.saturation_params.saturation_temperature_array(pressure) + 273.15
+    raise_for_invalid_elements(invalid_saturation_temperatures(saturation_temperature), "Pressure invalid: out of the range")
+    critical_point_enthalpy, *coefficients = SATURATED_STEAM_COEFFICIENTS
+
+    result = self.saturation_params.saturation_factor(saturation_temperature, *coefficients) * critical_point_enthalpy
+    return result
+
+  @cached_steam_property
   def overheated_steam(self, pressure, temperature):
     """Calculate enthalpy of overheated steam in kJ/kg"""
     try:
@@ -105,33 +131,25 @@ class Enthalpy:
     except DataValidationError as e:
       raise e
 
-    # Converting temperatures in Kelvin
-    temperature += 273.15
-    saturation_temperature += 273.15
-    # Converting pressure in MegaPascal after calculating saturation_temperature
-    pressure = pressure/10
-
-    M = 45
-    B11 = 2041.21
-    B12 = -40.40021
-    B13 = -0.48095
-    B21 = 1.610693
-    B22 = 0.05472051
-    B23 = 0.0007517537
-    B31 = 0.0003383117
-    B32 = -0.00001975736
-    B33 = -0.000000287409
-    B41 = 1707.82
-    B42 = -16.99419
-    B43 = 0.062746295
-    B44 = -0.00010284259
-    B45 = 0.000000064561298
-
-    A0 = B11 + B12 * pressure + B13 * (pressure ** 2)
-    A1 = B21 + B22 * pressure + B23 * (pressure ** 2)
-    A2 = B31 + B32 * pressure + B33 * (pressure ** 2)
-    A3 = B41 + B42 * saturation_temperature + B43 * (saturation_temperature ** 2) + B44 * (saturation_temperature ** 3) + B45 * (saturation_temperature ** 4)
-
-    result = (A0 + A1 * temperature + A2 * (temperature ** 2)) - (A3 * math.exp((saturation_temperature - temperature) / M))
+    # Converting temperatures in Kelvin and pressure in MegaPascal (after calculating saturation_temperature)
+    return overheated_steam_enthalpy(pressure / 10, temperature + 273.15, saturation_temperature + 273.15)
 
-    return result
+  def overheated_steam_array(self, pressure, temperature):
+    """Calculate enthalpies of overheated steam in kJ/kg for arrays of pressures and temperatures (broadcast together)"""
+    pressure, temperature = np.broadcast_arrays(as_float_array(pressure), as_float_array(temperature))
+    saturation_temperature = self.saturation_params.saturation_temperature_array(pressure)
+
+    # Converting temperatures in Kelvin and pressure in MegaPascal (after calculating saturation_temperature)
+    return overheated_steam_enthalpy(pressure / 10, temperature + 273.15, saturation_temperature + 273.15, exp=np.exp)
+
+  @cached_steam_property
+  def overheated_steam_derivative(self, pressure, temperature):
+    """Calculate the derivative of the enthalpy of overheated steam with temperature, in kJ/(kg*K)"""
+    saturation_temperature = self.saturation_params.saturation_temperature(pressure)
+    return overheated_steam_enthalpy_derivative(pressure / 10, temperature + 273.15, saturation_temperature + 273.15)
+
+  def overheated_steam_derivative_array(self, pressure, temperature):
+    """Calculate the derivatives of the enthalpy of overheated steam with temperature in kJ/(kg*K), for arrays of states"""
+    pressure, temperature = np.broadcast_arrays(as_float_array(pressure), as_float_array(temperature))
+    saturation_temperature = self.saturation_params.saturation_temperature_array(pressure)
+    return overheated_steam_enthalpy_derivative(pressure / 10, temperature + 273.15, saturation_temperature + 273.15, exp=np.exp)
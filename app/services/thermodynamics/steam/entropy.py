@@ -1,12 +1,70 @@
 import math
-from app.services.thermodynamics.steam.saturation_parameters import SaturationParameters
+import numpy as np
+from app.services.thermodynamics.steam.saturation_parameters import (
+  SaturationParameters,
+  SATURATION_TEMPERATURE_LIMITS,
+  saturated_liquid_range,
+  saturated_liquid_ranges,
+  invalid_saturation_temperatures
+)
+from app.services.utils.arrays import as_float_array, raise_for_invalid_elements
+from app.services.thermodynamics.steam.property_cache import cached_steam_property
 from app.utils.errors import DataValidationError
 
+# Coefficients (critical_point_entropy, A, B, C, D, E1, ..., E7) of the saturated liquid entropy,
+# for each range of saturation temperature: [273.16, 300), [300, 600) and [600, 647.3] Kelvin
+SATURATED_LIQUID_COEFFICIENTS = (
+  (4.4289, 0, 0, 0, 0, -1836.92956, 14706.6352, -43146.6046, 48606.6733, 7997.5096, -58333.9887, 33140.0718),
+  (4.4289, 0.912762917, 0, 0, 0, -1.75702956, 1.68754095, 5.82215341, -63.3354786, 188.076546, -252.344531, 128.058531),
+  (4.4289, 1, -0.32481765, -2.990556709, 3.23419, -0.678067859, -1.91910364, 0, 0, 0, 0, 0),
+)
+
+# Coefficients (critical_point_entropy, A, B, C, D, E1, ..., E7) of the saturated steam entropy
+SATURATED_STEAM_COEFFICIENTS = (4.4289, 1, 0.377391, -2.78368, 6.93135, -4.34839, 1.34672, 1.75261, -6.22295, 9.99004, 0, 0)
+
+
+# Exponential decay constant of the overheated steam entropy correlation
+OVERHEATED_STEAM_M = 85
+
+# Coefficients of the overheated steam entropy correlation
+OVERHEATED_STEAM_A = (4.6162961, 0.01039008, -0.000009873085, 0.00000000543411, -1.170465E-12)
+OVERHEATED_STEAM_B = (-0.4650306, 0.001)
+OVERHEATED_STEAM_C = (1.777804, -0.01802468, 0.00006854459, -0.0000001184424, 8.142201E-11)
+
+def overheated_steam_entropy(pressure, temperature, saturation_temperature, exp=math.exp, log=math.log):
+  """Correlation of entropy of overheated steam in kJ/(kg*K), with pressure in MPa and temperatures in Kelvin.
+  With exp=np.exp and log=np.log it evaluates arrays of states"""
+  M = OVERHEATED_STEAM_M
+  A0, A1, A2, A3, A4 = OVERHEATED_STEAM_A
+  B1, B2 = OVERHEATED_STEAM_B
+  C0, C1, C2, C3, C4 = OVERHEATED_STEAM_C
+
+  result = (A0 + A1 * temperature + A2 * (temperature ** 2) + A3 * (temperature ** 3) + A4 * (temperature ** 4)) + (B1 * log(10 * pressure + B2)) - (C0 + C1 * saturation_temperature + C2 * (saturation_temperature ** 2) + C3 * (saturation_temperature ** 3) + C4 * (saturation_temperature ** 4)) * (exp((saturation_temperature - temperature) / M))
+  return result
+
+def overheated_steam_entropy_derivative(pressure, temperature, saturation_temperature, exp=math.exp):
+  """Exact derivative ds/dT of the overheated steam entropy correlation in kJ/(kg*K²), same units of overheated_steam_entropy"""
+  M = OVERHEATED_STEAM_M
+  A0, A1, A2, A3, A4 = OVERHEATED_STEAM_A
+  C0, C1, C2, C3, C4 = OVERHEATED_STEAM_C
+
+  result = (A1 + 2 * A2 * temperature + 3 * A3 * (temperature ** 2) + 4 * A4 * (temperature ** 3)) + ((C0 + C1 * saturation_temperature + C2 * (saturation_temperature ** 2) + C3 * (saturation_temperature ** 3) + C4 * (saturation_temperature ** 4)) / M) * (exp((saturation_temperature - temperature) / M))
+  return result
+
+def isentropic_temperature_estimate(inlet_temperature, inlet_pressure, outlet_pressure):
+  """Estimate of the outlet temperature (Celsius) of an isentropic expansion of steam, by the ideal gas relation.
+  T2 = T1 * (P2/P1) ** ((k - 1) / k), with k = 1.3 for superheated steam. Used as initial guess of the iterations"""
+  k = 1.3
+  return (inlet_temperature + 273.15) * ((outlet_pressure / inlet_pressure) ** ((k - 1) / k)) - 273.15
+
+
 class Entropy:
-  """Service class to calculate entropy properties of steam"""
+  """Service class to calculate entropy properties of steam.
+  The *_array methods accept NumPy arrays and evaluate all elements at once"""
   def __init__(self, saturation_params=None):
     self.saturation_params = saturation_params or SaturationParameters()
 
+  @cached_steam_property
   def saturated_liquid(self, pressure):
     """Calculate entropy of saturated liquid in kJ/(kg*K)"""
     saturation_temperature = self.saturation_params.saturation_temperature(pressure)
@@ -14,64 +72,25 @@ class Entropy:
     # Converting saturation temperature to Kelvin
     saturation_temperature += 273.15
 
-    critical_point_entropy = 0
-    A = 0
-    B = 0
-    C = 0
-    D = 0
-    E1 = 0
-    E2 = 0
-    E3 = 0
-    E4 = 0
-    E5 = 0
-    E6 = 0
-    E7 = 0
-
-    if 273.16 <= saturation_temperature and saturation_temperature < 300:
-      critical_point_entropy = 4.4289
-      A = 0
-      B = 0
-      C = 0
-      D = 0
-      E1 = -1836.92956
-      E2 = 14706.6352
-      E3 = -43146.6046
-      E4 = 48606.6733
-      E5 = 7997.5096
-      E6 = -58333.9887
-      E7 = 33140.0718
-    if 300 <= saturation_temperature and saturation_temperature < 600:
-      critical_point_entropy = 4.4289
-      A = 0.912762917
-      B = 0
-      C = 0
-      D = 0
-      E1 = -1.75702956
-      E2 = 1.68754095
-      E3 = 5.82215341
-      E4 = -63.3354786
-      E5 = 188.076546
-      E6 = -252.344531
-      E7 = 128.058531
-    if 600 <= saturation_temperature and saturation_temperature <= 647.3:
-      critical_point_entropy = 4.4289
-      A = 1
-      B = -0.32481765
-      C = -2.990556709
-      D = 3.23419
-      E1 = -0.678067859
-      E2 = -1.91910364
-      E3 = 0
-      E4 = 0
-      E5 = 0
-      E6 = 0
-      E7 = 0
-    if saturation_temperature < 273.16 or saturation_temperature > 647.3:
+    if saturation_temperature < SATURATION_TEMPERATURE_LIMITS[0] or saturation_temperature > SATURATION_TEMPERATURE_LIMITS[1]:
       raise DataValidationError(f"Pressure invalid: out of the range")
+    critical_point_entropy, *coefficients = SATURATED_LIQUID_COEFFICIENTS[saturated_liquid_range(saturation_temperature)]
+
+    result = self.saturation_params.saturation_factor(saturation_temperature, *coefficients) * critical_point_entropy
+    return result
+
+  def saturated_liquid_array(self, pressure):
+    """Calculate entropies of saturated liquid in kJ/(kg*K) for an array of pressures"""
+    saturation_temperature = self.saturation_params.saturation_temperature_array(pressure) + 273.15
+    raise_for_invalid_elements(invalid_saturation_temperatures(saturation_temperature), "Pressure invalid: out of the range")
+
+    coefficients = np.asarray(SATURATED_LIQUID_COEFFICIENTS)[saturated_liquid_ranges(saturation_temperature)]
+    critical_point_entropy, *coefficients = np.moveaxis(coefficients, -1, 0)
 
-    result = self.saturation_params.saturation_factor(saturation_temperature, A, B, C, D, E1, E2, E3, E4, E5, E6, E7) * critical_point_entropy
+    result = self.saturation_params.saturation_factor(saturation_temperature, *coefficients) * critical_point_entropy
     return result
 
+  @cached_steam_property
   def saturated_steam(self, pressure):
     """Calculate entropy of saturated steam in kJ/(kg*K)"""
     saturation_temperature = self.saturation_params.saturation_temperature(pressure)
@@ -79,52 +98,49 @@ class Entropy:
     # Converting saturation temperature to Kelvin
     saturation_temperature += 273.15
 
-    critical_point_entropy = 4.4289
-    A = 1
-    B = 0.377391
-    C = -2.78368
-    D = 6.93135
-    E1 = -4.34839
-    E2 = 1.34672
-    E3 = 1.75261
-    E4 = -6.22295
-    E5 = 9.99004
-    E6 = 0
-    E7 = 0
-
-    if saturation_temperature < 273.16 or saturation_temperature > 647.3:
+    if saturation_temperature < SATURATION_TEMPERATURE_LIMITS[0] or saturation_temperature > SATURATION_TEMPERATURE_LIMITS[1]:
       raise DataValidationError(f"Pressure invalid: out of the range")
+    critical_point_entropy, *coefficients = SATURATED_STEAM_COEFFICIENTS
+
+    result = self.saturation_params.saturation_factor(saturation_temperature, *coefficients) * critical_point_entropy
+    return result
+
+  def saturated_steam_array(self, pressure):
+    """Calculate entropies of saturated steam in kJ/(kg*K) for an array of pressures"""
+    saturation_temperature = self.saturation_params.saturation_temperature_array(pressure) + 273.15
+    raise_for_invalid_elements(invalid_saturation_temperatures(saturation_temperature), "Pressure invalid: out of the range")
+    critical_point_entropy, *coefficients = SATURATED_STEAM_COEFFICIENTS
 
-    result = self.saturation_params.saturation_factor(saturation_temperature, A, B, C, D, E1, E2, E3, E4, E5, E6, E7) * critical_point_entropy
+    result = self.saturation_params.saturation_factor(saturation_temperature, *coefficients) * critical_point_entropy
     return result
 
+  @cached_steam_property
   def overheated_steam(self, pressure, temperature):
     """Calculate entropy of overheated steam in kJ/(kg*K)"""
     try:
       saturation_temperature = self.saturation_params.saturation_temperature(pressure)
     except DataValidationError as e:
       raise e
-    # Converting temperatures in Kelvin
-    temperature += 273.15
-    saturation_temperature += 273.15
-    # Converting pressure in MegaPascal after calculating saturation_temperature
-    pressure = pressure/10
-
-    M = 85
-    A0 = 4.6162961
-    A1 = 0.01039008
-    A2 = -0.000009873085
-    A3 = 0.00000000543411
-    A4 = -1.170465E-12
-    B1 = -0.4650306
-    B2 = 0.001
-    C0 = 1.777804
-    C1 = -0.01802468
-    C2 = 0.00006854459
-    C3 = -0.0000001184424
-    C4 = 8.142201E-11
-
-    result = (A0 + A1 * temperature + A2 * (temperature ** 2) + A3 * (temperature ** 3) + A4 * (temperature ** 4)) + (B1 * math.log(10 * pressure + B2)) - (C0 + C1 * saturation_temperature + C2 * (saturation_temperature ** 2) + C3 * (saturation_temperature ** 3) + C4 * (saturation_temperature ** 4)) * (math.exp((saturation_temperature - temperature) / M))
 
+    # Converting temperatures in Kelvin and pressure in MegaPascal (after calculating saturation_temperature)
+    return overheated_steam_entropy(pressure / 10, temperature + 273.15, saturation_temperature + 273.15)
 
-    return result
+  def overheated_steam_array(self, pressure, temperature):
+    """Calculate entropies of overheated steam in kJ/(kg*K) for arrays of pressures and temperatures (broadcast together)"""
+    pressure, temperature = np.broadcast_arrays(as_float_array(pressure), as_float_array(temperature))
+    saturation_temperature = self.saturation_params.saturation_temperature_array(pressure)
+
+    # Converting temperatures in Kelvin and pressure in MegaPascal (after calculating saturation_temperature)
+    return overheated_steam_entropy(pressure / 10, temperature + 273.15, saturation_temperature + 273.15, exp=np.exp, log=np.log)
+
+  @cached_steam_property
+  def overheated_steam_derivative(self, pressure, temperature):
+    """Calculate the derivative of the entropy of overheated steam with temperature, in kJ/(kg*K²)"""
+    saturation_temperature = self.saturation_params.saturation_temperature(pressure)
+    return overheated_steam_entropy_derivative(pressure / 10, temperature + 273.15, saturation_temperature + 273.15)
+
+  def overheated_steam_derivative_array(self, pressure, temperature):
+    """Calculate the derivatives of the entropy of overheated steam with temperature in kJ/(kg*K²), for arrays of states"""
+    pressure, temperature = np.broadcast_arrays(as_float_array(pressure), as_float_array(temperature))
+    saturation_temperature = self.saturation_params.saturation_temperature_array(pressure)
+    return overheated_steam_entropy_derivative(pressure / 10, temperature + 273.15, saturation_temperature + 273.15, exp=np.exp)
@@ -0,0 +1,35 @@
+from functools import wraps
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.profiler import record_property
+from app.utils.lru_cache import LRUCache, MISSING
+
+# Process-wide cache of the scalar steam properties, shared by all requests
+steam_property_cache = LRUCache(settings.STEAM_PROPERTY_CACHE_SIZE)
+metrics.register_cache("steam_property", steam_property_cache)
+
+
+def cached_steam_property(method):
+  """
+  Decorator memoizing a scalar steam property method on the process-wide steam_property_cache.
+  The key is the method, the saturation mode and the exact arguments, so a hit returns the very value of an evaluation.
+  The cache is bypassed when the saturation service is not a genuine SaturationParameters (mocks in tests). Errors are never cached.
+  """
+  name = method.__qualname__
+
+  @wraps(method)
+  def wrapper(self, *args, **kwargs):
+    saturation = getattr(self, "saturation_params", self)
+    if steam_property_cache.maxsize <= 0 or not getattr(type(saturation), "cacheable", False):
+      record_property(name)
+      return method(self, *args, **kwargs)
+
+    key = (name, saturation.mode, args, tuple(sorted(kwargs.items())))
+    result = steam_property_cache.get(key)
+    record_property(name, result is not MISSING)
+    if result is MISSING:
+      result = method(self, *args, **kwargs)
+      steam_property_cache.put(key, result)
+    return result
+
+  return wrapper
@@ -1,12 +1,24 @@
 import math
-from app.services.thermodynamics.steam.saturation_parameters import SaturationParameters
+from app.services.thermodynamics.steam.saturation_parameters import (
+  SaturationParameters,
+  SATURATION_TEMPERATURE_LIMITS,
+  invalid_saturation_temperatures
+)
+from app.services.utils.arrays import raise_for_invalid_elements
+from app.services.thermodynamics.steam.property_cache import cached_steam_property
 from app.utils.errors import DataValidationError
 
+# Coefficients (critical_point_specific_volume, A, B, C, D, E1, ..., E7) of the saturated liquid specific volume
+SATURATED_LIQUID_COEFFICIENTS = (0.003155, 1, -1.9153882, 12.015186, -7.8464025, -3.888614, 2.0582238, -2.0829991, 0.82180004, 0.47549742, 0, 0)
+
+
 class SpecificVolume:
-  """Service class to calculate specific volume property of steam"""
+  """Service class to calculate specific volume property of steam.
+  The *_array methods accept NumPy arrays and evaluate all elements at once"""
   def __init__(self, saturation_params=None):
     self.saturation_params = saturation_params or SaturationParameters()
 
+  @cached_steam_property
   def saturated_liquid(self, pressure, ):
     """Calculate specific volume of saturated liquid in m³/kg"""
     saturation_temperature = self.saturation_params.saturation_temperature(pressure)
@@ -14,22 +26,18 @@ class SpecificVolume:
     # Converting saturation temperature to Kelvin
     saturation_temperature += 273.15
 
-    critical_point_specific_volume = 0.003155
-    A = 1
-    B = -1.9153882
-    C = 12.015186
-    D = -7.8464025
-    E1 = -3.888614
-    E2 = 2.0582238
-    E3 = -2.0829991
-    E4 = 0.82180004
-    E5 = 0.47549742
-    E6 = 0
-    E7 = 0
-
-    if saturation_temperature < 273.16 or saturation_temperature > 647.3:
+    if saturation_temperature < SATURATION_TEMPERATURE_LIMITS[0] or saturation_temperature > SATURATION_TEMPERATURE_LIMITS[1]:
       raise DataValidationError(f"Pressure invalid: out of the range")
+    critical_point_specific_volume, *coefficients = SATURATED_LIQUID_COEFFICIENTS
+
+    result = self.saturation_params.saturation_factor(saturation_temperature, *coefficients) * critical_point_specific_volume
+    return result
 
+  def saturated_liquid_array(self, pressure):
+    """Calculate specific volumes of saturated liquid in m³/kg for an array of pressures"""
+    saturation_temperature = self.saturation_params.saturation_temperature_array(pressure) + 273.15
+    raise_for_invalid_elements(invalid_saturation_temperatures(saturation_temperature), "Pressure invalid: out of the range")
+    critical_point_specific_volume, *coefficients = SATURATED_LIQUID_COEFFICIENTS
 
-    result = self.saturation_params.saturation_factor(saturation_temperature, A, B, C, D, E1, E2, E3, E4, E5, E6, E7) * critical_point_specific_volume
+    result = self.saturation_params.saturation_factor(saturation_temperature, *coefficients) * critical_point_specific_volume
     return result
@@ -0,0 +1,24 @@
+import numpy as np
+from app.utils.errors import DataValidationError
+
+def as_float_array(values):
+  """Converting scalars, lists or arrays into a float NumPy array"""
+  return np.asarray(values, dtype=float)
+
+def raise_for_invalid_elements(invalid, message, error=DataValidationError):
+  """
+  Raising the error of a vectorized calculation when any element is invalid.
+  The message reports the indices (flattened) of the invalid elements; with a 1-D mask, they are also
+  the elements attribute of the error, so that a batch can run its other elements again
+  """
+  if not np.any(invalid):
+    return
+
+  indices = np.flatnonzero(invalid)
+  shown = ", ".join(str(index) for index in indices[:10])
+  if len(indices) > 10:
+    shown += f", ... ({len(indices)} elements)"
+  exc = error(f"{message} (elements {shown})")
+  if np.ndim(invalid) == 1:
+    exc.elements = indices.tolist()
+  raise exc
@@ -0,0 +1,35 @@
+import itertools
+import numpy as np
+from app.utils.errors import LogicConstraintError
+
+# Designs of experiments: each takes the variables by name and returns the list of points, as {name: value}
+
+def cartesian_design(axes):
+  """Every combination of the values of the axes ({name: values}), the last axis varying fastest"""
+  names = list(axes)
+  return [dict(zip(names, values)) for values in itertools.product(*axes.values())]
+
+
+def linspace_design(axes):
+  """Axes ({name: values}) varied together: the i-th point takes the i-th value of every axis"""
+  sizes = {len(values) for values in axes.values()}
+  if len(sizes) > 1:
+    raise LogicConstraintError(f"All variables of a linspace design must have the same number of values, got {sorted(sizes)}")
+  names = list(axes)
+  return [dict(zip(names, values)) for values in zip(*axes.values())]
+
+
+def latin_hypercube_design(bounds, samples, seed=None):
+  """
+  Latin hypercube sample of the bounds ({name: (lower, upper)}): the range of each variable is split into
+  `samples` intervals of equal width and each interval is sampled exactly once, in a random order per variable
+  """
+  if samples < 1:
+    raise LogicConstraintError("A latin hypercube design needs at least 1 sample")
+  generator = np.random.default_rng(seed)
+  columns = {}
+  for name, (lower, upper) in bounds.items():
+    # One random position inside each interval, the intervals shuffled independently for each variable
+    positions = (generator.permutation(samples) + generator.random(samples)) / samples
+    columns[name] = (lower + positions * (upper - lower)).tolist()
+  return [{name: values[i] for name, values in columns.items()} for i in range(samples)]
@@ -0,0 +1,42 @@
+import numpy as np
+from app.services.utils.arrays import as_float_array
+
+class HermiteTable:
+  """
+  Cubic Hermite interpolation of a function on a uniform grid of [start, stop],
+  from its values and exact derivatives at the nodes (error O(step⁴)).
+  The table is built once; values out of [start, stop] are extrapolated by the border intervals.
+  """
+
+  def __init__(self, start, stop, size, function, derivative):
+    self.start = start
+    self.stop = stop
+    self.size = size
+    self.step = (stop - start) / (size - 1)
+    self._inverse_step = 1 / self.step
+    self._last_interval = size - 2
+
+    # Values and derivatives (scaled to the step) at the nodes; lists are faster for the scalar path
+    nodes = np.linspace(start, stop, size)
+    self.values = as_float_array(function(nodes))
+    self.slopes = as_float_array(derivative(nodes)) * self.step
+    self._values = self.values.tolist()
+    self._slopes = self.slopes.tolist()
+
+  def __call__(self, x):
+    """Interpolated value of a scalar"""
+    position = (x - self.start) * self._inverse_step
+    i = min(max(int(position), 0), self._last_interval)
+    t = position - i
+    y0, y1 = self._values[i], self._values[i + 1]
+    m0, m1 = self._slopes[i], self._slopes[i + 1]
+    return y0 + t * (m0 + t * (3 * (y1 - y0) - 2 * m0 - m1 + t * (2 * (y0 - y1) + m0 + m1)))
+
+  def evaluate_array(self, x):
+    """Interpolated values of an array"""
+    position = (as_float_array(x) - self.start) * self._inverse_step
+    i = np.clip(np.floor(position), 0, self._last_interval).astype(int)
+    t = position - i
+    y0, y1 = self.values[i], self.values[i + 1]
+    m0, m1 = self.slopes[i], self.slopes[i + 1]
+    return y0 + t * (m0 + t * (3 * (y1 - y0) - 2 * m0 - m1 + t * (2 * (y0 - y1) + m0 + m1)))
@@ -0,0 +1,103 @@
+import numpy as np
+from app.core.metrics import optimizer_evaluations
+
+class NelderMead():
+  """Service class of the derivative-free minimization by the Nelder-Mead simplex method, inside a box of bounds.
+  The search runs in coordinates normalized to [0, 1] on each variable; points leaving the box are projected back onto it.
+  Utilized for the optimization of operating points, whose objective is a whole simulation (no derivatives available)"""
+  # Iteration parameters: budget of evaluations, tolerances of the objective spread and of the simplex size (normalized)
+  maximum_evaluations = 200
+  tolerance = 1e-6
+  size_tolerance = 1e-4
+  # Size of the initial simplex, as a fraction of each range
+  initial_step = 0.1
+  # Reflection, expansion, contraction and shrink coefficients
+  reflection = 1.0
+  expansion = 2.0
+  contraction = 0.5
+  shrink = 0.5
+
+  def __init__(self):
+    # Telemetry of the last minimization
+    self.last_evaluations = 0
+    self.last_iterations = 0
+
+  def minimize(self, function, initial_guess, lower_bound, upper_bound):
+    """Point of the box minimizing function(x), starting at initial_guess.
+    Failed evaluations must return inf. Returns the point, its value, the counters, the convergence flag
+    and the trace of the best point after each iteration"""
+    lower = np.asarray(lower_bound, dtype=float)
+    upper = np.asarray(upper_bound, dtype=float)
+    span = upper - lower
+    evaluations = 0
+
+    def evaluate(u):
+      nonlocal evaluations
+      evaluations += 1
+      return function(lower + u * span)
+
+    # Initial simplex: the initial point and one step along each variable (backwards near the upper bound)
+    start = np.clip((np.asarray(initial_guess, dtype=float) - lower) / span, 0, 1)
+    simplex = [start]
+    for i in range(len(start)):
+      vertex = start.copy()
+      vertex[i] += self.initial_step if vertex[i] + self.initial_step <= 1 else -self.initial_step
+      simplex.append(vertex)
+    simplex = np.array(simplex)
+    values = np.array([evaluate(vertex) for vertex in simplex])
+
+    trace = []
+    iterations = 0
+    converged = False
+    while evaluations < self.maximum_evaluations:
+      order = np.argsort(values, kind="stable")
+      simplex, values = simplex[order], values[order]
+      iterations += 1
+      trace.append({"iteration": iterations, "evaluations": evaluations, "value": float(values[0]), "x": (lower + simplex[0] * span).tolist()})
+
+      # Converged when the values agree and the simplex is small
+      size = np.max(np.abs(simplex[1:] - simplex[0]))
+      if np.isfinite(values[0]) and values[-1] - values[0] <= self.tolerance and size <= self.size_tolerance:
+        converged = True
+        break
+
+      centroid = simplex[:-1].mean(axis=0)
+      reflected = np.clip(centroid + self.reflection * (centroid - simplex[-1]), 0, 1)
+      reflected_value = evaluate(reflected)
+
+      if reflected_value < values[0]:
+        # Expanding beyond the reflected point
+        expanded = np.clip(centroid + self.expansion * (reflected - centroid), 0, 1)
+        expanded_value = evaluate(expanded)
+        if expanded_value < reflected_value:
+          simplex[-1], values[-1] = expanded, expanded_value
+        else:
+          simplex[-1], values[-1] = reflected, reflected_value
+      elif reflected_value < values[-2]:
+        simplex[-1], values[-1] = reflected, reflected_value
+      else:
+        # Contracting towards the better of the worst and the reflected points
+        if reflected_value < values[-1]:
+          contracted = centroid + self.contraction * (reflected - centroid)
+        else:
+          contracted = centroid + self.contraction * (simplex[-1] - centroid)
+        contracted_value = evaluate(contracted)
+        if contracted_value < min(reflected_value, values[-1]):
+          simplex[-1], values[-1] = contracted, contracted_value
+        else:
+          # Shrinking all vertices towards the best one
+          simplex[1:] = simplex[0] + self.shrink * (simplex[1:] - simplex[0])
+          values[1:] = [evaluate(vertex) for vertex in simplex[1:]]
+
+    best = int(np.argmin(values))
+    self.last_evaluations = evaluations
+    self.last_iterations = iterations
+    optimizer_evaluations.observe(evaluations, "nelder_mead")
+    return {
+      "x": (lower + simplex[best] * span).tolist(),
+      "value": float(values[best]),
+      "evaluations": evaluations,
+      "iterations": iterations,
+      "converged": converged,
+      "trace": trace
+    }
@@ -0,0 +1,151 @@
+import math
+import time
+import numpy as np
+from app.utils.errors import ComputationalError
+from app.services.utils.arrays import as_float_array, raise_for_invalid_elements
+from app.core.metrics import root_finder_iterations
+from app.core.profiler import record_root_finder
+
+class NewtonMethod():
+  """Service class to calculate the computational routine of iteration by the Newton method, safeguarded by bisection.
+  Utilized for the calculation of outlet temperature in isenthalpic and isentropic process, with the exact derivatives of the correlations,
+  and of the exhaustion gas temperature of the gas turbine.
+  solve() and solve_array() are the generic cores, for increasing functions of one variable"""
+  # Iteration parameters shared by the scalar and the array versions: budgets of iterations and of time (seconds) of each solve
+  maximum_iterations = 50
+  tolerance = 1e-6
+  time_budget = 1.0
+
+  def __init__(self):
+    # Iteration telemetry: iterations of the last root (array of iterations in the array version) and totals since creation
+    self.last_iterations = 0
+    self.total_iterations = 0
+    self.total_roots = 0
+
+  def _record(self, iterations):
+    self.last_iterations = iterations
+    self.total_iterations += int(np.sum(iterations))
+    self.total_roots += int(np.size(iterations))
+    if np.ndim(iterations):
+      root_finder_iterations.observe_array(iterations, "newton")
+    else:
+      root_finder_iterations.observe(iterations, "newton")
+    record_root_finder("newton", iterations)
+
+  def _check_deadline(self, deadline):
+    if time.perf_counter() > deadline:
+      raise ComputationalError(f"Newton method did not converge within its time budget of {self.time_budget} s")
+
+  def solve(self, function, derivative, initial_guess, lower_bound=-math.inf, upper_bound=math.inf):
+    """Root of the increasing function, starting at initial_guess.
+    Each evaluated point narrows the bracket [lower, upper] of the root; Newton steps falling outside of it are replaced by bisection"""
+    x = initial_guess
+    lower = lower_bound
+    upper = upper_bound
+    deadline = time.perf_counter() + self.time_budget
+
+    for i in range(1, self.maximum_iterations + 1):
+      self._check_deadline(deadline)
+      value = function(x)
+      if value == 0:
+        self._record(i)
+        return x
+
+      # Narrowing the bracket by the sign of the function
+      if value < 0:
+        lower = max(lower, x)
+      else:
+        upper = min(upper, x)
+
+      # Newton step, or bisection of the bracket when the step leaves it (or the derivative is useless)
+      slope = derivative(x)
+      x_next = x - value / slope if slope > 0 else math.nan
+      if not lower < x_next < upper:
+        if math.isinf(lower) or math.isinf(upper):
+          raise ComputationalError("Newton method failed: non-positive derivative without a bracket of the root")
+        x_next = (lower + upper) / 2
+
+      if abs(x_next - x) <= self.tolerance:
+        self._record(i)
+        return x_next
+      x = x_next
+
+    raise ComputationalError("Newton method did not converge after maximum iterations")
+
+  def solve_array(self, function, derivative, initial_guess, lower_bound=-np.inf, upper_bound=np.inf):
+    """Roots of N independent increasing functions at once, with NumPy arrays.
+    function and derivative receive the values and the indices of the elements still iterating.
+    Returns the array of roots and the array of iterations of each element"""
+    x = np.array(as_float_array(initial_guess), dtype=float)
+    lower = np.array(np.broadcast_to(lower_bound, x.shape), dtype=float)
+    upper = np.array(np.broadcast_to(upper_bound, x.shape), dtype=float)
+    iterations = np.zeros(x.shape, dtype=int)
+
+    # Elements still iterating
+    active = np.ones(x.shape, dtype=bool)
+    deadline = time.perf_counter() + self.time_budget
+
+    while active.any() and iterations.max() < self.maximum_iterations:
+      self._check_deadline(deadline)
+      indices = np.flatnonzero(active)
+      x_active = x.flat[indices]
+      value = function(x_active, indices)
+      slope = derivative(x_active, indices)
+
+      # Narrowing the brackets by the sign of the functions
+      negative = value < 0
+      lower.flat[indices] = np.where(negative, np.maximum(lower.flat[indices], x_active), lower.flat[indices])
+      upper.flat[indices] = np.where(negative, upper.flat[indices], np.minimum(upper.flat[indices], x_active))
+      lower_active = lower.flat[indices]
+      upper_active = upper.flat[indices]
+
+      # Newton steps, or bisection of the brackets when the step leaves it
+      with np.errstate(divide="ignore", invalid="ignore"):
+        x_next = np.where(slope > 0, x_active - value / slope, np.nan)
+      # (exact roots close their bracket on themselves, and are kept below)
+      outside = ~((lower_active < x_next) & (x_next < upper_active)) & (value != 0)
+      unbracketed = np.zeros(x.shape, dtype=bool)
+      unbracketed.flat[indices] = outside & (np.isinf(lower_active) | np.isinf(upper_active))
+      raise_for_invalid_elements(unbracketed, "Newton method failed: non-positive derivative without a bracket of the root", ComputationalError)
+      x_next = np.where(outside, (lower_active + upper_active) / 2, x_next)
+
+      # Exact roots keep their value
+      x_next = np.where(value == 0, x_active, x_next)
+      x.flat[indices] = x_next
+      iterations.flat[indices] += 1
+
+      # Elements whose step reached the tolerance stop iterating
+      converged = (np.abs(x_next - x_active) <= self.tolerance) | (value == 0)
+      active.flat[indices[converged]] = False
+
+    raise_for_invalid_elements(active, "Newton method did not converge after maximum iterations", ComputationalError)
+
+    self._record(iterations)
+    return x, iterations
+
+  def run(self, inlet_property, thermo_property_function, outlet_pressure, saturation_parameters, initial_guess=None):
+    """Calculation of the outlet temperature whose overheated steam property equals the inlet property.
+    Without initial guess, it starts close to the saturation temperature at the outlet pressure"""
+    if initial_guess is None:
+      initial_guess = saturation_parameters.saturation_temperature(outlet_pressure) + 0.01
+
+    # Difference between outlet property (iteration value) and inlet property (constant) that must be zero, and its derivative
+    function = lambda temperature: thermo_property_function.overheated_steam(outlet_pressure, temperature) - inlet_property
+    derivative = lambda temperature: thermo_property_function.overheated_steam_derivative(outlet_pressure, temperature)
+
+    return self.solve(function, derivative, initial_guess)
+
+  def run_array(self, inlet_property, thermo_property_function, outlet_pressure, saturation_parameters, initial_guess=None):
+    """Calculation of the outlet temperatures of N independent problems at once, with NumPy arrays.
+    Returns the array of roots and the array of iterations of each element"""
+    inlet_property, outlet_pressure = np.broadcast_arrays(as_float_array(inlet_property), as_float_array(outlet_pressure))
+    if initial_guess is None:
+      initial_guess = saturation_parameters.saturation_temperature_array(outlet_pressure) + 0.01
+    initial_guess = np.broadcast_to(as_float_array(initial_guess), inlet_property.shape)
+
+    inlet_property = inlet_property.ravel()
+    outlet_pressure = outlet_pressure.ravel()
+    function = lambda temperature, indices: thermo_property_function.overheated_steam_array(outlet_pressure[indices], temperature) - inlet_property[indices]
+    derivative = lambda temperature, indices: thermo_property_function.overheated_steam_derivative_array(outlet_pressure[indices], temperature)
+
+    return self.solve_array(function, derivative, initial_guess)
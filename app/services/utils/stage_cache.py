@@ -0,0 +1,143 @@
+from collections.abc import Mapping
+from functools import wraps
+from operator import attrgetter
+from app.utils.lru_cache import MISSING
+from app.core.metrics import stage_memo_lookups
+
+def cached_per_input(method):
+  """
+  Decorator for service methods without arguments that depend only on the service's input.
+  The result is computed once and kept on the instance, keyed on its input object:
+  it is discarded as soon as the input is replaced. Errors are never cached.
+  """
+  name = method.__name__
+
+  @wraps(method)
+  def wrapper(self):
+    cache = self.__dict__.get("_input_cache")
+    if cache is None or cache[0] is not self.input:
+      cache = (self.input, {})
+      self._input_cache = cache
+
+    results = cache[1]
+    if name not in results:
+      results[name] = method(self)
+    return results[name]
+
+  return wrapper
+
+
+class InputTracer:
+  """
+  Read-only proxy of an input, recording the names of the fields read through it (attributes or vars()).
+  Used by StageMemo to discover the input fields each stage depends on.
+  """
+  __slots__ = ("_input", "fields_read")
+
+  def __init__(self, input):
+    self._input = input
+    self.fields_read = set()
+
+  def __getattr__(self, name):
+    value = getattr(self._input, name)
+    self.fields_read.add(name)
+    return value
+
+  @property
+  def __dict__(self):
+    return _TracedFields(self)
+
+
+class _TracedFields(Mapping):
+  """vars() of an InputTracer: listing the names is free, reading a value records its field"""
+
+  def __init__(self, tracer):
+    self._tracer = tracer
+    self._fields = vars(tracer._input)
+
+  def __getitem__(self, name):
+    value = self._fields[name]
+    self._tracer.fields_read.add(name)
+    return value
+
+  def __iter__(self):
+    return iter(self._fields)
+
+  def __len__(self):
+    return len(self._fields)
+
+
+class StageMemo:
+  """
+  Results of named stages shared across the runs of many inputs (sweeps, optimizations).
+  The key of a stage is the values of the input fields it reads, its own and those of its dependencies,
+  discovered by tracing the input: a stage that does not read the varied fields is computed once.
+  A stage depending on a result that was not memoized (so its fields are unknown) is computed at each run.
+  Results are shared between runs, so they must not be mutated. Errors are never memoized.
+  """
+
+  def __init__(self):
+    # Stage name: input fields read by the stage itself
+    self.fields_read = {}
+    # Stage name: sorted input fields of its key, and the getter of their values
+    self.fields = {}
+    self._key_getters = {}
+    # Stage name: {values of the fields: result}
+    self.results = {}
+    self.hits = 0
+    self.misses = 0
+    # Incremented whenever a stage reads new fields: the keys computed at the current generation are up to date
+    self._generation = 0
+    self._key_generations = {}
+
+  def run(self, name, input, compute, dependencies=()):
+    """Result of the stage for the input, calling compute(traced input) only when no run with the same key was memoized"""
+    if any(dependency not in self.fields for dependency in dependencies):
+      return compute(input)
+
+    if self._key_fields(name, dependencies) is not None:
+      result = self.results[name].get(self._key_getters[name](input), MISSING)
+      if result is not MISSING:
+        self.hits += 1
+        stage_memo_lookups.inc(name, "hit")
+        return result
+
+    self.misses += 1
+    stage_memo_lookups.inc(name, "miss")
+    tracer = InputTracer(input)
+    result = compute(tracer)
+
+    # Fields read now are added to those of previous runs (other branches of the stage)
+    fields_read = self.fields_read.setdefault(name, set())
+    if not tracer.fields_read <= fields_read or name not in self.fields:
+      fields_read |= tracer.fields_read
+      self._generation += 1
+    self._key_fields(name, dependencies)
+    self.results[name][self._key_getters[name](input)] = result
+    return result
+
+  def _key_fields(self, name, dependencies):
+    """
+    Fields of the key of the stage: its own and those of the keys of its dependencies, or None before its first run.
+    When they change, the entries of the previous key are unreachable and discarded
+    """
+    if name not in self.fields_read:
+      return None
+    if self._key_generations.get(name) == self._generation:
+      return self.fields[name]
+
+    fields = set(self.fields_read[name])
+    for dependency in dependencies:
+      fields.update(self.fields.get(dependency, ()))
+    fields = tuple(sorted(fields))
+    if fields != self.fields.get(name):
+      self.fields[name] = fields
+      self._key_getters[name] = attrgetter(*fields) if fields else _empty_key
+      self.results[name] = {}
+    self._key_generations[name] = self._generation
+    return fields
+
+
+def _empty_key(input):
+  """Key of the stages that read no field"""
+  return ()
@@ -0,0 +1,120 @@
+import numpy as np
+
+# Statistics aggregated chunk by chunk, in bounded memory: each takes the values of a chunk as an array of rows
+# (one row per sample, one column per variable) and never keeps all samples
+
+class RunningMoments:
+  """Count, mean, standard deviation, minimum and maximum of each column, merged chunk by chunk
+  (Welford's algorithm, in the pairwise form of Chan et al. for whole chunks)"""
+
+  def __init__(self, columns):
+    self.count = 0
+    self.mean = np.zeros(columns)
+    self.m2 = np.zeros(columns)
+    self.minimum = np.full(columns, np.inf)
+    self.maximum = np.full(columns, -np.inf)
+
+  def add(self, values):
+    """Merging the moments of a chunk of rows"""
+    if len(values) == 0:
+      return
+    count = len(values)
+    mean = values.mean(axis=0)
+    m2 = ((values - mean) ** 2).sum(axis=0)
+    total = self.count + count
+    delta = mean - self.mean
+    self.mean = self.mean + delta * (count / total)
+    self.m2 = self.m2 + m2 + delta ** 2 * (self.count * count / total)
+    self.count = total
+    self.minimum = np.minimum(self.minimum, values.min(axis=0))
+    self.maximum = np.maximum(self.maximum, values.max(axis=0))
+
+  @property
+  def std(self):
+    """Sample standard deviation of each column (0 for less than 2 rows)"""
+    if self.count < 2:
+      return np.zeros_like(self.m2)
+    return np.sqrt(self.m2 / (self.count - 1))
+
+
+class Reservoir:
+  """Uniform random sample of at most `size` rows of the stream (Algorithm R): all rows while the stream is
+  shorter than the reservoir, so the percentiles are exact up to `size` rows and estimates beyond"""
+
+  def __init__(self, columns, size, seed=None):
+    self.size = size
+    self.rows = np.empty((size, columns))
+    self.seen = 0
+    self.generator = np.random.default_rng(seed)
+
+  def add(self, values):
+    """Offering the rows of a chunk to the reservoir"""
+    count = len(values)
+    # Filling the free places
+    free = max(0, min(self.size - self.seen, count))
+    self.rows[self.seen:self.seen + free] = values[:free]
+    # Then the i-th row of the stream replaces a random place with probability size / (i + 1)
+    if free < count:
+      positions = self.seen + np.arange(free, count)
+      places = self.generator.integers(0, positions + 1)
+      accepted = np.flatnonzero(places < self.size)
+      # Later rows win the places drawn more than once, as in the sequential algorithm
+      places, last = np.unique(places[accepted][::-1], return_index=True)
+      self.rows[places] = values[free + accepted[::-1][last]]
+    self.seen += count
+
+  def percentiles(self, percentiles):
+    """Percentiles (0-100) of each column, as an array of shape (percentiles, columns)"""
+    return np.percentile(self.rows[:min(self.seen, self.size)], percentiles, axis=0)
+
+
+class StreamingHistogram:
+  """Histogram of one variable with a fixed number of bins of equal width, counting every value exactly.
+  The range starts at the values of the first chunk, widened by half on each side; values beyond it double
+  the width of the bins (merging them in pairs) until they fit, so no value is ever dropped"""
+
+  def __init__(self, bins):
+    self.bins = bins
+    self.counts = np.zeros(bins, dtype=np.int64)
+    self.origin = None
+    self.width = None
+
+  @property
+  def edges(self):
+    return self.origin + self.width * np.arange(self.bins + 1)
+
+  def trimmed(self):
+    """Edges and counts without the empty bins at the ends"""
+    filled = np.flatnonzero(self.counts)
+    if len(filled) == 0:
+      return self.edges, self.counts
+    first, last = filled[0], filled[-1] + 1
+    return self.edges[first:last + 1], self.counts[first:last]
+
+  def _grow(self, upwards):
+    """Doubling the width of the bins, extending the range upwards or downwards"""
+    merged = np.add.reduceat(self.counts, np.arange(0, self.bins, 2))
+    self.counts = np.zeros(self.bins, dtype=np.int64)
+    self.width *= 2
+    if upwards:
+      self.counts[:len(merged)] = merged
+    else:
+      self.counts[self.bins - len(merged):] = merged
+      self.origin -= (self.bins - len(merged)) * self.width
+
+  def add(self, values):
+    """Counting the values of a chunk"""
+    if len(values) == 0:
+      return
+    lowest, highest = values.min(), values.max()
+    if self.origin is None:
+      span = (highest - lowest) or max(abs(lowest) * 1e-9, 1e-12)
+      self.origin = lowest - span / 2
+      self.width = 2 * span / self.bins
+    while lowest < self.origin:
+      self._grow(upwards=False)
+    while highest > self.origin + self.width * self.bins:
+      self._grow(upwards=True)
+    # The upper edge is included in the last bin
+    indexes = np.clip(((values - self.origin) // self.width).astype(np.int64), 0, self.bins - 1)
+    self.counts += np.bincount(indexes, minlength=self.bins)
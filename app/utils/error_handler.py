@@ -1,12 +1,14 @@
 from fastapi import Request, HTTPException
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
+from app.core.metrics import error_responses
 from .errors import (
   ThermodynamicError,
   LogicConstraintError,
   DataValidationError,
   NotFoundError,
-  ComputationalError
+  ComputationalError,
+  OverloadedError
 )
 
 def register_error_handlers(app):
@@ -15,6 +17,7 @@ def register_error_handlers(app):
   @app.exception_handler(ThermodynamicError)
   async def thermodynamic_error_handler(request: Request, exc: ThermodynamicError):
     # Physical law or thermodynamic principle violation
+    error_responses.inc("ThermodynamicError")
     return JSONResponse(
       status_code=422,
       content={"error": str(exc), "type": "ThermodynamicError"}
@@ -23,6 +26,7 @@ def register_error_handlers(app):
   @app.exception_handler(LogicConstraintError)
   async def logic_constraint_error_handler(request: Request, exc: LogicConstraintError):
     # Logical or business rule violation
+    error_responses.inc("LogicConstraintError")
     return JSONResponse(
       status_code=400,
       content={"error": str(exc), "type": "LogicConstraintError"}
@@ -31,6 +35,7 @@ def register_error_handlers(app):
   @app.exception_handler(DataValidationError)
   async def data_validation_error_handler(request: Request, exc: DataValidationError):
     # Invalid or inconsistent input data
+    error_responses.inc("DataValidationError")
     return JSONResponse(
       status_code=422,
       content={"error": str(exc), "type": "DataValidationError"}
@@ -39,6 +44,7 @@ def register_error_handlers(app):
   @app.exception_handler(NotFoundError)
   async def not_found_error_handler(request: Request, exc: NotFoundError):
     # Database entity or parameter not found
+    error_responses.inc("NotFoundError")
     return JSONResponse(
       status_code=404,
       content={"error": str(exc), "type": "NotFoundError"}
@@ -47,15 +53,27 @@ def register_error_handlers(app):
   @app.exception_handler(ComputationalError)
   async def computational_error_handler(request: Request, exc: ComputationalError):
     # Convergence or numerical instability in calculation
+    error_responses.inc("ComputationalError")
     return JSONResponse(
       status_code=500,
       content={"error": str(exc), "type": "ComputationalError"}
     )
 
+  @app.exception_handler(OverloadedError)
+  async def overloaded_error_handler(request: Request, exc: OverloadedError):
+    # Back-pressure: all workers busy and the queue full
+    error_responses.inc("OverloadedError")
+    return JSONResponse(
+      status_code=429,
+      content={"error": str(exc), "type": "OverloadedError"},
+      headers={"Retry-After": str(exc.retry_after)}
+    )
+
   @app.exception_handler(RequestValidationError)
   async def validation_error_handler(request: Request, exc: RequestValidationError):
     # Extract details of each validation error
     errors = [{"loc": e["loc"], "msg": e["msg"], "type": e["type"]} for e in exc.errors()]
+    error_responses.inc("RequestValidationError")
     return JSONResponse(
       status_code=422,
       content={
@@ -68,6 +86,7 @@ def register_error_handlers(app):
   @app.exception_handler(Exception)
   async def generic_error_handler(request: Request, exc: Exception):
     # Unexpected or unhandled exception
+    error_responses.inc("InternalServerError")
     return JSONResponse(
       status_code=500,
       content={"error": str(exc), "type": "InternalServerError"}
@@ -21,3 +21,10 @@ class NotFoundError(Exception):
 class ComputationalError(Exception):
   """Raised when a numerical method or iterative algorithm fails to converge."""
   pass
+
+
+class OverloadedError(Exception):
+  """Raised when the server is at capacity and cannot accept more work for now."""
+  def __init__(self, message, retry_after=1):
+    super().__init__(message)
+    self.retry_after = retry_after
@@ -0,0 +1,79 @@
+import time
+from collections import OrderedDict
+from threading import Lock
+
+# Returned by LRUCache.get() when the key is not cached (None may be a cached value)
+MISSING = object()
+
+
+class LRUCache:
+  """
+  Bounded thread-safe cache that discards the least recently used entries, with hit/miss statistics.
+  With a ttl (seconds), entries also expire that long after being stored; expired entries count as misses.
+  A maxsize of 0 disables the cache: nothing is stored and every lookup is a miss.
+  """
+
+  def __init__(self, maxsize=128, ttl=None, clock=time.monotonic):
+    self.maxsize = maxsize
+    self.ttl = ttl
+    self.clock = clock
+    self.hits = 0
+    self.misses = 0
+    self.expirations = 0
+    # Entries as key: (expiration time or None, value)
+    self._entries = OrderedDict()
+    self._lock = Lock()
+
+  def get(self, key):
+    """Cached value of the key, or MISSING"""
+    with self._lock:
+      entry = self._entries.get(key)
+      if entry is None:
+        self.misses += 1
+        return MISSING
+
+      expires_at, value = entry
+      if expires_at is not None and self.clock() >= expires_at:
+        del self._entries[key]
+        self.expirations += 1
+        self.misses += 1
+        return MISSING
+
+      self.hits += 1
+      self._entries.move_to_end(key)
+      return value
+
+  def put(self, key, value):
+    """Caching the value of the key, discarding the least recently used entry when full"""
+    if self.maxsize <= 0:
+      return
+    expires_at = self.clock() + self.ttl if self.ttl else None
+    with self._lock:
+      self._entries[key] = (expires_at, value)
+      self._entries.move_to_end(key)
+      if len(self._entries) > self.maxsize:
+        self._entries.popitem(last=False)
+
+  def clear(self):
+    """Discarding all entries and statistics"""
+    with self._lock:
+      self._entries.clear()
+      self.hits = 0
+      self.misses = 0
+      self.expirations = 0
+
+  def __len__(self):
+    return len(self._entries)
+
+  def stats(self):
+    """Hit/miss statistics of the cache"""
+    with self._lock:
+      lookups = self.hits + self.misses
+      return {
+        "hits": self.hits,
+        "misses": self.misses,
+        "expirations": self.expirations,
+        "hit_rate": self.hits / lookups if lookups else 0.0,
+        "size": len(self._entries),
+        "maxsize": self.maxsize
+      }
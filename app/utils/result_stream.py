@@ -0,0 +1,61 @@
+import csv
+import io
+from app.models.output import Output
+from app.models.simulation_error import SimulationError
+from app.utils.result_table import TABLE_MEDIA_TYPES, require_pyarrow, table_chunks
+
+# Media types of the streamed formats of batch and sweep results
+STREAM_MEDIA_TYPES = {
+  "ndjson": "application/x-ndjson",
+  "csv": "text/csv",
+  **TABLE_MEDIA_TYPES
+}
+
+# CSV columns of a result: the Output fields, then the error of failed simulations
+RESULT_COLUMNS = list(Output.model_fields) + list(SimulationError.model_fields)
+
+
+def ndjson_lines(rows):
+  """One JSON line for each row (Output, SimulationError or SweepRow), generated lazily"""
+  for row in rows:
+    yield row.model_dump_json() + "\n"
+
+
+def csv_lines(rows, point_fields=()):
+  """
+  CSV lines of the rows, generated lazily: a header, then one line for each row.
+  Sweep rows start with the values of their varied fields (point_fields); the columns of the other kind of result are left empty
+  """
+  buffer = io.StringIO()
+  writer = csv.writer(buffer, lineterminator="\n")
+
+  def line(values):
+    buffer.seek(0)
+    buffer.truncate()
+    writer.writerow(values)
+    return buffer.getvalue()
+
+  yield line([*point_fields, *RESULT_COLUMNS])
+  for row in rows:
+    point = [row.point[field] for field in point_fields] if point_fields else []
+    result = row.result if point_fields else row
+    values = result.model_dump()
+    yield line([*point, *(values.get(column, "") for column in RESULT_COLUMNS)])
+
+
+def stream_lines(rows, output_format, point_fields=()):
+  """Lines of the rows in the streamed format ("ndjson" or "csv")"""
+  if output_format == "csv":
+    return csv_lines(rows, point_fields)
+  return ndjson_lines(rows)
+
+
+def result_chunks(rows, output_format, point_fields=()):
+  """
+  Pieces of the results in any streamed format: text lines of the rows (ndjson, csv), or bytes blocks of the
+  ResultColumns of each chunk (arrow, parquet). The pyarrow package is checked at once for the columnar formats
+  """
+  if output_format in TABLE_MEDIA_TYPES:
+    require_pyarrow(output_format)
+    return table_chunks(rows, output_format, point_fields)
+  return stream_lines(rows, output_format, point_fields)
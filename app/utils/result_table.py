@@ -0,0 +1,92 @@
+from app.models.result_columns import OUTPUT_FIELDS
+from app.utils.errors import LogicConstraintError
+
+try:
+  import pyarrow
+  import pyarrow.parquet
+except ImportError:  # In requirements.txt; without it, only the Arrow and Parquet formats are refused
+  pyarrow = None
+
+# Media types of the columnar formats of batch and sweep results
+TABLE_MEDIA_TYPES = {
+  "arrow": "application/vnd.apache.arrow.stream",
+  "parquet": "application/vnd.apache.parquet"
+}
+
+
+def require_pyarrow(output_format):
+  """Checking that the pyarrow package is installed, before any simulation"""
+  if pyarrow is None:
+    raise LogicConstraintError(f"The {output_format} format needs the pyarrow package, not installed on this server")
+
+
+def table_schema(point_fields=()):
+  """Columns of the table: varied fields and Output fields (null in failed rows), then the error of failed rows"""
+  return pyarrow.schema(
+    [pyarrow.field(name, pyarrow.float64()) for name in [*point_fields, *OUTPUT_FIELDS]]
+    + [pyarrow.field("error", pyarrow.string()), pyarrow.field("type", pyarrow.string())]
+  )
+
+
+def record_batch(columns, schema):
+  """
+  Record batch of a block of results (ResultColumns, with the varied fields of a sweep ahead of the Output fields):
+  each NumPy column goes straight into an Arrow array, the Output fields of the failed items masked as null
+  """
+  failed = columns.failed
+  arrays = [
+    pyarrow.array(columns.columns[name], mask=failed if name in OUTPUT_FIELDS else None)
+    for name in schema.names[:-2]
+  ]
+  for field in ("error", "type"):
+    arrays.append(pyarrow.array([None if error is None else getattr(error, field) for error in columns.errors], pyarrow.string()))
+  return pyarrow.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+class _DrainedSink:
+  """Binary sink whose written bytes are taken out in pieces, keeping the total position that Parquet records"""
+
+  def __init__(self):
+    self.position = 0
+    self.pieces = []
+    self.closed = False
+
+  def write(self, data):
+    self.pieces.append(bytes(data))
+    self.position += len(data)
+    return len(data)
+
+  def tell(self):
+    return self.position
+
+  def flush(self):
+    pass
+
+  def close(self):
+    self.closed = True
+
+  def drain(self):
+    data = b"".join(self.pieces)
+    self.pieces = []
+    return data
+
+
+def table_chunks(blocks, output_format, point_fields=()):
+  """
+  Bytes of the blocks of results (ResultColumns of each chunk) as an Arrow IPC stream or a Parquet file,
+  generated lazily: one piece for each block, so only a block is held in memory
+  """
+  require_pyarrow(output_format)
+  schema = table_schema(point_fields)
+  sink = _DrainedSink()
+  if output_format == "parquet":
+    writer = pyarrow.parquet.ParquetWriter(sink, schema)
+  else:
+    writer = pyarrow.ipc.new_stream(sink, schema)
+
+  for columns in blocks:
+    writer.write_batch(record_batch(columns, schema))
+    yield sink.drain()
+
+  writer.close()
+  yield sink.drain()
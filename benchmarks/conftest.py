@@ -0,0 +1,78 @@
+import json
+import os
+from argparse import ArgumentTypeError
+from pathlib import Path
+import numpy as np
+import pytest
+from sqlalchemy.pool import StaticPool
+from sqlmodel import SQLModel, Session, create_engine
+from pytest_benchmark.utils import parse_compare_fail
+from app.database.models import Substance, CorrelationSpecificHeat
+from app.models.input import Input
+from app.repositories.component_catalog import invalidate_component_catalog
+from app.services.thermodynamics.steam.property_cache import steam_property_cache
+# Payload of the input of the tests, shared as a fixture of the benchmarks
+from tests.conftest import valid_input_payload
+
+# Benchmarks of the hot paths, each one in scalar mode and in batch mode of the sizes of benchmarks/sizes.py.
+# They run apart from the tests: `pytest benchmarks` (see the README for baselines and regression gates)
+
+# Baselines are stored next to the benchmarks, one JSON file per saved run. They depend on the machine and are not
+# committed: CI saves one of the target branch and compares against it on the same runner (see the README)
+BASELINES = Path(__file__).parent / ".baselines"
+
+DEFAULT_SUBSTANCES = Path(__file__).parent.parent / "app" / "database" / "default_substances.json"
+
+
+def pytest_addoption(parser):
+  parser.addoption(
+    "--max-slowdown",
+    default=os.getenv("BENCHMARK_MAX_SLOWDOWN") or "20",
+    help="Slowdown of the mean, in whole %%, over the compared baseline that fails a benchmark (default: BENCHMARK_MAX_SLOWDOWN or 20)"
+  )
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config):
+  # Defaults of pytest-benchmark for this suite, before its session reads them: the storage of the baselines
+  # and, when comparing without an explicit --benchmark-compare-fail, the regression gate of --max-slowdown
+  if config.option.benchmark_storage == "file://./.benchmarks":
+    config.option.benchmark_storage = f"file://{BASELINES}"
+  if config.option.benchmark_compare and not config.option.benchmark_compare_fail:
+    try:
+      config.option.benchmark_compare_fail = [parse_compare_fail(f"mean:{config.option.max_slowdown}%")]
+    except ArgumentTypeError:
+      raise pytest.UsageError(f"--max-slowdown must be a whole percentage, not {config.option.max_slowdown!r}")
+
+
+@pytest.fixture
+def valid_input(valid_input_payload):
+  return Input(**valid_input_payload)
+
+
+@pytest.fixture
+def memory_session():
+  """Session of an in-memory SQLite database seeded with the default substances, loaded into a fresh component catalog"""
+  engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+  SQLModel.metadata.create_all(engine)
+  with Session(engine) as session:
+    for item in json.loads(DEFAULT_SUBSTANCES.read_text(encoding="utf-8")):
+      substance = Substance(**{name: item[name] for name in ("name", "molar_mass", "lower_calorific_value", "formula", "cas_number", "is_default")})
+      session.add(substance)
+      session.flush()
+      session.add(CorrelationSpecificHeat(substance_id=substance.id, **{name: item[name] for name in ("param_A", "param_B", "param_C", "param_D", "is_default")}))
+    session.commit()
+    invalidate_component_catalog()
+    yield session
+  invalidate_component_catalog()
+
+
+@pytest.fixture
+def no_property_cache(monkeypatch):
+  """Disabling the steam property cache, so the scalar benchmarks evaluate the correlations at each call"""
+  monkeypatch.setattr(steam_property_cache, "maxsize", 0)
+
+
+@pytest.fixture
+def generator():
+  return np.random.default_rng(0)
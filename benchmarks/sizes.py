@@ -0,0 +1,6 @@
+# Sizes of the batch mode of the benchmarks
+BATCH_SIZES = [1, 1000, 100000]
+
+# Whole simulations take about a millisecond each: batches of 100k (beyond SIMULATION_BATCH_MAX_SIZE
+# of the API) would take minutes per round, so they are benchmarked up to 1k
+SIMULATION_BATCH_SIZES = [1, 1000]
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+from types import SimpleNamespace
+from benchmarks.sizes import BATCH_SIZES
+from app.repositories.repositories_container import RepositoriesContainer
+from app.services.orchestrators.brayton_cycle import BraytonCycle
+from app.services.orchestrators.rankine_cycle import RankineCycle
+from app.services.thermodynamics.heat.icph import ICPH
+from app.services.thermodynamics.steam.saturation_parameters import SaturationParameters
+
+@pytest.fixture
+def catalog(memory_session):
+  return RepositoriesContainer(memory_session).component_catalog
+
+@pytest.fixture
+def brayton_cycle(valid_input, catalog):
+  return BraytonCycle(valid_input, catalog, catalog, SaturationParameters())
+
+@pytest.fixture
+def rankine_cycle(valid_input, catalog, brayton_cycle):
+  rankine_cycle = RankineCycle(valid_input, catalog, catalog, heat_suplier_cycle=brayton_cycle.run(), saturation_parameters=SaturationParameters())
+  rankine_cycle.run()
+  return rankine_cycle
+
+@pytest.mark.benchmark(group="exhaustion_gas_temp")
+def test_exhaustion_gas_temp_scalar(benchmark, valid_input, catalog):
+  # A new cycle for each call, as the gas turbine keeps its results per input; its properties are computed before timing
+  def setup():
+    brayton_cycle = BraytonCycle(valid_input, catalog, catalog, SaturationParameters())
+    brayton_cycle.gas_turbine.combustion_gas_properties()
+    return (brayton_cycle.gas_turbine,), {}
+
+  benchmark.pedantic(lambda gas_turbine: gas_turbine.exhaustion_gas_temp(), setup=setup, rounds=2000)
+
+@pytest.mark.benchmark(group="exhaustion_gas_temp")
+@pytest.mark.parametrize("size", BATCH_SIZES)
+def test_exhaustion_gas_temp_batch(benchmark, brayton_cycle, generator, size):
+  combustion_gas = brayton_cycle.gas_turbine.combustion_gas_properties()
+  icph_params = ICPH.stack_params([combustion_gas["icph_params"]]) * generator.uniform(0.95, 1.05, (size, 4))
+  heat_supplied = generator.uniform(400, 900, size)
+  benchmark(brayton_cycle.gas_turbine.exhaustion_temperature_array, heat_supplied, icph_params, combustion_gas["molar_mass"])
+
+@pytest.mark.benchmark(group="hrsg_mass_flow")
+def test_hrsg_get_mass_flow_scalar(benchmark, valid_input, rankine_cycle):
+  hrsg_params = rankine_cycle.context["hrsg_params"]
+  benchmark(rankine_cycle.hrsg.get_mass_flow, valid_input, hrsg_params, rankine_cycle.context["hrsg_heat"])
+
+@pytest.mark.benchmark(group="hrsg_mass_flow")
+@pytest.mark.parametrize("size", BATCH_SIZES)
+def test_hrsg_get_mass_flow_batch(benchmark, valid_input, rankine_cycle, generator, size):
+  columns = SimpleNamespace(
+    high_steam_level_fraction=generator.uniform(50, 70, size),
+    medium_steam_level_fraction=generator.uniform(10, 30, size),
+    purge_level=generator.uniform(0, 5, size)
+  )
+  hrsg_params = {name: np.full(size, value) for name, value in rankine_cycle.context["hrsg_params"].items()}
+  heat_supplied = rankine_cycle.context["hrsg_heat"] * generator.uniform(0.5, 1, size)
+  benchmark(rankine_cycle.hrsg.get_mass_flow_array, columns, hrsg_params, heat_supplied)
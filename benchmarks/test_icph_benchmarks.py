@@ -0,0 +1,19 @@
+import numpy as np
+import pytest
+from benchmarks.sizes import BATCH_SIZES
+from app.services.thermodynamics.heat.icph import ICPH
+
+# ICPH params and molar mass of a combustion gas
+ICPH_PARAMS = {"param_A": 3.5, "param_B": 6.0e-4, "param_C": 0.0, "param_D": -1.5e4}
+MOLAR_MASS = 28.3
+
+@pytest.mark.benchmark(group="icph")
+def test_icph_calc_heat_scalar(benchmark):
+  benchmark(ICPH().icph_calc_heat, ICPH_PARAMS, MOLAR_MASS, 25, 565)
+
+@pytest.mark.benchmark(group="icph")
+@pytest.mark.parametrize("size", BATCH_SIZES)
+def test_icph_calc_heat_batch(benchmark, generator, size):
+  icph_params = ICPH.stack_params([ICPH_PARAMS]) * generator.uniform(0.9, 1.1, (size, 4))
+  molar_mass = generator.uniform(27, 30, size)
+  benchmark(ICPH().icph_calc_heat_array, icph_params, molar_mass, 25, generator.uniform(400, 600, size))
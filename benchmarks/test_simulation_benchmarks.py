@@ -0,0 +1,54 @@
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.database.session import get_session
+from app.controllers.simulation_controller import create_batch_simulation
+from app.models.input import Input
+from app.repositories.repositories_container import RepositoriesContainer
+from app.services.orchestrators.full_cycles import FullCycles
+from app.services.orchestrators.simulation_cache import simulation_cache
+from benchmarks.sizes import SIMULATION_BATCH_SIZES
+
+@pytest.fixture
+def inputs(valid_input_payload):
+  """Inputs differing in their local temperature, so that no result is shared between them"""
+  def _inputs(size):
+    return [Input(**dict(valid_input_payload, local_temperature=10 + 10 * i / size)) for i in range(size)]
+  return _inputs
+
+@pytest.fixture
+def no_simulation_cache(monkeypatch):
+  """Disabling the simulation result cache, so that each request computes its simulation"""
+  monkeypatch.setattr(simulation_cache, "maxsize", 0)
+  simulation_cache.clear()
+
+@pytest.fixture
+def client(memory_session, no_simulation_cache):
+  """ASGI test client of the API on the in-memory database"""
+  app.dependency_overrides[get_session] = lambda: memory_session
+  with TestClient(app) as client:
+    yield client
+  app.dependency_overrides.pop(get_session)
+
+@pytest.mark.benchmark(group="full_cycles")
+def test_full_cycles_scalar(benchmark, valid_input, memory_session):
+  repos = RepositoriesContainer(memory_session)
+  benchmark(lambda: FullCycles(valid_input, repos).create_full_cycles_combined())
+
+@pytest.mark.benchmark(group="full_cycles")
+@pytest.mark.parametrize("size", SIMULATION_BATCH_SIZES)
+def test_full_cycles_batch(benchmark, inputs, memory_session, size):
+  batch = inputs(size)
+  benchmark(create_batch_simulation, batch, memory_session)
+
+@pytest.mark.benchmark(group="post_simulation")
+def test_post_simulation(benchmark, client, valid_input_payload):
+  response = benchmark(client.post, "/simulation", json=valid_input_payload)
+  assert response.status_code == 200
+
+@pytest.mark.benchmark(group="post_simulation")
+@pytest.mark.parametrize("size", SIMULATION_BATCH_SIZES)
+def test_post_simulation_batch(benchmark, client, inputs, size):
+  payload = [input.model_dump() for input in inputs(size)]
+  response = benchmark(client.post, "/simulation/batch", json=payload)
+  assert response.status_code == 200
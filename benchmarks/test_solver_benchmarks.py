@@ -0,0 +1,29 @@
+import pytest
+from benchmarks.sizes import BATCH_SIZES
+from app.services.thermodynamics.steam.entropy import Entropy, isentropic_temperature_estimate
+from app.services.thermodynamics.steam.saturation_parameters import SaturationParameters
+from app.services.utils.newton_method import NewtonMethod
+
+@pytest.fixture
+def isentropic_expansions(generator):
+  """Inlet entropies of the steam at 98.8 bar and 450-600 °C, expanded to outlet pressures of 20-30 bar,
+  with the ideal gas estimates of the outlet temperatures as initial guesses (like the high steam turbine)"""
+  saturation_parameters = SaturationParameters()
+  entropy = Entropy(saturation_parameters)
+  def _expansions(size):
+    inlet_temperature = generator.uniform(450, 600, size)
+    outlet_pressure = generator.uniform(20, 30, size)
+    inlet_entropy = entropy.overheated_steam_array(98.8, inlet_temperature)
+    initial_guess = isentropic_temperature_estimate(inlet_temperature, 98.8, outlet_pressure)
+    return inlet_entropy, entropy, outlet_pressure, saturation_parameters, initial_guess
+  return _expansions
+
+@pytest.mark.benchmark(group="newton_method")
+def test_newton_method_scalar(benchmark, isentropic_expansions, no_property_cache):
+  inlet_entropy, entropy, outlet_pressure, saturation_parameters, initial_guess = isentropic_expansions(1)
+  benchmark(NewtonMethod().run, float(inlet_entropy[0]), entropy, float(outlet_pressure[0]), saturation_parameters, float(initial_guess[0]))
+
+@pytest.mark.benchmark(group="newton_method")
+@pytest.mark.parametrize("size", BATCH_SIZES)
+def test_newton_method_batch(benchmark, isentropic_expansions, size):
+  benchmark(NewtonMethod().run_array, *isentropic_expansions(size))
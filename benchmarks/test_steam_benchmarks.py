@@ -0,0 +1,75 @@
+import pytest
+from benchmarks.sizes import BATCH_SIZES
+from app.services.thermodynamics.steam.enthalpy import Enthalpy
+from app.services.thermodynamics.steam.entropy import Entropy
+from app.services.thermodynamics.steam.saturation_parameters import SaturationParameters
+
+@pytest.fixture
+def saturation_parameters():
+  return SaturationParameters()
+
+@pytest.fixture
+def steam_states(generator, saturation_parameters):
+  """States of overheated steam: pressures in bar and temperatures in °C above their saturation"""
+  def _states(size):
+    pressure = generator.uniform(0.1, 100, size)
+    temperature = saturation_parameters.saturation_temperature_array(pressure) + generator.uniform(10, 250, size)
+    return pressure, temperature
+  return _states
+
+@pytest.mark.benchmark(group="saturation_temperature")
+def test_saturation_temperature_scalar(benchmark, saturation_parameters, no_property_cache):
+  benchmark(saturation_parameters.saturation_temperature, 24)
+
+@pytest.mark.benchmark(group="saturation_temperature")
+@pytest.mark.parametrize("size", BATCH_SIZES)
+def test_saturation_temperature_batch(benchmark, saturation_parameters, steam_states, size):
+  pressure, _ = steam_states(size)
+  benchmark(saturation_parameters.saturation_temperature_array, pressure)
+
+@pytest.mark.benchmark(group="saturation_pressure")
+def test_saturation_pressure_scalar(benchmark, saturation_parameters, no_property_cache):
+  benchmark(saturation_parameters.saturation_pressure, 15)
+
+@pytest.mark.benchmark(group="saturation_pressure")
+@pytest.mark.parametrize("size", BATCH_SIZES)
+def test_saturation_pressure_batch(benchmark, saturation_parameters, generator, size):
+  benchmark(saturation_parameters.saturation_pressure_array, generator.uniform(1, 370, size))
+
+@pytest.mark.benchmark(group="enthalpy")
+def test_enthalpy_overheated_steam_scalar(benchmark, saturation_parameters, no_property_cache):
+  benchmark(Enthalpy(saturation_parameters).overheated_steam, 98.8, 565)
+
+@pytest.mark.benchmark(group="enthalpy")
+@pytest.mark.parametrize("size", BATCH_SIZES)
+def test_enthalpy_overheated_steam_batch(benchmark, saturation_parameters, steam_states, size):
+  benchmark(Enthalpy(saturation_parameters).overheated_steam_array, *steam_states(size))
+
+@pytest.mark.benchmark(group="enthalpy")
+def test_enthalpy_saturated_liquid_scalar(benchmark, saturation_parameters, no_property_cache):
+  benchmark(Enthalpy(saturation_parameters).saturated_liquid, 4)
+
+@pytest.mark.benchmark(group="enthalpy")
+@pytest.mark.parametrize("size", BATCH_SIZES)
+def test_enthalpy_saturated_liquid_batch(benchmark, saturation_parameters, steam_states, size):
+  pressure, _ = steam_states(size)
+  benchmark(Enthalpy(saturation_parameters).saturated_liquid_array, pressure)
+
+@pytest.mark.benchmark(group="entropy")
+def test_entropy_overheated_steam_scalar(benchmark, saturation_parameters, no_property_cache):
+  benchmark(Entropy(saturation_parameters).overheated_steam, 98.8, 565)
+
+@pytest.mark.benchmark(group="entropy")
+@pytest.mark.parametrize("size", BATCH_SIZES)
+def test_entropy_overheated_steam_batch(benchmark, saturation_parameters, steam_states, size):
+  benchmark(Entropy(saturation_parameters).overheated_steam_array, *steam_states(size))
+
+@pytest.mark.benchmark(group="entropy")
+def test_entropy_saturated_steam_scalar(benchmark, saturation_parameters, no_property_cache):
+  benchmark(Entropy(saturation_parameters).saturated_steam, 4)
+
+@pytest.mark.benchmark(group="entropy")
+@pytest.mark.parametrize("size", BATCH_SIZES)
+def test_entropy_saturated_steam_batch(benchmark, saturation_parameters, steam_states, size):
+  pressure, _ = steam_states(size)
+  benchmark(Entropy(saturation_parameters).saturated_steam_array, pressure)
@@ -1,6 +1,21 @@
 import pytest
-from app.controllers.simulation_controller import create_simulation
+from sqlmodel import Session
+from app.controllers.simulation_controller import create_simulation, create_batch_simulation, create_cached_simulation, create_sweep, iter_sweep, create_part_load, create_monte_carlo, iter_batch_simulation, iter_sweep_columns, simulate_batch, simulate_batch_columns, simulate_item, BATCH_MIN_VECTOR_SIZE, simulate_sweep, simulate_sweep_batch, sweep_input
 from tests.conftest import MockDB
+from app.models.output import Output
+from app.models.simulation_error import SimulationError
+from app.services.orchestrators.full_cycles import FullCyclesResult
+from app.utils.errors import ThermodynamicError, LogicConstraintError
+from app.services.orchestrators.simulation_cache import simulation_cache
+from app.models.sweep import SweepRequest
+from app.services.utils.stage_cache import StageMemo
+from app.models.part_load import PartLoadRequest
+from app.models.monte_carlo import MonteCarloRequest
+from app.services.orchestrators.monte_carlo import MonteCarlo
+from app.database.engine import engine
+from app.models.input import Input
+from app.repositories.repositories_container import RepositoriesContainer
+from app.controllers import simulation_controller
 
 def test_create_simulation_calls_full_cycles(mocker, fake_input, fake_db):
     """
@@ -25,4 +40,302 @@ def test_create_simulation_calls_full_cycles(mocker, fake_input, fake_db):
     # Checks if the method was called exactly once
     mock_full_cycles_instance.create_full_cycles_combined.assert_called_once()
     # Checks if the controller return is the method return
-    assert result == {"status": "ok"}
\ No newline at end of file
+    assert result == {"status": "ok"}
+
+def test_create_batch_simulation_returns_outputs_and_errors(mocker, fake_db):
+    """
+    Tests whether the batch controller runs every input, returning the
+    Output of each valid simulation and the error of each failing one.
+    """
+    valid_result = FullCyclesResult(*([10.0] * len(FullCyclesResult._fields)))
+
+    def fake_full_cycles(input, repos, saturation_mode=None, stage_memo=None):
+        instance = mocker.Mock()
+        if input == "invalid":
+            instance.create_full_cycles_combined.side_effect = ThermodynamicError("Impossible cycle")
+        else:
+            instance.create_full_cycles_combined.return_value = valid_result
+        return instance
+
+    mocker.patch("app.controllers.simulation_controller.FullCycles", side_effect=fake_full_cycles)
+    mock_repos_class = mocker.patch("app.controllers.simulation_controller.RepositoriesContainer")
+
+    result = create_batch_simulation(["valid", "invalid"], fake_db)
+
+    # Checks if the repositories are created once for the whole batch
+    mock_repos_class.assert_called_once_with(fake_db)
+    assert isinstance(result[0], Output)
+    assert result[0].LHV_fuel == 10.0
+    assert result[1] == SimulationError(error="Impossible cycle", type="ThermodynamicError")
+
+
+def test_create_batch_simulation_too_large(mocker, fake_db):
+    """
+    Tests whether the batch controller rejects batches above the configured maximum size.
+    """
+    mocker.patch("app.controllers.simulation_controller.settings.SIMULATION_BATCH_MAX_SIZE", 1)
+    with pytest.raises(LogicConstraintError):
+        create_batch_simulation(["first", "second"], fake_db)
+
+def test_create_cached_simulation_runs_once_per_input(mocker, fake_db):
+    """
+    Tests whether the controller serves a repeated input from the simulation cache.
+    """
+    simulation_cache.clear()
+    mock_create = mocker.patch("app.controllers.simulation_controller.create_simulation", return_value="results")
+    input = mocker.Mock()
+    input.model_dump.return_value = {"fuel_mass_flow": 53064.0}
+
+    first = create_cached_simulation(input, fake_db)
+    second = create_cached_simulation(input, fake_db)
+
+    assert first == ("results", "MISS")
+    assert second == ("results", "HIT")
+    mock_create.assert_called_once()
+    simulation_cache.clear()
+
+def test_create_cached_simulation_does_not_cache_errors(mocker, fake_db):
+    """
+    Tests whether a failing simulation runs again on the next request.
+    """
+    simulation_cache.clear()
+    mock_create = mocker.patch("app.controllers.simulation_controller.create_simulation", side_effect=ThermodynamicError("Impossible cycle"))
+    input = mocker.Mock()
+    input.model_dump.return_value = {"fuel_mass_flow": 1.0}
+
+    for _ in range(2):
+        with pytest.raises(ThermodynamicError):
+            create_cached_simulation(input, fake_db)
+
+    assert mock_create.call_count == 2
+    assert len(simulation_cache) == 0
+
+def test_create_sweep_returns_rows_in_design_order(mocker, fake_db, valid_input_payload):
+    """
+    Tests whether the sweep controller runs every point of the design with one shared stage memo,
+    reporting invalid points as errors without running them.
+    """
+    valid_result = FullCyclesResult(*([10.0] * len(FullCyclesResult._fields)))
+    mock_full_cycles = mocker.patch("app.controllers.simulation_controller.FullCycles")
+    mock_full_cycles.return_value.create_full_cycles_combined.return_value = valid_result
+    mocker.patch("app.controllers.simulation_controller.RepositoriesContainer")
+
+    # 300 °C is above the maximum chimney gas temperature
+    request = SweepRequest(base=valid_input_payload, variables=[{"field": "chimney_gas_temperature", "values": [90, 300, 110]}])
+    rows = create_sweep(request, fake_db)
+
+    assert [row.point for row in rows] == [{"chimney_gas_temperature": value} for value in (90, 300, 110)]
+    assert isinstance(rows[0].result, Output)
+    assert rows[1].result.type == "InputValidationError"
+    assert isinstance(rows[2].result, Output)
+
+    # Only the valid points run, sharing the same memo
+    assert mock_full_cycles.call_count == 2
+    memos = {id(call.args[3]) for call in mock_full_cycles.call_args_list}
+    assert len(memos) == 1
+    assert isinstance(mock_full_cycles.call_args.args[3], StageMemo)
+    assert [call.args[0].chimney_gas_temperature for call in mock_full_cycles.call_args_list] == [90, 110]
+
+def test_create_sweep_too_large(mocker, fake_db, valid_input_payload):
+    """
+    Tests whether the sweep controller rejects designs above the configured maximum size.
+    """
+    mocker.patch("app.controllers.simulation_controller.settings.SIMULATION_BATCH_MAX_SIZE", 3)
+    request = SweepRequest(base=valid_input_payload, variables=[
+        {"field": "chimney_gas_temperature", "values": [90, 100]},
+        {"field": "purge_level", "values": [0, 1]}
+    ])
+    with pytest.raises(LogicConstraintError):
+        create_sweep(request, fake_db)
+
+def test_iter_sweep_streams_in_its_own_session(mocker, valid_input_payload):
+    """
+    Tests whether the sweep generator checks the size at once, and runs the points in its own session,
+    opened when the stream starts and closed when it ends.
+    """
+    mock_full_cycles = mocker.patch("app.controllers.simulation_controller.FullCycles")
+    mock_full_cycles.return_value.create_full_cycles_combined.return_value = FullCyclesResult(*([10.0] * len(FullCyclesResult._fields)))
+    mocker.patch("app.controllers.simulation_controller.RepositoriesContainer")
+    mock_session = mocker.patch("app.controllers.simulation_controller.Session")
+
+    request = SweepRequest(base=valid_input_payload, variables=[{"field": "chimney_gas_temperature", "values": [90, 110]}])
+    rows = iter_sweep(request)
+    assert mock_session.call_count == 0
+    assert [row.point for row in rows] == [{"chimney_gas_temperature": value} for value in (90, 110)]
+    mock_session.return_value.__enter__.assert_called_once()
+    mock_session.return_value.__exit__.assert_called_once()
+
+    mocker.patch("app.controllers.simulation_controller.settings.SIMULATION_BATCH_MAX_SIZE", 1)
+    with pytest.raises(LogicConstraintError):
+        iter_sweep(request)
+
+def test_create_part_load_groups_curves_by_ambient(mocker, fake_db, valid_input_payload):
+    """
+    Tests whether the part-load controller runs every load of every ambient condition in one sweep,
+    grouping the results in one curve per condition, in increasing load.
+    """
+    mock_simulate_sweep = mocker.patch("app.controllers.simulation_controller.simulate_sweep", side_effect=lambda items, repos, mode: iter(items))
+    mocker.patch("app.controllers.simulation_controller.RepositoriesContainer")
+    mocker.patch("app.controllers.simulation_controller.PartLoadPoint", side_effect=lambda **point: point)
+    mocker.patch("app.controllers.simulation_controller.PartLoadCurve", side_effect=lambda **curve: curve)
+    mocker.patch("app.controllers.simulation_controller.PartLoadResult", side_effect=lambda **result: result)
+
+    request = PartLoadRequest(base=valid_input_payload, loads=[1.0, 0.5], ambient=[{"field": "local_temperature", "values": [10, 30]}])
+    result = create_part_load(request, fake_db)
+
+    mock_simulate_sweep.assert_called_once()
+    assert result["evaluations"] == 4
+    assert [curve["ambient"] for curve in result["curves"]] == [{"local_temperature": 10}, {"local_temperature": 30}]
+    for curve in result["curves"]:
+        assert [point["load"] for point in curve["points"]] == [0.5, 1.0]
+        for point in curve["points"]:
+            assert point["fuel_mass_flow"] == point["load"] * valid_input_payload["fuel_mass_flow"]
+            assert point["result"].fuel_mass_flow == point["fuel_mass_flow"]
+            assert point["result"].local_temperature == curve["ambient"]["local_temperature"]
+
+def test_create_part_load_too_large(mocker, fake_db, valid_input_payload):
+    """
+    Tests whether the part-load controller rejects grids above the configured maximum size.
+    """
+    mocker.patch("app.controllers.simulation_controller.settings.SIMULATION_BATCH_MAX_SIZE", 10)
+    request = PartLoadRequest(base=valid_input_payload, points=11)
+    with pytest.raises(LogicConstraintError):
+        create_part_load(request, fake_db)
+
+def test_create_monte_carlo_runs_chunks(mocker, fake_db, valid_input_payload):
+    """
+    Tests whether the Monte Carlo controller simulates (through the array kernels) and aggregates the samples chunk by chunk,
+    counting the samples out of the Input limits as failures.
+    """
+    valid_result = FullCyclesResult(*([10.0] * len(FullCyclesResult._fields)))
+    mock_full_cycles = mocker.patch("app.controllers.simulation_controller.FullCycles")
+    mock_full_cycles.return_value.create_full_cycles_combined.return_value = valid_result
+    mocker.patch("app.controllers.simulation_controller.RepositoriesContainer")
+    mocker.patch.object(MonteCarlo, "chunk_size", 4)
+    mock_simulate_sweep = mocker.spy(simulation_controller, "simulate_sweep_batch")
+
+    # Half of the local temperatures are below the minimum of 5 °C
+    request = MonteCarloRequest(base=valid_input_payload, samples=10, seed=1, distributions=[
+        {"field": "local_temperature", "distribution": "uniform", "lower": 0, "upper": 10}
+    ])
+    result = create_monte_carlo(request, fake_db)
+
+    assert mock_simulate_sweep.call_count == 3
+    assert result.samples == 10
+    assert result.successes + result.failures.get("InputValidationError", 0) == 10
+    assert 0 < result.successes < 10
+    assert result.statistics["net_power_cycle_combined"].mean == 10
+
+def test_create_monte_carlo_too_many_samples(mocker, fake_db, valid_input_payload):
+    """
+    Tests whether the Monte Carlo controller rejects more samples than the configured maximum.
+    """
+    mocker.patch("app.controllers.simulation_controller.settings.MONTE_CARLO_MAX_SAMPLES", 100)
+    request = MonteCarloRequest(base=valid_input_payload, samples=101, distributions=[
+        {"field": "local_temperature", "distribution": "normal", "mean": 15, "std": 1}
+    ])
+    with pytest.raises(LogicConstraintError):
+        create_monte_carlo(request, fake_db)
+
+def test_iter_batch_simulation_is_lazy(mocker):
+    """
+    Tests whether the batch generator checks the size at once, but runs each chunk only when its results are requested,
+    in its own session opened when the stream starts and closed when it ends.
+    """
+    mocker.patch("app.controllers.simulation_controller.BATCH_CHUNK_SIZE", 1)
+    mock_full_cycles = mocker.patch("app.controllers.simulation_controller.FullCycles")
+    mock_full_cycles.return_value.create_full_cycles_combined.return_value = FullCyclesResult(*([10.0] * len(FullCyclesResult._fields)))
+    mocker.patch("app.controllers.simulation_controller.RepositoriesContainer")
+    mock_session = mocker.patch("app.controllers.simulation_controller.Session")
+
+    results = iter_batch_simulation(["first", "second"])
+    assert mock_full_cycles.call_count == 0
+    assert mock_session.call_count == 0
+    next(results)
+    assert mock_full_cycles.call_count == 1
+    mock_session.return_value.__enter__.assert_called_once()
+    assert len(list(results)) == 1
+    mock_session.return_value.__exit__.assert_called_once()
+
+    mocker.patch("app.controllers.simulation_controller.settings.SIMULATION_BATCH_MAX_SIZE", 1)
+    with pytest.raises(LogicConstraintError):
+        iter_batch_simulation(["first", "second"])
+
+def test_simulate_batch_matches_single_simulations(valid_input_payload):
+    """
+    Tests whether a chunk run by the array kernels returns the Outputs of the single simulations, in order.
+    """
+    inputs = [
+        Input(**{**valid_input_payload, "local_temperature": 10 + index, "fuel_mass_flow": 45000 + 500 * index})
+        for index in range(BATCH_MIN_VECTOR_SIZE)
+    ]
+    with Session(engine) as db:
+        repos = RepositoriesContainer(db)
+        assert simulate_batch(inputs, repos) == [simulate_item(input, repos) for input in inputs]
+
+def test_simulate_batch_reports_errors_per_item(mocker, valid_input_payload):
+    """
+    Tests whether the failing items of a chunk are run alone, each with its own error,
+    while the other items run again through the array kernels.
+    """
+    inputs = [Input(**valid_input_payload) for _ in range(2 * simulation_controller.BATCH_MIN_VECTOR_SIZE)]
+    for index in (3, 20):
+        inputs[index] = Input(**{**valid_input_payload, "high_steam_level_temperature": 300})
+    array_pass = mocker.spy(simulation_controller.FullCycles, "create_full_cycles_combined_array")
+    single_simulation = mocker.spy(simulation_controller.FullCycles, "create_full_cycles_combined")
+    with Session(engine) as db:
+        result = simulation_controller.simulate_batch(inputs, RepositoriesContainer(db))
+
+    assert array_pass.call_count == 2
+    assert single_simulation.call_count == 2
+    for index in (3, 20):
+        assert result[index].type == "ThermodynamicError"
+        assert "high steam temperature is below saturation" in result[index].error
+    assert all(isinstance(output, Output) for index, output in enumerate(result) if index not in (3, 20))
+
+def test_simulate_sweep_batch_matches_simulate_sweep(valid_input_payload):
+    """
+    Tests whether a chunk of sweep inputs run by the array kernels returns the rows of the per-point sweep,
+    keeping the errors of the invalid points in place.
+    """
+    base = Input(**valid_input_payload)
+    # Local temperatures below 5 °C are out of the Input limits
+    items = [sweep_input(base, {"local_temperature": 2 + index}) for index in range(BATCH_MIN_VECTOR_SIZE + 4)]
+    assert isinstance(items[0], SimulationError)
+    with Session(engine) as db:
+        repos = RepositoriesContainer(db)
+        assert simulate_sweep_batch(items, repos) == list(simulate_sweep(items, repos))
+
+def test_simulate_batch_columns_reports_output_bounds_per_item(mocker, valid_input_payload):
+    """
+    Tests whether the columnar results of a chunk keep the arrays of the kernels, with the items out of the Output bounds
+    failing the validation of their Output alone.
+    """
+    inputs = [Input(**{**valid_input_payload, "local_temperature": 10 + index}) for index in range(BATCH_MIN_VECTOR_SIZE)]
+    array_pass = simulation_controller.FullCycles.create_full_cycles_combined_array
+
+    def out_of_bounds(full_cycles):
+        results = array_pass(full_cycles)
+        results.net_cycle_combined_efficiency[2] = 150.0
+        return results
+
+    with Session(engine) as db:
+        repos = RepositoriesContainer(db)
+        expected = simulate_batch(inputs, repos)
+        mocker.patch.object(simulation_controller.FullCycles, "create_full_cycles_combined_array", out_of_bounds)
+        columns = simulate_batch_columns(inputs, repos)
+
+    assert columns.failed.tolist() == [index == 2 for index in range(len(inputs))]
+    assert columns.errors[2].type == "OutputValidationError"
+    assert [row for index, row in enumerate(columns.rows()) if index != 2] == [row for index, row in enumerate(expected) if index != 2]
+
+def test_iter_sweep_columns_matches_iter_sweep(valid_input_payload):
+    """
+    Tests whether the columnar sweep yields the results of the streamed rows, with the varied field ahead of the Output fields.
+    """
+    request = SweepRequest(base=Input(**valid_input_payload), variables=[{"field": "local_temperature", "start": 2, "stop": 30, "num": 20}])
+    blocks = list(iter_sweep_columns(request))
+    rows = list(iter_sweep(request))
+
+    assert [row.point["local_temperature"] for row in rows] == [value for block in blocks for value in block.columns["local_temperature"].tolist()]
+    assert [row.result for row in rows] == [result for block in blocks for result in block.rows()]
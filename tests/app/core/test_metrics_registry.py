@@ -0,0 +1,87 @@
+import pytest
+from app.core.metrics import MetricsRegistry, timed
+from app.utils.lru_cache import LRUCache
+
+def test_histogram_renders_cumulative_buckets():
+  """Test the buckets, sum and count of a histogram in the Prometheus text format."""
+  registry = MetricsRegistry()
+  histogram = registry.histogram("duration_seconds", "Duration", ("stage",), buckets=(0.1, 1))
+  histogram.observe(0.05, "hrsg")
+  histogram.observe(0.1, "hrsg")
+  histogram.observe(5, "hrsg")
+
+  lines = registry.render().splitlines()
+
+  assert "# TYPE duration_seconds histogram" in lines
+  assert 'duration_seconds_bucket{stage="hrsg",le="0.1"} 2' in lines
+  assert 'duration_seconds_bucket{stage="hrsg",le="1"} 2' in lines
+  assert 'duration_seconds_bucket{stage="hrsg",le="+Inf"} 3' in lines
+  assert 'duration_seconds_sum{stage="hrsg"} 5.15' in lines
+  assert 'duration_seconds_count{stage="hrsg"} 3' in lines
+
+def test_histogram_observe_array_matches_observe():
+  """Test the array observations counting like the scalar ones."""
+  registry = MetricsRegistry()
+  scalar = registry.histogram("scalar", "Iterations", buckets=(1, 2, 5))
+  array = registry.histogram("array", "Iterations", buckets=(1, 2, 5))
+  values = [1, 2, 2, 3, 7]
+  for value in values:
+    scalar.observe(value)
+  array.observe_array(values)
+
+  assert scalar.samples() == [line.replace("array", "scalar") for line in array.samples()]
+
+def test_counter_and_escaped_labels():
+  """Test the counts by label values, with the quotes of the values escaped."""
+  registry = MetricsRegistry()
+  counter = registry.counter("errors", "Errors", ("type",))
+  counter.inc("ThermodynamicError")
+  counter.inc("ThermodynamicError")
+  counter.inc('Odd "type"')
+
+  assert counter.value("ThermodynamicError") == 2
+  assert 'errors_total{type="Odd \\"type\\""} 1' in registry.render().splitlines()
+
+def test_disabled_registry_records_nothing():
+  """Test the observations and the timed functions while the metrics are disabled."""
+  registry = MetricsRegistry(enabled=False)
+  histogram = registry.histogram("duration_seconds", "Duration", ("stage",))
+  counter = registry.counter("errors", "Errors", ("type",))
+  function = timed(histogram, "stage")(lambda x: x * 2)
+
+  assert function(21) == 42
+  histogram.observe(1, "stage")
+  counter.inc("ThermodynamicError")
+
+  assert histogram.count("stage") == 0
+  assert counter.value("ThermodynamicError") == 0
+
+def test_timed_observes_failed_calls():
+  """Test the duration of a call raising an error being observed, and the error propagated."""
+  registry = MetricsRegistry()
+  histogram = registry.histogram("duration_seconds", "Duration", ("stage",))
+
+  @timed(histogram, "condenser")
+  def failing():
+    raise ValueError("failed")
+
+  with pytest.raises(ValueError):
+    failing()
+  assert histogram.count("condenser") == 1
+
+def test_registered_cache_statistics():
+  """Test the hits, misses and hit ratio of a registered cache, read at each export."""
+  registry = MetricsRegistry()
+  cache = LRUCache(maxsize=10)
+  registry.register_cache("simulation", cache)
+  cache.put("a", 1)
+  cache.get("a")
+  cache.get("b")
+
+  lines = registry.render().splitlines()
+
+  assert "# TYPE cycle_comb_cache_hits counter" in lines
+  assert 'cycle_comb_cache_hits_total{cache="simulation"} 1' in lines
+  assert 'cycle_comb_cache_misses_total{cache="simulation"} 1' in lines
+  assert 'cycle_comb_cache_hit_ratio{cache="simulation"} 0.5' in lines
+  assert 'cycle_comb_cache_entries{cache="simulation"} 1' in lines
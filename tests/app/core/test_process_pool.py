@@ -0,0 +1,86 @@
+import pytest
+from sqlmodel import Session
+from app.core.config import settings
+from app.core.process_pool import ProcessPool
+from app.database.engine import engine
+from app.core import process_pool
+from app.controllers.simulation_controller import create_batch_simulation
+from app.models.input import Input
+from app.repositories.component_catalog import component_catalog_version, invalidate_component_catalog
+
+def test_process_pool_map_chunks_keeps_the_order(monkeypatch):
+  """Test the chunked dispatch returning the results in the order of the items."""
+  monkeypatch.setattr(settings, "SIMULATION_CHUNK_SIZE", 3)
+  pool = ProcessPool(workers=2)
+  try:
+    # list() returns each chunk as it is: the concatenation must be the items
+    assert pool.map_chunks(list, list(range(10))) == list(range(10))
+  finally:
+    pool.shutdown()
+
+def test_process_pool_imap_chunks_is_lazy(monkeypatch):
+  """Test the generator dispatch yielding the results in order, and cancelling the chunks not started when closed."""
+  monkeypatch.setattr(settings, "SIMULATION_CHUNK_SIZE", 1)
+  pool = ProcessPool(workers=1)
+  try:
+    results = pool.imap_chunks(list, list(range(10)))
+    assert next(results) == 0
+    assert next(results) == 1
+    results.close()
+    assert pool.map_chunks(list, [5, 6]) == [5, 6]
+  finally:
+    pool.shutdown()
+
+def test_process_pool_imap_takes_chunks_lazily():
+  """Test the dispatch of an iterable of chunks, taken only as they are submitted (2 per worker ahead)."""
+  pool = ProcessPool(workers=1)
+  taken = []
+  def chunks():
+    for start in range(0, 10, 2):
+      taken.append(start)
+      yield [start, start + 1]
+  try:
+    results = pool.imap(sum, chunks())
+    assert next(results) == 1
+    assert taken == [0, 2]
+    assert list(results) == [5, 9, 13, 17]
+  finally:
+    pool.shutdown()
+
+def test_process_pool_chunk_size(monkeypatch):
+  """Test the automatic chunk size, about 4 chunks per worker."""
+  monkeypatch.setattr(settings, "SIMULATION_CHUNK_SIZE", 0)
+  pool = ProcessPool(workers=2)
+
+  assert pool.chunk_size(80) == 10
+  assert pool.chunk_size(3) == 1
+  pool.shutdown()
+
+def test_process_pool_workers_follow_the_catalog_version():
+  """Test the workers taking the catalog version of the server process, so an invalidation reaches them."""
+  pool = ProcessPool(workers=1)
+  try:
+    version = component_catalog_version()
+    assert pool.submit(component_catalog_version).result() == version
+    invalidate_component_catalog()
+    assert pool.submit(component_catalog_version).result() == version + 1
+  finally:
+    pool.shutdown()
+
+def test_batch_simulation_in_worker_processes(monkeypatch, valid_input_payload):
+  """Test a batch dispatched to the worker processes, with the same results of the threads."""
+  inputs = [Input(**{**valid_input_payload, "fuel_mass_flow": flow}) for flow in (45000, 50000, 55000)]
+  inputs.append(Input(**{**valid_input_payload, "methane_molar_fraction_fuel": 50}))
+
+  with Session(engine) as db:
+    expected = create_batch_simulation(inputs, db)
+
+    monkeypatch.setattr(settings, "SIMULATION_EXECUTOR", "process")
+    monkeypatch.setattr(settings, "SIMULATION_PROCESSES", 2)
+    try:
+      result = create_batch_simulation(inputs, db)
+    finally:
+      process_pool.shutdown_process_pool()
+
+  assert result == expected
+  assert result[-1].type == "LogicConstraintError"
@@ -0,0 +1,59 @@
+import pytest
+from app.core.metrics import timed_query, timed_stage
+from app.core.profiler import active_trace, profile_span, profiling, record_property, record_root_finder
+
+@timed_stage("outer")
+def outer(fail=False):
+  record_root_finder("newton", 4)
+  return inner(fail)
+
+@timed_stage("inner")
+def inner(fail):
+  record_property("Enthalpy.overheated_steam", True)
+  record_property("Enthalpy.overheated_steam", False)
+  record_property("ICPH.icph_calc_heat")
+  if fail:
+    raise ValueError("failed")
+  return query()
+
+@timed_query("Repository.get_all")
+def query():
+  return 42
+
+def test_profiling_builds_the_call_tree():
+  """Test the nested spans, root finder iterations, property lookups and queries of a trace."""
+  with profiling() as trace:
+    assert outer() == 42
+    with profile_span("after"):
+      pass
+  summary = trace.summary()
+
+  assert [span["name"] for span in summary["call_tree"]] == ["outer", "after"]
+  assert summary["call_tree"][0]["children"][0]["name"] == "inner"
+  assert summary["call_tree"][0]["children"][0]["children"][0]["kind"] == "query"
+  assert summary["root_finders"] == [{"stage": "outer", "method": "newton", "iterations": 4}]
+  assert summary["property_evaluations"]["Enthalpy.overheated_steam"] == {"lookups": 2, "cache_hits": 1, "evaluations": 1}
+  assert summary["property_evaluations"]["ICPH.icph_calc_heat"] == {"lookups": 1, "cache_hits": 0, "evaluations": 1}
+  assert summary["caches"]["steam_property"] == {"hits": 1, "misses": 1}
+  assert summary["database_round_trips"] == 1
+
+def test_profiling_marks_failed_spans():
+  """Test the error type on the spans of the failed calls, and the trace closed after them."""
+  with profiling() as trace:
+    with pytest.raises(ValueError):
+      outer(fail=True)
+  span = trace.summary()["call_tree"][0]
+
+  assert span["error"] == "ValueError"
+  assert span["children"][0]["error"] == "ValueError"
+  assert trace._stack == [trace.root]
+
+def test_hooks_without_active_trace():
+  """Test the hooks doing nothing outside of profiling()."""
+  with profiling():
+    pass
+
+  assert active_trace.get() is None
+  assert outer() == 42
+  with profile_span("stage") as span:
+    assert span is None
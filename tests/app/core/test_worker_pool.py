@@ -0,0 +1,82 @@
+import asyncio
+import threading
+import pytest
+from app.core.worker_pool import WorkerPool
+from app.utils.errors import OverloadedError
+
+def test_worker_pool_runs_outside_the_event_loop_thread():
+  """Test the call running in a worker thread and returning its result."""
+  pool = WorkerPool(workers=2, queue_depth=0)
+
+  result = asyncio.run(pool.run(lambda x: (x * 2, threading.current_thread().name), 21))
+
+  assert result[0] == 42
+  assert result[1].startswith("simulation")
+  pool.shutdown()
+
+def test_worker_pool_refuses_calls_beyond_capacity():
+  """Test the back-pressure with all workers busy and the queue full."""
+  pool = WorkerPool(workers=1, queue_depth=1, retry_after=3)
+  release = threading.Event()
+
+  async def scenario():
+    running = asyncio.ensure_future(pool.run(release.wait))
+    queued = asyncio.ensure_future(pool.run(lambda: "queued"))
+    await asyncio.sleep(0.05)
+
+    with pytest.raises(OverloadedError) as error:
+      await pool.run(lambda: "refused")
+    assert error.value.retry_after == 3
+
+    release.set()
+    assert await running is True
+    assert await queued == "queued"
+    # The slots are released after the calls
+    assert await pool.run(lambda: "accepted") == "accepted"
+
+  asyncio.run(scenario())
+  pool.shutdown()
+
+def test_worker_pool_streams_a_generator():
+  """Test the stream yielding each item of the generator, computed in the worker threads."""
+  pool = WorkerPool(workers=1, queue_depth=0)
+
+  def generator(count):
+    for i in range(count):
+      yield i, threading.current_thread().name
+
+  async def scenario():
+    return [item async for item in pool.stream(generator, 3)]
+
+  items = asyncio.run(scenario())
+  assert [i for i, _ in items] == [0, 1, 2]
+  assert all(name.startswith("simulation") for _, name in items)
+  pool.shutdown()
+
+def test_worker_pool_stream_closed_early():
+  """Test a stream closed by its consumer (client disconnected): no further item is computed and the slot is released."""
+  pool = WorkerPool(workers=1, queue_depth=0)
+  computed = []
+  closed = threading.Event()
+
+  def generator():
+    try:
+      for i in range(100):
+        computed.append(i)
+        yield i
+    finally:
+      closed.set()
+
+  async def scenario():
+    stream = pool.stream(generator)
+    # The slot is taken as soon as the stream is created
+    with pytest.raises(OverloadedError):
+      pool.stream(generator)
+    assert await stream.__anext__() == 0
+    await stream.aclose()
+    assert await asyncio.to_thread(closed.wait, 1)
+    assert await pool.run(lambda: "accepted") == "accepted"
+
+  asyncio.run(scenario())
+  assert computed == [0]
+  pool.shutdown()
@@ -0,0 +1,24 @@
+import pytest
+import numpy as np
+from app.models.input import Input
+from app.models.input_columns import InputColumns
+
+def make_input(**changes):
+  values = {name: field.json_schema_extra["example"] for name, field in Input.model_fields.items()}
+  values.update(changes)
+  return Input(**values)
+
+def test_from_inputs_builds_one_array_per_field():
+  """Testing columnar view of a list of inputs"""
+  inputs = [make_input(fuel_mass_flow=1000), make_input(fuel_mass_flow=2000)]
+  columns = InputColumns.from_inputs(inputs)
+
+  assert len(columns) == 2
+  assert isinstance(columns.fuel_mass_flow, np.ndarray)
+  assert columns.fuel_mass_flow.tolist() == [1000, 2000]
+  assert columns.high_steam_level_pressure.tolist() == [98, 98]
+
+def test_columns_with_different_lengths():
+  """Testing that all columns must describe the same operating points"""
+  with pytest.raises(ValueError):
+    InputColumns({"fuel_mass_flow": [1, 2], "purge_level": [1]})
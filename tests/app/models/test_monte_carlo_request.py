@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+from pydantic import ValidationError
+from app.models.monte_carlo import InputDistribution, MonteCarloRequest
+
+def test_input_distribution_draws():
+  generator = np.random.default_rng(0)
+  uniform = InputDistribution(field="local_temperature", distribution="uniform", lower=10, upper=20).draw(generator, 1000)
+  triangular = InputDistribution(field="local_temperature", distribution="triangular", lower=10, mode=12, upper=20).draw(generator, 1000)
+  normal = InputDistribution(field="local_temperature", distribution="normal", mean=15, std=2).draw(generator, 1000)
+
+  assert uniform.min() >= 10 and uniform.max() <= 20
+  assert triangular.min() >= 10 and triangular.max() <= 20
+  assert normal.mean() == pytest.approx(15, abs=0.3)
+
+def test_input_distribution_missing_parameters():
+  with pytest.raises(ValidationError, match="mean and std"):
+    InputDistribution(field="local_temperature", distribution="normal", mean=15)
+  with pytest.raises(ValidationError, match="lower and upper"):
+    InputDistribution(field="local_temperature", distribution="uniform", lower=10)
+  with pytest.raises(ValidationError, match="mode"):
+    InputDistribution(field="local_temperature", distribution="triangular", lower=10, mode=25, upper=20)
+
+def test_input_distribution_unknown_field():
+  with pytest.raises(ValidationError, match="Unknown Input field"):
+    InputDistribution(field="unknown", distribution="normal", mean=1, std=1)
+
+def test_monte_carlo_request_repeated_field(valid_input_payload):
+  distribution = {"field": "local_temperature", "distribution": "normal", "mean": 15, "std": 2}
+  with pytest.raises(ValidationError, match="only one distribution"):
+    MonteCarloRequest(base=valid_input_payload, distributions=[distribution, distribution])
+
+def test_monte_carlo_request_percentiles(valid_input_payload):
+  distribution = {"field": "local_temperature", "distribution": "normal", "mean": 15, "std": 2}
+  with pytest.raises(ValidationError, match="between 0 and 100"):
+    MonteCarloRequest(base=valid_input_payload, distributions=[distribution], percentiles=[50, 101])
@@ -0,0 +1,24 @@
+import pytest
+from pydantic import ValidationError
+from app.models.part_load import PartLoadRequest
+
+def test_part_load_request_range_loads(valid_input_payload):
+  request = PartLoadRequest(base=valid_input_payload, minimum_load=0.5, maximum_load=1.0, points=6)
+  assert request.load_points() == pytest.approx([0.5, 0.6, 0.7, 0.8, 0.9, 1.0])
+  assert request.load_points()[-1] == 1.0
+
+def test_part_load_request_sorted_loads(valid_input_payload):
+  request = PartLoadRequest(base=valid_input_payload, loads=[1.0, 0.6, 0.8])
+  assert request.load_points() == [0.6, 0.8, 1.0]
+
+def test_part_load_request_rejects_fuel_mass_flow_ambient(valid_input_payload):
+  with pytest.raises(ValidationError, match="loads"):
+    PartLoadRequest(base=valid_input_payload, ambient=[{"field": "fuel_mass_flow", "values": [40000]}])
+
+def test_part_load_request_rejects_inverted_range(valid_input_payload):
+  with pytest.raises(ValidationError, match="minimum load"):
+    PartLoadRequest(base=valid_input_payload, minimum_load=1.0, maximum_load=0.5)
+
+def test_part_load_request_rejects_non_positive_loads(valid_input_payload):
+  with pytest.raises(ValidationError, match="positive"):
+    PartLoadRequest(base=valid_input_payload, loads=[0, 1])
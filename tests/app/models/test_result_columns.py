@@ -0,0 +1,32 @@
+import numpy as np
+from app.models.output import Output
+from app.models.result_columns import ResultColumns
+from app.models.simulation_error import SimulationError
+
+OUTPUT = Output(**{field: 10.0 for field in Output.model_fields})
+ERROR = SimulationError(error="Impossible cycle", type="ThermodynamicError")
+
+def test_from_rows_builds_one_array_per_field():
+  """Testing columnar results of a list of Outputs and errors, back to the same rows"""
+  columns = ResultColumns.from_rows([OUTPUT, ERROR])
+
+  assert len(columns) == 2
+  assert columns.columns["LHV_fuel"][0] == 10.0
+  assert np.isnan(columns.columns["LHV_fuel"][1])
+  assert columns.failed.tolist() == [False, True]
+  assert columns.rows() == [OUTPUT, ERROR]
+
+def test_assemble_puts_the_parts_in_place():
+  """Testing the columns of a chunk put together from the results of some of its items"""
+  columns = ResultColumns.assemble(3, [([0, 2], ResultColumns.from_rows([OUTPUT, OUTPUT])), ([1], ResultColumns.from_rows([ERROR]))])
+
+  assert columns.rows() == [OUTPUT, ERROR, OUTPUT]
+  assert columns.take([1, 2]).rows() == [ERROR, OUTPUT]
+
+def test_valid_mask_checks_the_output_bounds():
+  """Testing the items out of the bounds of the Output fields, or not finite, flagged as invalid"""
+  columns = {field: np.full(3, 10.0) for field in Output.model_fields}
+  columns["net_cycle_combined_efficiency"][1] = 150.0
+  columns["LHV_fuel"][2] = np.nan
+
+  assert ResultColumns.valid_mask(columns).tolist() == [True, False, False]
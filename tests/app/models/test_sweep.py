@@ -0,0 +1,41 @@
+import pytest
+from pydantic import ValidationError
+from app.models.sweep import SweepVariable, SweepRequest
+
+def test_sweep_variable_range_points():
+  """Test that a range gives num evenly spaced values, ending exactly at stop"""
+  variable = SweepVariable(field="chimney_gas_temperature", start=90, stop=110, num=3)
+  assert variable.points() == [90, 100, 110]
+  assert variable.bounds() == (90, 110)
+
+def test_sweep_variable_values_bounds():
+  """Test that the bounds of a list of values are its extremes"""
+  variable = SweepVariable(field="chimney_gas_temperature", values=[110, 90, 100])
+  assert variable.points() == [110, 90, 100]
+  assert variable.bounds() == (90, 110)
+
+def test_sweep_variable_unknown_field():
+  """Test that only Input fields can be varied"""
+  with pytest.raises(ValidationError):
+    SweepVariable(field="unknown", values=[1])
+
+def test_sweep_variable_without_values():
+  """Test that a variable needs values or a range"""
+  with pytest.raises(ValidationError):
+    SweepVariable(field="chimney_gas_temperature", start=90)
+
+def test_sweep_request_latin_hypercube_needs_samples(valid_input_payload):
+  """Test that latin hypercube designs need the number of samples"""
+  with pytest.raises(ValidationError):
+    SweepRequest(base=valid_input_payload, variables=[{"field": "chimney_gas_temperature", "start": 90, "stop": 110}], design="latin_hypercube")
+
+def test_sweep_request_range_needs_num(valid_input_payload):
+  """Test that ranges of cartesian designs need the number of values"""
+  with pytest.raises(ValidationError):
+    SweepRequest(base=valid_input_payload, variables=[{"field": "chimney_gas_temperature", "start": 90, "stop": 110}])
+
+def test_sweep_request_repeated_field(valid_input_payload):
+  """Test that a field is varied only once"""
+  variable = {"field": "chimney_gas_temperature", "values": [90]}
+  with pytest.raises(ValidationError):
+    SweepRequest(base=valid_input_payload, variables=[variable, variable])
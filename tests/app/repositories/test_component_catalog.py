@@ -0,0 +1,95 @@
+import pytest
+from app.repositories import component_catalog
+from app.repositories.component_catalog import (
+  ComponentCatalog,
+  get_component_catalog,
+  invalidate_component_catalog,
+  component_catalog_version,
+  sync_component_catalog_version
+)
+
+class MockSubstanceRepository:
+  def __init__(self, results=None):
+    self.calls = 0
+    self.results = {
+      "methane": {"id": 1, "molar_mass": 16.043, "lower_calorific_value": 802625, "formula": "CH4"},
+      "water": {"id": 2, "molar_mass": 18.015, "lower_calorific_value": 0, "formula": "H2O"}
+    } if results is None else results
+  def get_all(self):
+    self.calls += 1
+    return self.results
+
+class MockICPHRepository:
+  def __init__(self):
+    self.calls = 0
+    self.results = {
+      1: {"param_A": 1.702, "param_B": 9.081e-3, "param_C": -2.164e-6, "param_D": 0},
+      2: {"param_A": 3.47, "param_B": 1.45e-3, "param_C": 0, "param_D": 0.121e5}
+    }
+  def get_all(self):
+    self.calls += 1
+    return self.results
+
+@pytest.fixture(autouse=True)
+def clean_catalog():
+  """Every test starts without a process-wide catalog"""
+  invalidate_component_catalog()
+  yield
+  invalidate_component_catalog()
+
+def test_catalog_reads_like_repositories():
+  """Testing that the catalog answers like SubstanceRepository and ICPHRepository"""
+  catalog = ComponentCatalog.from_repositories(MockSubstanceRepository(), MockICPHRepository())
+  assert catalog.get_all()["methane"] == {"id": 1, "molar_mass": 16.043, "lower_calorific_value": 802625, "formula": "CH4"}
+  assert catalog.get_by_substance_id(2) == {"param_A": 3.47, "param_B": 1.45e-3, "param_C": 0, "param_D": 0.121e5}
+  assert catalog.get_by_substance_id(99) is None
+
+def test_catalog_is_immutable():
+  """Testing that the snapshot can not be changed by the services"""
+  catalog = ComponentCatalog.from_repositories(MockSubstanceRepository(), MockICPHRepository())
+  with pytest.raises(TypeError):
+    catalog.get_all()["methane"]["molar_mass"] = 0
+  with pytest.raises(TypeError):
+    catalog.get_all()["hydrogen"] = {}
+
+def test_get_component_catalog_loads_once():
+  """Testing that the database is queried only on the first access"""
+  substance_repo = MockSubstanceRepository()
+  icph_repo = MockICPHRepository()
+  first = get_component_catalog(substance_repo, icph_repo)
+  second = get_component_catalog(substance_repo, icph_repo)
+  assert first is second
+  assert substance_repo.calls == 1
+  assert icph_repo.calls == 1
+
+def test_invalidate_component_catalog_reloads():
+  """Testing that the catalog is reloaded with a new version after invalidation"""
+  substance_repo = MockSubstanceRepository()
+  icph_repo = MockICPHRepository()
+  first = get_component_catalog(substance_repo, icph_repo)
+  invalidate_component_catalog()
+  second = get_component_catalog(substance_repo, icph_repo)
+  assert first is not second
+  assert second.version == first.version + 1 == component_catalog_version()
+  assert substance_repo.calls == 2
+
+def test_empty_database_is_not_cached():
+  """Testing that an empty snapshot is not kept, so the seed data is loaded later"""
+  empty_repo = MockSubstanceRepository(results={})
+  assert not get_component_catalog(empty_repo, MockICPHRepository()).get_all()
+  assert component_catalog._catalog is None
+
+def test_sync_component_catalog_version_discards_older_snapshot():
+  """Testing that a worker keeps its catalog at the same version, and reloads it at another version"""
+  substance_repo = MockSubstanceRepository()
+  icph_repo = MockICPHRepository()
+  first = get_component_catalog(substance_repo, icph_repo)
+
+  sync_component_catalog_version(first.version)
+  assert get_component_catalog(substance_repo, icph_repo) is first
+
+  sync_component_catalog_version(first.version + 1)
+  second = get_component_catalog(substance_repo, icph_repo)
+  assert second is not first
+  assert second.version == first.version + 1
+  assert substance_repo.calls == 2
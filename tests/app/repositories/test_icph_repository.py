@@ -38,4 +38,13 @@ def test_get_by_substance_id(db_session):
   substance_id = 1
   result = repo.get_by_substance_id(substance_id)
   assert len(result) == 4
-  assert result == ({"param_A": 1, "param_B": 2,"param_C": 3,"param_D": 4})
\ No newline at end of file
+  assert result == ({"param_A": 1, "param_B": 2,"param_C": 3,"param_D": 4})
+def test_get_all(db_session):
+  """
+  Testing get_all method from ICPHRepository
+  """
+  repo = ICPHRepository(db_session)
+  result = repo.get_all()
+  assert len(result) == 2
+  assert result[1] == ({"param_A": 1, "param_B": 2,"param_C": 3,"param_D": 4})
+  assert result[2] == ({"param_A": 3, "param_B": 6,"param_C": 9,"param_D": 12})
@@ -10,3 +10,14 @@ def test_repositories_container_instantiation():
 
     # Checks if the attribute is of the correct type
     assert isinstance(container.substance_repository, SubstanceRepository)
+
+def test_repositories_container_component_catalog(monkeypatch):
+    mock_db = MockDB()
+    container = RepositoriesContainer(mock_db)
+    monkeypatch.setattr(
+      "app.repositories.repositories_container.get_component_catalog",
+      lambda substance_repo, icph_repo: (substance_repo, icph_repo)
+    )
+
+    # Checks if the catalog is loaded from the container's repositories
+    assert container.component_catalog == (container.substance_repository, container.icph_repository)
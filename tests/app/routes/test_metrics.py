@@ -0,0 +1,58 @@
+from fastapi.testclient import TestClient
+from app.main import app
+from app.core.metrics import error_responses, metrics, stage_duration
+
+client = TestClient(app)
+
+def test_metrics_route_exports_stages_and_errors(valid_input_payload):
+  """
+  Testing '/metrics' endpoint route after a simulation and an error response
+  """
+  metrics.clear()
+  # A distinct input, so the simulation is not served by the result cache
+  payload = dict(valid_input_payload, local_temperature=17.25)
+  assert client.post("/simulation", json=payload).status_code == 200
+  assert client.post("/simulation", json=dict(payload, relative_humidity=-1)).status_code == 422
+
+  response = client.get("/metrics")
+  assert response.status_code == 200
+  assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+
+  lines = response.text.splitlines()
+  for stage in ["brayton_cycle", "gas_turbine.exhaustion_temperature", "high_steam_turbine", "medium_steam_turbine",
+                "low_steam_turbine", "hrsg.mass_flow", "condenser", "cycles_performances"]:
+    assert f'cycle_comb_stage_duration_seconds_count{{stage="{stage}"}} 1' in lines
+  assert 'cycle_comb_error_responses_total{type="RequestValidationError"} 1' in lines
+  assert any(line.startswith('cycle_comb_root_finder_iterations_count{method="newton"}') for line in lines)
+  assert any(line.startswith('cycle_comb_cache_hit_ratio{cache="simulation"}') for line in lines)
+
+def test_metrics_route_disabled():
+  """
+  Testing '/metrics' endpoint route with the recording disabled
+  """
+  metrics.clear()
+  metrics.enabled = False
+  try:
+    client.post("/simulation", json={})
+    assert stage_duration.count("brayton_cycle") == 0
+    assert error_responses.value("RequestValidationError") == 0
+    assert client.get("/metrics").status_code == 200
+  finally:
+    metrics.enabled = True
+
+def test_metrics_route_sample_names_match_families(valid_input_payload):
+  """
+  Testing that each sample of '/metrics' belongs to the family declared by its '# TYPE' line:
+  counters are declared without '_total' and only their samples carry it
+  """
+  client.post("/simulation", json=valid_input_payload)
+  suffixes = {"counter": ("_total",), "gauge": ("",), "histogram": ("_bucket", "_sum", "_count")}
+
+  family, kind = None, None
+  for line in client.get("/metrics").text.splitlines():
+    if line.startswith("# TYPE "):
+      family, kind = line.split()[2:4]
+      assert not family.endswith("_total")
+    elif line and not line.startswith("#"):
+      sample_name = line.split("{")[0].split(" ")[0]
+      assert sample_name in [family + suffix for suffix in suffixes[kind]], line
@@ -1,8 +1,14 @@
+import csv
+import io
+import json
 import pytest
+import pyarrow.parquet as parquet
 from fastapi.testclient import TestClient
 from app.main import app
 from app.models.input import Input
 from app.models.output import Output
+from app.services.orchestrators.simulation_cache import simulation_cache
+from app.utils.errors import OverloadedError
 
 client = TestClient(app)
 
@@ -65,3 +71,298 @@ def test_simulation_negative_net_power():
 
   response = client.post("/simulation", json=payload)
   assert response.status_code == 422  # Pydantic bloqueia
+
+def test_create_batch_simulation_route(valid_input_payload):
+  """
+  Testing '/simulation/batch' endpoint route with a valid and an invalid input
+  """
+  # Composition that does not sum 100%
+  invalid_payload = {**valid_input_payload, "methane_molar_fraction_fuel": 50}
+
+  response = client.post("/simulation/batch", json=[valid_input_payload, invalid_payload])
+  assert response.status_code == 200
+
+  results = response.json()
+  assert len(results) == 2
+  assert isinstance(Output(**results[0]), Output)
+  assert results[1]["type"] == "LogicConstraintError"
+
+  # The batch result is the same of the single simulation
+  single_response = client.post("/simulation", json=valid_input_payload)
+  assert results[0] == single_response.json()
+
+def test_create_simulation_route_tabulated_saturation(valid_input_payload):
+  """
+  Testing '/simulation' endpoint route with the tabulated saturation curve, close to the analytic one
+  """
+  analytic = client.post("/simulation?saturation_mode=analytic", json=valid_input_payload)
+  tabulated = client.post("/simulation?saturation_mode=tabulated", json=valid_input_payload)
+  assert tabulated.status_code == 200
+  for name, value in analytic.json().items():
+    assert tabulated.json()[name] == pytest.approx(value, abs=0.011)
+
+  invalid = client.post("/simulation?saturation_mode=spline", json=valid_input_payload)
+  assert invalid.status_code == 422
+
+def test_create_simulation_route_cache_header(valid_input_payload):
+  """
+  Testing '/simulation' endpoint route serving a repeated input from the simulation cache
+  """
+  simulation_cache.clear()
+
+  first = client.post("/simulation", json=valid_input_payload)
+  # Same input, with integers written as floats
+  second = client.post("/simulation", json={**valid_input_payload, "fuel_mass_flow": 53064.0})
+
+  assert first.headers["X-Cache"] == "MISS"
+  assert second.headers["X-Cache"] == "HIT"
+  assert first.json() == second.json()
+
+def test_create_simulation_route_profile(valid_input_payload):
+  """
+  Testing '/simulation' endpoint route with profile=true: the same results, with the trace of their calculation
+  """
+  expected = client.post("/simulation", json=valid_input_payload).json()
+  response = client.post("/simulation?profile=true", json=valid_input_payload)
+
+  assert response.status_code == 200
+  assert response.headers["X-Cache"] == "BYPASS"
+  data = response.json()
+  assert data["result"] == expected
+
+  profile = data["profile"]
+  stages = [span["name"] for span in profile["call_tree"] if span["kind"] == "stage"]
+  assert stages == ["full_cycles"]
+  assert [span["name"] for span in profile["call_tree"][-1]["children"]] == ["brayton_cycle", "rankine_cycle", "cycles_performances"]
+  assert {run["stage"] for run in profile["root_finders"]} >= {"high_steam_turbine", "medium_steam_turbine", "low_steam_turbine"}
+  assert profile["property_evaluations"]["Entropy.overheated_steam"]["lookups"] > 0
+  assert "steam_property" in profile["caches"]
+
+def test_create_simulation_route_profile_error(valid_input_payload):
+  """
+  Testing '/simulation' endpoint route with profile=true for a failing simulation: the error with the trace
+  """
+  payload = dict(valid_input_payload, condenser_operation_pressure=1.0)
+  response = client.post("/simulation?profile=true", json=payload)
+
+  assert response.status_code == 200
+  data = response.json()
+  assert data["result"]["type"] == "ThermodynamicError"
+  assert data["profile"]["call_tree"][-1]["error"] == "ThermodynamicError"
+
+def test_simulation_route_overloaded(mocker):
+  """
+  Testing '/simulation' endpoint route refusing a request when the worker pool is at capacity
+  """
+  pool = mocker.Mock()
+  pool.run = mocker.AsyncMock(side_effect=OverloadedError("Server at capacity", retry_after=2))
+  mocker.patch("app.routes.simulation.get_worker_pool", return_value=pool)
+
+  response = client.post("/simulation/batch", json=[])
+
+  assert response.status_code == 429
+  assert response.headers["Retry-After"] == "2"
+  assert response.json()["type"] == "OverloadedError"
+
+def test_create_sweep_simulation_route(valid_input_payload):
+  """
+  Testing '/simulation/sweep' endpoint route with a cartesian design, whose rows equal single simulations
+  """
+  request = {
+    "base": valid_input_payload,
+    "variables": [
+      {"field": "chimney_gas_temperature", "start": 90, "stop": 110, "num": 3},
+      {"field": "low_steam_level_efficiency", "values": [85, 89]}
+    ]
+  }
+
+  response = client.post("/simulation/sweep", json=request)
+  assert response.status_code == 200
+
+  rows = response.json()
+  assert len(rows) == 6
+  assert rows[1]["point"] == {"chimney_gas_temperature": 90, "low_steam_level_efficiency": 89}
+  for row in rows:
+    single_response = client.post("/simulation", json={**valid_input_payload, **row["point"]})
+    assert row["result"] == single_response.json()
+
+def test_create_sweep_simulation_route_latin_hypercube(valid_input_payload):
+  """
+  Testing '/simulation/sweep' endpoint route with a reproducible latin hypercube design
+  """
+  request = {
+    "base": valid_input_payload,
+    "variables": [{"field": "percent_excess_air", "start": 150, "stop": 180}],
+    "design": "latin_hypercube",
+    "samples": 4,
+    "seed": 3
+  }
+
+  first = client.post("/simulation/sweep", json=request).json()
+  second = client.post("/simulation/sweep", json=request).json()
+  assert len(first) == 4
+  assert first == second
+  assert all(150 <= row["point"]["percent_excess_air"] <= 180 for row in first)
+
+def test_create_sweep_simulation_route_unknown_field(valid_input_payload):
+  """
+  Testing '/simulation/sweep' endpoint route with a field that is not an input
+  """
+  request = {"base": valid_input_payload, "variables": [{"field": "unknown", "values": [1]}]}
+
+  response = client.post("/simulation/sweep", json=request)
+  assert response.status_code == 422
+
+def test_create_batch_simulation_route_ndjson(valid_input_payload):
+  """
+  Testing '/simulation/batch' endpoint route streaming NDJSON, with the same results of the JSON list
+  """
+  invalid_payload = {**valid_input_payload, "methane_molar_fraction_fuel": 50}
+
+  response = client.post("/simulation/batch?format=ndjson", json=[valid_input_payload, invalid_payload])
+  assert response.status_code == 200
+  assert response.headers["content-type"] == "application/x-ndjson"
+
+  lines = [json.loads(line) for line in response.text.splitlines()]
+  assert lines == client.post("/simulation/batch", json=[valid_input_payload, invalid_payload]).json()
+
+def test_create_sweep_simulation_route_csv(valid_input_payload):
+  """
+  Testing '/simulation/sweep' endpoint route streaming CSV, one line per point after the header
+  """
+  request = {"base": valid_input_payload, "variables": [{"field": "purge_level", "values": [0, 1, 20]}]}
+
+  response = client.post("/simulation/sweep?format=csv", json=request)
+  assert response.status_code == 200
+  assert response.headers["content-type"].startswith("text/csv")
+
+  records = list(csv.DictReader(io.StringIO(response.text)))
+  assert [float(record["purge_level"]) for record in records] == [0, 1, 20]
+  assert float(records[0]["LHV_fuel"]) > 0
+  # 20% is above the maximum purge level
+  assert records[2]["type"] == "InputValidationError"
+
+def test_create_batch_simulation_route_stream_too_large(valid_input_payload, mocker):
+  """
+  Testing '/simulation/batch' endpoint route rejecting a streamed batch above the maximum size before streaming
+  """
+  mocker.patch("app.controllers.simulation_controller.settings.SIMULATION_BATCH_MAX_SIZE", 1)
+
+  response = client.post("/simulation/batch?format=csv", json=[valid_input_payload, valid_input_payload])
+  assert response.status_code == 400
+  assert response.json()["type"] == "LogicConstraintError"
+
+def test_create_sweep_simulation_route_parquet(valid_input_payload):
+  """
+  Testing '/simulation/sweep' endpoint route streaming a Parquet file, with the varied field as first column
+  """
+  request = {"base": valid_input_payload, "variables": [{"field": "purge_level", "values": [0, 1, 20]}]}
+
+  response = client.post("/simulation/sweep?format=parquet", json=request)
+  assert response.status_code == 200
+  assert response.headers["content-type"] == "application/vnd.apache.parquet"
+
+  table = parquet.read_table(io.BytesIO(response.content))
+  assert table.column("purge_level").to_pylist() == [0, 1, 20]
+  assert table.column("type").to_pylist() == [None, None, "InputValidationError"]
+  assert table.column("LHV_fuel").to_pylist()[0] == client.post("/simulation", json=valid_input_payload).json()["LHV_fuel"]
+
+def test_create_optimization_route(valid_input_payload):
+  """
+  Testing '/simulation/optimize' endpoint route, improving the efficiency of the base input
+  """
+  request = {
+    "base": valid_input_payload,
+    "variables": [{"field": "percent_excess_air", "lower": 120, "upper": 220}],
+    "constraints": [{"field": "quality_exhaustion_steam_turbine", "minimum": 0.9}],
+    "maximum_evaluations": 40
+  }
+
+  response = client.post("/simulation/optimize", json=request)
+  assert response.status_code == 200
+
+  result = response.json()
+  base_efficiency = client.post("/simulation", json=valid_input_payload).json()["net_cycle_combined_efficiency"]
+  assert result["objective"] >= base_efficiency
+  assert result["feasible"]
+  assert 120 <= result["point"]["percent_excess_air"] <= 220
+  assert result["evaluations"] <= 40 + 1
+  assert len(result["trace"]) == result["iterations"]
+
+def test_create_optimization_route_unknown_objective(valid_input_payload):
+  """
+  Testing '/simulation/optimize' endpoint route with an objective that is not an Output field
+  """
+  request = {"base": valid_input_payload, "variables": [{"field": "percent_excess_air", "lower": 120, "upper": 220}], "objective": "unknown"}
+
+  response = client.post("/simulation/optimize", json=request)
+  assert response.status_code == 422
+
+def test_create_sensitivity_route(valid_input_payload):
+  """
+  Testing '/simulation/sensitivity' endpoint route, with derivatives close to the differences of two simulations
+  """
+  request = {"base": valid_input_payload, "fields": ["chimney_gas_temperature", "local_temperature"], "relative_step": 1e-3}
+
+  response = client.post("/simulation/sensitivity", json=request)
+  assert response.status_code == 200
+
+  result = response.json()
+  assert result["base"] == client.post("/simulation", json=valid_input_payload).json()
+  assert result["evaluations"] == 5
+
+  # Secant over a wide step, from the rounded results
+  lower = client.post("/simulation", json={**valid_input_payload, "chimney_gas_temperature": 95}).json()
+  upper = client.post("/simulation", json={**valid_input_payload, "chimney_gas_temperature": 105}).json()
+  secant = (upper["net_power_cycle_combined"] - lower["net_power_cycle_combined"]) / 10
+  assert result["jacobian"]["net_power_cycle_combined"]["chimney_gas_temperature"] == pytest.approx(secant, rel=0.05)
+  assert result["elasticities"]["net_power_cycle_combined"]["chimney_gas_temperature"] < 0
+
+def test_create_part_load_route(valid_input_payload):
+  """
+  Testing '/simulation/part-load' endpoint route, whose points equal single simulations at their fuel mass flow
+  """
+  request = {"base": valid_input_payload, "minimum_load": 0.6, "maximum_load": 1.0, "points": 3, "ambient": [{"field": "local_temperature", "values": [10, 30]}]}
+
+  response = client.post("/simulation/part-load", json=request)
+  assert response.status_code == 200
+
+  result = response.json()
+  assert result["evaluations"] == 6
+  assert [curve["ambient"] for curve in result["curves"]] == [{"local_temperature": 10}, {"local_temperature": 30}]
+  for curve in result["curves"]:
+    assert [point["load"] for point in curve["points"]] == pytest.approx([0.6, 0.8, 1.0])
+    for point in curve["points"]:
+      single_response = client.post("/simulation", json={**valid_input_payload, **curve["ambient"], "fuel_mass_flow": point["fuel_mass_flow"]})
+      assert point["result"] == single_response.json()
+  # The net power increases with the load
+  net_powers = [point["result"]["net_power_cycle_combined"] for point in result["curves"][0]["points"]]
+  assert net_powers == sorted(net_powers)
+
+def test_create_monte_carlo_route(valid_input_payload):
+  """
+  Testing '/simulation/monte-carlo' endpoint route, reproducible with a seed
+  """
+  request = {
+    "base": valid_input_payload,
+    "distributions": [
+      {"field": "local_temperature", "distribution": "normal", "mean": 15, "std": 8},
+      {"field": "gas_turbine_efficiency", "distribution": "triangular", "lower": 34, "mode": 36.78, "upper": 38}
+    ],
+    "samples": 60,
+    "seed": 11,
+    "outputs": ["net_power_cycle_combined", "net_cycle_combined_efficiency"],
+    "percentiles": [5, 50, 95]
+  }
+
+  response = client.post("/simulation/monte-carlo", json=request)
+  assert response.status_code == 200
+
+  result = response.json()
+  assert result["samples"] == 60
+  assert result["successes"] + sum(result["failures"].values()) == 60
+  assert set(result["statistics"]) == {"net_power_cycle_combined", "net_cycle_combined_efficiency"}
+  statistics = result["statistics"]["net_power_cycle_combined"]
+  assert statistics["minimum"] <= statistics["percentiles"]["5"] <= statistics["percentiles"]["50"] <= statistics["percentiles"]["95"] <= statistics["maximum"]
+  assert sum(statistics["histogram"]["counts"]) == result["successes"]
+  assert client.post("/simulation/monte-carlo", json=request).json() == result
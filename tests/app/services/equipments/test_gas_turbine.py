@@ -1,6 +1,8 @@
 import pytest
 from app.services.equipments.gas_turbine import GasTurbine
 from app.services.configs.gas_turbine_config import GasTurbineConfig
+from app.services.thermodynamics.heat.icph import ICPH
+from app.utils.errors import ComputationalError
 
 # ---------- Fakes for dependencies ----------
 
@@ -164,3 +166,57 @@ def test_exhaustion_gas_temp_invalid_zero_mass(gas_turbine):
   with pytest.raises(ZeroDivisionError):
     gas_turbine.exhaustion_gas_temp()
 
+def test_exhaustion_gas_temp_solves_icph_balance(gas_turbine):
+  """Testing the exhaustion temperature as the root of the ICPH balance, by the Newton method in few iterations"""
+  icph_params = {"param_A": 3.426, "param_B": 6.71e-4, "param_C": 0, "param_D": -3.35e3}
+
+  result = gas_turbine.exhaustion_temperature(900.0, icph_params, 28.3)
+
+  assert ICPH().icph_calc_heat(icph_params, 28.3, 25, result) == pytest.approx(900.0, abs=1e-9)
+  assert 0 < gas_turbine.root_finder.last_iterations <= 6
+
+def test_exhaustion_gas_temp_iteration_budget(gas_turbine):
+  """Testing that the exhaustion temperature stops at the iteration budget of the root finder"""
+  gas_turbine.root_finder.maximum_iterations = 1
+  with pytest.raises(ComputationalError):
+    gas_turbine.exhaustion_gas_temp()
+
+def test_exhaustion_temperature_array_matches_scalar(gas_turbine):
+  """Testing the batch mode of the exhaustion temperature against the scalar one"""
+  icph_params = [
+    {"param_A": 3.426, "param_B": 6.71e-4, "param_C": 0, "param_D": -3.35e3},
+    {"param_A": 3.5, "param_B": 7e-4, "param_C": 1e-8, "param_D": -1e4}
+  ]
+  heat_supplied = [500.0, 1100.0]
+  molar_mass = [28.3, 27.9]
+
+  result, iterations = gas_turbine.exhaustion_temperature_array(heat_supplied, ICPH.stack_params(icph_params), molar_mass)
+
+  for i in range(2):
+    assert result[i] == pytest.approx(gas_turbine.exhaustion_temperature(heat_supplied[i], icph_params[i], molar_mass[i]), abs=1e-9)
+  assert (iterations > 0).all()
+
+def test_intermediate_results_computed_once(gas_turbine, mocker):
+  """Testing that stoichiometry, air properties and LHV are computed once for all methods"""
+  reactions_spy = mocker.spy(gas_turbine.reactions, "molar_flow_stoichiometric_calc")
+  input_air_spy = mocker.spy(gas_turbine.input_air, "input_air_data_calc")
+  combustion_gas_spy = mocker.spy(gas_turbine.combustion_gas, "combustion_gas_data_calc")
+  lhv_spy = mocker.spy(gas_turbine.gas_fuel, "LHV_fuel_calc")
+
+  gas_turbine.net_power_GT_calculation()
+  gas_turbine.input_air_properties()
+  gas_turbine.combustion_gas_properties()
+  gas_turbine.exhaustion_gas_temp()
+
+  assert reactions_spy.call_count == 1
+  assert input_air_spy.call_count == 1
+  assert combustion_gas_spy.call_count == 1
+  assert lhv_spy.call_count == 1
+
+def test_intermediate_results_recomputed_for_new_input(gas_turbine, mocker):
+  """Testing that the cached results are discarded when the input is replaced"""
+  input_air_spy = mocker.spy(gas_turbine.input_air, "input_air_data_calc")
+  gas_turbine.input_air_properties()
+  gas_turbine.input = FakeInput()
+  gas_turbine.input_air_properties()
+  assert input_air_spy.call_count == 2
@@ -1,7 +1,14 @@
 import pytest
+import numpy as np
 from unittest.mock import Mock
+from types import SimpleNamespace
 from app.utils.errors import ThermodynamicError
 from app.services.equipments.high_steam_turbine import HighSteamTurbine
+from app.models.input_columns import InputColumns
+from app.services.thermodynamics.steam.enthalpy import Enthalpy
+from app.services.thermodynamics.steam.entropy import Entropy
+from app.services.thermodynamics.steam.saturation_parameters import SaturationParameters
+from app.services.utils.newton_method import NewtonMethod
 
 class TestHighSteamTurbine:
 
@@ -25,10 +32,10 @@ class TestHighSteamTurbine:
     enthalpy = Mock()
     enthalpy.overheated_steam.side_effect = [3500, 3000]  # inlet e outlet
 
-    secant_method = Mock()
-    secant_method.run.return_value = 350  # estimated outlet temperature
+    newton_method = Mock()
+    newton_method.run.return_value = 350  # estimated outlet temperature
 
-    result = turbine.get_params_operation(input_mock, saturation_parameters, entropy, enthalpy, secant_method)
+    result = turbine.get_params_operation(input_mock, saturation_parameters, entropy, enthalpy, newton_method)
 
     # Checks
     assert "delta_enthalpy_real" in result
@@ -51,10 +58,43 @@ class TestHighSteamTurbine:
 
     entropy = Mock()
     enthalpy = Mock()
-    secant_method = Mock()
+    newton_method = Mock()
 
     # Expected to throw custom exception
     with pytest.raises(ThermodynamicError) as excinfo:
-      turbine.get_params_operation(input_mock, saturation_parameters, entropy, enthalpy, secant_method)
+      turbine.get_params_operation(input_mock, saturation_parameters, entropy, enthalpy, newton_method)
 
-    assert "below saturation" in str(excinfo.value)
\ No newline at end of file
+    assert "below saturation" in str(excinfo.value)
+
+  def test_get_params_operation_array_matches_scalar(self):
+    """Test high steam turbine batch mode against the scalar calculation, with real correlations."""
+    turbine = HighSteamTurbine()
+    dependencies = (SaturationParameters(), Entropy(), Enthalpy(), NewtonMethod())
+    columns = {
+      "high_steam_level_pressure": [98.8, 120, 70],
+      "high_steam_level_temperature": [565, 540, 510],
+      "high_steam_level_efficiency": [87, 85, 90],
+      "medium_steam_level_pressure": [24, 30, 15]
+    }
+
+    result = turbine.get_params_operation_array(InputColumns(columns), *dependencies)
+
+    for i in range(3):
+      point = SimpleNamespace(**{name: values[i] for name, values in columns.items()})
+      expected = turbine.get_params_operation(point, *dependencies)
+      assert result["outlet_enthalpy_real"][i] == pytest.approx(expected["outlet_enthalpy_real"], rel=1e-9)
+      assert result["delta_enthalpy_real"][i] == pytest.approx(expected["delta_enthalpy_real"], rel=1e-9)
+    assert np.all(result["iterations"] > 0)
+
+  def test_get_params_operation_array_below_saturation_temperature(self):
+    """Test high steam turbine batch mode reporting the operating points below saturation."""
+    turbine = HighSteamTurbine()
+    columns = InputColumns({
+      "high_steam_level_pressure": [98.8, 98.8],
+      "high_steam_level_temperature": [565, 250],  # second point below saturation
+      "high_steam_level_efficiency": [87, 87],
+      "medium_steam_level_pressure": [24, 24]
+    })
+
+    with pytest.raises(ThermodynamicError, match=r"below saturation \(elements 1\)"):
+      turbine.get_params_operation_array(columns, SaturationParameters(), Mock(), Mock(), Mock())
@@ -1,8 +1,10 @@
 import pytest
 import numpy as np
 from unittest.mock import Mock
+from types import SimpleNamespace
 from app.services.equipments.HRSG import HRSG  
 from app.utils.errors import DataValidationError, ThermodynamicError
+from app.services.thermodynamics.heat.icph import ICPH
 
 class TestHRSG:
   """Testing class for HRSG service"""
@@ -24,6 +26,29 @@ class TestHRSG:
     icph_mock.icph_calc_heat.assert_called_once()
     assert result == abs(150.0 * 2.0)  # expected: 300.0
 
+  def test_heat_supplied_calc_array_matches_scalar(self):
+    """Test the batch mode against the scalar calculation, with the real ICPH equation"""
+    hrsg = HRSG()
+    icph = ICPH()
+    icph_params = [
+      {"param_A": 3.5, "param_B": 6e-4, "param_C": 0, "param_D": -1.2e4},
+      {"param_A": 3.6, "param_B": 7e-4, "param_C": 1e-8, "param_D": -0.9e4}
+    ]
+    combustion_gas = {"icph_params": ICPH.stack_params(icph_params), "molar_mass": np.array([28.1, 27.6]), "mass_flow": np.array([1.1e6, 0.9e6])}
+    chimney_gas_temperature = np.array([100, 120])
+    exhaustion_temp = np.array([600, 550])
+
+    result = hrsg.heat_supplied_calc_array(SimpleNamespace(chimney_gas_temperature=chimney_gas_temperature), combustion_gas, exhaustion_temp, icph)
+
+    for i in range(2):
+      expected = hrsg.heat_supplied_calc(
+        SimpleNamespace(chimney_gas_temperature=chimney_gas_temperature[i]),
+        {"icph_params": icph_params[i], "molar_mass": combustion_gas["molar_mass"][i], "mass_flow": combustion_gas["mass_flow"][i]},
+        exhaustion_temp[i],
+        icph
+      )
+      assert result[i] == pytest.approx(expected, rel=1e-12)
+
   # ---------- Test for get_params_operation ----------
   def test_get_params_operation_normal(self):
     """Test with valid data"""
@@ -151,3 +176,42 @@ class TestHRSG:
 
     with pytest.raises(np.linalg.LinAlgError):
       hrsg.get_mass_flow(input_mock, hsrg_params, heat_supplied=0)
+
+  def test_get_mass_flow_array_matches_scalar(self):
+    """Test the batch mode of the balances against the scalar solution of each point"""
+    hrsg = HRSG()
+    columns = {"high_steam_level_fraction": np.array([50, 70]), "medium_steam_level_fraction": np.array([30, 15]), "purge_level": np.array([10, 0])}
+    hsrg_params = {
+      "high_steam_enthaply": np.array([3100, 3500]),
+      "medium_steam_enthaply": np.array([2900, 3580]),
+      "low_steam_enthaply": np.array([2700, 3080]),
+      "high_purge_enthalpy": np.array([800, 1360]),
+      "medium_purge_enthalpy": np.array([700, 960]),
+      "low_purge_enthalpy": np.array([600, 600]),
+      "medium_steam_cold_enthaply": np.array([2600, 2960]),
+      "inlet_water_enthalpy": np.array([500, 420])
+    }
+    heat_supplied = np.array([1e6, 2.5e8])
+
+    result = hrsg.get_mass_flow_array(SimpleNamespace(**columns), hsrg_params, heat_supplied)
+
+    for i in range(2):
+      point = SimpleNamespace(**{name: values[i] for name, values in columns.items()})
+      expected = hrsg.get_mass_flow(point, {name: values[i] for name, values in hsrg_params.items()}, heat_supplied[i])
+      for name, value in expected.items():
+        assert result[name][i] == pytest.approx(value, rel=1e-12)
+      # Solution of the mass and energy balances
+      assert result["feed_water_required"][i] == pytest.approx(result["total_steam_generated"][i] + result["purge"][i])
+
+  def test_get_mass_flow_array_singular_matrix(self):
+    """Test the batch mode with a point whose balances have no single solution"""
+    hrsg = HRSG()
+    columns = SimpleNamespace(high_steam_level_fraction=np.array([50, 50]), medium_steam_level_fraction=np.array([30, 30]), purge_level=np.array([10, 10]))
+    hsrg_params = {name: np.array([1000.0, 0.0]) for name in (
+      "high_steam_enthaply", "medium_steam_enthaply", "low_steam_enthaply", "high_purge_enthalpy",
+      "medium_purge_enthalpy", "low_purge_enthalpy", "medium_steam_cold_enthaply", "inlet_water_enthalpy"
+    )}
+    hsrg_params["inlet_water_enthalpy"] = np.array([500.0, 0.0])
+
+    with pytest.raises(np.linalg.LinAlgError, match=r"elements 1\)"):
+      hrsg.get_mass_flow_array(columns, hsrg_params, np.array([1e6, 0]))
@@ -1,8 +1,15 @@
 import pytest
+import numpy as np
 from math import isclose
 from unittest.mock import Mock
+from types import SimpleNamespace
 from app.utils.errors import ThermodynamicError
 from app.services.equipments.low_steam_turbine import LowSteamTurbine
+from app.models.input_columns import InputColumns
+from app.services.thermodynamics.steam.enthalpy import Enthalpy
+from app.services.thermodynamics.steam.entropy import Entropy
+from app.services.thermodynamics.steam.saturation_parameters import SaturationParameters
+from app.services.utils.newton_method import NewtonMethod
 
 class TestLowSteamTurbine:
 
@@ -44,7 +51,7 @@ class TestLowSteamTurbine:
 
     enthalpy = Mock()
     entropy = Mock()
-    secant_method = Mock()
+    newton_method = Mock()
     saturation_parameters = Mock()
 
     # Setting plausible physical returns
@@ -54,13 +61,13 @@ class TestLowSteamTurbine:
     entropy.saturated_steam.return_value = 7.0
     enthalpy.saturated_liquid.return_value = 200
     enthalpy.saturated_steam.return_value = 2600
-    secant_method.run.return_value = 350
+    newton_method.run.return_value = 350
 
     medium_steam_turbine = {"outlet_enthalpy_real": 3000}
     hrsg_data = {"mass_flows": {"medium_steam": 3, "high_steam": 2, "low_steam": 5}}
 
     result = turbine.get_params_operation(
-      input, saturation_parameters, entropy, enthalpy, medium_steam_turbine, hrsg_data, secant_method
+      input, saturation_parameters, entropy, enthalpy, medium_steam_turbine, hrsg_data, newton_method
     )
 
     assert "delta_enthalpy_real" in result
@@ -80,7 +87,7 @@ class TestLowSteamTurbine:
 
     enthalpy = Mock()
     entropy = Mock()
-    secant_method = Mock()
+    newton_method = Mock()
     saturation_parameters = Mock()
 
     # Returns configured with physical error: equal entropies
@@ -90,14 +97,14 @@ class TestLowSteamTurbine:
     entropy.saturated_steam.return_value = 5.0  # causes division by zero
     enthalpy.saturated_liquid.return_value = 200
     enthalpy.saturated_steam.return_value = 2600
-    secant_method.run.return_value = 350
+    newton_method.run.return_value = 350
 
     medium_steam_turbine = {"outlet_enthalpy_real": 3000}
     hrsg_data = {"mass_flows": {"medium_steam": 3, "high_steam": 2, "low_steam": 5}}
 
     with pytest.raises(ZeroDivisionError):
       turbine.get_params_operation(
-        input, saturation_parameters, entropy, enthalpy, medium_steam_turbine, hrsg_data, secant_method
+        input, saturation_parameters, entropy, enthalpy, medium_steam_turbine, hrsg_data, newton_method
       )
   
   def test_get_params_operation_superheated_outlet(monkeypatch):
@@ -112,7 +119,7 @@ class TestLowSteamTurbine:
 
     enthalpy = Mock()
     entropy = Mock()
-    secant_method = Mock()
+    newton_method = Mock()
     saturation_parameters = Mock()
 
     enthalpy.overheated_steam.return_value = 3095
@@ -121,13 +128,40 @@ class TestLowSteamTurbine:
     entropy.saturated_steam.return_value = 7.3
     enthalpy.saturated_liquid.return_value = 420
     enthalpy.saturated_steam.return_value = 2600
-    secant_method.run.return_value = 313.5
+    newton_method.run.return_value = 313.5
 
     medium_steam_turbine = {"outlet_enthalpy_real": 3098}
     hrsg_data = {"mass_flows": {"medium_steam": 3, "high_steam": 2, "low_steam": 5}}
 
     with pytest.raises(ThermodynamicError) as excinfo:
-      turbine.get_params_operation(input, saturation_parameters, entropy, enthalpy, medium_steam_turbine, hrsg_data, secant_method
+      turbine.get_params_operation(input, saturation_parameters, entropy, enthalpy, medium_steam_turbine, hrsg_data, newton_method
   )
 
-    assert "The outlet steam in the low steam turbine is still overheated or saturated, review the conditions of the power plant" in str(excinfo.value)
\ No newline at end of file
+    assert "The outlet steam in the low steam turbine is still overheated or saturated, review the conditions of the power plant" in str(excinfo.value)
+  def test_get_params_operation_array_matches_scalar(self):
+    """Test low steam turbine batch mode against the scalar calculation, with real correlations."""
+    turbine = LowSteamTurbine()
+    saturation_parameters, entropy, enthalpy, root_finder = SaturationParameters(), Entropy(), Enthalpy(), NewtonMethod()
+    columns = {
+      "low_steam_level_pressure": [4, 5],
+      "low_steam_level_temperature": [312.5, 300],
+      "low_steam_level_efficiency": [89, 85],
+      "condenser_operation_pressure": [0.074, 0.1]
+    }
+    medium_steam_turbine = {"outlet_enthalpy_real": np.array([3095.0, 3050.0])}
+    hrsg_data = {"mass_flows": {"medium_steam": np.array([3.0, 2.0]), "high_steam": np.array([2.0, 2.0]), "low_steam": np.array([5.0, 1.0])}}
+
+    result = turbine.get_params_operation_array(
+      InputColumns(columns), saturation_parameters, entropy, enthalpy, medium_steam_turbine, hrsg_data, root_finder
+    )
+
+    for i in range(2):
+      point = SimpleNamespace(**{name: values[i] for name, values in columns.items()})
+      expected = turbine.get_params_operation(
+        point, saturation_parameters, entropy, enthalpy,
+        {"outlet_enthalpy_real": medium_steam_turbine["outlet_enthalpy_real"][i]},
+        {"mass_flows": {name: flows[i] for name, flows in hrsg_data["mass_flows"].items()}},
+        root_finder
+      )
+      assert result["outlet_enthalpy_real"][i] == pytest.approx(expected["outlet_enthalpy_real"], rel=1e-9)
+      assert result["real_quality_outlet_steam"][i] == pytest.approx(expected["real_quality_outlet_steam"], rel=1e-9)
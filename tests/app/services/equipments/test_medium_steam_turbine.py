@@ -1,7 +1,13 @@
 import pytest
 from unittest.mock import Mock
+from types import SimpleNamespace
 from app.utils.errors import ThermodynamicError
 from app.services.equipments.medium_steam_turbine import MediumSteamTurbine
+from app.models.input_columns import InputColumns
+from app.services.thermodynamics.steam.enthalpy import Enthalpy
+from app.services.thermodynamics.steam.entropy import Entropy
+from app.services.thermodynamics.steam.saturation_parameters import SaturationParameters
+from app.services.utils.newton_method import NewtonMethod
 
 class TestMediumSteamTurbine:
 
@@ -25,10 +31,10 @@ class TestMediumSteamTurbine:
     enthalpy = Mock()
     enthalpy.overheated_steam.side_effect = [3500, 3000]  # inlet e outlet
 
-    secant_method = Mock()
-    secant_method.run.return_value = 350  # estimated outlet temperature
+    newton_method = Mock()
+    newton_method.run.return_value = 350  # estimated outlet temperature
 
-    result = turbine.get_params_operation(input_mock, saturation_parameters, entropy, enthalpy, secant_method)
+    result = turbine.get_params_operation(input_mock, saturation_parameters, entropy, enthalpy, newton_method)
 
     # Checks
     assert "delta_enthalpy_real" in result
@@ -51,10 +57,28 @@ class TestMediumSteamTurbine:
 
     entropy = Mock()
     enthalpy = Mock()
-    secant_method = Mock()
+    newton_method = Mock()
 
     # Expected to throw custom exception
     with pytest.raises(ThermodynamicError) as excinfo:
-      turbine.get_params_operation(input_mock, saturation_parameters, entropy, enthalpy, secant_method)
+      turbine.get_params_operation(input_mock, saturation_parameters, entropy, enthalpy, newton_method)
 
-    assert "below saturation" in str(excinfo.value)
\ No newline at end of file
+    assert "below saturation" in str(excinfo.value)
+
+  def test_get_params_operation_array_matches_scalar(self):
+    """Test medium steam turbine batch mode against the scalar calculation, with real correlations."""
+    turbine = MediumSteamTurbine()
+    dependencies = (SaturationParameters(), Entropy(), Enthalpy(), NewtonMethod())
+    columns = {
+      "medium_steam_level_pressure": [24, 30, 15],
+      "medium_steam_level_temperature": [565, 540, 480],
+      "medium_steam_level_efficiency": [91, 85, 90],
+      "low_steam_level_pressure": [4, 6, 3]
+    }
+
+    result = turbine.get_params_operation_array(InputColumns(columns), *dependencies)
+
+    for i in range(3):
+      point = SimpleNamespace(**{name: values[i] for name, values in columns.items()})
+      expected = turbine.get_params_operation(point, *dependencies)
+      assert result["outlet_enthalpy_real"][i] == pytest.approx(expected["outlet_enthalpy_real"], rel=1e-9)
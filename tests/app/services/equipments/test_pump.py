@@ -1,6 +1,10 @@
 import pytest
+from types import SimpleNamespace
 from app.services.equipments.pump import Pump
 from app.utils.errors import ThermodynamicError
+from app.models.input_columns import InputColumns
+from app.services.thermodynamics.steam.enthalpy import Enthalpy
+from app.services.thermodynamics.steam.specific_volume import SpecificVolume
 
 class MockInput:
   high_steam_level_pressure = 100  # bar
@@ -62,4 +66,21 @@ class TestPump:
     input = InvalidInput()
 
     with pytest.raises(ThermodynamicError):
-      pump.get_params_operation(input, enthalpy, specific_volume)
\ No newline at end of file
+      pump.get_params_operation(input, enthalpy, specific_volume)
+  def test_pump_get_params_operation_array_matches_scalar(self):
+    """Test pump batch mode against the scalar calculation, with real correlations."""
+    pump = Pump()
+    enthalpy, specific_volume = Enthalpy(), SpecificVolume()
+    columns = {
+      "high_steam_level_pressure": [98.8, 120, 70],
+      "condenser_operation_pressure": [0.074, 0.1, 0.05],
+      "pump_efficiency": [85, 80, 90]
+    }
+
+    result = pump.get_params_operation_array(InputColumns(columns), enthalpy, specific_volume)
+
+    for i in range(3):
+      point = SimpleNamespace(**{name: values[i] for name, values in columns.items()})
+      expected = pump.get_params_operation(point, enthalpy, specific_volume)
+      for key in expected:
+        assert result[key][i] == pytest.approx(expected[key], rel=1e-9)
@@ -100,4 +100,28 @@ def test_brayton_cycle_run_with_error(mock_dependencies, monkeypatch):
 
   # Checks if the error is propagated correctly
   with pytest.raises(ValueError, match="Error in LHV calculation"):
-    cycle.run()
\ No newline at end of file
+    cycle.run()
+
+def test_brayton_cycle_scale_results():
+  """Test the scaling of the results to another fuel mass flow: flows and power scale, properties do not."""
+  results = {
+    "LHV_fuel": 47504.11,
+    "fuel_sensible_heat": 12.5,
+    "net_power": 100.0,
+    "exhaustion_temp": 900.0,
+    "input_air": {"molar_flow": {"oxygen": 2.0, "nitrogen": 8.0}, "mass_flow": 30.0, "molar_mass": 28.9},
+    "combustion_gas": {"molar_flow": {"carbon_dioxide": 1.0, "water": 2.0}, "mass_flow": 32.0, "molar_mass": 27.5}
+  }
+
+  scaled = BraytonCycle.scale_results(results, 0.5)
+
+  assert scaled["net_power"] == 50.0
+  assert scaled["input_air"]["molar_flow"] == {"oxygen": 1.0, "nitrogen": 4.0}
+  assert scaled["input_air"]["mass_flow"] == 15.0
+  assert scaled["combustion_gas"]["molar_flow"] == {"carbon_dioxide": 0.5, "water": 1.0}
+  assert scaled["combustion_gas"]["mass_flow"] == 16.0
+  for key in ("LHV_fuel", "fuel_sensible_heat", "exhaustion_temp"):
+    assert scaled[key] == results[key]
+  assert scaled["combustion_gas"]["molar_mass"] == 27.5
+  # The original results are not changed
+  assert results["net_power"] == 100.0
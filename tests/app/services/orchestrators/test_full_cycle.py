@@ -1,5 +1,10 @@
 import pytest
+from sqlmodel import Session
 from app.services.orchestrators.full_cycles import FullCycles, FullCyclesResult
+from app.database.engine import engine
+from app.models.input import Input
+from app.models.input_columns import InputColumns
+from app.repositories.repositories_container import RepositoriesContainer
 
 class MockInput:
   """Mock class to simulate input parameters for the cycle performance calculation."""
@@ -51,7 +56,7 @@ def test_full_cycles_combined_normal(monkeypatch):
   monkeypatch.setattr("app.services.orchestrators.full_cycles.CyclesPerformances", lambda *a, **kw: type("", (), {"cycles_effiencies_calc": lambda self, *b, **kw: cycles_perf_mock_data})())
 
   # --- Execution ---
-  repositories = type("RepoContainer", (), {"substance_repository": None, "icph_repository": None})()
+  repositories = type("RepoContainer", (), {"substance_repository": None, "icph_repository": None, "component_catalog": None})()
   service = FullCycles(mock_input, repositories)
   result = service.create_full_cycles_combined()
 
@@ -63,3 +68,18 @@ def test_full_cycles_combined_normal(monkeypatch):
   assert result.net_cycle_combined_efficiency == 21.04
   assert result.exhaustion_gas_temperature == 450.0
   assert result.high_steam_mass_flow == 5
+
+
+def test_full_cycles_combined_array_matches_scalar(valid_input_payload):
+  """Test the array pass of the full cycles against the scalar simulation of each input, with the real database."""
+  inputs = [
+    Input(**{**valid_input_payload, "local_temperature": 15 + 5 * index, "condenser_operation_pressure": 0.074 + 0.01 * index})
+    for index in range(3)
+  ]
+  with Session(engine) as db:
+    repos = RepositoriesContainer(db)
+    result = FullCycles(InputColumns.from_inputs(inputs), repos).create_full_cycles_combined_array()
+    for i, input in enumerate(inputs):
+      expected = FullCycles(input, repos).create_full_cycles_combined(digits=None)
+      for name, value in expected._asdict().items():
+        assert getattr(result, name)[i] == pytest.approx(value, rel=1e-9)
@@ -0,0 +1,58 @@
+import pytest
+from app.models.monte_carlo import MonteCarloRequest
+from app.models.output import Output
+from app.models.simulation_error import SimulationError
+from app.services.orchestrators.monte_carlo import MonteCarlo
+
+def make_request(payload, **kwargs):
+  distributions = [
+    {"field": "local_temperature", "distribution": "normal", "mean": 15, "std": 5},
+    {"field": "methane_molar_fraction_fuel", "distribution": "uniform", "lower": 80, "upper": 95}
+  ]
+  return MonteCarloRequest(base=payload, distributions=distributions, **kwargs)
+
+def test_monte_carlo_samples_do_not_depend_on_chunks(valid_input_payload):
+  """Test the samples of a seed, equal for any chunk size."""
+  request = make_request(valid_input_payload, samples=250, seed=3)
+  chunks = list(MonteCarlo(request).sample_chunks(100))
+  small_chunks = list(MonteCarlo(request).sample_chunks(7))
+
+  assert [len(chunk) for chunk in chunks] == [100, 100, 50]
+  assert sum(chunks, []) == sum(small_chunks, [])
+  assert sum(chunks, []) != sum(MonteCarlo(make_request(valid_input_payload, samples=250, seed=4)).sample_chunks(100), [])
+
+def test_monte_carlo_normalized_fuel_sums_exactly(valid_input_payload):
+  """Test the sampled fuel compositions, rescaled so that the fractions sum exactly to 1 like the fuel check requires."""
+  monte_carlo = MonteCarlo(make_request(valid_input_payload, samples=500, seed=0))
+  for points in monte_carlo.sample_chunks():
+    for point in points:
+      assert sum(point[field] / 100 for field in monte_carlo.fuel_fields) == 1
+      assert point["methane_molar_fraction_fuel"] > 80
+
+def test_monte_carlo_aggregates_results_and_failures(valid_input_payload):
+  """Test the statistics of the successful results and the failure rates by error type."""
+  monte_carlo = MonteCarlo(make_request(valid_input_payload, samples=4, outputs=["net_power_cycle_combined"], percentiles=[50]))
+  template = dict.fromkeys(Output.model_fields, 1.0)
+  monte_carlo.add([Output(**{**template, "net_power_cycle_combined": 100.0}), SimulationError(error="boom", type="ThermodynamicError")])
+  monte_carlo.add([Output(**{**template, "net_power_cycle_combined": 300.0}), SimulationError(error="invalid", type="InputValidationError")])
+  result = monte_carlo.result()
+
+  assert result.samples == 4
+  assert result.successes == 2
+  assert result.failures == {"ThermodynamicError": 1, "InputValidationError": 1}
+  assert result.failure_rates == {"ThermodynamicError": 0.25, "InputValidationError": 0.25}
+  assert result.exact_percentiles
+  statistics = result.statistics["net_power_cycle_combined"]
+  assert statistics.mean == 200
+  assert statistics.std == pytest.approx(141.42, abs=0.01)
+  assert (statistics.minimum, statistics.maximum) == (100, 300)
+  assert statistics.percentiles == {"50": 200}
+  assert sum(statistics.histogram.counts) == 2
+
+def test_monte_carlo_all_failed(valid_input_payload):
+  monte_carlo = MonteCarlo(make_request(valid_input_payload, samples=1))
+  monte_carlo.add([SimulationError(error="boom", type="ComputationalError")])
+  result = monte_carlo.result()
+
+  assert result.statistics == {}
+  assert result.failure_rates == {"ComputationalError": 1.0}
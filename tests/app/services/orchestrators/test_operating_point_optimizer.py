@@ -0,0 +1,64 @@
+import pytest
+from app.models.optimization import OptimizationRequest
+from app.models.output import Output
+from app.services.orchestrators.full_cycles import FullCyclesResult
+from app.services.orchestrators.operating_point_optimizer import OperatingPointOptimizer
+from app.utils.errors import ComputationalError
+
+def fake_simulate(point):
+  """Results whose efficiency peaks at 60% with percent_excess_air = 150, and quality falls with it"""
+  excess_air = point["percent_excess_air"]
+  values = {field: 10.0 for field in FullCyclesResult._fields}
+  values["net_cycle_combined_efficiency"] = 60 - ((excess_air - 150) / 10) ** 2
+  values["quality_exhaustion_steam_turbine"] = 1 - excess_air / 1000
+  return point, FullCyclesResult(**values)
+
+def fake_simulate_flat(point):
+  """Results whose efficiency rises by less than 0.01 over the bounds, so its rounded values are all equal"""
+  values = {field: 10.0 for field in FullCyclesResult._fields}
+  values["net_cycle_combined_efficiency"] = 56.8568 + 0.0007 * (point["percent_excess_air"] - 100) / 150
+  return point, FullCyclesResult(**values)
+
+def optimizer(mocker, valid_input_payload, simulate=fake_simulate, **options):
+  request = OptimizationRequest(base=valid_input_payload, variables=[{"field": "percent_excess_air", "lower": 100, "upper": 250}], **options)
+  service = OperatingPointOptimizer(request, repositories=None)
+  mocker.patch.object(service, "simulate", side_effect=lambda point: simulate(point))
+  return service
+
+def test_optimizer_maximizes_objective(mocker, valid_input_payload):
+  """Test the optimal point of the objective, with the trace of the iterations"""
+  service = optimizer(mocker, valid_input_payload, tolerance=1e-6)
+  result = service.run()
+
+  assert result.converged
+  assert result.feasible
+  assert result.point["percent_excess_air"] == pytest.approx(150, abs=0.1)
+  assert result.objective == pytest.approx(60, abs=1e-3)
+  assert result.result.net_cycle_combined_efficiency == round(result.objective, 2)
+  assert result.evaluations == len(service.evaluated)
+  assert result.trace[-1].objective == result.objective
+
+def test_optimizer_scores_exact_results(mocker, valid_input_payload):
+  """Test the optimum of an objective varying by less than the rounding of the results: it is at the upper bound"""
+  service = optimizer(mocker, valid_input_payload, simulate=fake_simulate_flat)
+  result = service.run()
+
+  assert result.point["percent_excess_air"] == pytest.approx(250, abs=0.5)
+  assert result.objective == pytest.approx(56.8575, abs=1e-5)
+  assert result.result.net_cycle_combined_efficiency == 56.86
+
+def test_optimizer_respects_constraints(mocker, valid_input_payload):
+  """Test the optimal point moved to the limit of an active constraint"""
+  # Quality of at least 0.86 limits the excess of air to 140%
+  service = optimizer(mocker, valid_input_payload, tolerance=1e-6, constraints=[{"field": "quality_exhaustion_steam_turbine", "minimum": 0.86}])
+  result = service.run()
+
+  assert result.point["percent_excess_air"] == pytest.approx(140, abs=0.5)
+  assert result.result.quality_exhaustion_steam_turbine >= 0.86 - 1e-3
+
+def test_optimizer_without_feasible_simulation(mocker, valid_input_payload):
+  """Test the error when no point can be simulated"""
+  service = optimizer(mocker, valid_input_payload)
+  service.simulate.side_effect = ValueError("Impossible cycle")
+  with pytest.raises(ComputationalError):
+    service.run()
@@ -2,6 +2,13 @@ import pytest
 from unittest.mock import MagicMock
 from app.services.orchestrators.rankine_cycle import RankineCycle
 from app.utils.errors import ThermodynamicError
+from sqlmodel import Session
+from app.database.engine import engine
+from app.models.input import Input
+from app.repositories.repositories_container import RepositoriesContainer
+from app.services.orchestrators.brayton_cycle import BraytonCycle
+from app.services.thermodynamics.steam.saturation_parameters import SaturationParameters
+from app.services.utils.stage_cache import StageMemo
 
 @pytest.fixture
 def mock_dependencies():
@@ -103,3 +110,79 @@ def test_rankine_cycle_chimney_temp_error(mock_dependencies, monkeypatch):
   # ThermodynamicError is expected to be raised
   with pytest.raises(ThermodynamicError, match="chimney temperature is less than the operating condenser temperature"):
     cycle.run()
+
+
+def test_rankine_cycle_run_computes_each_stage_once(mock_dependencies, monkeypatch):
+  """Test that every equipment of the Rankine cycle is calculated exactly once per run."""
+  mock_input, mock_substance_repo, mock_icph_repo, mock_heat_suplier_cycle = mock_dependencies
+
+  mock_hrsg = MagicMock()
+  mock_high_turbine = MagicMock()
+  mock_medium_turbine = MagicMock()
+  mock_low_turbine = MagicMock()
+  mock_pump = MagicMock()
+  mock_condenser = MagicMock()
+  mock_saturation = MagicMock()
+
+  mock_high_turbine.get_params_operation.return_value = {"delta_enthalpy_real": 5000}
+  mock_medium_turbine.get_params_operation.return_value = {"delta_enthalpy_real": 3000}
+  mock_low_turbine.get_params_operation.return_value = {"delta_enthalpy_real": 2000}
+  mock_hrsg.heat_supplied_calc.return_value = 10000
+  mock_hrsg.get_params_operation.return_value = {"param": 1}
+  mock_hrsg.get_mass_flow.return_value = {"high_steam": 3600, "medium_steam": 1800, "total_steam_generated": 5400}
+  mock_pump.get_params_operation.return_value = {"delta_specific_enthalpy": 50}
+  mock_condenser.get_params_operation.return_value = {"saturated_water_mass_flow": 7200}
+  mock_saturation.saturation_temperature.return_value = 50
+  mock_input.chimney_gas_temperature = 100
+
+  monkeypatch.setattr("app.services.orchestrators.rankine_cycle.HRSG", lambda *a, **kw: mock_hrsg)
+  monkeypatch.setattr("app.services.orchestrators.rankine_cycle.HighSteamTurbine", lambda *a, **kw: mock_high_turbine)
+  monkeypatch.setattr("app.services.orchestrators.rankine_cycle.MediumSteamTurbine", lambda *a, **kw: mock_medium_turbine)
+  monkeypatch.setattr("app.services.orchestrators.rankine_cycle.LowSteamTurbine", lambda *a, **kw: mock_low_turbine)
+  monkeypatch.setattr("app.services.orchestrators.rankine_cycle.Pump", lambda *a, **kw: mock_pump)
+  monkeypatch.setattr("app.services.orchestrators.rankine_cycle.Condenser", lambda *a, **kw: mock_condenser)
+  monkeypatch.setattr("app.services.orchestrators.rankine_cycle.SaturationParameters", lambda *a, **kw: mock_saturation)
+
+  cycle = RankineCycle(mock_input, mock_substance_repo, mock_icph_repo, mock_heat_suplier_cycle)
+  result = cycle.run()
+
+  # Every stage result is cached on the run context
+  assert set(cycle.context) == {"brayton", *RankineCycle.STAGES}
+  assert result["generated_consumed_powers_data"] is cycle.context["powers"]
+
+  mock_high_turbine.get_params_operation.assert_called_once()
+  mock_medium_turbine.get_params_operation.assert_called_once()
+  mock_low_turbine.get_params_operation.assert_called_once()
+  mock_hrsg.heat_supplied_calc.assert_called_once()
+  mock_hrsg.get_params_operation.assert_called_once()
+  mock_hrsg.get_mass_flow.assert_called_once()
+  mock_pump.get_params_operation.assert_called_once()
+  mock_condenser.get_params_operation.assert_called_once()
+
+def test_rankine_cycle_shares_the_saturation_parameters(mock_dependencies):
+  """Test the steam properties using the saturation service (and its mode) given to the cycle."""
+  mock_input, mock_substance_repo, mock_icph_repo, mock_heat_suplier_cycle = mock_dependencies
+  saturation_parameters = SaturationParameters("tabulated")
+
+  cycle = RankineCycle(mock_input, mock_substance_repo, mock_icph_repo, mock_heat_suplier_cycle, saturation_parameters)
+
+  assert cycle.saturation_parameters is saturation_parameters
+  assert cycle.enthalpy.saturation_params is saturation_parameters
+  assert cycle.entropy.saturation_params is saturation_parameters
+  assert cycle.specific_volume.saturation_params is saturation_parameters
+
+def test_rankine_cycle_with_its_own_stage_memo(valid_input_payload):
+  """Test a stage memo shared by runs with different Brayton cycles: the stages depending on them are not reused."""
+  memo = StageMemo()
+  with Session(engine) as db:
+    catalog = RepositoriesContainer(db).component_catalog
+    for fuel_mass_flow in (45000, 53064):
+      input = Input(**{**valid_input_payload, "fuel_mass_flow": fuel_mass_flow})
+      brayton_cycle_data = BraytonCycle(input, catalog, catalog).run()
+
+      expected = RankineCycle(input, catalog, catalog, brayton_cycle_data).run()
+      result = RankineCycle(input, catalog, catalog, brayton_cycle_data, stage_memo=memo).run()
+      assert result == expected
+
+  # The steam turbines do not depend on the Brayton cycle: they are shared
+  assert memo.hits > 0
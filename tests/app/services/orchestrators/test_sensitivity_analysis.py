@@ -0,0 +1,51 @@
+import pytest
+from app.models.output import Output
+from app.models.sensitivity import SensitivityRequest
+from app.services.orchestrators.full_cycles import FullCyclesResult
+from app.services.orchestrators.sensitivity_analysis import SensitivityAnalysis
+from app.utils.errors import LogicConstraintError
+
+def fake_results(input):
+  """Results with net power = 1000·T² + 50·humidity, and all other outputs constant"""
+  values = {field: 10.0 for field in FullCyclesResult._fields}
+  values["net_power_cycle_combined"] = 1000 * input.local_temperature ** 2 + 50 * input.relative_humidity
+  return FullCyclesResult(**values)
+
+def analysis(mocker, valid_input_payload, **options):
+  request = SensitivityRequest(base=valid_input_payload, **options)
+  service = SensitivityAnalysis(request, repositories=None)
+  mocker.patch.object(service, "simulate", side_effect=fake_results)
+  return service
+
+def test_sensitivity_central_differences(mocker, valid_input_payload):
+  """Test the derivatives and elasticities with central differences, 2 simulations per field and the base one"""
+  service = analysis(mocker, valid_input_payload, fields=["local_temperature", "relative_humidity"])
+  result = service.run()
+
+  temperature = valid_input_payload["local_temperature"]
+  net_power = 1000 * temperature ** 2 + 50 * valid_input_payload["relative_humidity"]
+  assert result.jacobian["net_power_cycle_combined"]["local_temperature"] == pytest.approx(2000 * temperature)
+  assert result.jacobian["net_power_cycle_combined"]["relative_humidity"] == pytest.approx(50)
+  assert result.jacobian["LHV_fuel"]["local_temperature"] == 0
+  assert result.elasticities["net_power_cycle_combined"]["local_temperature"] == pytest.approx(2000 * temperature ** 2 / net_power)
+  assert result.schemes == {"local_temperature": "central", "relative_humidity": "central"}
+  assert service.simulate.call_count == 5
+  assert isinstance(result.base, Output)
+
+def test_sensitivity_one_sided_at_limit(mocker, valid_input_payload):
+  """Test a forward difference at the lower limit of a field, without elasticity for its null value"""
+  service = analysis(mocker, {**valid_input_payload, "purge_level": 0}, fields=["purge_level"], outputs=["net_power_cycle_combined"])
+  result = service.run()
+
+  assert result.schemes["purge_level"] == "forward"
+  assert result.steps["purge_level"] == 1e-3
+  assert result.jacobian == {"net_power_cycle_combined": {"purge_level": 0}}
+  assert result.elasticities["net_power_cycle_combined"]["purge_level"] is None
+  assert service.simulate.call_count == 2
+
+def test_sensitivity_without_valid_step(mocker, valid_input_payload):
+  """Test the error when both steps leave the limits of the field"""
+  # The local atmospheric pressure is in (0.9, 1]
+  service = analysis(mocker, {**valid_input_payload, "local_atmospheric_pressure": 0.95}, fields=["local_atmospheric_pressure"], relative_step=0.1)
+  with pytest.raises(LogicConstraintError):
+    service.run()
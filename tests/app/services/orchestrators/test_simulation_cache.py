@@ -0,0 +1,27 @@
+from unittest.mock import Mock
+from app.services.orchestrators.simulation_cache import canonical_input, simulation_cache_key
+from app.repositories.component_catalog import invalidate_component_catalog
+
+def make_input(**values):
+  input = Mock()
+  input.model_dump.return_value = values
+  return input
+
+def test_canonical_input_ignores_order_and_negative_zero():
+  """Test equal inputs producing the same canonical text."""
+  first = make_input(fuel_mass_flow=53064.0, purge_level=0.0)
+  second = make_input(purge_level=-0.0, fuel_mass_flow=53064.0)
+
+  assert canonical_input(first) == canonical_input(second) == '{"fuel_mass_flow":53064.0,"purge_level":0.0}'
+
+def test_simulation_cache_key():
+  """Test the key changing with the input, the saturation mode and the catalog version."""
+  input = make_input(fuel_mass_flow=53064.0)
+  key = simulation_cache_key(input, "analytic")
+
+  assert key == simulation_cache_key(make_input(fuel_mass_flow=53064.0), "analytic")
+  assert key != simulation_cache_key(make_input(fuel_mass_flow=53065.0), "analytic")
+  assert key != simulation_cache_key(input, "tabulated")
+
+  invalidate_component_catalog()
+  assert key != simulation_cache_key(input, "analytic")
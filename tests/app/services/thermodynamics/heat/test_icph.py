@@ -1,3 +1,4 @@
+import numpy as np
 import pytest
 from app.services.thermodynamics.heat.icph import ICPH
 from app.utils.errors import DataValidationError
@@ -49,3 +50,55 @@ class TestICPH:
     icph_params = {"param_A": 1.0, "param_B": 1.0, "param_C": 1.0, "param_D": 1.0}
     with pytest.raises(DataValidationError):
       icph.icph_calc_heat(icph_params, molar_mass=0, temp_in=25, temp_out=100)
+
+  def test_icph_heat_array_matches_scalar(self):
+    """
+    Test ICPH batch mode over stacked mixtures and temperatures against the scalar calculation.
+    """
+    icph = ICPH()
+    icph_params = [
+      {"param_A": 3.426, "param_B": 6.71e-4, "param_C": 0, "param_D": -3.35e3},
+      {"param_A": 3.355, "param_B": 5.75e-4, "param_C": 0, "param_D": -1.6e4},
+      {"param_A": 1.702, "param_B": 9.081e-3, "param_C": -2.164e-6, "param_D": 0}
+    ]
+    molar_mass = [18.5, 28.97, 16.04]
+    temp_in = [35, 520, 600]
+    temp_out = [30, 100, 25]
+
+    result = icph.icph_calc_heat_array(ICPH.stack_params(icph_params), molar_mass, temp_in, temp_out)
+
+    assert result.shape == (3,)
+    for i in range(3):
+      assert result[i] == pytest.approx(icph.icph_calc_heat(icph_params[i], molar_mass[i], temp_in[i], temp_out[i]), rel=1e-12)
+
+  def test_icph_heat_array_broadcasts_temperatures(self):
+    """
+    Test ICPH batch mode of one mixture over an array of outlet temperatures.
+    """
+    icph = ICPH()
+    icph_params = {"param_A": 3.355, "param_B": 5.75e-4, "param_C": 0, "param_D": -1.6e4}
+    temp_out = [25, 100, 200]
+
+    result = icph.icph_calc_heat_array(ICPH.stack_params([icph_params])[0], 28.97, 500, temp_out)
+
+    assert result == pytest.approx([icph.icph_calc_heat(icph_params, 28.97, 500, t) for t in temp_out], rel=1e-12)
+
+  def test_icph_mixture_params_array(self):
+    """
+    Test the params of mixtures weighted by their molar fractions, like the scalar weighting of the chemistry services.
+    """
+    substance_params = [[3.0, 1e-3, 0, 100], [4.0, 2e-3, 1e-6, -200]]
+    fractions = [[0.25, 0.75], [1.0, 0.0]]
+
+    result = ICPH.mixture_params_array(fractions, substance_params)
+
+    assert result == pytest.approx(np.array([[3.75, 1.75e-3, 0.75e-6, -125], [3.0, 1e-3, 0, 100]]))
+
+  def test_icph_heat_array_molar_mass_zero(self):
+    """
+    Test ICPH batch mode with an invalid molar mass, reported by its index.
+    """
+    icph = ICPH()
+    icph_params = ICPH.stack_params([{"param_A": 1.0, "param_B": 1.0, "param_C": 1.0, "param_D": 1.0}] * 2)
+    with pytest.raises(DataValidationError, match="elements 1"):
+      icph.icph_calc_heat_array(icph_params, [28.97, 0], 25, 100)
@@ -101,3 +101,54 @@ class TestEnthalpy:
 
     with pytest.raises(DataValidationError, match="Invalid pressure"):
       enthalpy.overheated_steam(pressure=5, temperature=300)
+
+  # ---------- TESTS for array versions ----------
+  def test_saturated_array_matches_scalar(self):
+    """Test saturated liquid and steam arrays against the scalar correlations, in all temperature ranges."""
+    enthalpy = Enthalpy()
+    # Saturation temperatures below 300 K, between 300 K and 600 K and above 600 K
+    pressures = [0.01, 0.074, 1, 24, 98.8, 150, 200]
+
+    liquid = enthalpy.saturated_liquid_array(pressures)
+    steam = enthalpy.saturated_steam_array(pressures)
+
+    assert liquid == pytest.approx([enthalpy.saturated_liquid(p) for p in pressures], rel=1e-12)
+    assert steam == pytest.approx([enthalpy.saturated_steam(p) for p in pressures], rel=1e-12)
+
+  def test_overheated_steam_array_matches_scalar(self):
+    """Test overheated steam array with broadcast of pressures and temperatures."""
+    enthalpy = Enthalpy()
+    pressures = [[4], [24], [98.8]]
+    temperatures = [312.5, 450, 565]
+
+    result = enthalpy.overheated_steam_array(pressures, temperatures)
+
+    assert result.shape == (3, 3)
+    for i, p in enumerate([4, 24, 98.8]):
+      for j, t in enumerate(temperatures):
+        assert result[i, j] == pytest.approx(enthalpy.overheated_steam(p, t), rel=1e-12)
+
+  def test_overheated_steam_array_invalid_pressure(self):
+    """Test overheated steam array reporting the invalid elements."""
+    enthalpy = Enthalpy()
+    with pytest.raises(DataValidationError, match=r"Pressure invalid: out of the range \(elements 1\)"):
+      enthalpy.overheated_steam_array([10, -5], 200)
+
+  # ---------- TESTS for derivatives ----------
+  def test_overheated_steam_derivative_matches_finite_difference(self):
+    """Test the exact derivative with temperature against a central finite difference."""
+    enthalpy = Enthalpy()
+    step = 1e-4
+    for p, t in [(4, 260), (24, 400), (98.8, 565)]:
+      finite_difference = (enthalpy.overheated_steam(p, t + step) - enthalpy.overheated_steam(p, t - step)) / (2 * step)
+      assert enthalpy.overheated_steam_derivative(p, t) == pytest.approx(finite_difference, rel=1e-6)
+
+  def test_overheated_steam_derivative_array_matches_scalar(self):
+    """Test the derivative array version against the scalar one."""
+    enthalpy = Enthalpy()
+    pressures = [4, 24, 98.8]
+    temperatures = [260, 400, 565]
+
+    result = enthalpy.overheated_steam_derivative_array(pressures, temperatures)
+
+    assert result == pytest.approx([enthalpy.overheated_steam_derivative(p, t) for p, t in zip(pressures, temperatures)], rel=1e-12)
@@ -101,3 +101,50 @@ class TestEntropy:
 
     with pytest.raises(DataValidationError, match="Invalid pressure"):
       enthalpy.overheated_steam(pressure=5, temperature=300)
+
+  # ---------- TESTS for array versions ----------
+  def test_saturated_array_matches_scalar(self):
+    """Test saturated liquid and steam arrays against the scalar correlations, in all temperature ranges."""
+    entropy = Entropy()
+    pressures = [0.01, 0.074, 1, 24, 98.8, 150, 200]
+
+    liquid = entropy.saturated_liquid_array(pressures)
+    steam = entropy.saturated_steam_array(pressures)
+
+    assert liquid == pytest.approx([entropy.saturated_liquid(p) for p in pressures], rel=1e-12)
+    assert steam == pytest.approx([entropy.saturated_steam(p) for p in pressures], rel=1e-12)
+
+  def test_overheated_steam_array_matches_scalar(self):
+    """Test overheated steam array against the scalar correlation."""
+    entropy = Entropy()
+    pressures = [4, 24, 98.8]
+    temperatures = [312.5, 450, 565]
+
+    result = entropy.overheated_steam_array(pressures, temperatures)
+
+    assert result == pytest.approx([entropy.overheated_steam(p, t) for p, t in zip(pressures, temperatures)], rel=1e-12)
+
+  def test_overheated_steam_array_invalid_pressure(self):
+    """Test overheated steam array reporting the invalid elements."""
+    entropy = Entropy()
+    with pytest.raises(DataValidationError, match=r"Pressure invalid: out of the range \(elements 0\)"):
+      entropy.overheated_steam_array([-5, 10], [200, 200])
+
+  # ---------- TESTS for derivatives ----------
+  def test_overheated_steam_derivative_matches_finite_difference(self):
+    """Test the exact derivative with temperature against a central finite difference."""
+    entropy = Entropy()
+    step = 1e-4
+    for p, t in [(4, 260), (24, 400), (98.8, 565)]:
+      finite_difference = (entropy.overheated_steam(p, t + step) - entropy.overheated_steam(p, t - step)) / (2 * step)
+      assert entropy.overheated_steam_derivative(p, t) == pytest.approx(finite_difference, rel=1e-6)
+
+  def test_overheated_steam_derivative_array_matches_scalar(self):
+    """Test the derivative array version against the scalar one."""
+    entropy = Entropy()
+    pressures = [4, 24, 98.8]
+    temperatures = [260, 400, 565]
+
+    result = entropy.overheated_steam_derivative_array(pressures, temperatures)
+
+    assert result == pytest.approx([entropy.overheated_steam_derivative(p, t) for p, t in zip(pressures, temperatures)], rel=1e-12)
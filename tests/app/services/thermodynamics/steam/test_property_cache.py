@@ -0,0 +1,73 @@
+import pytest
+from unittest.mock import Mock
+from sqlmodel import Session
+from app.services.thermodynamics.steam.enthalpy import Enthalpy
+from app.services.thermodynamics.steam.saturation_parameters import SaturationParameters
+from app.services.thermodynamics.steam.property_cache import steam_property_cache
+from app.database.engine import engine
+from app.models.input import Input
+from app.repositories.repositories_container import RepositoriesContainer
+from app.services.orchestrators.full_cycles import FullCycles
+from app.utils.errors import DataValidationError
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+  steam_property_cache.clear()
+  yield
+  steam_property_cache.clear()
+
+
+def test_repeated_property_is_served_by_the_cache(mocker):
+  """Test a repeated steam property evaluated once."""
+  enthalpy = Enthalpy()
+  spy = mocker.spy(enthalpy.saturation_params, "saturation_factor")
+
+  first = enthalpy.saturated_liquid(0.074)
+  second = Enthalpy().saturated_liquid(0.074)
+
+  assert first == second
+  assert spy.call_count == 1
+  assert steam_property_cache.stats()["hits"] >= 1
+
+def test_cache_key_includes_the_saturation_mode():
+  """Test the analytic and tabulated modes cached apart."""
+  analytic = SaturationParameters("analytic").saturation_temperature(24)
+  tabulated = SaturationParameters("tabulated").saturation_temperature(24)
+
+  assert tabulated == pytest.approx(analytic, abs=1e-9)
+  assert steam_property_cache.stats()["misses"] == 2
+
+def test_cache_bypassed_with_mocked_saturation():
+  """Test the cache bypassed when the saturation service is a mock."""
+  mock_params = Mock()
+  mock_params.saturation_temperature.return_value = 100
+  enthalpy = Enthalpy(saturation_params=mock_params)
+
+  enthalpy.overheated_steam(10, 300)
+  enthalpy.overheated_steam(10, 300)
+
+  assert mock_params.saturation_temperature.call_count == 2
+  assert steam_property_cache.stats()["size"] == 0
+
+def test_cached_full_cycle_matches_uncached(monkeypatch, valid_input_payload):
+  """Test a full cycle at a condenser pressure of 0.074 bar, cold and warm cache, matching the run without the cache."""
+  input = Input(**valid_input_payload)
+  with Session(engine) as db:
+    repos = RepositoriesContainer(db)
+    cold = FullCycles(input, repos).create_full_cycles_combined()
+    warm = FullCycles(input, repos).create_full_cycles_combined()
+    monkeypatch.setattr(steam_property_cache, "maxsize", 0)
+    uncached = FullCycles(input, repos).create_full_cycles_combined()
+
+  assert input.condenser_operation_pressure == 0.074
+  assert cold == uncached
+  assert warm == uncached
+
+def test_errors_are_not_cached():
+  """Test an invalid pressure raising on every call."""
+  saturation_parameters = SaturationParameters()
+
+  for _ in range(2):
+    with pytest.raises(DataValidationError):
+      saturation_parameters.saturation_temperature(1000)
+  assert steam_property_cache.stats()["size"] == 0
@@ -1,6 +1,7 @@
 import pytest
 import math
-from app.services.thermodynamics.steam.saturation_parameters import SaturationParameters
+import numpy as np
+from app.services.thermodynamics.steam.saturation_parameters import SaturationParameters, SATURATION_PRESSURE_TABLE_MAX_RELATIVE_ERROR
 from app.utils.errors import DataValidationError
 
 class TestSaturationParameters:
@@ -64,3 +65,60 @@ class TestSaturationParameters:
         result1 = self.sp.saturation_factor(50, 1,0.1,0.01,0.001,0,0,0,0,0,0,0)
         result2 = self.sp.saturation_factor(150, 1,0.1,0.01,0.001,0,0,0,0,0,0,0)
         assert result1 != result2  # values ​​should change according to temperature
+
+    # -------------------------------
+    # array versions
+    # -------------------------------
+    def test_saturation_temperature_array_matches_scalar(self):
+      # Pressures in both ranges of the correlation (below and above 123.3 bar)
+      pressures = [0.01, 0.074, 1, 24, 98.8, 123.3, 200, 221]
+      result = self.sp.saturation_temperature_array(pressures)
+      expected = [self.sp.saturation_temperature(p) for p in pressures]
+      assert result.shape == (len(pressures),)
+      assert result == pytest.approx(expected, rel=1e-12)
+
+    def test_saturation_temperature_array_invalid_elements(self):
+      # The error reports which elements are out of range
+      with pytest.raises(DataValidationError, match=r"Pressure invalid: out of the range \(elements 1, 3\)"):
+        self.sp.saturation_temperature_array([1, 0.0001, 10, 300])
+
+    def test_saturation_pressure_array_matches_scalar(self):
+      temperatures = [1, 15, 100, 250, 374]
+      result = self.sp.saturation_pressure_array(temperatures)
+      expected = [self.sp.saturation_pressure(t) for t in temperatures]
+      assert result == pytest.approx(expected, rel=1e-12)
+
+    def test_saturation_pressure_array_invalid_elements(self):
+      with pytest.raises(DataValidationError, match=r"Temperature invalid: out of the range \(elements 0\)"):
+        self.sp.saturation_pressure_array([-200, 100])
+
+    # -------------------------------
+    # tabulated mode
+    # -------------------------------
+    def test_tabulated_saturation_temperature_is_analytic(self):
+      tabulated = SaturationParameters("tabulated")
+      # Saturation temperature is not tabulated: both sides of the 123.3 bar breakpoint included
+      pressures = np.concatenate([np.geomspace(0.00611, 221, 1001), [123.3, 123.3 - 1e-9]])
+
+      assert np.array_equal(tabulated.saturation_temperature_array(pressures), self.sp.saturation_temperature_array(pressures))
+      assert tabulated.saturation_temperature(24) == self.sp.saturation_temperature(24)
+
+    def test_tabulated_saturation_pressure_within_documented_error(self):
+      tabulated = SaturationParameters("tabulated")
+      temperatures = np.linspace(0.02, 374.15, 50001)
+
+      result = tabulated.saturation_pressure_array(temperatures)
+      expected = self.sp.saturation_pressure_array(temperatures)
+      assert np.max(np.abs(result / expected - 1)) <= SATURATION_PRESSURE_TABLE_MAX_RELATIVE_ERROR
+      assert tabulated.saturation_pressure(15) == pytest.approx(self.sp.saturation_pressure(15), rel=SATURATION_PRESSURE_TABLE_MAX_RELATIVE_ERROR)
+
+    def test_tabulated_mode_validates_the_range(self):
+      tabulated = SaturationParameters("tabulated")
+      with pytest.raises(DataValidationError, match="Pressure invalid: out of the range"):
+        tabulated.saturation_temperature(300)
+      with pytest.raises(DataValidationError, match="Temperature invalid: out of the range"):
+        tabulated.saturation_pressure(-200)
+
+    def test_invalid_saturation_mode(self):
+      with pytest.raises(DataValidationError, match="Invalid saturation mode: spline"):
+        SaturationParameters("spline")
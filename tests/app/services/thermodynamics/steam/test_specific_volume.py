@@ -33,3 +33,19 @@ class TestSpecificVolume:
 
     with pytest.raises(DataValidationError, match="Pressure invalid: out of the range"):
       specific_volume.saturated_liquid(pressure=1)
+
+  # ---------- TESTS for array versions ----------
+  def test_saturated_liquid_array_matches_scalar(self):
+    """Test saturated_liquid array against the scalar correlation."""
+    specific_volume = SpecificVolume()
+    pressures = [0.074, 1, 24, 98.8]
+
+    result = specific_volume.saturated_liquid_array(pressures)
+
+    assert result == pytest.approx([specific_volume.saturated_liquid(p) for p in pressures], rel=1e-12)
+
+  def test_saturated_liquid_array_invalid_pressure(self):
+    """Test saturated_liquid array reporting the invalid elements."""
+    specific_volume = SpecificVolume()
+    with pytest.raises(DataValidationError, match=r"Pressure invalid: out of the range \(elements 2\)"):
+      specific_volume.saturated_liquid_array([0.074, 1, 500])
@@ -0,0 +1,43 @@
+import pytest
+from app.services.utils.experiment_design import cartesian_design, linspace_design, latin_hypercube_design
+from app.utils.errors import LogicConstraintError
+
+def test_cartesian_design_combines_all_values():
+  """Test that the cartesian design has every combination, the last axis varying fastest"""
+  points = cartesian_design({"a": [1, 2], "b": [10, 20, 30]})
+  assert len(points) == 6
+  assert points[0] == {"a": 1, "b": 10}
+  assert points[1] == {"a": 1, "b": 20}
+  assert points[-1] == {"a": 2, "b": 30}
+
+def test_linspace_design_varies_axes_together():
+  """Test that the linspace design takes the i-th value of every axis"""
+  assert linspace_design({"a": [1, 2], "b": [10, 20]}) == [{"a": 1, "b": 10}, {"a": 2, "b": 20}]
+
+def test_linspace_design_different_lengths():
+  """Test that axes of different lengths are rejected"""
+  with pytest.raises(LogicConstraintError):
+    linspace_design({"a": [1, 2], "b": [10]})
+
+def test_latin_hypercube_design_stratifies_each_variable():
+  """Test that each interval of each variable is sampled exactly once, within the bounds"""
+  samples = 20
+  points = latin_hypercube_design({"a": (0, 1), "b": (100, 200)}, samples, seed=7)
+  assert len(points) == samples
+
+  for name, (lower, upper) in {"a": (0, 1), "b": (100, 200)}.items():
+    values = [point[name] for point in points]
+    assert all(lower <= value <= upper for value in values)
+    intervals = sorted(int((value - lower) / (upper - lower) * samples) for value in values)
+    assert intervals == list(range(samples))
+
+def test_latin_hypercube_design_is_reproducible():
+  """Test that the same seed gives the same sample"""
+  bounds = {"a": (0, 1)}
+  assert latin_hypercube_design(bounds, 5, seed=1) == latin_hypercube_design(bounds, 5, seed=1)
+  assert latin_hypercube_design(bounds, 5, seed=1) != latin_hypercube_design(bounds, 5, seed=2)
+
+def test_latin_hypercube_design_without_samples():
+  """Test that a design without samples is rejected"""
+  with pytest.raises(LogicConstraintError):
+    latin_hypercube_design({"a": (0, 1)}, 0)
@@ -0,0 +1,21 @@
+import math
+import pytest
+import numpy as np
+from app.services.utils.interpolation import HermiteTable
+
+def test_hermite_table_is_exact_for_cubic_polynomials():
+  """Test the interpolation of a cubic polynomial, reproduced exactly by Hermite splines."""
+  table = HermiteTable(-1.0, 2.0, 7, lambda x: x ** 3 - 2 * x + 1, lambda x: 3 * x ** 2 - 2)
+
+  for x in [-1.0, -0.3, 0.0, 0.77, 1.5, 2.0]:
+    assert table(x) == pytest.approx(x ** 3 - 2 * x + 1, abs=1e-12)
+
+def test_hermite_table_array_matches_scalar():
+  """Test the array version of the interpolation against the scalar one."""
+  table = HermiteTable(0.0, math.pi, 64, np.sin, np.cos)
+  x = np.linspace(0.0, math.pi, 101)
+
+  result = table.evaluate_array(x)
+
+  assert result == pytest.approx([table(value) for value in x], abs=1e-15)
+  assert result == pytest.approx(np.sin(x), abs=1e-7)
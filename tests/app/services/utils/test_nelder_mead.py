@@ -0,0 +1,37 @@
+import math
+import pytest
+from app.services.utils.nelder_mead import NelderMead
+
+def test_nelder_mead_interior_minimum():
+  """Test the minimum of a quadratic inside the bounds"""
+  optimizer = NelderMead()
+  optimizer.maximum_evaluations = 500
+  result = optimizer.minimize(lambda x: (x[0] - 3) ** 2 + 2 * (x[1] + 1) ** 2, [0, 0], [-5, -5], [5, 5])
+
+  assert result["converged"]
+  assert result["x"] == pytest.approx([3, -1], abs=1e-3)
+  assert result["value"] == pytest.approx(0, abs=1e-6)
+  assert optimizer.last_evaluations == result["evaluations"] <= 500
+
+def test_nelder_mead_minimum_on_bound():
+  """Test the minimum of a function decreasing beyond the upper bound, found on the bound"""
+  result = NelderMead().minimize(lambda x: -x[0], [2], [0], [10])
+  assert result["x"] == pytest.approx([10])
+
+def test_nelder_mead_avoids_failed_evaluations():
+  """Test the points of infinite value (failed evaluations) avoided"""
+  function = lambda x: math.inf if x[0] > 4 else (x[0] - 4.5) ** 2
+  result = NelderMead().minimize(function, [1], [0], [10])
+  assert result["x"][0] <= 4
+  assert result["x"][0] == pytest.approx(4, abs=1e-2)
+
+def test_nelder_mead_stops_at_maximum_evaluations():
+  """Test the budget of evaluations, reported as not converged, with a non-increasing trace"""
+  optimizer = NelderMead()
+  optimizer.maximum_evaluations = 15
+  result = optimizer.minimize(lambda x: (x[0] - 1) ** 2 + (x[1] - 2) ** 2 + (x[2] - 3) ** 2, [0, 0, 0], [-10] * 3, [10] * 3)
+
+  assert not result["converged"]
+  assert result["evaluations"] <= 15 + 3
+  values = [step["value"] for step in result["trace"]]
+  assert values == sorted(values, reverse=True)
@@ -0,0 +1,131 @@
+import re
+import math
+import pytest
+import numpy as np
+from app.services.utils.newton_method import NewtonMethod
+from app.services.thermodynamics.steam.saturation_parameters import SaturationParameters
+from app.services.thermodynamics.steam.entropy import Entropy, isentropic_temperature_estimate
+from app.services.thermodynamics.steam.enthalpy import Enthalpy
+from app.utils.errors import ComputationalError
+
+class MockSaturationParameters:
+  """Mock that simulates the behavior of the saturation object"""
+  def saturation_temperature(self, pressure):
+    # fixed value just to simplify the test
+    return 100.0
+
+  def saturation_temperature_array(self, pressure):
+    return np.full(np.shape(pressure), 100.0)
+
+
+class MockThermoPropertyFunction:
+  """Mock that simulates the thermodynamic function used in the iterations, with a cubic relationship"""
+  def overheated_steam(self, pressure, temperature):
+    return pressure * 0.1 + temperature + 1e-5 * temperature ** 3
+
+  def overheated_steam_derivative(self, pressure, temperature):
+    return 1 + 3e-5 * temperature ** 2
+
+  def overheated_steam_array(self, pressure, temperature):
+    return self.overheated_steam(np.asarray(pressure), np.asarray(temperature))
+
+  def overheated_steam_derivative_array(self, pressure, temperature):
+    return self.overheated_steam_derivative(np.asarray(pressure), np.asarray(temperature))
+
+
+def test_newton_method_converges_successfully():
+  """Test newton_method calculation with valid data."""
+  newton = NewtonMethod()
+  thermo = MockThermoPropertyFunction()
+
+  result = newton.run(500.0, thermo, 10.0, MockSaturationParameters())
+
+  assert thermo.overheated_steam(10.0, result) == pytest.approx(500.0, abs=1e-9)
+  assert 0 < newton.last_iterations <= 10
+  assert newton.total_roots == 1
+
+def test_newton_method_bisects_outside_the_bracket():
+  """Test solve() falling back to bisection when the Newton step leaves the bracket."""
+  newton = NewtonMethod()
+
+  # arctan flattens away from the root, so pure Newton from x = 3 diverges
+  result = newton.solve(math.atan, lambda x: 1 / (1 + x ** 2), 3.0, lower_bound=-10.0, upper_bound=10.0)
+
+  assert result == pytest.approx(0.0, abs=1e-9)
+
+def test_newton_method_fails_without_bracket():
+  """Test newton_method calculation with a flat function and no bracket."""
+  newton = NewtonMethod()
+  expected_message = "Newton method failed: non-positive derivative without a bracket of the root"
+
+  with pytest.raises(ComputationalError, match=re.escape(expected_message)):
+    newton.solve(lambda x: 1.0, lambda x: 0.0, 5.0)
+
+def test_newton_method_matches_steam_tables_in_few_iterations():
+  """Test newton_method in isentropic expansions of the steam turbines: the outlet entropy matches the inlet entropy."""
+  saturation_parameters, entropy = SaturationParameters(), Entropy()
+
+  for inlet_pressure, inlet_temperature, outlet_pressure in [(98.8, 565, 24), (24, 565, 4), (40, 400, 3)]:
+    newton = NewtonMethod()
+    inlet_entropy = entropy.overheated_steam(inlet_pressure, inlet_temperature)
+    initial_guess = isentropic_temperature_estimate(inlet_temperature, inlet_pressure, outlet_pressure)
+
+    result = newton.run(inlet_entropy, entropy, outlet_pressure, saturation_parameters, initial_guess)
+
+    assert entropy.overheated_steam(outlet_pressure, result) == pytest.approx(inlet_entropy, abs=1e-12)
+    assert newton.last_iterations <= 5
+
+def test_newton_method_array_matches_scalar():
+  """Test newton_method array version solving several problems at once."""
+  newton = NewtonMethod()
+  saturation_parameters, enthalpy = SaturationParameters(), Enthalpy()
+
+  outlet_pressures = np.array([4.0, 24.0, 98.8])
+  inlet_enthalpies = enthalpy.overheated_steam_array(outlet_pressures, [300.0, 450.0, 520.0])
+
+  result, iterations = newton.run_array(inlet_enthalpies, enthalpy, outlet_pressures, saturation_parameters)
+
+  expected = [newton.run(h, enthalpy, p, saturation_parameters) for h, p in zip(inlet_enthalpies, outlet_pressures)]
+  assert result == pytest.approx(expected, abs=1e-6)
+  assert result == pytest.approx([300.0, 450.0, 520.0], abs=1e-6)
+  assert iterations.shape == (3,)
+  assert (iterations > 0).all()
+
+def test_newton_method_array_reports_failed_elements():
+  """Test newton_method array version reporting the elements without a bracket."""
+  newton = NewtonMethod()
+  function = lambda x, indices: np.where(indices == 1, 1.0, x - 2.0)
+  derivative = lambda x, indices: np.where(indices == 1, 0.0, 1.0)
+
+  with pytest.raises(ComputationalError, match=r"\(elements 1\)"):
+    newton.solve_array(function, derivative, np.array([0.0, 0.0, 5.0]))
+
+def test_newton_method_array_keeps_exact_roots():
+  """Test newton_method array version with elements reaching their exact root while others still iterate."""
+  newton = NewtonMethod()
+  # Roots at 1 (hit exactly by the first step of the linear element) and at sqrt(2)
+  function = lambda x, indices: np.where(indices == 0, x - 1.0, x ** 2 - 2.0)
+  derivative = lambda x, indices: np.where(indices == 0, 1.0, 2 * x)
+
+  result, iterations = newton.solve_array(function, derivative, np.array([3.0, 3.0]))
+
+  assert result == pytest.approx([1.0, math.sqrt(2)])
+  assert iterations[0] < iterations[1]
+
+def test_newton_method_time_budget():
+  """Test the time budget of newton_method, in the scalar and array versions."""
+  newton = NewtonMethod()
+  newton.time_budget = -1
+
+  with pytest.raises(ComputationalError, match="time budget"):
+    newton.solve(lambda x: x - 2.0, lambda x: 1.0, 0.0)
+  with pytest.raises(ComputationalError, match="time budget"):
+    newton.solve_array(lambda x, indices: x - 2.0, lambda x, indices: np.ones_like(x), np.array([0.0]))
+
+def test_newton_method_iteration_budget():
+  """Test the iteration budget of newton_method with a root that needs more iterations."""
+  newton = NewtonMethod()
+  newton.maximum_iterations = 2
+
+  with pytest.raises(ComputationalError, match="maximum iterations"):
+    newton.solve(lambda x: x ** 3 - 2.0, lambda x: 3 * x ** 2, 10.0)
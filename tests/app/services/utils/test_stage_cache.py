@@ -0,0 +1,106 @@
+import pytest
+from app.services.utils.stage_cache import cached_per_input, InputTracer, StageMemo
+
+class MockService:
+  """Service whose calculation counts how many times it was executed"""
+  def __init__(self, input):
+    self.input = input
+    self.calls = 0
+
+  @cached_per_input
+  def calculation(self):
+    self.calls += 1
+    if self.input is None:
+      raise ValueError("Invalid input")
+    return self.input * 2
+
+def test_cached_per_input_computes_once():
+  """Test that the result is reused while the input is the same"""
+  service = MockService(21)
+  assert service.calculation() == 42
+  assert service.calculation() == 42
+  assert service.calls == 1
+
+def test_cached_per_input_recomputes_for_new_input():
+  """Test that replacing the input discards the cached result"""
+  service = MockService(21)
+  service.calculation()
+  service.input = 5
+  assert service.calculation() == 10
+  assert service.calls == 2
+
+def test_cached_per_input_does_not_cache_errors():
+  """Test that errors are raised again on each call"""
+  service = MockService(None)
+  with pytest.raises(ValueError):
+    service.calculation()
+  with pytest.raises(ValueError):
+    service.calculation()
+  assert service.calls == 2
+
+def test_cached_per_input_is_per_instance():
+  """Test that two services with the same input do not share results"""
+  first = MockService(1)
+  second = MockService(1)
+  first.calculation()
+  second.calculation()
+  assert first.calls == second.calls == 1
+
+def test_input_tracer_records_fields_read(mock_input_factory):
+  """Test that the tracer records the attributes and the vars() values read through it"""
+  tracer = InputTracer(mock_input_factory(a=1, b=2, c=3))
+  assert tracer.a == 1
+  assert list(vars(tracer)) == ["a", "b", "c"]
+  assert vars(tracer)["b"] == 2
+  assert tracer.fields_read == {"a", "b"}
+
+def test_stage_memo_reuses_stage_not_reading_varied_field(mock_input_factory):
+  """Test that a stage is computed once for inputs differing only in fields it does not read"""
+  memo = StageMemo()
+  calls = []
+  compute = lambda input: calls.append(input.a) or input.a * 10
+
+  assert memo.run("stage", mock_input_factory(a=1, b=1), compute) == 10
+  assert memo.run("stage", mock_input_factory(a=1, b=2), compute) == 10
+  assert memo.run("stage", mock_input_factory(a=2, b=2), compute) == 20
+  assert calls == [1, 2]
+  assert (memo.hits, memo.misses) == (1, 2)
+  assert memo.fields["stage"] == ("a",)
+
+def test_stage_memo_keys_on_dependency_fields(mock_input_factory):
+  """Test that a stage is recomputed when a field read by its dependency changes"""
+  memo = StageMemo()
+  first = mock_input_factory(a=1, b=1)
+  second = mock_input_factory(a=2, b=1)
+
+  memo.run("dependency", first, lambda input: input.a)
+  memo.run("stage", first, lambda input: input.b, dependencies=("dependency",))
+  memo.run("dependency", second, lambda input: input.a)
+  memo.run("stage", second, lambda input: input.b, dependencies=("dependency",))
+
+  assert memo.fields["stage"] == ("a", "b")
+  assert memo.misses == 4
+
+def test_stage_memo_does_not_memoize_errors(mock_input_factory):
+  """Test that a failing stage is computed again"""
+  memo = StageMemo()
+  input = mock_input_factory(a=1)
+
+  def compute(input):
+    raise ValueError("Invalid input")
+
+  for _ in range(2):
+    with pytest.raises(ValueError):
+      memo.run("stage", input, compute)
+  assert memo.misses == 2
+
+def test_stage_memo_does_not_memoize_stage_of_unknown_dependency(mock_input_factory):
+  """Test that a stage depending on a result that was not memoized is computed at each run"""
+  memo = StageMemo()
+  calls = []
+  compute = lambda input: calls.append(input.a) or input.a
+
+  assert memo.run("stage", mock_input_factory(a=1), compute, dependencies=("given",)) == 1
+  assert memo.run("stage", mock_input_factory(a=1), compute, dependencies=("given",)) == 1
+  assert calls == [1, 1]
+  assert "stage" not in memo.fields
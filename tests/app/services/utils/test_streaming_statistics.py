@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+from app.services.utils.streaming_statistics import Reservoir, RunningMoments, StreamingHistogram
+
+def test_running_moments_match_numpy():
+  """Test the moments merged chunk by chunk against those of all values at once."""
+  values = np.random.default_rng(1).normal([10, -3], [2, 0.5], (1000, 2))
+  moments = RunningMoments(2)
+  for chunk in np.array_split(values, 7):
+    moments.add(chunk)
+
+  assert moments.count == 1000
+  assert moments.mean == pytest.approx(values.mean(axis=0), rel=1e-12)
+  assert moments.std == pytest.approx(values.std(axis=0, ddof=1), rel=1e-12)
+  assert list(moments.minimum) == list(values.min(axis=0))
+  assert list(moments.maximum) == list(values.max(axis=0))
+
+def test_running_moments_single_value():
+  moments = RunningMoments(1)
+  moments.add(np.array([[4.0]]))
+  moments.add(np.empty((0, 1)))
+  assert moments.count == 1
+  assert list(moments.std) == [0]
+
+def test_reservoir_exact_below_its_size():
+  """Test the percentiles of a stream shorter than the reservoir, equal to those of all values."""
+  values = np.random.default_rng(2).uniform(0, 1, (500, 1))
+  reservoir = Reservoir(1, 1000, seed=0)
+  for chunk in np.array_split(values, 3):
+    reservoir.add(chunk)
+
+  assert reservoir.percentiles([5, 50, 95]) == pytest.approx(np.percentile(values, [5, 50, 95], axis=0))
+
+def test_reservoir_uniform_sample_of_long_stream():
+  """Test the reservoir of a long stream: it keeps only stream rows, spread over all the stream."""
+  values = np.arange(100000, dtype=float).reshape(-1, 1)
+  reservoir = Reservoir(1, 1000, seed=0)
+  for chunk in np.array_split(values, 40):
+    reservoir.add(chunk)
+
+  kept = reservoir.rows[:, 0]
+  assert len(np.unique(kept)) == 1000
+  assert reservoir.percentiles([50])[0, 0] == pytest.approx(50000, rel=0.1)
+  # The first and the last quarter of the stream are both represented
+  assert 150 < np.sum(kept < 25000) < 350
+  assert 150 < np.sum(kept >= 75000) < 350
+
+def test_streaming_histogram_counts_every_value():
+  """Test the histogram growing both ways beyond the range of the first chunk, without dropping values."""
+  histogram = StreamingHistogram(10)
+  histogram.add(np.array([0.0, 1.0]))
+  histogram.add(np.array([-20.0, 0.5]))
+  histogram.add(np.array([35.0]))
+
+  assert histogram.counts.sum() == 5
+  edges = histogram.edges
+  assert edges[0] <= -20 and edges[-1] >= 35
+  assert np.diff(edges) == pytest.approx(np.full(10, histogram.width))
+  # Each value is counted in its bin
+  expected, _ = np.histogram([0.0, 1.0, -20.0, 0.5, 35.0], bins=edges)
+  assert list(histogram.counts) == list(expected)
+
+def test_streaming_histogram_trimmed():
+  histogram = StreamingHistogram(10)
+  histogram.add(np.array([0.0, 1.0, 0.25]))
+  edges, counts = histogram.trimmed()
+
+  assert counts.sum() == 3
+  assert counts[0] > 0 and counts[-1] > 0
+  assert len(edges) == len(counts) + 1
+  assert edges[0] <= 0 and edges[-1] >= 1
@@ -0,0 +1,35 @@
+import json
+import pyarrow.parquet as parquet
+from app.cli import main
+
+def test_cli_writes_sweep_as_csv(tmp_path, valid_input_payload):
+  """Test the sweep run from the command line, written to the output file"""
+  request = tmp_path / "sweep.json"
+  request.write_text(json.dumps({"base": valid_input_payload, "variables": [{"field": "purge_level", "values": [0, 1]}]}))
+  output = tmp_path / "results.csv"
+
+  assert main(["sweep", str(request), "-f", "csv", "-o", str(output)]) == 0
+
+  lines = output.read_text().splitlines()
+  assert len(lines) == 3
+  assert lines[0].startswith("purge_level,LHV_fuel,")
+
+def test_cli_writes_batch_as_parquet(tmp_path, valid_input_payload):
+  """Test the batch run from the command line, written as a Parquet file"""
+  request = tmp_path / "inputs.json"
+  request.write_text(json.dumps([valid_input_payload, {**valid_input_payload, "methane_molar_fraction_fuel": 50}]))
+  output = tmp_path / "results.parquet"
+
+  assert main(["batch", str(request), "-o", str(output)]) == 0
+
+  table = parquet.read_table(output)
+  assert table.num_rows == 2
+  assert table.column("type").to_pylist() == [None, "LogicConstraintError"]
+
+def test_cli_invalid_request(tmp_path, capsys):
+  """Test an invalid request reported on the standard error"""
+  request = tmp_path / "sweep.json"
+  request.write_text(json.dumps({"variables": []}))
+
+  assert main(["sweep", str(request), "-f", "ndjson"]) == 2
+  assert "error" in capsys.readouterr().err
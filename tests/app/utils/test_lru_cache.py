@@ -0,0 +1,73 @@
+from threading import Thread
+from app.utils.lru_cache import LRUCache, MISSING
+
+def test_lru_cache_discards_least_recently_used():
+  """Test the bound of the cache, keeping the recently used entries."""
+  cache = LRUCache(maxsize=2)
+  cache.put("a", 1)
+  cache.put("b", 2)
+
+  # Using "a" makes "b" the least recently used entry
+  assert cache.get("a") == 1
+  cache.put("c", 3)
+
+  assert cache.get("b") is MISSING
+  assert cache.get("a") == 1
+  assert cache.get("c") == 3
+  assert len(cache) == 2
+
+def test_lru_cache_stats():
+  """Test hit/miss statistics."""
+  cache = LRUCache(maxsize=10)
+  cache.get("a")
+  cache.put("a", None)
+  cache.get("a")
+  cache.get("a")
+
+  assert cache.stats() == {"hits": 2, "misses": 1, "expirations": 0, "hit_rate": 2 / 3, "size": 1, "maxsize": 10}
+
+  cache.clear()
+  assert cache.stats()["size"] == 0
+  assert cache.stats()["hits"] == 0
+
+def test_lru_cache_disabled():
+  """Test a cache of size 0 storing nothing."""
+  cache = LRUCache(maxsize=0)
+  cache.put("a", 1)
+
+  assert cache.get("a") is MISSING
+  assert len(cache) == 0
+
+def test_lru_cache_concurrent_access():
+  """Test the cache bound and statistics under concurrent access."""
+  cache = LRUCache(maxsize=50)
+
+  def worker(offset):
+    for i in range(1000):
+      key = (offset + i) % 80
+      if cache.get(key) is MISSING:
+        cache.put(key, key)
+
+  threads = [Thread(target=worker, args=(offset,)) for offset in range(8)]
+  for thread in threads:
+    thread.start()
+  for thread in threads:
+    thread.join()
+
+  stats = cache.stats()
+  assert stats["hits"] + stats["misses"] == 8000
+  assert stats["size"] <= 50
+
+def test_lru_cache_ttl():
+  """Test the expiration of entries after the ttl."""
+  now = [100.0]
+  cache = LRUCache(maxsize=10, ttl=5, clock=lambda: now[0])
+  cache.put("a", 1)
+
+  now[0] = 104.9
+  assert cache.get("a") == 1
+
+  now[0] = 105.0
+  assert cache.get("a") is MISSING
+  assert cache.stats()["expirations"] == 1
+  assert len(cache) == 0
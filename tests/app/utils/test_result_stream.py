@@ -0,0 +1,48 @@
+import csv
+import io
+import json
+from app.models.output import Output
+from app.models.simulation_error import SimulationError
+from app.models.sweep import SweepRow
+from app.utils.result_stream import RESULT_COLUMNS, csv_lines, ndjson_lines, stream_lines
+
+OUTPUT = Output(**{field: 10.0 for field in Output.model_fields})
+ERROR = SimulationError(error="Impossible cycle", type="ThermodynamicError")
+
+def test_ndjson_lines_one_object_per_line():
+  """Test each row serialized as a JSON line"""
+  lines = list(ndjson_lines([OUTPUT, ERROR]))
+  assert len(lines) == 2
+  assert all(line.endswith("\n") for line in lines)
+  assert json.loads(lines[0]) == OUTPUT.model_dump()
+  assert json.loads(lines[1]) == {"error": "Impossible cycle", "type": "ThermodynamicError"}
+
+def test_ndjson_lines_is_lazy():
+  """Test rows consumed only as lines are requested"""
+  consumed = []
+
+  def rows():
+    for row in (OUTPUT, ERROR):
+      consumed.append(row)
+      yield row
+
+  lines = ndjson_lines(rows())
+  next(lines)
+  assert consumed == [OUTPUT]
+
+def test_csv_lines_of_batch_results():
+  """Test the CSV of results and errors, with the columns of the other kind left empty"""
+  records = list(csv.DictReader(io.StringIO("".join(csv_lines([OUTPUT, ERROR])))))
+  assert list(records[0]) == RESULT_COLUMNS
+  assert float(records[0]["LHV_fuel"]) == 10.0
+  assert records[0]["error"] == ""
+  assert records[1]["LHV_fuel"] == ""
+  assert records[1]["type"] == "ThermodynamicError"
+
+def test_csv_lines_of_sweep_rows():
+  """Test the CSV of sweep rows, starting with the varied fields"""
+  rows = [SweepRow(point={"purge_level": 1.0}, result=OUTPUT), SweepRow(point={"purge_level": 20.0}, result=ERROR)]
+  lines = list(stream_lines(rows, "csv", ["purge_level"]))
+  assert lines[0].startswith("purge_level,LHV_fuel,")
+  assert lines[1].startswith("1.0,10.0,")
+  assert lines[2].startswith("20.0,,")
@@ -0,0 +1,61 @@
+import io
+import numpy as np
+import pyarrow
+import pyarrow.parquet
+import pytest
+from app.models.output import Output
+from app.models.result_columns import ResultColumns
+from app.models.simulation_error import SimulationError
+from app.utils import result_table
+from app.utils.errors import LogicConstraintError
+
+OUTPUT = Output(**{field: 10.0 for field in Output.model_fields})
+ERROR = SimulationError(error="Impossible cycle", type="ThermodynamicError")
+
+def test_require_pyarrow_without_the_package(monkeypatch):
+  """Test the columnar formats refused when the package is not installed"""
+  monkeypatch.setattr(result_table, "pyarrow", None)
+  with pytest.raises(LogicConstraintError):
+    result_table.require_pyarrow("parquet")
+
+def test_record_batch_masks_failed_rows():
+  """Test the columns of a block, with the Output fields null and the error set in failed rows"""
+  columns = ResultColumns.from_rows([OUTPUT, ERROR]).with_columns({"purge_level": [1.0, 20.0]})
+  schema = result_table.table_schema(["purge_level"])
+
+  batch = result_table.record_batch(columns, schema)
+
+  assert batch.schema.names[0] == "purge_level"
+  assert batch.column("purge_level").to_pylist() == [1.0, 20.0]
+  assert batch.column("LHV_fuel").to_pylist() == [10.0, None]
+  assert batch.column("type").to_pylist() == [None, "ThermodynamicError"]
+  assert batch.column("LHV_fuel").type == pyarrow.float64()
+
+def test_record_batch_takes_the_result_arrays():
+  """Test the Output columns of a block written from the arrays of its ResultColumns, without building Outputs"""
+  values = np.linspace(1.0, 2.0, 5)
+  columns = ResultColumns({field: values for field in Output.model_fields}, [None] * 5)
+
+  batch = result_table.record_batch(columns, result_table.table_schema())
+
+  assert batch.column("net_power_cycle_combined").to_numpy().tolist() == values.tolist()
+  assert batch.column("error").null_count == 5
+
+@pytest.mark.parametrize("output_format", ["arrow", "parquet"])
+def test_table_chunks_one_piece_per_block(output_format):
+  """Test the bytes of the table written block by block, read back with all the rows"""
+  rows = [OUTPUT if i % 3 else ERROR for i in range(25)]
+  blocks = [ResultColumns.from_rows(rows[start:start + 10]) for start in range(0, 25, 10)]
+
+  chunks = list(result_table.table_chunks(iter(blocks), output_format))
+  data = b"".join(chunks)
+  if output_format == "arrow":
+    table = pyarrow.ipc.open_stream(data).read_all()
+  else:
+    table = pyarrow.parquet.read_table(io.BytesIO(data))
+
+  # 3 blocks and the end of the stream (or the Parquet footer)
+  assert len(chunks) == 4
+  assert table.num_rows == 25
+  assert table.column("LHV_fuel").null_count == 9
+  assert table.column_names == [*Output.model_fields, "error", "type"]